@@ -0,0 +1,10 @@
+"""
+📈 BENCHMARKS - Sistema de Inventario AGC
+Bases sintéticas y mediciones de rendimiento de la capa de datos y de la ventana principal
+
+Uso:
+    python -m benchmarks --tamanos 10k 100k
+    python -m benchmarks --tamanos 500k --repeticiones 3 --guardar-base
+    python -m benchmarks --suite ui --tamanos 10k 100k
+    python -m benchmarks --suite indices --tamanos 100k
+"""
@@ -0,0 +1,101 @@
+"""
+📈 BENCHMARKS - PUNTO DE ENTRADA
+python -m benchmarks [--suite db|ui|indices|todo] [--tamanos 10k 100k 500k] [--repeticiones N] [--guardar-base] [--regenerar]
+"""
+
+import argparse
+import os
+import platform
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.banco_db import BancoDB, cargar_base, comparar, guardar_base
+from benchmarks.generador_inventario import TAMANOS, GeneradorInventario
+from database.asesor_indices import informe
+from utils.logger import configurar_logging
+
+
+def _informe(titulo, resultados, base, regresiones):
+    """Tabla por caso: mediana, peor (p95 o máximo), bloqueo máximo del bucle de eventos y base"""
+    print(f"\n📈 {titulo}")
+    print("=" * 90)
+    print(f"  {'caso':<42} {'mediana':>9} {'peor':>9} {'bloqueo':>9} {'base':>9}")
+    for caso, medicion in resultados.items():
+        anterior = ((base or {}).get("resultados") or {}).get(caso, {}).get("mediana_ms")
+        peor = medicion.get("p95_ms", medicion.get("max_ms"))
+        bloqueo = medicion.get("bloqueo_max_ms")
+        bloqueo = f"{bloqueo:>9.2f}" if bloqueo is not None else f"{'-':>9}"
+        anterior = f"{anterior:>9.2f}" if anterior is not None else f"{'-':>9}"
+        print(f"  {caso:<42} {medicion['mediana_ms']:>9.2f} {peor:>9.2f} {bloqueo} {anterior}")
+    for caso, base_ms, actual in regresiones:
+        print(f"  ⚠️ REGRESIÓN {caso}: {actual:.2f} ms (base {base_ms:.2f} ms)")
+    if base and not regresiones:
+        print("  ✅ Sin regresiones respecto de la línea base")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de la capa de datos del inventario")
+    parser.add_argument("--suite", choices=["db", "ui", "indices", "todo"], default="db",
+                        help="db: métodos de DB; ui: ventana principal offscreen; "
+                             "indices: asesor de índices (antes/después de aplicar sus propuestas)")
+    parser.add_argument("--tamanos", nargs="+", default=["10k"], choices=sorted(TAMANOS))
+    parser.add_argument("--repeticiones", type=int, default=BancoDB.REPETICIONES)
+    parser.add_argument("--semilla", type=int, default=GeneradorInventario.SEMILLA)
+    parser.add_argument("--guardar-base", action="store_true", help="Reemplaza la línea base con esta corrida")
+    parser.add_argument("--regenerar", action="store_true", help="Regenera las bases sintéticas")
+    parser.add_argument("--sin-importacion", action="store_true", help="No medir la importación de Excel")
+    args = parser.parse_args()
+
+    # La consola queda para el informe; el detalle va al archivo de log
+    configurar_logging({"log_nivel": "INFO", "log_consola": False})
+
+    generador = GeneradorInventario(args.semilla)
+    suites = ["db", "ui"] if args.suite == "todo" else [args.suite]
+    hay_regresiones = False
+    for tamano in args.tamanos:
+        ruta = generador.obtener(TAMANOS[tamano], regenerar=args.regenerar)
+        for suite in suites:
+            if suite == "indices":
+                from benchmarks.banco_indices import BancoIndices
+                banco = BancoIndices(ruta, args.repeticiones, generador)
+                try:
+                    antes, despues = banco.ejecutar()
+                finally:
+                    banco.cerrar()
+                # Acá la "base" es la misma corrida sin los índices propuestos
+                _informe(f"ÍNDICES {tamano} ({TAMANOS[tamano]:,} bienes): después vs antes",
+                         despues, {"resultados": antes}, comparar(despues, {"resultados": antes}))
+                print()
+                print(informe(banco.propuestas))
+                continue
+            if suite == "db":
+                banco = BancoDB(ruta, args.repeticiones, generador)
+                nombre_base = tamano
+            else:
+                from benchmarks.banco_ui import BancoUI  # importa Qt en modo offscreen
+                banco = BancoUI(ruta)
+                nombre_base = f"ui_{tamano}"
+            try:
+                resultados = (banco.ejecutar(incluir_importacion=not args.sin_importacion)
+                              if suite == "db" else banco.ejecutar())
+            finally:
+                banco.cerrar()
+
+            base = cargar_base(nombre_base)
+            regresiones = comparar(resultados, base) if base else []
+            hay_regresiones = hay_regresiones or bool(regresiones)
+            _informe(f"{suite.upper()} {tamano} ({TAMANOS[tamano]:,} bienes)", resultados, base, regresiones)
+
+            if args.guardar_base:
+                guardar_base(nombre_base, resultados, {
+                    "bienes": TAMANOS[tamano], "semilla": args.semilla,
+                    "python": platform.python_version(), "plataforma": platform.platform(),
+                })
+                print(f"  💾 Línea base actualizada: {nombre_base}")
+
+    sys.exit(1 if hay_regresiones else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+⏲️ BANCO DE PRUEBAS DB - Sistema de Inventario AGC
+Mide los métodos clave de DB sobre una base sintética y compara con la línea base
+"""
+
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from database.db_manager import DB
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+CARPETA_BASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bases")
+
+
+class BancoDB:
+    """
+    Corre cada caso REPETICIONES veces (más una de calentamiento) sobre una
+    copia de trabajo de la base, para que las escrituras no ensucien la
+    base en caché, y devuelve mínimo, mediana y p95 en milisegundos.
+    """
+
+    REPETICIONES = 5
+    FILAS_IMPORTACION = 500
+
+    def __init__(self, ruta_db, repeticiones=None, generador=None):
+        self.ruta_origen = ruta_db
+        self.repeticiones = repeticiones or self.REPETICIONES
+        self.generador = generador
+        self._carpeta = tempfile.mkdtemp(prefix="inventario_banco_")
+        self.ruta_trabajo = os.path.join(self._carpeta, "trabajo.db")
+        shutil.copyfile(ruta_db, self.ruta_trabajo)
+        self.db = DB(self.ruta_trabajo, os.path.join(self._carpeta, "actas"))
+
+    def cerrar(self):
+        self.db.cerrar()
+        shutil.rmtree(self._carpeta, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Casos
+    # ------------------------------------------------------------------
+    def _muestra(self):
+        """Valores reales de la base para armar consultas representativas"""
+        conn = self.db.conn
+        marca_comun = conn.execute(
+            "SELECT marca FROM bienes GROUP BY marca ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+        tipo_comun = conn.execute(
+            "SELECT tipo FROM bienes GROUP BY tipo ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+        institucional = conn.execute(
+            "SELECT institucional FROM bienes WHERE institucional != '' "
+            "GROUP BY institucional ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+        bien = conn.execute("SELECT * FROM bienes ORDER BY id LIMIT 1 OFFSET "
+                            "(SELECT COUNT(*) / 2 FROM bienes)").fetchone()
+        ids_deposito = [fila[0] for fila in conn.execute(
+            "SELECT id FROM bienes WHERE estado = 'En depósito' LIMIT 20")]
+        con_historial = conn.execute(
+            "SELECT id_bien FROM bienes_movimientos GROUP BY id_bien ORDER BY COUNT(*) DESC LIMIT 1").fetchone()
+        return {
+            "marca": marca_comun, "tipo": tipo_comun, "institucional": institucional,
+            "bien": dict(bien), "ids_deposito": ids_deposito,
+            "id_con_historial": con_historial[0] if con_historial else bien["id"],
+        }
+
+    def casos(self):
+        """[(nombre, función)] de los métodos medidos"""
+        db = self.db
+        m = self._muestra()
+        bien = m["bien"]
+        movimiento = {
+            "tipo": "Entrega",
+            "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "responsable": "BANCO DE PRUEBAS",
+            "responsable_nombre": "Banco",
+            "responsable_apellido": "Pruebas",
+            "responsable_dni_cuit": "20000000001",
+            "responsable_institucional": m["institucional"],
+            "observaciones": "benchmark",
+        }
+        return [
+            ("buscar_bienes.comun", lambda: db.buscar_bienes(m["marca"])),
+            ("buscar_bienes.ficha", lambda: db.buscar_bienes(bien["ficha"])),
+            ("buscar_bienes.sin_resultados", lambda: db.buscar_bienes("zzzz-no-existe")),
+            ("buscar_bienes_filtrados.tipo", lambda: db.buscar_bienes_filtrados({"tipo": m["tipo"]})),
+            ("buscar_bienes_filtrados.combinado", lambda: db.buscar_bienes_filtrados(
+                {"tipo": m["tipo"], "estado": "Asignado", "institucional": m["institucional"][:20]})),
+            ("get_movimientos_detallados.completo", lambda: db.get_movimientos_detallados()),
+            ("get_movimientos_detallados.sin_resumenes", lambda: db.get_movimientos_detallados(
+                columnas=["id", "tipo", "fecha", "responsable"])),
+            ("obtener_movimientos_por_bien", lambda: db.obtener_movimientos_por_bien(m["id_con_historial"])),
+            ("get_estadisticas_filtradas.todo", lambda: db.get_estadisticas_filtradas()),
+            ("get_estadisticas_filtradas.institucional", lambda: db.get_estadisticas_filtradas(
+                institucional=m["institucional"])),
+            ("bien_existe.ficha", lambda: db.bien_existe(
+                bien["ficha"], bien["tipo"], bien["marca"], bien["modelo"], bien["serie"], bien["imei"])),
+            ("bien_existe.nuevo", lambda: db.bien_existe(
+                "999999999", bien["tipo"], bien["marca"], "MODELO-NUEVO", "", "")),
+            ("add_movimiento.1_bien", lambda: db.add_movimiento(dict(movimiento), m["ids_deposito"][:1])),
+            ("add_movimiento.20_bienes", lambda: db.add_movimiento(dict(movimiento), m["ids_deposito"])),
+        ]
+
+    # ------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------
+    def medir(self, funcion, repeticiones=None):
+        repeticiones = repeticiones or self.repeticiones
+        resultado = funcion()  # calentamiento (caché de páginas y de sentencias)
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        tiempos.sort()
+        return {
+            "min_ms": round(tiempos[0], 2),
+            "mediana_ms": round(statistics.median(tiempos), 2),
+            "p95_ms": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 2),
+            "filas": len(resultado) if isinstance(resultado, (list, tuple)) else None,
+        }
+
+    def medir_importacion(self):
+        """Análisis de importación de Excel (necesita pandas y openpyxl)"""
+        try:
+            from core.bien_manager import BienManager
+            from utils.excel_handler import analizar_y_preparar_importacion
+        except ImportError as e:
+            logger.warning("⏭️ Importación no medida: %s", e)
+            return None
+        ruta_excel = os.path.join(self._carpeta, "importacion.xlsx")
+        self.generador.generar_excel_importacion(ruta_excel, self.FILAS_IMPORTACION)
+        bien_manager = BienManager(self.db)
+        return self.medir(lambda: analizar_y_preparar_importacion(ruta_excel, self.db, bien_manager),
+                          repeticiones=min(self.repeticiones, 3))
+
+    def ejecutar(self, incluir_importacion=True):
+        resultados = {}
+        for nombre, funcion in self.casos():
+            resultados[nombre] = self.medir(funcion)
+            logger.info("⏲️ %-42s mediana %8.2f ms", nombre, resultados[nombre]["mediana_ms"])
+        if incluir_importacion and self.generador is not None:
+            importacion = self.medir_importacion()
+            if importacion is not None:
+                resultados["importacion.analizar_excel"] = importacion
+        return resultados
+
+
+# Línea base --------------------------------------------------------------------
+
+TOLERANCIA = 0.30   # más de un 30% sobre la mediana base es regresión...
+MINIMO_MS = 5       # ...si además la diferencia pasa de esto
+
+
+def ruta_base(tamano):
+    return os.path.join(CARPETA_BASES, f"{tamano}.json")
+
+
+def cargar_base(tamano):
+    try:
+        with open(ruta_base(tamano), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def guardar_base(tamano, resultados, info=None):
+    os.makedirs(CARPETA_BASES, exist_ok=True)
+    with open(ruta_base(tamano), "w", encoding="utf-8") as f:
+        json.dump({"fecha": datetime.now().isoformat(timespec="seconds"),
+                   **(info or {}), "resultados": resultados}, f, indent=2, ensure_ascii=False)
+
+
+def comparar(resultados, base):
+    """[(caso, base_ms, actual_ms)] cuya mediana empeoró más allá de la tolerancia"""
+    regresiones = []
+    for caso, medicion in resultados.items():
+        anterior = (base.get("resultados") or {}).get(caso)
+        if not anterior:
+            continue
+        base_ms, actual = anterior["mediana_ms"], medicion["mediana_ms"]
+        if actual > base_ms * (1 + TOLERANCIA) and actual - base_ms > MINIMO_MS:
+            regresiones.append((caso, base_ms, actual))
+    return regresiones
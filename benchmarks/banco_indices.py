@@ -0,0 +1,39 @@
+"""
+💡 BANCO DE ÍNDICES - Sistema de Inventario AGC
+Asesor de índices sobre una base sintética: propuestas y tiempos antes/después de aplicarlas
+"""
+
+from benchmarks.banco_db import BancoDB
+from database.asesor_indices import AsesorIndices
+from database.metricas import metricas
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class BancoIndices:
+    """
+    Sobre la copia de trabajo de BancoDB: corre los casos (eso llena el
+    catálogo de sentencias), pide propuestas al asesor, valida cada una,
+    aplica las elegidas (`AsesorIndices.seleccionar`) y vuelve a correr los casos.
+    """
+
+    def __init__(self, ruta_db, repeticiones=None, generador=None):
+        self.banco = BancoDB(ruta_db, repeticiones, generador)
+        self.propuestas = []
+
+    def cerrar(self):
+        self.banco.cerrar()
+
+    def ejecutar(self):
+        """(resultados antes, resultados después); las propuestas quedan en self.propuestas"""
+        metricas().reiniciar()
+        antes = self.banco.ejecutar(incluir_importacion=False)
+
+        asesor = AsesorIndices(self.banco.db.conn)
+        self.propuestas = [asesor.validar(p) for p in asesor.analizar(metricas().consultas())]
+        creados = asesor.aplicar(asesor.seleccionar(self.propuestas))
+        logger.info("💡 %s propuestas, %s índices aplicados", len(self.propuestas), len(creados))
+
+        despues = self.banco.ejecutar(incluir_importacion=False)
+        return antes, despues
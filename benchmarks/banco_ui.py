@@ -0,0 +1,247 @@
+"""
+🖥️ BANCO DE PRUEBAS UI - Sistema de Inventario AGC
+Ventana principal sin pantalla sobre una base sintética: tiempo y bloqueos por interacción
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Sin pantalla: tiene que estar definido antes de crear la QApplication
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, Qt, QTimer
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+from database.db_manager import DB
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class MonitorBloqueos:
+    """
+    Timer de INTERVALO_MS: si entre dos ticks pasa mucho más que eso, el
+    bucle de eventos estuvo bloqueado (la ventana no respondía) ese tiempo.
+    """
+
+    INTERVALO_MS = 5
+    UMBRAL_MS = 50   # bloqueos más cortos no se notan
+
+    def __init__(self):
+        self.bloqueos = []
+        self._ultimo = None
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    def iniciar(self):
+        self._ultimo = time.perf_counter()
+        self._timer.start(self.INTERVALO_MS)
+
+    def detener(self):
+        self._timer.stop()
+
+    def reiniciar(self):
+        self.bloqueos = []
+        self._ultimo = time.perf_counter()
+
+    def _tick(self):
+        ahora = time.perf_counter()
+        espera_ms = (ahora - self._ultimo) * 1000 - self.INTERVALO_MS
+        if espera_ms > self.UMBRAL_MS:
+            self.bloqueos.append(espera_ms)
+        self._ultimo = ahora
+
+
+class BancoUI:
+    """
+    Abre VentanaPrincipal offscreen sobre una copia de la base y guiona
+    las interacciones de todos los días. Cada interacción corre dentro del
+    bucle de eventos (como un clic) y después se deja ASENTAR_MS para que
+    se vea también el trabajo diferido (timers, repintados).
+
+    Por interacción: mediana del tiempo hasta que la acción y los eventos
+    que dejó pendientes terminan, y bloqueos del bucle (máximo, total, cantidad).
+    """
+
+    REPETICIONES = 3
+    ASENTAR_MS = 150
+    USUARIO = {'id': 'mario', 'nombre': 'Mario', 'apellido': 'Admin', 'cargo': 'Administrador del Sistema',
+               'dni_cuit': '20123456789', 'email': 'mario@agc.gob.ar', 'rol': 'admin'}
+
+    def __init__(self, ruta_db, repeticiones=None):
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.repeticiones = repeticiones or self.REPETICIONES
+        self._carpeta = tempfile.mkdtemp(prefix="inventario_banco_ui_")
+        ruta_trabajo = os.path.join(self._carpeta, "trabajo.db")
+        shutil.copyfile(ruta_db, ruta_trabajo)
+        self.db = DB(ruta_trabajo, os.path.join(self._carpeta, "actas"))
+        self.monitor = MonitorBloqueos()
+        self.dialogos = []
+        self.ventana = None
+
+    def cerrar(self):
+        self.monitor.detener()
+        if self.ventana is not None:
+            self.ventana.close()
+            self.ventana.deleteLater()
+            self.app.processEvents()
+        self.db.cerrar()
+        shutil.rmtree(self._carpeta, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+    def _sin_dialogos(self):
+        """Un QMessageBox modal colgaría la corrida desatendida: se anota y se sigue"""
+        def anotar(_padre, titulo, texto, *args, **kwargs):
+            self.dialogos.append(f"{titulo}: {texto}")
+            logger.warning("🖥️ Diálogo omitido: %s - %s", titulo, texto)
+            return QMessageBox.Yes
+        for nombre in ("information", "warning", "critical", "question"):
+            setattr(QMessageBox, nombre, staticmethod(anotar))
+
+    def _correr(self, accion):
+        """Corre `accion` desde el bucle de eventos; devuelve (ms, bloqueos)"""
+        bucle = QEventLoop()
+        resultado = {}
+
+        def ejecutar():
+            inicio = time.perf_counter()
+            try:
+                accion()
+            except Exception as e:
+                resultado['error'] = str(e)
+                logger.error("❌ Interacción falló: %s", e)
+            QApplication.processEvents()
+            resultado['ms'] = (time.perf_counter() - inicio) * 1000
+            QTimer.singleShot(self.ASENTAR_MS, bucle.quit)
+
+        self.monitor.reiniciar()
+        QTimer.singleShot(0, ejecutar)
+        bucle.exec_()
+        return resultado['ms'], list(self.monitor.bloqueos), resultado.get('error')
+
+    def medir(self, accion, preparar=None, repeticiones=None):
+        tiempos, bloqueos, errores = [], [], []
+        for _ in range(repeticiones or self.repeticiones):
+            if preparar is not None:
+                preparar()
+                QApplication.processEvents()
+            ms, bloqueos_accion, error = self._correr(accion)
+            tiempos.append(ms)
+            bloqueos.extend(bloqueos_accion)
+            if error:
+                errores.append(error)
+        return {
+            "mediana_ms": round(statistics.median(tiempos), 2),
+            "max_ms": round(max(tiempos), 2),
+            "bloqueo_max_ms": round(max(bloqueos, default=0.0), 2),
+            "bloqueo_total_ms": round(sum(bloqueos) / len(tiempos), 2),
+            "bloqueos": len(bloqueos),
+            **({"errores": errores} if errores else {}),
+        }
+
+    # ------------------------------------------------------------------
+    # Interacciones
+    # ------------------------------------------------------------------
+    def _crear_ventana(self):
+        from ui.main_window import VentanaPrincipal
+        self.ventana = VentanaPrincipal(self.db, self.USUARIO)
+        self.ventana.resize(1280, 800)
+        self.ventana.show()
+
+    def interacciones(self):
+        """[(nombre, acción, preparación)] sobre la ventana ya abierta"""
+        v = self.ventana
+        panel = v.panel_filtros
+
+        def escribir(campo, texto):
+            return lambda: QTest.keyClicks(campo, texto)
+
+        def limpiar(campo):
+            def preparar():
+                campo.blockSignals(True)
+                campo.clear()
+                campo.blockSignals(False)
+            return preparar
+
+        def ir_a_pagina_1():
+            v.pagina_actual = 1
+            v.cargar_bienes()
+
+        def items(cantidad):
+            def preparar():
+                v.combo_items_pagina.blockSignals(True)
+                v.combo_items_pagina.setCurrentText("50")
+                v.combo_items_pagina.blockSignals(False)
+                v.cambiar_items_por_pagina()
+            return (lambda: v.combo_items_pagina.setCurrentText(str(cantidad))), preparar
+
+        casos = [
+            ("bienes.pagina_siguiente", v.pagina_siguiente, None),
+            ("bienes.pagina_anterior", v.pagina_anterior, v.pagina_siguiente),
+            ("bienes.items_por_pagina_500", *items(500)),
+            ("bienes.escribir_filtro_apellido", escribir(panel.filtro_apellido, "Sosa"),
+             limpiar(panel.filtro_apellido)),
+            ("bienes.filtro_tipo", lambda: panel.filtro_tipo.setCurrentIndex(1),
+             lambda: panel.filtro_tipo.setCurrentIndex(0)),
+            ("bienes.limpiar_filtros", panel.limpiar_filtros, lambda: panel.filtro_tipo.setCurrentIndex(1)),
+            ("bienes.recargar", ir_a_pagina_1, None),
+            ("movimientos.escribir_busqueda", escribir(v.buscador_movimientos, "gom"),
+             limpiar(v.buscador_movimientos)),
+            ("movimientos.filtro_entregas", v.btn_entregas.click, v.btn_todos_movimientos.click),
+            ("movimientos.recargar", v.cargar_movimientos, None),
+            ("status_bar.actualizar", v.actualizar_status_bar, None),
+        ]
+        return casos
+
+    def interacciones_dashboard(self):
+        v = self.ventana
+        casos = []
+        for indice, tipo in ((0, "Bienes por Marca"), (1, "Bienes por Área")):
+            combo = v.dashboard_widget.contenedores_graficos[indice]['combo']
+
+            def preparar(combo=combo):
+                combo.blockSignals(True)
+                combo.setCurrentIndex(0)
+                combo.blockSignals(False)
+            casos.append((f"dashboard.grafico_{indice + 1}_{tipo.split()[-1].lower()}",
+                          lambda combo=combo, tipo=tipo: combo.setCurrentText(tipo), preparar))
+
+        combo_tipo = v.dashboard_widget.combo_tipo
+
+        def preparar_filtro():
+            v.dashboard_widget.cache_estadisticas.clear()
+            combo_tipo.blockSignals(True)
+            combo_tipo.setCurrentIndex(0)
+            combo_tipo.blockSignals(False)
+        casos.append(("dashboard.filtrar_tipo", lambda: combo_tipo.setCurrentIndex(1), preparar_filtro))
+        return casos
+
+    def ejecutar(self):
+        self._sin_dialogos()
+        self.monitor.iniciar()
+        resultados = {"ventana.crear": self.medir(self._crear_ventana, repeticiones=1)}
+
+        for nombre, accion, preparar in self.interacciones():
+            resultados[nombre] = self.medir(accion, preparar)
+            logger.info("🖥️ %-40s mediana %8.2f ms", nombre, resultados[nombre]["mediana_ms"])
+
+        # Primera entrada al dashboard (construye widget y gráficos) y después sus gráficos
+        tabs = self.ventana.tabs
+        resultados["dashboard.abrir"] = self.medir(
+            lambda: tabs.setCurrentWidget(self.ventana.tab_dashboard), repeticiones=1)
+        resultados["dashboard.volver"] = self.medir(
+            lambda: tabs.setCurrentWidget(self.ventana.tab_dashboard), lambda: tabs.setCurrentIndex(0))
+        for nombre, accion, preparar in self.interacciones_dashboard():
+            resultados[nombre] = self.medir(accion, preparar)
+
+        if self.dialogos:
+            logger.warning("🖥️ %s diálogos omitidos durante la corrida", len(self.dialogos))
+        return resultados
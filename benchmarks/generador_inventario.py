@@ -0,0 +1,261 @@
+"""
+🏭 GENERADOR DE INVENTARIO - Sistema de Inventario AGC
+Bases sintéticas realistas para medir rendimiento
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from database.db_manager import DB
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+TAMANOS = {"10k": 10_000, "100k": 100_000, "500k": 500_000}
+
+# Catálogos: el orden es el de frecuencia (distribución tipo Zipf)
+TIPOS = [
+    "Notebook", "Monitor", "CPU", "Celular", "Silla", "Escritorio", "Impresora",
+    "Tablet", "Teclado", "Mouse", "Proyector", "Router", "Switch", "Cámara",
+    "Heladera", "Microondas", "Aire acondicionado", "Escáner", "UPS", "Otro",
+]
+MARCAS = [
+    "HP", "Lenovo", "Samsung", "Dell", "Motorola", "Positivo", "Epson", "BGH",
+    "Philips", "Genérica", "Apple", "Cisco", "TP-Link", "Brother", "LG",
+    "Logitech", "Noblex", "Xerox", "APC", "Sony", "Acer", "Asus", "Kodak",
+]
+INSTITUCIONALES = [
+    "DIRECCION GENERAL DE FISCALIZACION Y CONTROL",
+    "DIRECCION GENERAL HABILITACIONES Y PERMISOS",
+    "AGENCIA GUBERNAMENTAL DE CONTROL",
+    "DIRECCION GENERAL FISCALIZACION Y CONTROL DE OBRAS",
+    "DIRECCION GENERAL HIGIENE Y SEGURIDAD ALIMENTARIA",
+    "UNIDAD DE COORDINACION ADMINISTRATIVA",
+    "DIRECCION EJECUTIVA",
+    "DIRECCION GENERAL LEGAL Y TECNICA",
+    "UNION OPERATIVA DE FISCALIZACION INTEGRAL",
+    "UNIDAD OPERATIVA PLANIFICACION Y COORDINACION DE GESTION",
+    "GERENCIA OPERATIVA ESTRATEGIA COMUNICACIONAL",
+    "UNIDAD DE AUDITORIA INTERNA",
+]
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Laura", "Jorge", "Silvia", "Diego",
+           "Paula", "Martín", "Gabriela", "Pablo", "Lucía", "Sergio", "Valeria"]
+APELLIDOS = ["González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez",
+             "Pérez", "García", "Sánchez", "Romero", "Sosa", "Álvarez", "Torres", "Ruiz",
+             "Ramírez", "Flores", "Acosta", "Benítez", "Medina", "Herrera", "Suárez"]
+TIPOS_CON_LINEA = {"Celular", "Tablet"}
+
+# Tipo de movimiento -> peso
+TIPOS_MOVIMIENTO = {"Entrega": 55, "Devolución": 30, "Transferencia": 10, "Baja": 5}
+# Cantidad de bienes por movimiento -> peso (la mayoría son de uno o pocos)
+BIENES_POR_MOVIMIENTO = {1: 50, 2: 15, 3: 10, 5: 10, 10: 8, 25: 5, 60: 2}
+
+COLUMNAS_BIEN = [
+    "ficha", "tipo", "marca", "modelo", "serie", "linea", "sim", "empresa", "imei",
+    "responsable", "nombre", "apellido", "dni_cuit", "institucional", "descripcion",
+    "estado", "fecha_registro", "monto_original", "prd", "anio_prd",
+]
+COLUMNAS_MOVIMIENTO = [
+    "tipo", "fecha", "responsable", "responsable_nombre", "responsable_apellido",
+    "responsable_dni_cuit", "responsable_institucional", "observaciones",
+    "archivo_path_pdf", "numero_transferencia", "eliminado", "fecha_eliminacion",
+    "motivo_eliminacion",
+]
+
+
+def pesos_zipf(cantidad, s=1.2):
+    return [1 / (rango ** s) for rango in range(1, cantidad + 1)]
+
+
+class GeneradorInventario:
+    """
+    Arma una base con el esquema real (lo crea DB._init_db) y la llena con
+    bienes y movimientos sintéticos con sesgo realista:
+
+    - tipo, marca e institucional con distribución Zipf (pocos valores
+      concentran la mayoría de los bienes);
+    - movimientos en orden cronológico, casi todos de 1-3 bienes y unos
+      pocos de decenas; el estado final de cada bien es el de su último
+      movimiento, como lo dejaría add_movimiento.
+
+    La misma semilla produce siempre la misma base.
+    """
+
+    SEMILLA = 2024
+    VERSION = 1                     # cambiarla invalida las bases en caché
+    MOVIMIENTOS_POR_BIEN = 0.25
+    LOTE = 5000
+
+    def __init__(self, semilla=None):
+        self.semilla = self.SEMILLA if semilla is None else semilla
+        self.azar = random.Random(self.semilla)
+        self._pesos_tipo = pesos_zipf(len(TIPOS))
+        self._pesos_marca = pesos_zipf(len(MARCAS))
+        self._pesos_institucional = pesos_zipf(len(INSTITUCIONALES), 1.0)
+
+    # ------------------------------------------------------------------
+    # Base completa
+    # ------------------------------------------------------------------
+    def ruta_cache(self, cantidad_bienes):
+        carpeta = os.path.join(tempfile.gettempdir(), "inventario_benchmarks")
+        return os.path.join(carpeta, f"inventario_{cantidad_bienes}_s{self.semilla}_v{self.VERSION}.db")
+
+    def obtener(self, cantidad_bienes, regenerar=False):
+        """Ruta a una base generada (usa la caché si ya existe)"""
+        ruta = self.ruta_cache(cantidad_bienes)
+        if regenerar or not os.path.exists(ruta):
+            self.generar(ruta, cantidad_bienes)
+        return ruta
+
+    def generar(self, ruta, cantidad_bienes, cantidad_movimientos=None):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        if cantidad_movimientos is None:
+            cantidad_movimientos = int(cantidad_bienes * self.MOVIMIENTOS_POR_BIEN)
+
+        inicio = datetime.now()
+        logger.info("🏭 Generando base sintética: %s bienes, %s movimientos", cantidad_bienes, cantidad_movimientos)
+
+        # Esquema e índices reales
+        db = DB(ruta, os.path.join(os.path.dirname(ruta), "actas"))
+        db.cerrar()
+
+        conn = sqlite3.connect(ruta)
+        try:
+            conn.execute("PRAGMA synchronous = OFF")
+            bienes = [self._bien(i) for i in range(cantidad_bienes)]
+            movimientos, vinculos = self._movimientos(bienes, cantidad_movimientos)
+            with conn:
+                self._insertar(conn, "bienes", COLUMNAS_BIEN, bienes)
+                self._insertar(conn, "movimientos", COLUMNAS_MOVIMIENTO, movimientos)
+                self._insertar(conn, "bienes_movimientos", ["id_bien", "id_movimiento"], vinculos)
+        finally:
+            conn.close()
+
+        logger.info("🏭 Base lista en %.1fs: %s", (datetime.now() - inicio).total_seconds(), ruta)
+        return ruta
+
+    def _insertar(self, conn, tabla, columnas, filas):
+        sql = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})"
+        for i in range(0, len(filas), self.LOTE):
+            conn.executemany(sql, [[fila[c] for c in columnas] for fila in filas[i:i + self.LOTE]])
+
+    # ------------------------------------------------------------------
+    # Filas
+    # ------------------------------------------------------------------
+    def _bien(self, i):
+        azar = self.azar
+        tipo = azar.choices(TIPOS, self._pesos_tipo)[0]
+        marca = azar.choices(MARCAS, self._pesos_marca)[0]
+        con_linea = tipo in TIPOS_CON_LINEA
+        anio = azar.randint(2012, 2025)
+        fecha = datetime(2018, 1, 1) + timedelta(minutes=azar.randint(0, 8 * 365 * 24 * 60))
+        return {
+            "ficha": str(100000 + i),
+            "tipo": tipo,
+            "marca": marca,
+            "modelo": f"{marca[:3].upper()}-{azar.randint(100, 999)}",
+            "serie": "SIN SERIE" if azar.random() < 0.1 else f"SN{azar.getrandbits(40):010X}",
+            "linea": f"11{azar.randint(10000000, 99999999)}" if con_linea else "",
+            "sim": f"SIM{azar.randint(100000, 999999)}" if con_linea else "",
+            "empresa": azar.choice(["Personal", "Claro", "Movistar"]) if con_linea else "",
+            "imei": str(azar.randint(10 ** 14, 10 ** 15 - 1)) if con_linea else "",
+            "responsable": "",
+            "nombre": "",
+            "apellido": "",
+            "dni_cuit": "",
+            "institucional": "",
+            "descripcion": f"{tipo} {marca} - patrimonio {anio}",
+            "estado": "En depósito",
+            "fecha_registro": fecha.strftime("%Y-%m-%d %H:%M:%S"),
+            "monto_original": f"{azar.uniform(5000, 900000):.2f}",
+            "prd": f"{azar.randint(1, 9999):04d}-{anio}",
+            "anio_prd": str(anio),
+        }
+
+    def _responsable(self):
+        azar = self.azar
+        return {
+            "nombre": azar.choice(NOMBRES),
+            "apellido": azar.choice(APELLIDOS),
+            "dni_cuit": f"20{azar.randint(10000000, 45000000)}{azar.randint(0, 9)}",
+            "institucional": azar.choices(INSTITUCIONALES, self._pesos_institucional)[0],
+        }
+
+    def _movimientos(self, bienes, cantidad):
+        """Movimientos cronológicos; deja en cada bien el estado de su último movimiento"""
+        azar = self.azar
+        tipos = list(TIPOS_MOVIMIENTO)
+        pesos_tipo = list(TIPOS_MOVIMIENTO.values())
+        tamanos = list(BIENES_POR_MOVIMIENTO)
+        pesos_tamano = list(BIENES_POR_MOVIMIENTO.values())
+        fecha = datetime(2019, 1, 1)
+        paso = max(1, int(7 * 365 * 24 * 60 / max(cantidad, 1)))
+
+        movimientos, vinculos = [], []
+        for mov_id in range(1, cantidad + 1):
+            tipo = azar.choices(tipos, pesos_tipo)[0]
+            responsable = self._responsable()
+            fecha += timedelta(minutes=azar.randint(1, 2 * paso))
+            eliminado = azar.random() < 0.01
+            movimientos.append({
+                "tipo": tipo,
+                "fecha": fecha.strftime("%Y-%m-%d %H:%M:%S"),
+                "responsable": f"{responsable['nombre']} {responsable['apellido']}".upper(),
+                "responsable_nombre": responsable["nombre"],
+                "responsable_apellido": responsable["apellido"],
+                "responsable_dni_cuit": responsable["dni_cuit"],
+                "responsable_institucional": responsable["institucional"],
+                "observaciones": "",
+                "archivo_path_pdf": f"actas/acta_{mov_id}.pdf" if azar.random() < 0.6 else "",
+                "numero_transferencia": f"TR-{mov_id:06d}" if tipo == "Transferencia" else "",
+                "eliminado": 1 if eliminado else 0,
+                "fecha_eliminacion": fecha.strftime("%Y-%m-%d %H:%M:%S") if eliminado else None,
+                "motivo_eliminacion": "Carga duplicada" if eliminado else None,
+            })
+
+            cantidad_bienes = min(azar.choices(tamanos, pesos_tamano)[0], len(bienes))
+            for indice in azar.sample(range(len(bienes)), cantidad_bienes):
+                vinculos.append({"id_bien": indice + 1, "id_movimiento": mov_id})
+                if not eliminado:
+                    self._aplicar(bienes[indice], tipo, responsable)
+        return movimientos, vinculos
+
+    @staticmethod
+    def _aplicar(bien, tipo, responsable):
+        """Mismo efecto que DB.ACTUALIZACIONES_POR_MOVIMIENTO"""
+        if tipo == "Entrega":
+            bien.update(responsable, estado="Asignado")
+        elif tipo == "Baja":
+            bien["estado"] = "Baja definitiva"
+        else:
+            bien["estado"] = "En depósito"
+            if tipo == "Devolución":
+                bien.update(nombre="", apellido="", dni_cuit="", institucional="")
+
+    # ------------------------------------------------------------------
+    # Excel de importación
+    # ------------------------------------------------------------------
+    def generar_excel_importacion(self, ruta, filas=500, proporcion_existentes=0.2, primera_ficha_existente=100000):
+        """
+        Planilla con el formato de la plantilla de importación: bienes
+        nuevos, algunos ya existentes (actualizables/conflictos) y algunas
+        fichas repetidas dentro del mismo archivo. Requiere pandas.
+        """
+        import pandas as pd
+
+        registros = []
+        for i in range(filas):
+            bien = self._bien(900000 + i)
+            if self.azar.random() < proporcion_existentes:
+                bien["ficha"] = str(primera_ficha_existente + self.azar.randint(0, 9999))
+            if self.azar.random() < 0.02 and registros:
+                bien["ficha"] = self.azar.choice(registros)["ficha"]
+            registros.append(bien)
+        columnas = [c for c in COLUMNAS_BIEN if c not in ("responsable", "fecha_registro")]
+        pd.DataFrame(registros, columns=columnas).to_excel(ruta, index=False)
+        return ruta
@@ -31,20 +31,47 @@ CONFIG_DEFAULT_PRO = {
     "modo_trabajo": "local_con_sincronizacion",  # local_con_sincronizacion, red_directo, local_solo
     "db_maestra_red": "M:\\Patrimonio\\01 PATRIMONIO\\InventarioApp\\inventario.db",
     "db_cache_local": os.path.join(_obtener_ruta_base(), "inventario_cache.db"),
+    "db_replica_local": os.path.join(_obtener_ruta_base(), "inventario_replica.db"),  # lecturas en red_directo
+    "db_diario_escrituras": os.path.join(_obtener_ruta_base(), "inventario_diario.db"),  # escrituras en red_directo
+    
+    # Servidor de coordinación (servidor.py): si está, reemplaza al archivo compartido
+    "servidor_url": "",
+    "servidor_token": "",  # secreto compartido con el servidor; sin él responde 401
     
     # Configuración de sincronización
     "auto_sincronizar": True,
     "intervalo_sincronizacion": 300,
+    "intervalo_notificaciones": 2,  # segundos entre chequeos de cambios de otros puestos
+    "puesta_al_dia_segundos": 5,    # tope de la puesta al día al abrir
     "ultima_sincronizacion": None,
     "usuario_actual": "",
     
+    # Replicación parcial: vacío = todo el inventario
+    "alcance_replicacion": {"institucional": [], "tipos": []},
+    
     # Control de conflictos
     "notificar_conflictos": True,
     "resolucion_automatica": False,
     
+    # Mantenimiento de la base en segundo plano (optimize, ANALYZE, vacuum, integrity_check)
+    "mantenimiento_automatico": True,
+    
+    # Movimientos de más de estos días (y los eliminados) pasan al archivo (<base>_archivo.db); 0 = no archivar
+    "archivo_horizonte_dias": 730,
+    
+    # Asesor de índices (panel de rendimiento): solo propone salvo que esto esté activo
+    "asesor_indices_aplicar": False,
+    
     # Backup automático
     "backup_automatico": True,
-    "max_backups": 10
+    "max_backups": 10,
+    
+    # Logging
+    "log_nivel": "INFO",
+    "log_niveles_modulo": {},  # {"database.db_manager": "DEBUG"}
+    "log_consola": True,
+    "log_max_bytes": 2 * 1024 * 1024,
+    "log_backups": 5
 }
 
 def cargar_configuracion():
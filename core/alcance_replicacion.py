@@ -0,0 +1,82 @@
+"""
+🎯 ALCANCE DE REPLICACIÓN - Sistema de Inventario AGC
+Define qué parte del inventario guarda cada puesto en su caché local
+"""
+
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class AlcanceReplicacion:
+    """
+    Subconjunto de bienes que replica un puesto (config "alcance_replicacion").
+
+        {"institucional": ["Dependencia A", ...], "tipos": ["Notebook", ...]}
+
+    Una lista vacía no filtra. Un bien entra si cumple ambos filtros; los
+    movimientos y vínculos entran si tocan algún bien del alcance.
+    """
+
+    # Tablas que siguen al alcance; el resto se replica completo
+    TABLAS_CON_ALCANCE = ['bienes', 'movimientos', 'bienes_movimientos']
+
+    # Tablas que solo se suben a la maestra (no se bajan al caché)
+    TABLAS_SOLO_SUBIDA = ['logs_actividad']
+
+    def __init__(self, institucionales=None, tipos=None):
+        self.institucionales = sorted(set(institucionales or []))
+        self.tipos = sorted(set(tipos or []))
+
+    @classmethod
+    def desde_config(cls, config):
+        alcance = config.get("alcance_replicacion") or {}
+        return cls(alcance.get("institucional"), alcance.get("tipos"))
+
+    @property
+    def es_completo(self):
+        """Sin filtros: el puesto replica todo el inventario"""
+        return not self.institucionales and not self.tipos
+
+    def filtro_bienes(self, alias="b"):
+        """(cláusula WHERE, parámetros) para los bienes del alcance"""
+        condiciones, params = [], []
+        if self.institucionales:
+            condiciones.append(f"{alias}.institucional IN ({','.join('?' * len(self.institucionales))})")
+            params.extend(self.institucionales)
+        if self.tipos:
+            condiciones.append(f"{alias}.tipo IN ({','.join('?' * len(self.tipos))})")
+            params.extend(self.tipos)
+        return (" AND ".join(condiciones) or "1=1"), params
+
+    def incluye_bien(self, bien):
+        """True si el bien (dict) pertenece al alcance"""
+        if self.institucionales and bien.get('institucional') not in self.institucionales:
+            return False
+        if self.tipos and bien.get('tipo') not in self.tipos:
+            return False
+        return True
+
+    def ids_en_alcance(self, conn, tabla):
+        """Ids de `tabla` que pertenecen al alcance según la base `conn`"""
+        where, params = self.filtro_bienes()
+        if tabla == 'bienes':
+            sql = f"SELECT b.id FROM bienes b WHERE {where}"
+        elif tabla == 'bienes_movimientos':
+            sql = f"""
+                SELECT bm.id FROM bienes_movimientos bm
+                JOIN bienes b ON b.id = bm.id_bien
+                WHERE {where}
+            """
+        elif tabla == 'movimientos':
+            sql = f"""
+                SELECT DISTINCT bm.id_movimiento FROM bienes_movimientos bm
+                JOIN bienes b ON b.id = bm.id_bien
+                WHERE {where}
+            """
+        else:
+            sql, params = f"SELECT id FROM {tabla}", []
+        return {fila[0] for fila in conn.execute(sql, params)}
+
+    def __repr__(self):
+        return f"AlcanceReplicacion(institucional={self.institucionales}, tipos={self.tipos})"
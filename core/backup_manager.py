@@ -7,6 +7,7 @@ import shutil
 import os
 from datetime import datetime
 from database.db_manager import DB
+from database.almacen_respaldos import AlmacenRespaldos
 
 
 class BackupManager:
@@ -15,9 +16,26 @@ class BackupManager:
     def __init__(self, db: DB):
         self.db = db
     
-    def crear_backup_automatico(self):
-        """Crea backup automático (máximo 1 por día)"""
-        return self.db.crear_backup()
+    def crear_backup_automatico(self, al_terminar=None):
+        """Crea backup automático comprimido en segundo plano (máximo 1 por día)"""
+        return self.db.crear_backup(comprimir=True, en_segundo_plano=True, al_terminar=al_terminar)
+    
+    def crear_snapshot(self, etiqueta="manual"):
+        """Snapshot incremental (solo guarda los bloques que cambiaron)"""
+        self.db.vaciar_logs_actividad()
+        almacen = AlmacenRespaldos.para_base(self.db.path)
+        manifiesto = almacen.crear_snapshot(self.db.path, etiqueta=etiqueta)
+        almacen.aplicar_retencion()
+        return manifiesto
+    
+    def listar_snapshots(self):
+        """Snapshots disponibles para restaurar, del más viejo al más nuevo"""
+        return AlmacenRespaldos.para_base(self.db.path).listar_snapshots()
+    
+    def restaurar_a_fecha(self, fecha, ruta_destino=None):
+        """Restauración a un punto en el tiempo (último snapshot hasta `fecha`)"""
+        almacen = AlmacenRespaldos.para_base(self.db.path)
+        return almacen.restaurar_a_fecha(fecha, ruta_destino or self.db.path)
     
     def crear_backup_manual(self, nombre_personalizado=None):
         """Crea backup manual con nombre personalizado"""
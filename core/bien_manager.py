@@ -4,6 +4,9 @@ Lógica de negocio para gestión de bienes
 """
 
 from database.db_manager import DB
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
 
 class BienManager:
     """Maneja la lógica de negocio para bienes"""
@@ -58,23 +61,26 @@ class BienManager:
         """Crea un nuevo bien con validaciones"""
         return self.db.add_bien(datos_bien)
     
-    def buscar_bienes(self, filtros=None):
-        """Busca bienes con filtros avanzados - VERSIÓN OPTIMIZADA CON SQL"""
+    def buscar_bienes(self, filtros=None, columnas=None):
+        """Busca bienes con filtros avanzados - VERSIÓN OPTIMIZADA CON SQL
+        
+        columnas: proyección opcional (solo los campos que se van a mostrar)
+        """
         try:
             if not filtros:
-                return self.db.list_bienes()  # Con límite para rendimiento normal
+                return self.db.list_bienes(columnas=columnas)  # Con límite para rendimiento normal
                 
-            print(f"🔍 Aplicando filtros OPTIMIZADOS en BienManager: {filtros}")
+            logger.debug("🔍 Aplicando filtros en BienManager: %s", filtros)
             
             # ✅ OPTIMIZADO: Filtro directo en SQL
-            bienes_filtrados = self.db.buscar_bienes_filtrados(filtros)
+            bienes_filtrados = self.db.buscar_bienes_filtrados(filtros, columnas=columnas)
             
-            print(f"✅ Filtros SQL aplicados: {len(bienes_filtrados)} registros")
+            logger.debug("✅ Filtros SQL aplicados: %s registros", len(bienes_filtrados))
             return bienes_filtrados
             
         except Exception as e:
-            print(f"❌ Error en buscar_bienes: {e}")
-            return self.db.list_bienes()
+            logger.error("❌ Error en buscar_bienes: %s", e)
+            return self.db.list_bienes(columnas=columnas)
 
     def _aplicar_filtros_manual(self, bienes, filtros):
         """Aplica TODOS los filtros manualmente - VERSIÓN CON LIMPIEZA"""
@@ -83,7 +89,7 @@ class BienManager:
             
         resultados = []
         
-        print(f"🔍 Aplicando {len(filtros)} filtros sobre {len(bienes)} bienes")
+        logger.debug("🔍 Aplicando %s filtros sobre %s bienes", len(filtros), len(bienes))
         
         for bien in bienes:
             cumple_filtros = True
@@ -281,7 +287,7 @@ class BienManager:
             if cumple_filtros:
                 resultados.append(bien)
         
-        print(f"✅ Filtrado completado: {len(resultados)} de {len(bienes)} bienes coinciden")
+        logger.debug("✅ Filtrado completado: %s de %s bienes coinciden", len(resultados), len(bienes))
         return resultados
     
     def obtener_estadisticas(self):
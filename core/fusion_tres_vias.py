@@ -0,0 +1,547 @@
+"""
+🔀 FUSIÓN DE TRES VÍAS - Sistema de Inventario AGC
+Combina fila a fila la base local y la de red contra la última versión sincronizada
+"""
+
+import json
+from datetime import datetime
+
+from database import resumen_movimientos
+from database.archivo import ArchivoMovimientos
+from database.huellas import HuellasDB, borrar_filas, comparar, diferencias_por_ids
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class FusionTresVias:
+    """
+    Fusión por filas entre local y red usando la versión base (la última que
+    quedó igual en ambas) guardada en la base local (_sync_base).
+
+    Para cada fila distinta (las encuentra el árbol Merkle, sin recorrer todo):
+    - Cambió de un solo lado respecto de la base: gana ese lado.
+    - Cambió de los dos lados: se resuelve campo a campo; si un campo cambió
+      distinto en ambos se aplican las reglas automáticas y, si ninguna
+      aplica, queda en la cola de conflictos (_sync_conflictos) con el valor
+      de la red como provisorio.
+    - Ids iguales con identidad distinta (dos puestos crearon filas con el
+      mismo id) no es conflicto: la fila local se renumera. Solo cuando la
+      tabla ya tiene base; en la primera fusión se resuelve campo a campo.
+    - Una fila sin cambios que falta de un lado porque ese lado la archivó
+      (ArchivoMovimientos) se archiva también del otro, no se borra.
+
+    El resultado queda escrito en ambas bases (una transacción por base) y
+    pasa a ser la nueva base.
+    """
+
+    # Orden de fusión: bienes después de sus movimientos (regla de estado)
+    TABLAS = ['movimientos', 'bienes_movimientos', 'bienes', 'usuarios', 'logs_actividad']
+
+    # Tablas de solo agregado: no se editan, no necesitan base
+    TABLAS_SOLO_AGREGADO = {'logs_actividad'}
+
+    # Columnas que identifican la fila más allá del id (para detectar choques de ids)
+    IDENTIDAD = {
+        'bienes': ['ficha', 'serie'],
+        'movimientos': ['tipo', 'fecha', 'responsable'],
+        'bienes_movimientos': ['id_bien', 'id_movimiento'],
+        'logs_actividad': ['usuario', 'accion', 'fecha'],
+    }
+
+    # Columnas de otras tablas que apuntan al id (se actualizan al renumerar)
+    REFERENCIAS = {
+        'bienes': [('bienes_movimientos', 'id_bien')],
+        'movimientos': [('bienes_movimientos', 'id_movimiento')],
+    }
+
+    # El estado y el responsable de un bien solo cambian por movimientos
+    CAMPOS_ASIGNACION = ['estado', 'nombre', 'apellido', 'dni_cuit', 'institucional']
+    ASIGNACION_POR_MOVIMIENTO = {
+        'Entrega': {'estado': 'Asignado', 'nombre': 'responsable_nombre', 'apellido': 'responsable_apellido',
+                    'dni_cuit': 'responsable_dni_cuit', 'institucional': 'responsable_institucional'},
+        'Devolución': {'estado': 'En depósito', 'nombre': '', 'apellido': '', 'dni_cuit': '', 'institucional': ''},
+        'Baja': {'estado': 'Baja definitiva'},
+    }
+
+    CAMPOS_BAJA_LOGICA = ['eliminado', 'fecha_eliminacion', 'motivo_eliminacion']
+
+    def __init__(self, conn_local, conn_red, resolucion_automatica=False):
+        self.conn_local = conn_local
+        self.conn_red = conn_red
+        self.resolucion_automatica = resolucion_automatica
+        self.huellas_local = HuellasDB(conn_local)
+        self.huellas_red = HuellasDB(conn_red)
+        self.archivo_local = ArchivoMovimientos(conn_local)
+        self.archivo_red = ArchivoMovimientos(conn_red)
+        self.conflictos_nuevos = []
+        self._resumenes_pendientes = set()
+        self._crear_tablas()
+
+    def _crear_tablas(self):
+        with transaccion(self.conn_local):
+            self.conn_local.execute("""
+                CREATE TABLE IF NOT EXISTS _sync_base (
+                    tabla TEXT NOT NULL,
+                    fila_id TEXT NOT NULL,
+                    datos TEXT NOT NULL,
+                    PRIMARY KEY (tabla, fila_id)
+                )
+            """)
+            self.conn_local.execute("""
+                CREATE TABLE IF NOT EXISTS _sync_conflictos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tipo TEXT NOT NULL,
+                    tabla TEXT NOT NULL,
+                    fila_id TEXT NOT NULL,
+                    campo TEXT,
+                    valor_base TEXT,
+                    valor_local TEXT,
+                    valor_red TEXT,
+                    estado TEXT NOT NULL DEFAULT 'pendiente',
+                    resolucion TEXT,
+                    fecha TEXT NOT NULL
+                )
+            """)
+            self.conn_local.execute("CREATE TABLE IF NOT EXISTS _sync_estado (clave TEXT PRIMARY KEY, valor TEXT)")
+
+    # ------------------------------------------------------------------
+    # Fusión
+    # ------------------------------------------------------------------
+    def fusionar(self, ids_por_tabla=None, sembrar_base=True):
+        """
+        Fusiona todas las tablas comunes. `ids_por_tabla` restringe la fusión
+        a esos ids (puestos con alcance parcial); None = tablas completas.
+        Con sembrar_base=False una tabla sin base no se toca: sembrarla solo
+        es correcto si la fusión cubre todas las filas locales.
+        Devuelve un resumen con las cantidades por tipo de operación.
+
+        Todo va en una transacción por base. La de la red es inmediata y se
+        toma antes de leer: otro puesto que sincroniza a la vez espera en vez
+        de pisar lo que esta fusión leyó. Un error deshace la fusión completa
+        en ambas bases. La red confirma primero: si falla la confirmación
+        local, la próxima fusión parte de la base anterior y la repite.
+        """
+        self._adjuntar_archivos()
+        with transaccion(self.conn_local), transaccion(self.conn_red, inmediata=True):
+            return self._fusionar(ids_por_tabla, sembrar_base)
+
+    def _adjuntar_archivos(self):
+        """
+        ATTACH no se puede dentro de una transacción: los archivos se adjuntan
+        antes de fusionar. Si un lado tiene archivo se crea el del otro, por
+        si hay que archivar filas de ese lado.
+        """
+        if self.archivo_local.adjuntar() | self.archivo_red.adjuntar():
+            for archivo in (self.archivo_local, self.archivo_red):
+                archivo.adjuntar(crear=True)
+
+    def _fusionar(self, ids_por_tabla, sembrar_base):
+        resumen = {'subidas': 0, 'bajadas': 0, 'borradas': 0, 'archivadas': 0, 'renumeradas': 0,
+                   'fusionadas': 0, 'automaticas': 0, 'conflictos': 0}
+        tablas = [t for t in self.TABLAS
+                  if t in self.huellas_local.tablas and t in self.huellas_red.tablas
+                  and (ids_por_tabla is None or t in ids_por_tabla)]
+        if not sembrar_base:
+            tablas = [t for t in tablas if t in self.TABLAS_SOLO_AGREGADO or self._tiene_base(t)]
+
+        # 1. Choques de ids primero: renumerar cambia las referencias de otras tablas
+        for tabla in sorted(tablas, key=lambda t: t not in self.REFERENCIAS):
+            if tabla in self.IDENTIDAD:
+                resumen['renumeradas'] += self._renumerar_choques(tabla, self._diferencias(tabla, ids_por_tabla))
+
+        # 2. Fusión por tabla
+        for tabla in tablas:
+            sin_base = tabla not in self.TABLAS_SOLO_AGREGADO and not self._tiene_base(tabla)
+            dif = self._diferencias(tabla, ids_por_tabla)
+            self._fusionar_tabla(tabla, dif, resumen)
+            if sin_base:
+                self._sembrar_base(tabla)
+
+        # 3. Resúmenes de movimientos que quedaron provisorios (ver _aplicar_regla)
+        if self._resumenes_pendientes:
+            for conn in (self.conn_local, self.conn_red):
+                resumen_movimientos.recalcular(conn, self._resumenes_pendientes)
+            self._resumenes_pendientes.clear()
+
+        resumen['conflictos'] = len(self.conflictos_nuevos)
+        logger.info("🔀 Fusión: %s", {k: v for k, v in resumen.items() if v})
+        return resumen
+
+    def _diferencias(self, tabla, ids_por_tabla):
+        if ids_por_tabla is None:
+            return comparar(self.huellas_local, self.huellas_red, tabla)
+        return diferencias_por_ids(self.huellas_local, self.huellas_red, tabla, ids_por_tabla[tabla])
+
+    def _fusionar_tabla(self, tabla, dif, resumen):
+        base = self._bases(tabla, dif['solo_a'] + dif['solo_b'] + dif['distintas'])
+        locales = _filas(self.conn_local, tabla, dif['solo_a'] + dif['distintas'])
+        remotas = _filas(self.conn_red, tabla, dif['solo_b'] + dif['distintas'])
+        subir, bajar, borrar_local, borrar_red, nuevas_bases = {}, {}, [], [], {}
+
+        # Solo en local: alta local, o la red la borró
+        for fila_id in dif['solo_a']:
+            fila, previa = locales[fila_id], base.get(fila_id)
+            if previa is None or tabla in self.TABLAS_SOLO_AGREGADO:
+                subir[fila_id] = fila
+                nuevas_bases[fila_id] = fila
+            elif fila == previa:
+                borrar_local.append(fila_id)
+            else:
+                # Editada acá y borrada en la red: se conserva hasta que alguien decida
+                self._registrar_conflicto('borrado', tabla, fila_id, None, previa, fila, None)
+                subir[fila_id] = fila
+                nuevas_bases[fila_id] = fila
+
+        # Solo en red: alta de otro puesto, o la borramos acá
+        for fila_id in dif['solo_b']:
+            fila, previa = remotas[fila_id], base.get(fila_id)
+            if previa is None or tabla in self.TABLAS_SOLO_AGREGADO:
+                bajar[fila_id] = fila
+                nuevas_bases[fila_id] = fila
+            elif fila == previa:
+                borrar_red.append(fila_id)
+            else:
+                self._registrar_conflicto('borrado', tabla, fila_id, None, previa, None, fila)
+                bajar[fila_id] = fila
+                nuevas_bases[fila_id] = fila
+
+        # En ambas y distintas: campo a campo
+        for fila_id in dif['distintas']:
+            local, red = locales[fila_id], remotas[fila_id]
+            fusion = self._fusionar_fila(tabla, fila_id, base.get(fila_id), local, red, resumen)
+            if fusion != local:
+                bajar[fila_id] = fusion
+            if fusion != red:
+                subir[fila_id] = fusion
+            nuevas_bases[fila_id] = fusion
+            resumen['fusionadas'] += 1
+
+        # Lo que "borró" el otro lado puede estar en su archivo: se archiva acá también
+        archivar_local, archivar_red = set(), set()
+        if tabla in ArchivoMovimientos.TABLAS:
+            archivar_local = self.archivo_red.contiene(tabla, borrar_local)
+            archivar_red = self.archivo_local.contiene(tabla, borrar_red)
+
+        _escribir_filas(self.conn_red, tabla, subir.values())
+        _escribir_filas(self.conn_local, tabla, bajar.values())
+        self.archivo_local.mover(tabla, archivar_local)
+        self.archivo_red.mover(tabla, archivar_red)
+        borrar_filas(self.conn_local, tabla, [i for i in borrar_local if i not in archivar_local])
+        borrar_filas(self.conn_red, tabla, [i for i in borrar_red if i not in archivar_red])
+        if tabla not in self.TABLAS_SOLO_AGREGADO:
+            self._guardar_bases(tabla, nuevas_bases)
+            self.olvidar(tabla, borrar_local + borrar_red)
+
+        archivadas = len(archivar_local) + len(archivar_red)
+        resumen['subidas'] += len(subir)
+        resumen['bajadas'] += len(bajar)
+        resumen['archivadas'] += archivadas
+        resumen['borradas'] += len(borrar_local) + len(borrar_red) - archivadas
+
+    def _fusionar_fila(self, tabla, fila_id, base, local, red, resumen):
+        fusion = {}
+        for campo in list(red) + [c for c in local if c not in red]:
+            valor_local, valor_red = local.get(campo, red.get(campo)), red.get(campo, local.get(campo))
+            valor_base = base.get(campo) if base is not None else None
+            if valor_local == valor_red:
+                fusion[campo] = valor_local
+            elif base is not None and valor_local == valor_base:
+                fusion[campo] = valor_red
+            elif base is not None and valor_red == valor_base:
+                fusion[campo] = valor_local
+            else:
+                resuelto = self._aplicar_regla(tabla, campo, local, red)
+                if resuelto is not _SIN_REGLA:
+                    fusion[campo] = resuelto
+                    resumen['automaticas'] += 1
+                elif self.resolucion_automatica:
+                    # Sin regla específica: gana lo que llegó primero a la red
+                    fusion[campo] = valor_red
+                    resumen['automaticas'] += 1
+                else:
+                    fusion[campo] = valor_red  # provisorio hasta que se resuelva
+                    self._registrar_conflicto('campo', tabla, fila_id, campo,
+                                              valor_base, valor_local, valor_red)
+        return fusion
+
+    # ------------------------------------------------------------------
+    # Reglas automáticas por campo
+    # ------------------------------------------------------------------
+    def _aplicar_regla(self, tabla, campo, local, red):
+        """Valor resuelto por regla, o _SIN_REGLA"""
+        if tabla == 'bienes' and campo in self.CAMPOS_ASIGNACION:
+            asignacion = self._asignacion_por_ultimo_movimiento(red['id'])
+            if asignacion is not None and campo in asignacion:
+                return asignacion[campo]
+
+        if tabla == 'movimientos' and campo in self.CAMPOS_BAJA_LOGICA:
+            # La baja lógica no se deshace: manda el lado que eliminó
+            lado = local if local.get('eliminado') else red
+            return lado.get(campo)
+
+        if tabla == 'movimientos' and campo in ('archivo_path_pdf', 'archivo_path_docx'):
+            # Un acta adjunta en un puesto no se pierde por el otro
+            if not local.get(campo) or not red.get(campo):
+                return local.get(campo) or red.get(campo)
+
+        if tabla == 'movimientos' and campo in resumen_movimientos.COLUMNAS:
+            # Derivados de vínculos y bienes: se recalculan cuando esos ya estén fusionados
+            self._resumenes_pendientes.add(red['id'])
+            return red.get(campo)
+
+        if tabla == 'usuarios' and campo == 'ultimo_acceso':
+            return max(local.get(campo) or '', red.get(campo) or '') or None
+
+        return _SIN_REGLA
+
+    def _asignacion_por_ultimo_movimiento(self, bien_id):
+        """Estado/responsable que deja el último movimiento (ya fusionado) del bien"""
+        fila = self.conn_red.execute("""
+            SELECT m.tipo, m.responsable_nombre, m.responsable_apellido,
+                   m.responsable_dni_cuit, m.responsable_institucional
+            FROM movimientos m
+            JOIN bienes_movimientos bm ON bm.id_movimiento = m.id
+            WHERE bm.id_bien = ? AND COALESCE(m.eliminado, 0) = 0
+            ORDER BY m.fecha DESC, m.id DESC
+            LIMIT 1
+        """, (bien_id,)).fetchone()
+        if fila is None or fila[0] not in self.ASIGNACION_POR_MOVIMIENTO:
+            return None
+        movimiento = dict(zip(('tipo', 'responsable_nombre', 'responsable_apellido',
+                               'responsable_dni_cuit', 'responsable_institucional'), fila))
+        return {
+            campo: movimiento.get(valor, valor) if campo != 'estado' else valor
+            for campo, valor in self.ASIGNACION_POR_MOVIMIENTO[fila[0]].items()
+        }
+
+    # ------------------------------------------------------------------
+    # Choques de ids
+    # ------------------------------------------------------------------
+    def _renumerar_choques(self, tabla, dif):
+        """Filas locales nuevas que chocan por id con otra fila de la red: nuevo id local"""
+        candidatos = dif['distintas']
+        if not candidatos:
+            return 0
+        base = self._bases(tabla, candidatos)
+        locales = _filas(self.conn_local, tabla, candidatos)
+        remotas = _filas(self.conn_red, tabla, candidatos)
+        identidad = self.IDENTIDAD[tabla]
+        # Las filas de solo agregado no se editan: si difieren, son otra fila.
+        # Las demás solo chocan si la tabla ya tiene base y la fila no está en
+        # ella (alta en ambos lados). Sin base (primera fusión) no se puede
+        # distinguir un choque de una edición de ficha/serie: se fusiona campo
+        # a campo, y un cambio de identidad queda como conflicto, no duplicado.
+        con_base = self._tiene_base(tabla)
+        choques = [
+            i for i in candidatos
+            if tabla in self.TABLAS_SOLO_AGREGADO
+            or (con_base and i not in base and any(locales[i].get(c) != remotas[i].get(c) for c in identidad))
+        ]
+        if not choques:
+            return 0
+
+        siguiente = max(_ultimo_id(self.conn_local, tabla), _ultimo_id(self.conn_red, tabla)) + 1
+        with transaccion(self.conn_local):
+            for fila_id in choques:
+                self.conn_local.execute(f"UPDATE {tabla} SET id = ? WHERE id = ?", (siguiente, fila_id))
+                for tabla_ref, columna in self.REFERENCIAS.get(tabla, []):
+                    self.conn_local.execute(
+                        f"UPDATE {tabla_ref} SET {columna} = ? WHERE {columna} = ?", (siguiente, fila_id)
+                    )
+                logger.info("🔀 %s #%s chocaba con la red: renumerado a #%s", tabla, fila_id, siguiente)
+                siguiente += 1
+            self.conn_local.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                                    (siguiente - 1, tabla))
+        return len(choques)
+
+    # ------------------------------------------------------------------
+    # Base y cola de conflictos
+    # ------------------------------------------------------------------
+    def _bases(self, tabla, ids, tamano_lote=500):
+        ids = [str(i) for i in ids]
+        resultado = {}
+        for i in range(0, len(ids), tamano_lote):
+            lote = ids[i:i + tamano_lote]
+            for fila_id, datos in self.conn_local.execute(
+                f"SELECT fila_id, datos FROM _sync_base WHERE tabla = ? "
+                f"AND fila_id IN ({','.join('?' * len(lote))})", [tabla] + lote
+            ):
+                datos = json.loads(datos)
+                resultado[datos['id']] = datos
+        return resultado
+
+    def _guardar_bases(self, tabla, filas):
+        if not filas:
+            return
+        with transaccion(self.conn_local):
+            self.conn_local.executemany(
+                "INSERT OR REPLACE INTO _sync_base (tabla, fila_id, datos) VALUES (?, ?, ?)",
+                [(tabla, str(fila_id), json.dumps(fila, ensure_ascii=False)) for fila_id, fila in filas.items()]
+            )
+
+    def _tiene_base(self, tabla):
+        """La tabla ya se fusionó completa alguna vez (aunque estuviera vacía)"""
+        return self.conn_local.execute(
+            "SELECT 1 FROM _sync_estado WHERE clave = ?", (f"base:{tabla}",)
+        ).fetchone() is not None
+
+    def _sembrar_base(self, tabla):
+        """Primera fusión de la tabla: lo que quedó igual en ambas es la base"""
+        ids = [fila[0] for fila in self.conn_local.execute(f"SELECT id FROM {tabla}")]
+        self._guardar_bases(tabla, _filas(self.conn_local, tabla, ids))
+        with transaccion(self.conn_local):
+            self.conn_local.execute(
+                "INSERT OR REPLACE INTO _sync_estado (clave, valor) VALUES (?, ?)",
+                (f"base:{tabla}", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+        logger.debug("🔀 Base inicial de %s: %s filas", tabla, len(ids))
+
+    def olvidar(self, tabla, ids):
+        """Quita filas de la base (borradas o desalojadas del caché local)"""
+        ids = [str(i) for i in ids]
+        if not ids:
+            return
+        with transaccion(self.conn_local):
+            self.conn_local.executemany(
+                "DELETE FROM _sync_base WHERE tabla = ? AND fila_id = ?", [(tabla, i) for i in ids]
+            )
+
+    def _registrar_conflicto(self, tipo, tabla, fila_id, campo, valor_base, valor_local, valor_red):
+        # El mismo conflicto pendiente no se duplica en cada sincronización
+        existente = self.conn_local.execute(
+            "SELECT id FROM _sync_conflictos WHERE estado = 'pendiente' AND tipo = ? "
+            "AND tabla = ? AND fila_id = ? AND COALESCE(campo, '') = ?",
+            (tipo, tabla, str(fila_id), campo or '')
+        ).fetchone()
+        valores = [json.dumps(v, ensure_ascii=False) for v in (valor_base, valor_local, valor_red)]
+        with transaccion(self.conn_local):
+            if existente:
+                self.conn_local.execute(
+                    "UPDATE _sync_conflictos SET valor_base = ?, valor_local = ?, valor_red = ? WHERE id = ?",
+                    valores + [existente[0]]
+                )
+                return
+            cursor = self.conn_local.execute(
+                "INSERT INTO _sync_conflictos (tipo, tabla, fila_id, campo, valor_base, valor_local, "
+                "valor_red, fecha) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [tipo, tabla, str(fila_id), campo] + valores + [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+            )
+        conflicto = {
+            'id': cursor.lastrowid, 'tipo': tipo, 'tabla': tabla, 'fila_id': fila_id, 'campo': campo,
+            'base': valor_base, 'local': valor_local, 'red': valor_red,
+        }
+        self.conflictos_nuevos.append(conflicto)
+        logger.warning("⚠️ Conflicto %s en %s #%s %s", tipo, tabla, fila_id, campo or '')
+
+    def conflictos_pendientes(self):
+        return listar_conflictos(self.conn_local)
+
+    def resolver(self, conflicto_id, usar):
+        """
+        Resuelve un conflicto de la cola: usar='local' o 'red'.
+        El valor elegido se escribe en ambas bases y pasa a ser la base.
+        """
+        fila = self.conn_local.execute(
+            "SELECT tipo, tabla, fila_id, campo, valor_local, valor_red FROM _sync_conflictos "
+            "WHERE id = ? AND estado = 'pendiente'", (conflicto_id,)
+        ).fetchone()
+        if fila is None:
+            return False
+        tipo, tabla, fila_id, campo, valor_local, valor_red = fila
+        valor = json.loads(valor_local if usar == 'local' else valor_red)
+        fila_id = _id_tipado(self.conn_local, tabla, fila_id)
+
+        if tipo == 'campo':
+            for conn in (self.conn_local, self.conn_red):
+                with transaccion(conn):
+                    conn.execute(f"UPDATE {tabla} SET {campo} = ? WHERE id = ?", (valor, fila_id))
+            actual = _filas(self.conn_local, tabla, [fila_id]).get(fila_id)
+            if actual is not None:
+                self._guardar_bases(tabla, {fila_id: actual})
+        elif valor is None:
+            # Se confirma el borrado
+            borrar_filas(self.conn_local, tabla, [fila_id])
+            borrar_filas(self.conn_red, tabla, [fila_id])
+            self.olvidar(tabla, [fila_id])
+        else:
+            _escribir_filas(self.conn_local, tabla, [valor])
+            _escribir_filas(self.conn_red, tabla, [valor])
+            self._guardar_bases(tabla, {fila_id: valor})
+
+        with transaccion(self.conn_local):
+            self.conn_local.execute(
+                "UPDATE _sync_conflictos SET estado = 'resuelto', resolucion = ? WHERE id = ?",
+                (usar, conflicto_id)
+            )
+        logger.info("✅ Conflicto #%s resuelto con el valor %s", conflicto_id, usar)
+        return True
+
+
+class _SinRegla:
+    """Marca: ninguna regla automática aplica al campo"""
+
+
+_SIN_REGLA = _SinRegla()
+
+
+def listar_conflictos(conn, estado='pendiente'):
+    """Conflictos de la cola local (sin necesitar la red)"""
+    try:
+        cursor = conn.execute(
+            "SELECT id, tipo, tabla, fila_id, campo, valor_base, valor_local, valor_red, fecha "
+            "FROM _sync_conflictos WHERE estado = ? ORDER BY id", (estado,)
+        )
+    except Exception:
+        return []  # Todavía no hubo ninguna fusión
+    conflictos = []
+    for fila in cursor:
+        conflicto = dict(zip(('id', 'tipo', 'tabla', 'fila_id', 'campo'), fila[:5]))
+        for clave, valor in zip(('base', 'local', 'red'), fila[5:8]):
+            conflicto[clave] = json.loads(valor) if valor is not None else None
+        conflicto['fecha'] = fila[8]
+        conflictos.append(conflicto)
+    return conflictos
+
+
+def _filas(conn, tabla, ids, tamano_lote=500):
+    """{id: {columna: valor}} con valores normalizados como en la base guardada"""
+    ids = list(ids)
+    resultado = {}
+    for i in range(0, len(ids), tamano_lote):
+        lote = ids[i:i + tamano_lote]
+        cursor = conn.execute(f"SELECT * FROM {tabla} WHERE id IN ({','.join('?' * len(lote))})", lote)
+        columnas = [d[0] for d in cursor.description]
+        for fila in cursor:
+            datos = json.loads(json.dumps(dict(zip(columnas, fila)), default=str, ensure_ascii=False))
+            resultado[datos['id']] = datos
+    return resultado
+
+
+def _escribir_filas(conn, tabla, filas):
+    """INSERT OR REPLACE de filas (dicts) con las columnas que existan en destino"""
+    filas = list(filas)
+    if not filas:
+        return
+    columnas_destino = [c[1] for c in conn.execute(f"PRAGMA table_info({tabla})")]
+    with transaccion(conn):
+        for fila in filas:
+            columnas = [c for c in columnas_destino if c in fila]
+            conn.execute(
+                f"INSERT OR REPLACE INTO {tabla} ({', '.join(columnas)}) "
+                f"VALUES ({', '.join('?' * len(columnas))})",
+                [fila[c] for c in columnas]
+            )
+
+
+def _ultimo_id(conn, tabla):
+    fila = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (tabla,)).fetchone()
+    maximo = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabla}").fetchone()[0]
+    return max(maximo, fila[0] if fila else 0)
+
+
+def _id_tipado(conn, tabla, fila_id):
+    """Los ids se guardan como texto en la cola; las tablas numéricas los necesitan como int"""
+    tipo = next((c[2] for c in conn.execute(f"PRAGMA table_info({tabla})") if c[1] == 'id'), '')
+    return int(fila_id) if 'INT' in tipo.upper() else fila_id
@@ -11,6 +11,9 @@ from pathlib import Path
 
 from database.db_manager import DB
 from generador_actas import GeneradorActas
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
 
 
 class MovimientoManager:
@@ -23,21 +26,18 @@ class MovimientoManager:
     def _obtener_datos_bienes(self, bienes_ids):
         """Obtiene datos completos de los bienes para el acta"""
         try:
-            bienes_completos = []
-            for bien_id in bienes_ids:
-                # Necesitamos implementar este método en DB
-                bien_data = self.db.obtener_bien_por_id(bien_id)
-                if bien_data:
-                    # Agregar datos del responsable si están en el bien
-                    bien_data['responsable_actual'] = f"{bien_data.get('nombre', '')} {bien_data.get('apellido', '')}".strip()
-                    bien_data['dni_responsable'] = bien_data.get('dni_cuit', '')
-                    bien_data['area'] = bien_data.get('institucional', 'INSTITUCIONAL')
-                    bien_data['cantidad'] = 1
-                    bienes_completos.append(bien_data)
+            # ✅ Una sola consulta (por lotes) para todos los bienes seleccionados
+            bienes_completos = self.db.obtener_bienes_por_ids(bienes_ids)
+            for bien_data in bienes_completos:
+                # Agregar datos del responsable si están en el bien
+                bien_data['responsable_actual'] = f"{bien_data.get('nombre', '')} {bien_data.get('apellido', '')}".strip()
+                bien_data['dni_responsable'] = bien_data.get('dni_cuit', '')
+                bien_data['area'] = bien_data.get('institucional', 'INSTITUCIONAL')
+                bien_data['cantidad'] = 1
             
             return bienes_completos
         except Exception as e:
-            print(f"❌ Error obteniendo datos de bienes: {e}")
+            logger.error("❌ Error obteniendo datos de bienes: %s", e)
             return []
     
     def _generar_acta_automatica(self, tipo_movimiento, bienes_completos, datos_movimiento, usuario_actual):
@@ -61,7 +61,7 @@ class MovimientoManager:
                 return ""
                 
         except Exception as e:
-            print(f"❌ Error generando acta automática: {e}")
+            logger.error("❌ Error generando acta automática: %s", e)
             return f"❌ Error: {str(e)}"
         
     def _abrir_carpeta_actas(self, ruta_acta):
@@ -81,10 +81,10 @@ class MovimientoManager:
             else:  # Linux
                 subprocess.run(["xdg-open", carpeta_actas])
                 
-            print(f"📁 Carpeta de actas abierta: {carpeta_actas}")
+            logger.debug("📁 Carpeta de actas abierta: %s", carpeta_actas)
             
         except Exception as e:
-            print(f"⚠️ No se pudo abrir la carpeta: {e}")
+            logger.warning("⚠️ No se pudo abrir la carpeta: %s", e)
 
      
 
@@ -92,10 +92,10 @@ class MovimientoManager:
     def _guardar_pdf_correctamente(self, pdf_temp_path, movimiento_id, datos_movimiento):
         """Guarda PDF en local Y en red si está disponible - VERSIÓN CON DEPURACIÓN COMPLETA"""
         try:
-            print(f"🔍 DEBUG _guardar_pdf_correctamente LLAMADO")
-            print(f"   PDF temp: {pdf_temp_path}")
-            print(f"   Mov ID: {movimiento_id}")
-            print(f"   Tipo movimiento: {datos_movimiento.get('tipo', 'N/A')}")
+            logger.debug("🔍 _guardar_pdf_correctamente LLAMADO")
+            logger.debug("   PDF temp: %s", pdf_temp_path)
+            logger.debug("   Mov ID: %s", movimiento_id)
+            logger.debug("   Tipo movimiento: %s", datos_movimiento.get('tipo', 'N/A'))
             
             import os
             import shutil
@@ -105,9 +105,9 @@ class MovimientoManager:
             config = get_config()
             modo = get_modo_trabajo()
             
-            print(f"   Modo trabajo: {modo}")
-            print(f"   Carpeta red config: {config.get('actas_folder_red', 'NO CONFIGURADO')}")
-            print(f"   Carpeta local config: {config.get('actas_folder_local', 'NO CONFIGURADO')}")
+            logger.debug("   Modo trabajo: %s", modo)
+            logger.debug("   Carpeta red config: %s", config.get('actas_folder_red', 'NO CONFIGURADO'))
+            logger.debug("   Carpeta local config: %s", config.get('actas_folder_local', 'NO CONFIGURADO'))
             
             # 1. Nombre único del archivo
             responsable = ""
@@ -124,73 +124,69 @@ class MovimientoManager:
             timestamp = datetime.now().strftime('%H%M%S')
             
             nombre_pdf = f"ACTA_{tipo_mov}_{responsable}_{fecha}_{timestamp}.pdf"
-            print(f"   Nombre PDF generado: {nombre_pdf}")
+            logger.debug("   Nombre PDF generado: %s", nombre_pdf)
             
             # 2. GUARDAR LOCALMENTE (SIEMPRE)
             # Crear carpeta si no existe
             carpeta_local = config["actas_folder_local"]
-            print(f"   Creando carpeta local: {carpeta_local}")
+            logger.debug("   Creando carpeta local: %s", carpeta_local)
             os.makedirs(carpeta_local, exist_ok=True)
             
             ruta_local = os.path.join(carpeta_local, nombre_pdf)
-            print(f"   Ruta local completa: {ruta_local}")
+            logger.debug("   Ruta local completa: %s", ruta_local)
             
-            print(f"   Copiando a local...")
+            logger.debug("   Copiando a local...")
             shutil.copy(pdf_temp_path, ruta_local)
-            print(f"✅ PDF guardado localmente: {ruta_local}")
-            print(f"   ¿Existe local después de copiar?: {os.path.exists(ruta_local)}")
+            logger.info("✅ PDF guardado localmente: %s", ruta_local)
+            logger.debug("   ¿Existe local después de copiar?: %s", os.path.exists(ruta_local))
             
             # 3. GUARDAR EN RED SI ES NECESARIO
             ruta_red = None
-            print(f"   Modo actual: {modo}")
-            print(f"   ¿Modo diferente de local_solo?: {modo != 'local_solo'}")
+            logger.debug("   Modo actual: %s", modo)
+            logger.debug("   ¿Modo diferente de local_solo?: %s", modo != 'local_solo')
             
             if modo != "local_solo":  # Solo si no estamos en modo solo local
-                print("   🔄 Intentando guardar en red...")
+                logger.debug("   🔄 Intentando guardar en red...")
                 try:
                     # Verificar si la carpeta de red es accesible
                     carpeta_red = config["actas_folder_red"]
-                    print(f"   Carpeta red: {carpeta_red}")
+                    logger.debug("   Carpeta red: %s", carpeta_red)
                     
                     # Verificar si el directorio padre existe
                     directorio_padre_red = os.path.dirname(carpeta_red)
-                    print(f"   Directorio padre red: {directorio_padre_red}")
-                    print(f"   ¿Existe padre red?: {os.path.exists(directorio_padre_red)}")
+                    logger.debug("   Directorio padre red: %s", directorio_padre_red)
+                    logger.debug("   ¿Existe padre red?: %s", os.path.exists(directorio_padre_red))
                     
                     if os.path.exists(directorio_padre_red):
-                        print(f"   Creando carpeta red si no existe...")
+                        logger.debug("   Creando carpeta red si no existe...")
                         os.makedirs(carpeta_red, exist_ok=True)
                         
                         ruta_red = os.path.join(carpeta_red, nombre_pdf)
-                        print(f"   Ruta red completa: {ruta_red}")
+                        logger.debug("   Ruta red completa: %s", ruta_red)
                         
-                        print(f"   Copiando a red...")
+                        logger.debug("   Copiando a red...")
                         shutil.copy(pdf_temp_path, ruta_red)
-                        print(f"🌐 PDF guardado en red: {ruta_red}")
-                        print(f"   ¿Existe red después de copiar?: {os.path.exists(ruta_red)}")
+                        logger.info("🌐 PDF guardado en red: %s", ruta_red)
+                        logger.debug("   ¿Existe red después de copiar?: %s", os.path.exists(ruta_red))
                     else:
-                        print(f"⚠️ Directorio padre de red NO existe: {directorio_padre_red}")
+                        logger.warning("⚠️ Directorio padre de red NO existe: %s", directorio_padre_red)
                         
                 except Exception as e:
-                    print(f"⚠️ ERROR guardando en red: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning("⚠️ ERROR guardando en red: %s", str(e), exc_info=True)
                     ruta_red = None
             else:
-                print("   📭 Modo local_solo - No se guarda en red")
+                logger.debug("   📭 Modo local_solo - No se guarda en red")
             
             # 4. Devolver la ruta que usará la BD
             if modo == "red_directo" and ruta_red:
-                print(f"   Devolviendo ruta de red (modo red_directo): {ruta_red}")
+                logger.debug("   Devolviendo ruta de red (modo red_directo): %s", ruta_red)
                 return ruta_red
             else:
-                print(f"   Devolviendo ruta local: {ruta_local}")
+                logger.debug("   Devolviendo ruta local: %s", ruta_local)
                 return ruta_local
             
         except Exception as e:
-            print(f"❌ Error guardando PDF: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error guardando PDF: %s", e)
             return None
     
     def obtener_movimientos_detallados(self):
@@ -237,16 +233,16 @@ class MovimientoManager:
                 if archivo_docx and os.path.exists(archivo_docx):
                     try:
                         os.remove(archivo_docx)
-                        print(f"🗑️ Archivo DOCX temporal eliminado: {archivo_docx}")
+                        logger.info("🗑️ Archivo DOCX temporal eliminado: %s", archivo_docx)
                     except Exception as e:
-                        print(f"⚠️ No se pudo eliminar DOCX: {e}")
+                        logger.warning("⚠️ No se pudo eliminar DOCX: %s", e)
                 
                 return True, f"Movimiento #{movimiento_id} eliminado correctamente"
             else:
                 return False, "Error al marcar el movimiento como eliminado"
                 
         except Exception as e:
-            print(f"❌ Error en eliminar_movimiento_soft: {e}")
+            logger.error("❌ Error en eliminar_movimiento_soft: %s", e)
             return False, f"Error inesperado: {str(e)}"    
     
     def puede_eliminar_movimiento(self, movimiento_id, usuario_actual):
@@ -275,10 +271,10 @@ class MovimientoManager:
     def guardar_movimiento_completo(self, datos_formulario, bienes_ids, usuario_actual, archivo_pdf_path=None):
         """Guarda movimiento completo con generación automática de DOCX y PDF opcional"""
         try:
-            print(f"🔄 Guardando movimiento completo...")
-            print(f"🔍 DEBUG guardar_movimiento_completo INICIO")
-            print(f"   archivo_pdf_path recibido: {archivo_pdf_path}")
-            print(f"   ¿Existe PDF?: {archivo_pdf_path and os.path.exists(archivo_pdf_path)}")
+            logger.debug("🔄 Guardando movimiento completo...")
+            logger.debug("🔍 guardar_movimiento_completo INICIO")
+            logger.debug("   archivo_pdf_path recibido: %s", archivo_pdf_path)
+            logger.debug("   ¿Existe PDF?: %s", archivo_pdf_path and os.path.exists(archivo_pdf_path))
             
             # 1️⃣ Obtener datos completos de los bienes
             bienes_completos = self._obtener_datos_bienes(bienes_ids)
@@ -325,22 +321,22 @@ class MovimientoManager:
                 if ruta_pdf_final:
                     # Actualizar BD con la nueva ruta
                     if self.db.actualizar_pdf_movimiento(movimiento_id, ruta_pdf_final):
-                        print(f"✅ PDF guardado correctamente en BD: {ruta_pdf_final}")
+                        logger.info("✅ PDF guardado correctamente en BD: %s", ruta_pdf_final)
                     else:
-                        print(f"⚠️ PDF guardado pero no se pudo actualizar BD: {ruta_pdf_final}")
+                        logger.warning("⚠️ PDF guardado pero no se pudo actualizar BD: %s", ruta_pdf_final)
                 else:
-                    print(f"⚠️ No se pudo guardar el PDF: {archivo_pdf_path}")
+                    logger.warning("⚠️ No se pudo guardar el PDF: %s", archivo_pdf_path)
             
             # 6️⃣ Abrir carpeta y preguntar por PDF si se generó acta
             if ruta_acta_docx and not ruta_acta_docx.startswith("❌"):
                 self._abrir_carpeta_actas(ruta_acta_docx)
                 # ❌ ELIMINADA la llamada al diálogo molesto
-                print(f"📄 Acta generada: {ruta_acta_docx}")
-                print("💡 Podés subir el PDF firmado después desde la lista de movimientos.")
+                logger.debug("📄 Acta generada: %s", ruta_acta_docx)
+                logger.debug("💡 Podés subir el PDF firmado después desde la lista de movimientos.")
             
             return movimiento_id, "✅ Movimiento registrado correctamente"
             
         except Exception as e:
             error_msg = f"❌ Error guardando movimiento completo: {str(e)}"
-            print(error_msg)
+            logger.error(error_msg)
             return None, error_msg    
\ No newline at end of file
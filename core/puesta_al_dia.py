@@ -0,0 +1,158 @@
+"""
+⏩ PUESTA AL DÍA - Sistema de Inventario AGC
+Al abrir, trae de la maestra solo lo que cambió desde la última sincronización
+"""
+
+import os
+import sqlite3
+import time
+
+from core.alcance_replicacion import AlcanceReplicacion
+from core.fusion_tres_vias import FusionTresVias
+from database.notificador_cambios import cambios_desde, instalar_registro_cambios, ultimo_cambio
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class PuestaAlDia:
+    """
+    Etapa de arranque del modo local_con_sincronizacion.
+
+    La maestra anota cada cambio en _cambios (ver notificador_cambios) y el
+    puesto guarda, al terminar cada sincronización, su marca: el último
+    cambio que ya tiene. Al abrir se leen solo las filas cambiadas después
+    de la marca y se fusionan (tres vías) por lotes, antes de que la ventana
+    cargue datos.
+
+    - Presupuesto de tiempo: si se agota, lo que falta queda para la
+      sincronización normal y la marca no avanza.
+    - Sin marca, sin red o con el registro ya depurado más allá de la marca
+      no se hace nada acá; el resultado indica que hace falta sincronizar.
+    """
+
+    TAMANO_LOTE = 200
+    PRESUPUESTO = 5.0    # segundos
+    TIMEOUT_RED = 3      # segundos esperando un bloqueo de la maestra
+
+    def __init__(self, conn_local, ruta_red, alcance=None, presupuesto=None, resolucion_automatica=False):
+        self.conn_local = conn_local
+        self.ruta_red = ruta_red
+        self.alcance = alcance or AlcanceReplicacion()
+        self.presupuesto = presupuesto or self.PRESUPUESTO
+        self.resolucion_automatica = resolucion_automatica
+
+    @classmethod
+    def desde_config(cls, conn_local, ruta_red, config):
+        return cls(
+            conn_local, ruta_red,
+            alcance=AlcanceReplicacion.desde_config(config),
+            presupuesto=config.get("puesta_al_dia_segundos"),
+            resolucion_automatica=config.get("resolucion_automatica", False),
+        )
+
+    def ejecutar(self, al_progresar=None):
+        """
+        Devuelve {'filas', 'pendiente', 'segundos', 'conflictos'}.
+        `al_progresar(porcentaje, texto)` se llama entre lotes.
+        """
+        inicio = time.monotonic()
+        resultado = {'filas': 0, 'pendiente': True, 'segundos': 0.0, 'conflictos': []}
+        progresar = al_progresar or (lambda porcentaje, texto: None)
+
+        marca = leer_marca(self.conn_local)
+        if marca is None or not os.path.exists(self.ruta_red):
+            logger.info("⏩ Sin marca de sincronización o sin red: se pone al día la sincronización normal")
+            return resultado
+
+        progresar(0, "Buscando cambios en la red...")
+        conn_red = sqlite3.connect(self.ruta_red, timeout=self.TIMEOUT_RED)
+        try:
+            marca_red = ultimo_cambio(conn_red)
+            cambios = cambios_desde(conn_red, marca)
+            if cambios is None:
+                # Registro inexistente o depurado: que lo resuelva la sincronización completa
+                instalar_registro_cambios(conn_red)
+                logger.info("⏩ El registro de cambios no alcanza la marca %s", marca)
+                return resultado
+
+            lotes = self._lotes(conn_red, cambios)
+            total = sum(len(ids) for _, ids in lotes)
+            if not total:
+                resultado['pendiente'] = False
+                logger.info("⏩ Sin cambios en la red desde la última sincronización")
+                return resultado
+
+            fusion = FusionTresVias(self.conn_local, conn_red, self.resolucion_automatica)
+            for n, (tabla, ids) in enumerate(lotes):
+                if time.monotonic() - inicio > self.presupuesto:
+                    logger.warning("⏩ Presupuesto de %.1fs agotado: %s filas quedan para la sincronización",
+                                   self.presupuesto, total - resultado['filas'])
+                    break
+                progresar(int(100 * resultado['filas'] / total), f"Actualizando {tabla}...")
+                fusion.fusionar({tabla: ids}, sembrar_base=False)
+                resultado['filas'] += len(ids)
+            else:
+                guardar_marca(self.conn_local, marca_red)
+                resultado['pendiente'] = False
+
+            resultado['conflictos'] = fusion.conflictos_nuevos
+            progresar(100, "Listo")
+        except sqlite3.Error as e:
+            logger.warning("⚠️ No se pudo poner al día con la red: %s", e)
+        finally:
+            conn_red.close()
+            resultado['segundos'] = round(time.monotonic() - inicio, 3)
+
+        logger.info("⏩ Puesta al día: %s filas en %.2fs%s", resultado['filas'], resultado['segundos'],
+                    " (queda trabajo para la sincronización)" if resultado['pendiente'] else "")
+        return resultado
+
+    def _lotes(self, conn_red, cambios):
+        """[(tabla, ids)] en el orden de fusión, con los vínculos de los movimientos cambiados"""
+        movimientos = cambios.get('movimientos', [])
+        if movimientos:
+            vinculos = set()
+            for conn in (conn_red, self.conn_local):
+                for i in range(0, len(movimientos), 500):
+                    lote = movimientos[i:i + 500]
+                    vinculos.update(fila[0] for fila in conn.execute(
+                        f"SELECT id FROM bienes_movimientos WHERE id_movimiento IN ({','.join('?' * len(lote))})",
+                        lote
+                    ))
+            cambios['bienes_movimientos'] = sorted(vinculos)
+
+        lotes = []
+        for tabla in FusionTresVias.TABLAS:
+            ids = cambios.get(tabla)
+            if not ids:
+                continue
+            if not self.alcance.es_completo and tabla in self.alcance.TABLAS_CON_ALCANCE:
+                ids = self._filtrar_alcance(conn_red, tabla, ids)
+            lotes.extend((tabla, ids[i:i + self.TAMANO_LOTE]) for i in range(0, len(ids), self.TAMANO_LOTE))
+        return lotes
+
+    def _filtrar_alcance(self, conn_red, tabla, ids):
+        """Solo lo del alcance del puesto o lo que ya está en su caché"""
+        en_alcance = self.alcance.ids_en_alcance(conn_red, tabla)
+        locales = {fila[0] for fila in self.conn_local.execute(f"SELECT id FROM {tabla}")}
+        return [i for i in ids if i in en_alcance or i in locales]
+
+
+def leer_marca(conn_local):
+    """Último cambio de la maestra que el puesto ya tiene (None = nunca sincronizó)"""
+    try:
+        fila = conn_local.execute("SELECT valor FROM _sync_estado WHERE clave = 'marca_cambios'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return int(fila[0]) if fila else None
+
+
+def guardar_marca(conn_local, marca):
+    """Anota la marca; dentro de una transacción abierta se suma a ella, sin confirmarla"""
+    with transaccion(conn_local):
+        conn_local.execute("CREATE TABLE IF NOT EXISTS _sync_estado (clave TEXT PRIMARY KEY, valor TEXT)")
+        conn_local.execute(
+            "INSERT OR REPLACE INTO _sync_estado (clave, valor) VALUES ('marca_cambios', ?)", (str(marca),)
+        )
@@ -0,0 +1,214 @@
+"""
+🖧 SERVIDOR DE COORDINACIÓN - Sistema de Inventario AGC
+Proceso sin interfaz que es el único dueño de la base maestra
+"""
+
+import hmac
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from database.db_remoto import METODOS_ESCRITURA, METODOS_LECTURA, a_json
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class ServidorCoordinacion:
+    """
+    Expone las operaciones de DB por HTTP/JSON para varios puestos.
+
+        POST /rpc                 {"llamadas": [{"metodo", "args", "kwargs"}, ...]}
+        GET  /cambios?desde=N     long-polling: espera hasta que haya versión > N
+        GET  /estado              versión actual y carpeta de actas
+
+    Solo se pueden llamar las operaciones con nombre de METODOS_LECTURA y
+    METODOS_ESCRITURA (nada de SQL libre) y todo pedido tiene que traer el
+    token compartido en el encabezado X-Token; sin él, 401.
+
+    Todas las llamadas pasan por una única conexión SQLite (un solo escritor,
+    sin bloqueos de archivo entre puestos). Cada escritura incrementa la
+    versión y publica qué tablas e ids tocó ({"tablas": [...], "ids": {tabla: [...]}}).
+    """
+
+    MAX_CAMBIOS = 1000
+
+    # Tablas que toca cada escritura (para publicar el cambio)
+    TABLAS_POR_METODO = {
+        'add_bien': ['bienes'],
+        'add_movimiento': ['movimientos', 'bienes_movimientos', 'bienes'],
+        'marcar_como_eliminado': ['movimientos'],
+        'actualizar_pdf_movimiento': ['movimientos'],
+        'registrar_acceso': ['usuarios'],
+        'log_actividad': ['logs_actividad'],
+        'vaciar_logs_actividad': ['logs_actividad'],
+        'verificar_y_agregar_columnas_asignacion': ['bienes'],
+        'crear_usuario': ['usuarios'],
+        'actualizar_usuario': ['usuarios'],
+        'cambiar_estado_usuario': ['usuarios'],
+    }
+
+    def __init__(self, db, token, host="127.0.0.1", puerto=8765):
+        if not token:
+            raise ValueError("El servidor necesita un token compartido (servidor_token)")
+        self.db = db
+        self.token = token
+        self.host = host
+        self.puerto = puerto
+        self.version = 0
+        self._cambios = deque(maxlen=self.MAX_CAMBIOS)
+        self._lock_db = threading.Lock()
+        self._hay_cambios = threading.Condition()
+        self._http = None
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def iniciar(self, en_segundo_plano=False):
+        servidor = self
+
+        class Manejador(_ManejadorRPC):
+            coordinador = servidor
+
+        self._http = ThreadingHTTPServer((self.host, self.puerto), Manejador)
+        self._http.daemon_threads = True
+        self.puerto = self._http.server_address[1]
+        logger.info("🖧 Servidor de inventario escuchando en http://%s:%s", self.host, self.puerto)
+        if en_segundo_plano:
+            hilo = threading.Thread(target=self._http.serve_forever, name="servidor-inventario", daemon=True)
+            hilo.start()
+            return hilo
+        self._http.serve_forever()
+
+    def detener(self):
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        self.db.cerrar()
+
+    # ------------------------------------------------------------------
+    # RPC
+    # ------------------------------------------------------------------
+    def ejecutar_lote(self, llamadas):
+        resultados = []
+        cambios = []
+        with self._lock_db:
+            for llamada in llamadas:
+                metodo = llamada.get("metodo")
+                args = llamada.get("args") or []
+                kwargs = llamada.get("kwargs") or {}
+                try:
+                    if metodo not in METODOS_LECTURA and metodo not in METODOS_ESCRITURA:
+                        raise ValueError(f"Método no permitido: {metodo}")
+                    valor = getattr(self.db, metodo)(*args, **kwargs)
+                    cambio = self._cambio_de(metodo, args, valor)
+                    resultados.append({"ok": True, "valor": a_json(valor)})
+                    if cambio:
+                        cambios.append(cambio)
+                except Exception as e:
+                    logger.error("❌ RPC %s falló: %s", metodo, e)
+                    resultados.append({"ok": False, "error": str(e)})
+        if cambios:
+            self._publicar(cambios)
+        return {"resultados": resultados, "version": self.version}
+
+    def _cambio_de(self, metodo, args, valor):
+        """Qué tablas/ids tocó una escritura de DB"""
+        if metodo not in METODOS_ESCRITURA or valor is False or valor is None:
+            return None
+        ids = {}
+        if metodo == 'add_movimiento':
+            ids = {'movimientos': [valor], 'bienes': list(args[1] if len(args) > 1 else [])}
+        elif metodo in ('marcar_como_eliminado', 'actualizar_pdf_movimiento') and args:
+            ids = {'movimientos': [args[0]]}
+        return {"metodo": metodo, "tablas": self.TABLAS_POR_METODO.get(metodo, []), "ids": ids}
+
+    # ------------------------------------------------------------------
+    # Notificación de cambios
+    # ------------------------------------------------------------------
+    def _publicar(self, cambios):
+        with self._hay_cambios:
+            for cambio in cambios:
+                self.version += 1
+                cambio["version"] = self.version
+                cambio["fecha"] = time.time()
+                self._cambios.append(cambio)
+            self._hay_cambios.notify_all()
+
+    def autorizado(self, token):
+        """El token del pedido coincide con el del servidor (comparación en tiempo constante)"""
+        return bool(token) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def cambios_desde(self, version, espera=0):
+        """Cambios con versión > `version`; espera hasta `espera` s si no hay"""
+        limite = time.monotonic() + espera
+        with self._hay_cambios:
+            while self.version <= version:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                self._hay_cambios.wait(restante)
+            cambios = [c for c in self._cambios if c["version"] > version]
+            # Si el cliente se atrasó más que el buffer, que recargue todo
+            completo = bool(self._cambios) and self._cambios[0]["version"] > version + 1
+            return {"version": self.version, "cambios": cambios, "recargar_todo": completo}
+
+
+class _ManejadorRPC(BaseHTTPRequestHandler):
+    coordinador = None
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        if not self._autorizado():
+            return
+        url = urlparse(self.path)
+        consulta = parse_qs(url.query)
+        if url.path == "/estado":
+            self._responder({
+                "version": self.coordinador.version,
+                "actas_folder": self.coordinador.db.actas_folder,
+            })
+        elif url.path == "/cambios":
+            desde = int(consulta.get("desde", ["0"])[0])
+            espera = min(float(consulta.get("espera", ["0"])[0]), 60)
+            self._responder(self.coordinador.cambios_desde(desde, espera))
+        else:
+            self._responder({"error": "no encontrado"}, 404)
+
+    def do_POST(self):
+        if not self._autorizado():
+            return
+        if urlparse(self.path).path != "/rpc":
+            self._responder({"error": "no encontrado"}, 404)
+            return
+        largo = int(self.headers.get("Content-Length", 0))
+        try:
+            cuerpo = json.loads(self.rfile.read(largo) or b"{}")
+        except ValueError:
+            self._responder({"error": "JSON inválido"}, 400)
+            return
+        self._responder(self.coordinador.ejecutar_lote(cuerpo.get("llamadas", [])))
+
+    def _autorizado(self):
+        if self.coordinador.autorizado(self.headers.get("X-Token", "")):
+            return True
+        logger.warning("⚠️ Pedido sin token válido desde %s", self.address_string())
+        # El cuerpo no se lee: cerrar en vez de dejar la conexión a medias
+        self.close_connection = True
+        self._responder({"error": "no autorizado"}, 401)
+        return False
+
+    def _responder(self, datos, estado=200):
+        contenido = json.dumps(datos, default=str, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *args):
+        logger.debug("🖧 %s - %s", self.address_string(), formato % args)
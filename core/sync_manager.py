@@ -7,12 +7,24 @@ import sqlite3
 import os
 import shutil
 import hashlib
-from datetime import datetime, timedelta
+import time
 from pathlib import Path
 import json
 
 from PyQt5.QtCore import QTimer, QObject, pyqtSignal
 
+from database.almacen_respaldos import AlmacenRespaldos
+from database.metricas import medir
+from database.notificador_cambios import NotificadorCambios, instalar_registro_cambios, ultimo_cambio
+from core.alcance_replicacion import AlcanceReplicacion
+from core.fusion_tres_vias import FusionTresVias, listar_conflictos
+from core.puesta_al_dia import guardar_marca
+from database.huellas import HuellasDB, borrar_filas, comparar, diferencias_por_ids
+from database.respaldo import restaurar_respaldo
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
 class SyncManager(QObject):
     """Gestor principal de sincronización - VERSIÓN CORREGIDA"""
     
@@ -21,6 +33,10 @@ class SyncManager(QObject):
     sincronizacion_completada = pyqtSignal(str, bool)
     progreso_sincronizacion = pyqtSignal(int, str)
     conflicto_detectado = pyqtSignal(dict)
+    cambios_en_red = pyqtSignal(list)
+    
+    # El mantenimiento de la base no arranca si falta menos que esto (segundos) para sincronizar
+    MARGEN_MANTENIMIENTO = 120
 
     def _importar_config(self):
         """Importa config_manager solo cuando se necesita"""
@@ -36,6 +52,9 @@ class SyncManager(QObject):
         super().__init__()
         self.db_local = db_local
         self.db_red = None
+        self.notificador_red = None
+        self.sincronizando = False
+        self.proxima_sincronizacion = None   # time.monotonic() del próximo disparo del timer
         self.timer = QTimer()
         self.timer.timeout.connect(self._sincronizar_automatico)
         self._inicializar_sincronizador()
@@ -45,10 +64,41 @@ class SyncManager(QObject):
         cargar_configuracion, _, _, _ = self._importar_config()
         config = cargar_configuracion()
         
+        # Con servidor de coordinación no hay archivos que sincronizar
+        if getattr(self.db_local, "es_remoto", False):
+            logger.info("🖧 Base remota: sincronización por archivos desactivada")
+            return
+        
         if config["auto_sincronizar"]:
             intervalo = config["intervalo_sincronizacion"] * 1000
             self.timer.start(intervalo)
-            print(f"🔄 Sincronización automática cada {config['intervalo_sincronizacion']} segundos")
+            self.proxima_sincronizacion = time.monotonic() + config["intervalo_sincronizacion"]
+            logger.info("🔄 Sincronización automática cada %s segundos", config['intervalo_sincronizacion'])
+            if config["modo_trabajo"] == "local_con_sincronizacion":
+                self._vigilar_red(config)
+    
+    def _vigilar_red(self, config):
+        """
+        Aviso temprano: cuando otro puesto escribe en la maestra se sincroniza
+        enseguida, sin esperar al timer (ver NotificadorCambios).
+        """
+        try:
+            _, _, _, obtener_ruta_db_maestra = self._importar_config()
+            ruta_red = obtener_ruta_db_maestra()
+            if not os.path.exists(ruta_red):
+                return
+            self.notificador_red = NotificadorCambios(ruta_red, config.get("intervalo_notificaciones"))
+            # El aviso llega desde el hilo del notificador; la señal lo pasa al hilo de la UI
+            self.notificador_red.al_cambiar(self.cambios_en_red.emit)
+            self.cambios_en_red.connect(self._on_cambios_en_red)
+            logger.info("🔔 Vigilando cambios de otros puestos en la red")
+        except Exception as e:
+            logger.warning("⚠️ No se pudo vigilar cambios en la red: %s", e)
+            self.notificador_red = None
+    
+    def _on_cambios_en_red(self, cambios):
+        logger.debug("🔔 Otro puesto modificó %s: sincronizando", cambios[0]["tablas"] if cambios else [])
+        self._sincronizar_automatico()
     
     def conectar_db_red(self):
         """Intenta conectar a la base de datos de red - VERSIÓN CORREGIDA"""
@@ -58,48 +108,71 @@ class SyncManager(QObject):
             cargar_configuracion, _, _, _ = self._importar_config()
             config = cargar_configuracion()
             
-            print(f"🔍 Verificando acceso a red: {os.path.dirname(ruta_red)}")
+            logger.debug("🔍 Verificando acceso a red: %s", os.path.dirname(ruta_red))
             
             # ✅ VERIFICAR SI EL DIRECTORIO DE RED ES ACCESIBLE
             directorio_red = os.path.dirname(ruta_red)
             if not os.path.exists(directorio_red):
-                print(f"❌ No se puede acceder al directorio de red: {directorio_red}")
-                print("💡 Verifica que la unidad M: esté mapeada y tengas permisos")
+                logger.error("❌ No se puede acceder al directorio de red: %s", directorio_red)
+                logger.debug("💡 Verifica que la unidad M: esté mapeada y tengas permisos")
                 return False
             
+            # ✅ REUSAR la conexión de la sincronización anterior (una DB nueva por
+            # sincronización dejaba abiertas las conexiones de las anteriores)
+            if self.db_red is not None and self.db_red.conn is not None and self.db_red.path == ruta_red:
+                return True
+            self._cerrar_db_red()
+            
             # ✅ SI NO EXISTE LA BD, CREAR UNA NUEVA
             if not os.path.exists(ruta_red):
-                print(f"🆕 Archivo de BD no existe en red. Creando nueva base de datos...")
+                logger.debug("🆕 Archivo de BD no existe en red. Creando nueva base de datos...")
                 try:
                     from database.db_manager import DB
                     self.db_red = DB(ruta_red, config["actas_folder_red"])
-                    print(f"✅ Nueva base de datos creada en red: {ruta_red}")
+                    logger.info("✅ Nueva base de datos creada en red: %s", ruta_red)
                     return True
                 except Exception as e:
-                    print(f"❌ No se pudo crear BD en red: {e}")
+                    logger.error("❌ No se pudo crear BD en red: %s", e)
                     return False
             
             # ✅ CONECTAR A BD EXISTENTE
             from database.db_manager import DB
             self.db_red = DB(ruta_red, config["actas_folder_red"])
-            print("✅ Conectado exitosamente a base de datos de red")
+            logger.info("✅ Conectado exitosamente a base de datos de red")
             return True
             
         except Exception as e:
-            print(f"❌ Error conectando a BD red: {e}")
+            logger.error("❌ Error conectando a BD red: %s", e)
             return False
     
+    def _cerrar_db_red(self):
+        """Cierra la conexión a la red (la próxima sincronización reconecta)"""
+        if self.db_red is not None:
+            self.db_red.cerrar()
+            self.db_red = None
+    
     def sincronizar_manual(self):
         """Sincronización manual iniciada por el usuario"""
         self.sincronizacion_iniciada.emit("Iniciando sincronización manual...")
+        if getattr(self.db_local, "es_remoto", False):
+            self.sincronizacion_completada.emit("✅ Datos centralizados en el servidor", True)
+            return True
         return self._ejecutar_sincronizacion("manual")
     
+    def sincronizar_pronto(self, demora_ms=3000):
+        """Agenda una sincronización apenas arranca la ventana (ej: la puesta al día no terminó)"""
+        if getattr(self.db_local, "es_remoto", False):
+            return
+        QTimer.singleShot(demora_ms, self._sincronizar_automatico)
+    
     def _sincronizar_automatico(self):
         """Sincronización automática por timer"""
+        if self.timer.isActive():
+            self.proxima_sincronizacion = time.monotonic() + self.timer.interval() / 1000
         if not self._debe_sincronizar():
             return
         
-        print("🔄 Sincronización automática iniciada")
+        logger.debug("🔄 Sincronización automática iniciada")
         self._ejecutar_sincronizacion("auto")
     
     def _debe_sincronizar(self):
@@ -124,20 +197,39 @@ class SyncManager(QObject):
         except:
             return False
     
+    def ventana_libre(self, margen=MARGEN_MANTENIMIENTO):
+        """
+        True si no hay sincronización en curso ni agendada dentro de `margen`
+        segundos. Solo lee atributos: se puede llamar desde otro hilo.
+        """
+        if self.sincronizando:
+            return False
+        return self.proxima_sincronizacion is None or self.proxima_sincronizacion - time.monotonic() > margen
+    
     def _ejecutar_sincronizacion(self, tipo):
         """Ejecuta el proceso completo de sincronización - VERSIÓN SIMPLIFICADA"""
+        self.sincronizando = True
+        try:
+            return self._sincronizar(tipo)
+        finally:
+            self.sincronizando = False
+    
+    def _sincronizar(self, tipo):
         try:
             self.progreso_sincronizacion.emit(0, "Conectando con red...")
             
             # 1. Conectar a red
-            if not self.conectar_db_red():
+            with medir("sync", "conectar_red"):
+                conectado = self.conectar_db_red()
+            if not conectado:
                 self.sincronizacion_completada.emit("❌ No se pudo conectar a la red", False)
                 return False
             
             self.progreso_sincronizacion.emit(30, "Sincronizando base completa...")
             
             # 2. PARA PRIMERA VERSIÓN: Sincronización completa simple
-            exito = self._sincronizacion_completa_simple()
+            with medir("sync", "total"):
+                exito = self._sincronizacion_completa_simple()
             
             if exito:
                 self.progreso_sincronizacion.emit(100, "Completando...")
@@ -146,50 +238,205 @@ class SyncManager(QObject):
                 _, actualizar_ultima_sincronizacion, _, _ = self._importar_config()
                 actualizar_ultima_sincronizacion()
                 
+                # Lo que la propia sincronización escribió en la red no es "de otro puesto"
+                if self.notificador_red is not None:
+                    self.notificador_red.descartar_pendientes()
+                
                 mensaje = "✅ Sincronización completa exitosa"
                 self.sincronizacion_completada.emit(mensaje, True)
-                print(f"✅ Sincronización {tipo} completada")
+                logger.info("✅ Sincronización %s completada", tipo)
                 return True
             else:
+                # Puede ser la conexión (ej: se cayó la unidad de red): la próxima vez, una nueva
+                self._cerrar_db_red()
                 self.sincronizacion_completada.emit("❌ Error en sincronización", False)
                 return False
             
         except Exception as e:
+            self._cerrar_db_red()
             error_msg = f"❌ Error en sincronización: {str(e)}"
             self.sincronizacion_completada.emit(error_msg, False)
-            print(error_msg)
+            logger.error(error_msg)
             return False
     
+    def verificar_divergencia(self):
+        """
+        Compara local y red por huellas Merkle.
+        Devuelve {tabla: {'solo_a', 'solo_b', 'distintas'}} solo con las tablas distintas.
+        """
+        if self.db_red is None and not self.conectar_db_red():
+            return None
+        huellas_local = HuellasDB(self.db_local.conn)
+        huellas_red = HuellasDB(self.db_red.conn)
+        raices_red = huellas_red.raices()
+        return {
+            tabla: comparar(huellas_local, huellas_red, tabla)
+            for tabla, raiz in huellas_local.raices().items()
+            if tabla in raices_red and raices_red[tabla] != raiz
+        }
+    
     def _sincronizacion_completa_simple(self):
-        """Sincronización completa simple - reemplaza ambas bases"""
+        """Sincronización en ambos sentidos: fusión de tres vías fila a fila, guiada por huellas Merkle"""
+        respaldos = {}
+        cargar_configuracion, _, obtener_ruta_db_activa, _ = self._importar_config()
         try:
-            print("🔄 Iniciando sincronización completa...")
+            logger.debug("🔄 Iniciando sincronización completa...")
             
-            # Crear backup de ambas bases primero
-            backup_local = self._crear_backup_local()
-            backup_red = self._crear_backup_red()
+            # La actividad en buffer tiene que viajar en la sincronización
+            with medir("sync", "vaciar_logs"):
+                self.db_local.vaciar_logs_actividad()
             
-            # Estrategia simple: copiar la base más reciente a la otra
-            # Por ahora, copiamos local → red para pruebas
-            _, _, obtener_ruta_db_activa, obtener_ruta_db_maestra = self._importar_config()
             ruta_local = obtener_ruta_db_activa()
-            ruta_red = obtener_ruta_db_maestra()
-            
-            if os.path.exists(ruta_local):
-                shutil.copy2(ruta_local, ruta_red)
-                print("✅ Base local copiada a red")
-                return True
-            else:
-                print("❌ No existe base local para copiar")
+            if not os.path.exists(ruta_local):
+                logger.error("❌ No existe base local para copiar")
                 return False
+            
+            config = cargar_configuracion()
+            with medir("sync", "preparar_fusion"):
+                fusion = FusionTresVias(self.db_local.conn, self.db_red.conn,
+                                        resolucion_automatica=config.get("resolucion_automatica", False))
                 
-        except Exception as e:
-            print(f"❌ Error en sincronización completa: {e}")
+                # Marca para la puesta al día del próximo arranque (se lee antes de fusionar)
+                instalar_registro_cambios(self.db_red.conn)
+                marca = ultimo_cambio(self.db_red.conn)
             
-            # Restaurar backups en caso de error
-            self._restaurar_backup_si_existe(backup_local, obtener_ruta_db_activa())
-            self._restaurar_backup_si_existe(backup_red, obtener_ruta_db_maestra())
+            # Puesto con alcance parcial: caché local = solo su parte del inventario
+            alcance = AlcanceReplicacion.desde_config(config)
+            if not alcance.es_completo:
+                with medir("sync", "fusion_con_alcance"):
+                    exito = self._sincronizacion_con_alcance(alcance, fusion, respaldos)
+            else:
+                # Con las raíces iguales no hay nada que fusionar ni respaldar
+                with medir("sync", "huellas"):
+                    iguales = fusion.huellas_local.raices() == fusion.huellas_red.raices()
+                if iguales:
+                    logger.info("✅ Local y red idénticas, nada que sincronizar")
+                    guardar_marca(self.db_local.conn, marca)
+                    return True
+                
+                # Crear backup de ambas bases primero (la fusión escribe en las dos)
+                with medir("sync", "respaldos"):
+                    respaldos['local'] = self._crear_backup_local()
+                    respaldos['red'] = self._crear_backup_red()
+                
+                with medir("sync", "fusion"):
+                    resumen = fusion.fusionar()
+                with medir("sync", "alinear_secuencias"):
+                    self._alinear_secuencias()
+                logger.info("✅ Sincronización: %s subidas, %s bajadas, %s conflictos",
+                            resumen['subidas'], resumen['bajadas'], resumen['conflictos'])
+                exito = True
             
+            if exito:
+                guardar_marca(self.db_local.conn, marca)
+            self._notificar_conflictos(fusion.conflictos_nuevos, config)
+            return exito
+                
+        except Exception as e:
+            logger.error("❌ Error en sincronización completa: %s", e)
+
+            # La fusión ya se deshizo en ambas bases (ver FusionTresVias.fusionar).
+            # La red no se restaura: el snapshot pisaría lo que otros puestos
+            # escribieron mientras tanto. Lo local restante (desalojo, secuencias) sí.
+            self._restaurar_backup_si_existe(respaldos.get('local'), obtener_ruta_db_activa())
+
+            return False
+    
+    def _sincronizacion_con_alcance(self, alcance, fusion, respaldos):
+        """
+        Sincronización parcial según el alcance del puesto:
+        1. Fusionar (tres vías) las filas del caché local más las del alcance
+           en la red. Lo cambiado en local se sube aunque esté fuera del
+           alcance (esas escrituras se reenvían a la maestra).
+        2. Quitar del caché local lo que ya no pertenece al alcance.
+        El trabajo es proporcional al caché local, no al inventario completo.
+        """
+        conn_local, conn_red = self.db_local.conn, self.db_red.conn
+        tablas = [t for t in fusion.huellas_local.tablas if t in fusion.huellas_red.tablas]
+        
+        # 1. Fusión restringida a lo que le importa al puesto
+        ids_por_tabla, ids_alcance = {}, {}
+        for tabla in tablas:
+            ids_local = [fila[0] for fila in conn_local.execute(f"SELECT id FROM {tabla}")]
+            if tabla in alcance.TABLAS_SOLO_SUBIDA:
+                ids_por_tabla[tabla] = ids_local
+                continue
+            ids_alcance[tabla] = alcance.ids_en_alcance(conn_red, tabla)
+            ids_por_tabla[tabla] = list(set(ids_local) | ids_alcance[tabla])
+        
+        hay_cambios = any(
+            dif['solo_a'] or dif['solo_b'] or dif['distintas']
+            for dif in (diferencias_por_ids(fusion.huellas_local, fusion.huellas_red, tabla, ids)
+                        for tabla, ids in ids_por_tabla.items())
+        )
+        resumen = {'subidas': 0, 'bajadas': 0}
+        if hay_cambios:
+            respaldos['local'] = self._crear_backup_local()
+            respaldos['red'] = self._crear_backup_red()
+            resumen = fusion.fusionar(ids_por_tabla)
+        
+        # 2. Desalojo (con ambas ya al día)
+        desalojo = {}
+        for tabla in alcance.TABLAS_CON_ALCANCE:
+            if tabla not in ids_alcance:
+                continue
+            fuera = [fila[0] for fila in conn_local.execute(f"SELECT id FROM {tabla}")
+                     if fila[0] not in ids_alcance[tabla]]
+            if fuera:
+                desalojo[tabla] = fuera
+        if desalojo:
+            if 'local' not in respaldos:
+                respaldos['local'] = self._crear_backup_local()
+            for tabla, ids in desalojo.items():
+                borrar_filas(conn_local, tabla, ids)
+                # Sin base: si vuelve al alcance se trae como alta, no como borrado local
+                fusion.olvidar(tabla, ids)
+        
+        # 3. Los ids nuevos del caché no deben pisar filas de la red que no tenemos
+        self._alinear_secuencias()
+        
+        logger.info("✅ Sincronización parcial %s: %s filas subidas, %s bajadas, %s desalojadas",
+                    alcance, resumen['subidas'], resumen['bajadas'],
+                    sum(len(ids) for ids in desalojo.values()))
+        return True
+    
+    def _alinear_secuencias(self):
+        """Lleva los AUTOINCREMENT locales al menos hasta los de la red (menos choques de ids)"""
+        conn_local, conn_red = self.db_local.conn, self.db_red.conn
+        with conn_local:
+            for nombre, seq in conn_red.execute("SELECT name, seq FROM sqlite_sequence").fetchall():
+                conn_local.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, nombre))
+                conn_local.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? "
+                    "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+                    (nombre, seq, nombre)
+                )
+    
+    def _notificar_conflictos(self, conflictos, config):
+        """Emite conflicto_detectado por cada conflicto nuevo de la cola"""
+        if not conflictos:
+            return
+        logger.warning("⚠️ %s conflictos de sincronización en cola", len(conflictos))
+        if not config.get("notificar_conflictos", True):
+            return
+        for conflicto in conflictos:
+            self.conflicto_detectado.emit(conflicto)
+    
+    def conflictos_pendientes(self):
+        """Cola de conflictos sin resolver (se lee de la base local)"""
+        return listar_conflictos(self.db_local.conn)
+    
+    def resolver_conflicto(self, conflicto_id, usar):
+        """Resuelve un conflicto de la cola con el valor 'local' o 'red' (escribe en ambas bases)"""
+        try:
+            if self.db_red is None and not self.conectar_db_red():
+                return False
+            cargar_configuracion, _, _, _ = self._importar_config()
+            fusion = FusionTresVias(self.db_local.conn, self.db_red.conn,
+                                    cargar_configuracion().get("resolucion_automatica", False))
+            return fusion.resolver(conflicto_id, usar)
+        except Exception as e:
+            logger.error("❌ Error resolviendo conflicto %s: %s", conflicto_id, e)
             return False
     
     def _crear_backup_local(self):
@@ -199,7 +446,7 @@ class SyncManager(QObject):
             ruta_local = obtener_ruta_db_activa()
             return self._crear_backup(ruta_local, "local")
         except Exception as e:
-            print(f"⚠️ No se pudo crear backup local: {e}")
+            logger.warning("⚠️ No se pudo crear backup local: %s", e)
             return None
     
     def _crear_backup_red(self):
@@ -209,40 +456,39 @@ class SyncManager(QObject):
             ruta_red = obtener_ruta_db_maestra()
             return self._crear_backup(ruta_red, "red")
         except Exception as e:
-            print(f"⚠️ No se pudo crear backup red: {e}")
+            logger.warning("⚠️ No se pudo crear backup red: %s", e)
             return None
     
     def _crear_backup(self, ruta_original, tipo):
-        """Crea un backup de una base de datos"""
+        """Crea un snapshot incremental de una base de datos (devuelve su manifiesto)"""
         try:
             if not os.path.exists(ruta_original):
-                print(f"⚠️ No se puede hacer backup de {tipo}: archivo no existe")
+                logger.warning("⚠️ No se puede hacer backup de %s: archivo no existe", tipo)
                 return None
-                
-            backup_dir = os.path.join(os.path.dirname(ruta_original), "backups")
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"backup_{tipo}_{timestamp}.db"
-            backup_path = os.path.join(backup_dir, backup_name)
             
-            shutil.copy2(ruta_original, backup_path)
-            print(f"✅ Backup {tipo} creado: {backup_name}")
-            return backup_path
+            # Solo se escriben los bloques que cambiaron desde el último snapshot
+            almacen = AlmacenRespaldos.para_base(ruta_original)
+            manifiesto = almacen.crear_snapshot(ruta_original, etiqueta=tipo)
+            almacen.aplicar_retencion()
+            logger.info("✅ Backup %s creado: %s", tipo, os.path.basename(manifiesto))
+            return manifiesto
             
         except Exception as e:
-            print(f"⚠️ Error creando backup {tipo}: {e}")
+            logger.warning("⚠️ Error creando backup %s: %s", tipo, e)
             return None
     
     def _restaurar_backup_si_existe(self, backup_path, ruta_original):
         """Restaura un backup si existe"""
         try:
             if backup_path and os.path.exists(backup_path):
-                shutil.copy2(backup_path, ruta_original)
-                print(f"✅ Backup restaurado: {os.path.basename(backup_path)}")
+                if backup_path.endswith(".json"):
+                    AlmacenRespaldos.para_base(ruta_original).restaurar(backup_path, ruta_original)
+                else:
+                    restaurar_respaldo(backup_path, ruta_original)
+                logger.info("✅ Backup restaurado: %s", os.path.basename(backup_path))
                 return True
         except Exception as e:
-            print(f"⚠️ Error restaurando backup: {e}")
+            logger.warning("⚠️ Error restaurando backup: %s", e)
         return False
     
     def obtener_estado(self):
@@ -261,7 +507,11 @@ class SyncManager(QObject):
     def detener_sincronizacion(self):
         """Detiene la sincronización automática"""
         self.timer.stop()
-        print("⏹️ Sincronización automática detenida")
+        if self.notificador_red is not None:
+            self.notificador_red.detener()
+            self.notificador_red = None
+        self._cerrar_db_red()
+        logger.info("⏹️ Sincronización automática detenida")
         
 def sincronizar_archivos_pdf(self):
     """Sincroniza archivos PDF entre local y red"""
@@ -273,10 +523,10 @@ def sincronizar_archivos_pdf(self):
         
         # Solo sincronizar si estamos en modo de sincronización
         if modo != "local_con_sincronizacion":
-            print("📭 Modo no requiere sincronización de archivos")
+            logger.debug("📭 Modo no requiere sincronización de archivos")
             return
         
-        print("🔄 Sincronizando archivos PDF...")
+        logger.debug("🔄 Sincronizando archivos PDF...")
         
         # 1. LOCAL → RED (subir nuevos archivos locales)
         if os.path.exists(config["actas_folder_local"]):
@@ -296,9 +546,9 @@ def sincronizar_archivos_pdf(self):
                     origen = os.path.join(config["actas_folder_local"], archivo)
                     destino = os.path.join(config["actas_folder_red"], archivo)
                     shutil.copy2(origen, destino)
-                    print(f"  📤 Subido a red: {archivo}")
+                    logger.debug("  📤 Subido a red: %s", archivo)
                 except Exception as e:
-                    print(f"  ⚠️ Error subiendo {archivo}: {e}")
+                    logger.warning("  ⚠️ Error subiendo %s: %s", archivo, e)
         
         # 2. RED → LOCAL (descargar archivos nuevos de red)
         for archivo in archivos_red:
@@ -307,11 +557,11 @@ def sincronizar_archivos_pdf(self):
                     origen = os.path.join(config["actas_folder_red"], archivo)
                     destino = os.path.join(config["actas_folder_local"], archivo)
                     shutil.copy2(origen, destino)
-                    print(f"  📥 Descargado de red: {archivo}")
+                    logger.debug("  📥 Descargado de red: %s", archivo)
                 except Exception as e:
-                    print(f"  ⚠️ Error descargando {archivo}: {e}")
+                    logger.warning("  ⚠️ Error descargando %s: %s", archivo, e)
         
-        print("✅ Sincronización PDF completada")
+        logger.info("✅ Sincronización PDF completada")
         
     except Exception as e:
-        print(f"❌ Error sincronizando PDFs: {e}")
\ No newline at end of file
+        logger.error("❌ Error sincronizando PDFs: %s", e)
\ No newline at end of file
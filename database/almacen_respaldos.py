@@ -0,0 +1,297 @@
+"""
+🗃️ ALMACÉN DE RESPALDOS - Sistema de Inventario AGC
+Snapshots incrementales: bloques de páginas deduplicados por hash + manifiestos
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import zlib
+from datetime import datetime
+
+from database.respaldo import crear_respaldo, restaurar_respaldo
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class AlmacenRespaldos:
+    """
+    Repositorio de respaldos direccionado por contenido.
+
+    Cada snapshot parte de una copia consistente (API de backup) que se corta
+    en bloques de páginas; cada bloque se guarda una sola vez en objetos/
+    con su SHA-256 como nombre y el snapshot es un manifiesto JSON con la
+    lista ordenada de hashes. Un respaldo frecuente solo escribe los bloques
+    que cambiaron.
+
+    Estructura:
+        <raiz>/objetos/ab/abcdef...   bloques comprimidos con zlib
+        <raiz>/snapshots/<id>.json    manifiestos
+        <raiz>/recoleccion            marca de la última recolección de bloques
+
+    El almacén de la maestra lo comparten todos los puestos: mientras uno
+    recolecta, otro puede estar escribiendo bloques cuyo manifiesto todavía
+    no existe. Por eso la recolección solo borra bloques sin referencia más
+    viejos que GRACIA_OBJETOS (reusar un bloque existente le renueva la
+    fecha) y corre como mucho cada INTERVALO_RECOLECCION, no en cada
+    respaldo: recorrer todos los objetos por SMB es caro.
+    """
+
+    PAGINAS_POR_BLOQUE = 8
+
+    # Retención escalonada: último snapshot de cada hora / día / mes
+    RETENCION_HORAS = 24
+    RETENCION_DIAS = 30
+    RETENCION_MESES = 12
+
+    FORMATO_ID = "%Y%m%d_%H%M%S"
+
+    GRACIA_OBJETOS = 6 * 3600           # segundos; más que lo que tarda un snapshot
+    INTERVALO_RECOLECCION = 24 * 3600   # segundos
+
+    def __init__(self, raiz):
+        self.raiz = raiz
+        self.dir_objetos = os.path.join(raiz, "objetos")
+        self.dir_snapshots = os.path.join(raiz, "snapshots")
+        os.makedirs(self.dir_objetos, exist_ok=True)
+        os.makedirs(self.dir_snapshots, exist_ok=True)
+
+    @classmethod
+    def para_base(cls, ruta_db):
+        """Almacén ubicado junto a la base, en backups/almacen"""
+        return cls(os.path.join(os.path.dirname(os.path.abspath(ruta_db)), "backups", "almacen"))
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+    def crear_snapshot(self, ruta_db, etiqueta=""):
+        """Guarda un snapshot de `ruta_db`; devuelve la ruta de su manifiesto"""
+        inicio = time.perf_counter()
+        fecha = datetime.now()
+        snapshot_id = fecha.strftime(self.FORMATO_ID)
+        if etiqueta:
+            snapshot_id = f"{snapshot_id}_{etiqueta}"
+
+        ruta_manifiesto = os.path.join(self.dir_snapshots, f"{snapshot_id}.json")
+        sufijo = 1
+        while os.path.exists(ruta_manifiesto):
+            sufijo += 1
+            ruta_manifiesto = os.path.join(self.dir_snapshots, f"{snapshot_id}-{sufijo}.json")
+        snapshot_id = os.path.basename(ruta_manifiesto)[:-len(".json")]
+        # La copia se arma en un temporal local: al almacén (que puede estar
+        # en el recurso compartido) solo viajan los bloques nuevos y el manifiesto
+        temporal_local = tempfile.mkdtemp(prefix="snapshot_")
+        copia = os.path.join(temporal_local, f"{snapshot_id}.copia")
+        try:
+            crear_respaldo(ruta_db, copia)
+            conn = sqlite3.connect(copia)
+            try:
+                tamano_pagina = conn.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                conn.close()
+            tamano_bloque = tamano_pagina * self.PAGINAS_POR_BLOQUE
+
+            bloques = []
+            nuevos = 0
+            with open(copia, "rb") as f:
+                while True:
+                    datos = f.read(tamano_bloque)
+                    if not datos:
+                        break
+                    hash_bloque = hashlib.sha256(datos).hexdigest()
+                    if self._guardar_objeto(hash_bloque, datos):
+                        nuevos += 1
+                    bloques.append(hash_bloque)
+            tamano = os.path.getsize(copia)
+        finally:
+            shutil.rmtree(temporal_local, ignore_errors=True)
+
+        manifiesto = {
+            "id": snapshot_id,
+            "fecha": fecha.isoformat(timespec="seconds"),
+            "origen": os.path.abspath(ruta_db),
+            "etiqueta": etiqueta,
+            "tamano": tamano,
+            "tamano_bloque": tamano_bloque,
+            "bloques": bloques,
+        }
+        temporal = ruta_manifiesto + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f)
+        os.replace(temporal, ruta_manifiesto)
+
+        logger.info("🗃️ Snapshot %s: %s/%s bloques nuevos (%.2fs)",
+                    snapshot_id, nuevos, len(bloques), time.perf_counter() - inicio)
+        return ruta_manifiesto
+
+    def listar_snapshots(self):
+        """Manifiestos ordenados del más viejo al más nuevo"""
+        snapshots = []
+        for nombre in sorted(os.listdir(self.dir_snapshots)):
+            if nombre.endswith(".json"):
+                try:
+                    snapshots.append(self._leer_manifiesto(os.path.join(self.dir_snapshots, nombre)))
+                except (OSError, ValueError) as e:
+                    logger.warning("⚠️ Manifiesto ilegible %s: %s", nombre, e)
+        snapshots.sort(key=lambda m: m["fecha"])
+        return snapshots
+
+    # ------------------------------------------------------------------
+    # Restauración
+    # ------------------------------------------------------------------
+    def restaurar(self, manifiesto, ruta_destino):
+        """
+        Reconstruye un snapshot (manifiesto dict, id o ruta .json) sobre `ruta_destino`.
+        """
+        if isinstance(manifiesto, str):
+            manifiesto = self._leer_manifiesto(self._ruta_manifiesto(manifiesto))
+
+        temporal = ruta_destino + ".snapshot.tmp"
+        try:
+            with open(temporal, "wb") as f:
+                for hash_bloque in manifiesto["bloques"]:
+                    f.write(self._leer_objeto(hash_bloque))
+            restaurar_respaldo(temporal, ruta_destino)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+        logger.info("✅ Snapshot %s restaurado en %s", manifiesto["id"], os.path.basename(ruta_destino))
+        return True
+
+    def restaurar_a_fecha(self, fecha, ruta_destino):
+        """Restaura el último snapshot tomado hasta `fecha` (datetime o ISO)"""
+        if isinstance(fecha, datetime):
+            fecha = fecha.isoformat(timespec="seconds")
+        candidatos = [m for m in self.listar_snapshots() if m["fecha"] <= fecha]
+        if not candidatos:
+            logger.warning("⚠️ No hay snapshots anteriores a %s", fecha)
+            return False
+        return self.restaurar(candidatos[-1], ruta_destino)
+
+    # ------------------------------------------------------------------
+    # Retención
+    # ------------------------------------------------------------------
+    def aplicar_retencion(self, ahora=None):
+        """
+        Conserva, por etiqueta, el último snapshot de cada hora (RETENCION_HORAS),
+        de cada día (RETENCION_DIAS) y de cada mes (RETENCION_MESES); borra el
+        resto y, si toca, los bloques que ya nadie referencia.
+        """
+        ahora = ahora or datetime.now()
+        snapshots = self.listar_snapshots()
+        conservar = set()
+
+        niveles = [
+            ("%Y%m%d%H", self.RETENCION_HORAS * 3600),
+            ("%Y%m%d", self.RETENCION_DIAS * 86400),
+            ("%Y%m", self.RETENCION_MESES * 31 * 86400),
+        ]
+        for formato, ventana in niveles:
+            ultimo_por_periodo = {}
+            for m in snapshots:
+                fecha = datetime.fromisoformat(m["fecha"])
+                if (ahora - fecha).total_seconds() <= ventana:
+                    ultimo_por_periodo[(m.get("etiqueta", ""), fecha.strftime(formato))] = m["id"]
+            conservar.update(ultimo_por_periodo.values())
+
+        # El más reciente de cada etiqueta siempre se conserva
+        ultimos = {m.get("etiqueta", ""): m["id"] for m in snapshots}
+        conservar.update(ultimos.values())
+
+        eliminados = 0
+        for m in snapshots:
+            if m["id"] not in conservar:
+                try:
+                    os.remove(self._ruta_manifiesto(m["id"]))
+                    eliminados += 1
+                except FileNotFoundError:
+                    pass  # Lo borró la retención de otro puesto
+
+        objetos_eliminados = self._recolectar_objetos() if self._toca_recolectar() else 0
+        if eliminados or objetos_eliminados:
+            logger.info("🗑️ Retención: %s snapshots y %s bloques eliminados", eliminados, objetos_eliminados)
+        return eliminados
+
+    def _toca_recolectar(self):
+        """True si pasó INTERVALO_RECOLECCION desde la última (de cualquier puesto); la marca"""
+        marca = os.path.join(self.raiz, "recoleccion")
+        try:
+            if time.time() - os.path.getmtime(marca) < self.INTERVALO_RECOLECCION:
+                return False
+        except OSError:
+            pass  # Nunca se recolectó
+        with open(marca, "w", encoding="utf-8") as f:
+            f.write(datetime.now().isoformat(timespec="seconds"))
+        return True
+
+    def _recolectar_objetos(self):
+        """
+        Borra los bloques que no figuran en ningún manifiesto y que nadie
+        escribió ni reusó en las últimas GRACIA_OBJETOS: pueden ser de un
+        snapshot en curso de otro puesto.
+        """
+        referenciados = set()
+        for m in self.listar_snapshots():
+            referenciados.update(m["bloques"])
+
+        limite = time.time() - self.GRACIA_OBJETOS
+        eliminados = 0
+        for subdir in os.listdir(self.dir_objetos):
+            ruta_subdir = os.path.join(self.dir_objetos, subdir)
+            for nombre in os.listdir(ruta_subdir):
+                if nombre in referenciados:
+                    continue
+                ruta = os.path.join(ruta_subdir, nombre)
+                try:
+                    if os.path.getmtime(ruta) < limite:
+                        os.remove(ruta)
+                        eliminados += 1
+                except FileNotFoundError:
+                    pass
+        return eliminados
+
+    # ------------------------------------------------------------------
+    # Objetos
+    # ------------------------------------------------------------------
+    def _ruta_objeto(self, hash_bloque):
+        return os.path.join(self.dir_objetos, hash_bloque[:2], hash_bloque)
+
+    def _guardar_objeto(self, hash_bloque, datos):
+        """Escribe el bloque si no existe; devuelve True si era nuevo"""
+        ruta = self._ruta_objeto(hash_bloque)
+        if os.path.exists(ruta):
+            try:
+                # Fecha nueva: la recolección no lo toma por abandonado (ver GRACIA_OBJETOS)
+                os.utime(ruta)
+                return False
+            except FileNotFoundError:
+                pass  # Lo recolectaron recién: se vuelve a escribir
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as f:
+            f.write(zlib.compress(datos, 6))
+        os.replace(temporal, ruta)
+        return True
+
+    def _leer_objeto(self, hash_bloque):
+        with open(self._ruta_objeto(hash_bloque), "rb") as f:
+            datos = zlib.decompress(f.read())
+        if hashlib.sha256(datos).hexdigest() != hash_bloque:
+            raise ValueError(f"Bloque corrupto: {hash_bloque}")
+        return datos
+
+    def _ruta_manifiesto(self, manifiesto):
+        if manifiesto.endswith(".json"):
+            return manifiesto
+        return os.path.join(self.dir_snapshots, f"{manifiesto}.json")
+
+    @staticmethod
+    def _leer_manifiesto(ruta):
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
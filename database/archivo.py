@@ -0,0 +1,206 @@
+"""
+🗄️ ARCHIVO DE MOVIMIENTOS - Sistema de Inventario AGC
+Movimientos viejos y eliminados fuera de la tabla caliente, en una base adjunta
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from database import resumen_movimientos
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class ArchivoMovimientos:
+    """
+    Archivo frío de `movimientos` y `bienes_movimientos` en un archivo
+    hermano de la base (inventario.db -> inventario_archivo.db), adjuntado
+    como esquema ESQUEMA en la misma conexión.
+
+    - `archivar` mueve los movimientos anteriores al horizonte y los
+      eliminados, con sus vínculos. Nunca el último movimiento vigente de un
+      bien: de él salen su estado y responsable (ver FusionTresVias).
+    - Las vistas temporales VISTAS (movimientos_historial,
+      bienes_movimientos_historial) unen tabla caliente y archivo; las usan
+      las consultas de historial. Sin archivo son la tabla caliente sola.
+    - `contiene` / `mover` permiten que la sincronización replique un
+      archivado en vez de tomarlo por un borrado.
+
+    El archivo no se crea hasta que hay algo para mover.
+    """
+
+    ESQUEMA = "archivo"
+    TABLAS = ['movimientos', 'bienes_movimientos']
+    VISTAS = {'movimientos': 'movimientos_historial', 'bienes_movimientos': 'bienes_movimientos_historial'}
+    INDICES = {
+        'movimientos': ['fecha', 'eliminado'],
+        'bienes_movimientos': ['id_bien', 'id_movimiento'],
+    }
+    LOTE = 500
+
+    def __init__(self, conn, ruta_db=None):
+        self.conn = conn
+        if ruta_db is None:
+            ruta_db = conn.execute("PRAGMA database_list").fetchone()[2]
+        self.ruta = ruta_archivo(ruta_db)
+        self._vistas_con_archivo = None
+
+    # ------------------------------------------------------------------
+    # Adjuntar
+    # ------------------------------------------------------------------
+    def adjunto(self):
+        return any(fila[1] == self.ESQUEMA for fila in self.conn.execute("PRAGMA database_list"))
+
+    def adjuntar(self, crear=False):
+        """
+        Adjunta el archivo si existe (o si `crear`) y deja las vistas de
+        historial al día. Barato si ya estaba: se llama antes de cada consulta
+        de historial para enterarse de un archivo que creó otro proceso.
+        """
+        con_archivo = self.adjunto()
+        if not con_archivo and self.ruta and (crear or os.path.exists(self.ruta)):
+            try:
+                self.conn.execute(f"ATTACH DATABASE ? AS {self.ESQUEMA}", (self.ruta,))
+                self._crear_tablas()
+                con_archivo = True
+            except sqlite3.Error as e:
+                logger.warning("⚠️ No se pudo abrir el archivo de movimientos %s: %s", self.ruta, e)
+        if con_archivo != self._vistas_con_archivo:
+            self._crear_vistas(con_archivo)
+        return con_archivo
+
+    def _crear_tablas(self):
+        agregadas = set()
+        with self.conn:
+            for tabla in self.TABLAS:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.ESQUEMA}.{tabla} AS SELECT * FROM main.{tabla} WHERE 0")
+                # Columnas que la tabla caliente ganó después (ALTER TABLE ... ADD COLUMN)
+                existentes = {c[1] for c in self.conn.execute(f"PRAGMA {self.ESQUEMA}.table_info({tabla})")}
+                for columna in _columnas(self.conn, tabla):
+                    if columna not in existentes:
+                        self.conn.execute(f"ALTER TABLE {self.ESQUEMA}.{tabla} ADD COLUMN {columna}")
+                        agregadas.add(columna)
+                self.conn.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {self.ESQUEMA}.idx_{tabla}_id ON {tabla}(id)")
+                for columna in self.INDICES[tabla]:
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {self.ESQUEMA}.idx_{tabla}_{columna} ON {tabla}({columna})")
+        if agregadas & set(resumen_movimientos.COLUMNAS):
+            resumen_movimientos.recalcular(self.conn, esquema=self.ESQUEMA)
+
+    def _crear_vistas(self, con_archivo):
+        for tabla, vista in self.VISTAS.items():
+            columnas = ", ".join(_columnas(self.conn, tabla))
+            consulta = f"SELECT {columnas} FROM main.{tabla}"
+            if con_archivo:
+                # Una fila que volvió a la tabla caliente (ej: conflicto de sincronización) manda
+                consulta += (f" UNION ALL SELECT {columnas} FROM {self.ESQUEMA}.{tabla}"
+                             f" WHERE id NOT IN (SELECT id FROM main.{tabla})")
+            self.conn.execute(f"DROP VIEW IF EXISTS temp.{vista}")
+            self.conn.execute(f"CREATE TEMP VIEW {vista} AS {consulta}")
+        self._vistas_con_archivo = con_archivo
+
+    # ------------------------------------------------------------------
+    # Archivar
+    # ------------------------------------------------------------------
+    def candidatos(self, horizonte_dias, incluir_eliminados=True):
+        """Ids de movimientos a archivar"""
+        corte = (datetime.now() - timedelta(days=horizonte_dias)).strftime("%Y-%m-%d")
+        condiciones = ["(m.fecha < ? AND COALESCE(m.eliminado, 0) = 0)"] if horizonte_dias else []
+        params = [corte] if horizonte_dias else []
+        if incluir_eliminados:
+            condiciones.append("m.eliminado = 1")
+        if not condiciones:
+            return []
+        return [fila[0] for fila in self.conn.execute(f"""
+            SELECT m.id FROM main.movimientos m
+            WHERE ({' OR '.join(condiciones)})
+              AND m.id NOT IN (
+                  SELECT id_movimiento FROM (
+                      SELECT bm.id_movimiento,
+                             ROW_NUMBER() OVER (PARTITION BY bm.id_bien
+                                                ORDER BY m2.fecha DESC, m2.id DESC) AS orden
+                      FROM main.bienes_movimientos bm
+                      JOIN main.movimientos m2 ON m2.id = bm.id_movimiento
+                      WHERE COALESCE(m2.eliminado, 0) = 0
+                  ) WHERE orden = 1
+              )
+        """, params)]
+
+    def archivar(self, horizonte_dias, incluir_eliminados=True):
+        """Mueve al archivo los candidatos y sus vínculos; devuelve la cantidad de movimientos"""
+        ids = self.candidatos(horizonte_dias, incluir_eliminados)
+        if not ids:
+            return 0
+        self.adjuntar(crear=True)
+        for i in range(0, len(ids), self.LOTE):
+            lote = ids[i:i + self.LOTE]
+            marcas = ",".join("?" * len(lote))
+            vinculos = [fila[0] for fila in self.conn.execute(
+                f"SELECT id FROM main.bienes_movimientos WHERE id_movimiento IN ({marcas})", lote)]
+            # Misma transacción (abarca ambos archivos). Movimientos primero: al
+            # borrar sus vínculos los triggers de resúmenes ya no los encuentran
+            with transaccion(self.conn):
+                self._mover('movimientos', lote)
+                self._mover('bienes_movimientos', vinculos)
+        logger.info("🗄️ %s movimientos archivados en %s", len(ids), self.ruta)
+        return len(ids)
+
+    def mover(self, tabla, ids):
+        """Mueve filas de `tabla` por id de la tabla caliente al archivo"""
+        if not ids:
+            return 0
+        self.adjuntar(crear=True)
+        with transaccion(self.conn):
+            self._mover(tabla, list(ids))
+        return len(ids)
+
+    def _mover(self, tabla, ids):
+        columnas = ", ".join(_columnas(self.conn, tabla))
+        for i in range(0, len(ids), self.LOTE):
+            lote = ids[i:i + self.LOTE]
+            marcas = ",".join("?" * len(lote))
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.ESQUEMA}.{tabla} ({columnas}) "
+                f"SELECT {columnas} FROM main.{tabla} WHERE id IN ({marcas})", lote)
+            self.conn.execute(f"DELETE FROM main.{tabla} WHERE id IN ({marcas})", lote)
+
+    def contiene(self, tabla, ids):
+        """Subconjunto de `ids` que está en el archivo (vacío si no hay archivo)"""
+        if not ids or not self.adjuntar():
+            return set()
+        encontrados = set()
+        ids = list(ids)
+        for i in range(0, len(ids), self.LOTE):
+            lote = ids[i:i + self.LOTE]
+            encontrados.update(fila[0] for fila in self.conn.execute(
+                f"SELECT id FROM {self.ESQUEMA}.{tabla} WHERE id IN ({','.join('?' * len(lote))})", lote))
+        return encontrados
+
+    def estadisticas(self):
+        """{tabla: (filas calientes, filas archivadas)}"""
+        con_archivo = self.adjuntar()
+        return {
+            tabla: (
+                self.conn.execute(f"SELECT COUNT(*) FROM main.{tabla}").fetchone()[0],
+                self.conn.execute(f"SELECT COUNT(*) FROM {self.ESQUEMA}.{tabla}").fetchone()[0]
+                if con_archivo else 0,
+            )
+            for tabla in self.TABLAS
+        }
+
+
+def ruta_archivo(ruta_db):
+    """inventario.db -> inventario_archivo.db (None para bases en memoria)"""
+    if not ruta_db or ruta_db == ":memory:":
+        return None
+    raiz, extension = os.path.splitext(ruta_db)
+    return f"{raiz}_archivo{extension or '.db'}"
+
+
+def _columnas(conn, tabla):
+    return [c[1] for c in conn.execute(f"PRAGMA main.table_info({tabla})")]
@@ -0,0 +1,289 @@
+"""
+💡 ASESOR DE ÍNDICES - Sistema de Inventario AGC
+Propone índices a partir de las consultas realmente ejecutadas y de su plan
+"""
+
+import re
+import sqlite3
+import time
+
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class AsesorIndices:
+    """
+    Analiza el catálogo de sentencias de las métricas (`metricas().consultas()`)
+    con EXPLAIN QUERY PLAN y detecta:
+
+    - SCAN de una tabla entera (o recorrida entera por un índice que no la
+      cubre) cuando la consulta la filtra por igualdad o rango;
+    - índices automáticos (SQLite arma uno temporal en cada ejecución: falta uno real);
+    - TEMP B-TREE para ORDER BY / GROUP BY de una sola tabla, también después
+      de un SEARCH (el índice filtra pero no deja las filas ordenadas).
+
+    Para cada caso arma un índice candidato (columnas de igualdad, después las
+    de rango/orden y, si entra en MAX_COLUMNAS, el resto de columnas que la
+    consulta usa de esa tabla para que sea de cobertura). `validar` lo crea
+    dentro de un SAVEPOINT, compara plan y tiempo antes/después y lo deshace;
+    `aplicar` lo crea de verdad con el prefijo PREFIJO.
+    """
+
+    PREFIJO = "idx_auto_"
+    MAX_COLUMNAS = 4
+    REPETICIONES = 5
+    TABLAS_EXCLUIDAS = ('sqlite_master', 'sqlite_sequence', 'sqlite_stat1')
+
+    _RE_TABLAS = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?", re.I)
+    _RE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(?: USING INDEX \w+)?$")
+    _RE_BUSQUEDA = re.compile(r"^SEARCH (?:TABLE )?(\w+)(?: AS (\w+))? USING (?!AUTOMATIC)")
+    _RE_AUTOMATICO = re.compile(r"^SEARCH (?:TABLE )?(\w+)(?: AS (\w+))? USING AUTOMATIC (?:COVERING |PARTIAL )*INDEX \((.*)\)")
+    _RE_ORDEN = re.compile(r"\b(ORDER|GROUP)\s+BY\s+(.+?)(?:\bLIMIT\b|\bHAVING\b|\bORDER\b|\)|$)", re.I | re.S)
+    _PALABRAS_RESERVADAS = {'WHERE', 'ON', 'LEFT', 'INNER', 'JOIN', 'GROUP', 'ORDER', 'LIMIT', 'AND', 'OR',
+                            'USING', 'CROSS', 'OUTER', 'NATURAL', 'SET', 'VALUES', 'UNION', 'HAVING', 'AS'}
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._columnas = {}
+
+    # ------------------------------------------------------------------
+    # Plan
+    # ------------------------------------------------------------------
+    def plan(self, sql, parametros=()):
+        try:
+            return [fila[3] for fila in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros or ())]
+        except sqlite3.Error as e:
+            logger.debug("💡 Sin plan para %s: %s", sql[:80], e)
+            return None
+
+    @classmethod
+    def problemas(cls, plan):
+        """Líneas del plan que delatan un índice faltante"""
+        return [linea for linea in plan or []
+                if (cls._RE_SCAN.match(linea) or "AUTOMATIC" in linea or "TEMP B-TREE" in linea)]
+
+    def columnas_de(self, tabla):
+        if tabla not in self._columnas:
+            self._columnas[tabla] = [fila[1] for fila in self.conn.execute(f"PRAGMA table_info({tabla})")]
+        return self._columnas[tabla]
+
+    def _alias(self, sql):
+        """{alias o nombre: tabla} de las tablas del FROM/JOIN"""
+        alias = {}
+        for tabla, nombre in self._RE_TABLAS.findall(sql):
+            if not self.columnas_de(tabla):
+                continue  # subconsulta, CTE o función
+            alias[tabla] = tabla
+            if nombre and nombre.upper() not in self._PALABRAS_RESERVADAS:
+                alias[nombre] = tabla
+        return alias
+
+    def _referencias(self, sql, nombre, tabla, tablas):
+        """Columnas de `tabla` usadas en la consulta: calificadas (b.col) o sin calificar si no hay ambigüedad"""
+        columnas = self.columnas_de(tabla)
+        otras = {c for t in tablas if t != tabla for c in self.columnas_de(t)}
+        usadas = set(re.findall(rf"\b{re.escape(nombre)}\.(\w+)", sql))
+        if len(tablas) == 1 or nombre == tabla:
+            usadas |= {c for c in re.findall(r"(?<![.\w])(\w+)", sql) if c in columnas and c not in otras}
+        return [c for c in columnas if c in usadas]
+
+    def _filtros(self, sql, nombre, referencias):
+        """(igualdad, rango) de columnas de la tabla comparadas contra constantes o parámetros"""
+        constante = r"(?:\?|:\w+|'[^']*'|-?\d+(?:\.\d+)?)"
+        igualdad, rango = [], []
+        for columna in referencias:
+            calificada = rf"(?:\b{re.escape(nombre)}\.|(?<![.\w])){re.escape(columna)}\b"
+            if re.search(rf"{calificada}\s*(?:=|\bIS\b|\bIN\s*\()\s*(?:{constante}|\()", sql, re.I):
+                igualdad.append(columna)
+            elif re.search(rf"{calificada}\s*(?:<=?|>=?|\bBETWEEN\b|\bLIKE\s+'[^%_])", sql, re.I):
+                rango.append(columna)
+        return igualdad, rango
+
+    def _orden(self, sql, nombre, referencias):
+        columnas = []
+        for _, lista in self._RE_ORDEN.findall(sql):
+            for termino in lista.split(","):
+                palabras = termino.strip().split()
+                if not palabras:
+                    continue
+                columna = palabras[0].split(".")[-1]
+                calificada = "." not in palabras[0] or palabras[0].split(".")[0] == nombre
+                if calificada and columna in referencias and columna not in columnas:
+                    columnas.append(columna + (" DESC" if palabras[-1].upper() == "DESC" else ""))
+        return columnas
+
+    # ------------------------------------------------------------------
+    # Propuestas
+    # ------------------------------------------------------------------
+    def analizar(self, consultas):
+        """
+        [{tabla, columnas, motivo, consultas, sql}] sin repetir; `consultas`
+        es la lista de `metricas().consultas()`.
+        """
+        propuestas = {}
+        for consulta in consultas:
+            sql = consulta['sql']
+            if not sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE")):
+                continue
+            plan = self.plan(sql, consulta.get('parametros'))
+            for tabla, columnas, motivo in self._candidatos(sql, plan):
+                if self._cubierto(tabla, columnas):
+                    continue
+                clave = (tabla, tuple(columnas))
+                propuesta = propuestas.setdefault(clave, {
+                    'tabla': tabla, 'columnas': columnas, 'motivo': motivo,
+                    'consultas': [], 'sql': self.sentencia(tabla, columnas),
+                })
+                propuesta['consultas'].append(consulta)
+        return sorted(propuestas.values(),
+                      key=lambda p: sum(c.get('total_ms', 0) for c in p['consultas']), reverse=True)
+
+    def _candidatos(self, sql, plan):
+        alias = self._alias(sql)
+        tablas = set(alias.values())
+        orden_pendiente = any("TEMP B-TREE" in linea for linea in plan or [])
+        for linea in plan or []:
+            automatico = self._RE_AUTOMATICO.match(linea)
+            escaneo = self._RE_SCAN.match(linea)
+            busqueda = self._RE_BUSQUEDA.match(linea) if orden_pendiente and len(tablas) == 1 else None
+            if automatico:
+                nombre = automatico.group(2) or automatico.group(1)
+                tabla = alias.get(nombre, automatico.group(1))
+                claves = re.findall(r"(\w+)[=<>]", automatico.group(3))
+                motivo = f"índice automático en {nombre} ({automatico.group(3)})"
+            elif escaneo:
+                nombre = escaneo.group(2) or escaneo.group(1)
+                tabla = alias.get(nombre, escaneo.group(1))
+                claves = None
+                motivo = f"SCAN completo de {nombre}"
+            elif busqueda:
+                nombre = busqueda.group(2) or busqueda.group(1)
+                tabla = alias.get(nombre, busqueda.group(1))
+                claves = None
+                motivo = f"TEMP B-TREE para ordenar o agrupar {nombre}"
+            else:
+                continue
+            if tabla in self.TABLAS_EXCLUIDAS or not self.columnas_de(tabla):
+                continue
+
+            referencias = self._referencias(sql, nombre, tabla, tablas)
+            if claves is None:
+                igualdad, rango = self._filtros(sql, nombre, referencias)
+                orden = self._orden(sql, nombre, referencias) if orden_pendiente and len(tablas) == 1 else []
+                if orden and not igualdad and not rango:
+                    motivo = f"TEMP B-TREE para ordenar o agrupar {nombre}"
+                claves = igualdad + rango[:1] + [c for c in orden if c.split()[0] not in igualdad + rango[:1]]
+                if busqueda and not orden:
+                    continue  # el SEARCH ya usa un índice y no hay orden que resolver
+            if not claves:
+                continue  # recorrido completo legítimo (sin filtros sobre la tabla)
+
+            columnas = list(claves)
+            resto = [c for c in referencias if c not in [k.split()[0] for k in columnas]]
+            if len(columnas) + len(resto) <= self.MAX_COLUMNAS:
+                columnas += resto  # de cobertura: no hace falta ir a la tabla
+            yield tabla, columnas, motivo
+
+    def _cubierto(self, tabla, columnas):
+        """True si un índice existente ya empieza con las columnas clave propuestas"""
+        for indice in self.conn.execute(f"PRAGMA index_list({tabla})").fetchall():
+            info = self.conn.execute(f"PRAGMA index_info({indice[1]})").fetchall()
+            existentes = [fila[2] for fila in sorted(info, key=lambda f: f[0])]
+            if [c.split()[0] for c in columnas] == existentes[:len(columnas)]:
+                return True
+        return False
+
+    def sentencia(self, tabla, columnas):
+        nombre = self.PREFIJO + tabla + "_" + "_".join(c.split()[0] for c in columnas)
+        return f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla}({', '.join(columnas)})"
+
+    # ------------------------------------------------------------------
+    # Validación y aplicación
+    # ------------------------------------------------------------------
+    def _medir(self, consulta):
+        if not consulta['sql'].lstrip().upper().startswith(("SELECT", "WITH")):
+            return None
+        tiempos = []
+        for _ in range(self.REPETICIONES):
+            inicio = time.perf_counter()
+            self.conn.execute(consulta['sql'], consulta.get('parametros') or ()).fetchall()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return round(min(tiempos), 2)
+
+    def validar(self, propuesta):
+        """
+        Crea el índice en un SAVEPOINT, compara y lo deshace. Agrega a la
+        propuesta 'antes_ms', 'despues_ms', 'plan_antes', 'plan_despues' y
+        'mejora': el plan tiene que cambiar y, si hay consultas medibles
+        (SELECT), el tiempo bajar al menos un 20%; si no, quedar menos
+        líneas problemáticas en el plan.
+        """
+        consultas = propuesta['consultas']
+        antes = [self._medir(c) for c in consultas]
+        planes_antes = [self.plan(c['sql'], c.get('parametros')) for c in consultas]
+        self.conn.execute("SAVEPOINT asesor_indices")
+        try:
+            self.conn.execute(propuesta['sql'])
+            self.conn.execute("ANALYZE")  # que el planificador conozca el índice nuevo
+            despues = [self._medir(c) for c in consultas]
+            planes_despues = [self.plan(c['sql'], c.get('parametros')) for c in consultas]
+        finally:
+            self.conn.execute("ROLLBACK TO asesor_indices")
+            self.conn.execute("RELEASE asesor_indices")
+
+        problemas_antes = sum(len(self.problemas(p)) for p in planes_antes)
+        problemas_despues = sum(len(self.problemas(p)) for p in planes_despues)
+        suma = lambda ts: round(sum(t for t in ts if t is not None), 2)
+        medibles = any(t is not None for t in antes)
+        propuesta.update({
+            'antes_ms': suma(antes), 'despues_ms': suma(despues),
+            'plan_antes': planes_antes, 'plan_despues': planes_despues,
+            'mejora': planes_despues != planes_antes and (
+                suma(despues) < suma(antes) * 0.8 if medibles else problemas_despues < problemas_antes),
+        })
+        return propuesta
+
+    @staticmethod
+    def seleccionar(propuestas):
+        """
+        Las validadas que mejoran, sin las que son prefijo de otra elegida en
+        la misma tabla (esa ya sirve a sus consultas): cada índice de más
+        encarece todas las escrituras de la tabla.
+        """
+        elegidas = [p for p in propuestas if p.get('mejora')]
+        claves = lambda p: [c.split()[0] for c in p['columnas']]
+        return [p for p in elegidas
+                if not any(o is not p and o['tabla'] == p['tabla'] and len(o['columnas']) > len(p['columnas'])
+                           and claves(o)[:len(p['columnas'])] == claves(p) for o in elegidas)]
+
+    def aplicar(self, propuestas):
+        """Crea los índices de las propuestas (y actualiza estadísticas); devuelve los creados"""
+        creados = []
+        for propuesta in propuestas:
+            try:
+                self.conn.execute(propuesta['sql'])
+                creados.append(propuesta['sql'])
+                logger.info("💡 Índice creado: %s (%s)", propuesta['sql'], propuesta['motivo'])
+            except sqlite3.Error as e:
+                logger.error("❌ No se pudo crear el índice %s: %s", propuesta['sql'], e)
+        if creados:
+            self.conn.execute("ANALYZE")
+            self.conn.commit()
+        return creados
+
+
+def informe(propuestas):
+    """Texto legible de las propuestas (para el panel y la consola)"""
+    if not propuestas:
+        return "✅ Ningún índice faltante en las consultas registradas"
+    lineas = []
+    for propuesta in propuestas:
+        lineas.append(f"💡 {propuesta['sql']}")
+        lineas.append(f"   Motivo: {propuesta['motivo']} · {len(propuesta['consultas'])} consulta(s)")
+        if 'antes_ms' in propuesta:
+            lineas.append(f"   Medido: {propuesta['antes_ms']:.2f} ms → {propuesta['despues_ms']:.2f} ms"
+                          f"{'' if propuesta['mejora'] else '  (sin mejora: no conviene)'}")
+        lineas.append(f"   Ej.: {propuesta['consultas'][0]['sql'][:160]}")
+        lineas.append("")
+    return "\n".join(lineas)
@@ -5,20 +5,67 @@ Clase principal para operaciones de base de datos SQLite
 
 import sqlite3
 import os
-import shutil
 import time
 from datetime import datetime
 from PyQt5.QtWidgets import QApplication, QMessageBox
 import sys
 
+from database.archivo import ArchivoMovimientos
+from database.db_remoto import METODOS_ESCRITURA, METODOS_LECTURA
+from database.diario_escrituras import DiarioEscrituras
+from database.metricas import ConexionMedida, medido
+from database.mantenimiento import MantenimientoProgramado
+from database.notificador_cambios import NotificadorCambios
+from database.registro_actividad import RegistroActividad
+from database.replica_lectura import ReplicaLectura
+from database import resumen_movimientos
+from database.respaldo import crear_respaldo, crear_respaldo_en_segundo_plano
+from utils.logger import obtener_logger
+from utils.perfil_arranque import etapa
+
+logger = obtener_logger(__name__)
+
 
 class DB:
     """Maneja todas las operaciones de base de datos - VERSIÓN COMPLETA MIGRADA"""
     
+    # Columnas que devuelven los listados de bienes (orden de la grilla)
+    COLUMNAS_LISTADO_BIENES = [
+        'id', 'ficha', 'tipo', 'marca', 'modelo', 'serie', 'estado', 'prd',
+        'nombre', 'apellido', 'dni_cuit', 'institucional',
+        'linea', 'sim', 'empresa', 'imei', 'descripcion', 'fecha_registro',
+        'monto_original', 'anio_prd'
+    ]
+    
+    # Columnas de la tabla movimientos (las últimas son resúmenes de sus bienes,
+    # mantenidos por triggers: ver database/resumen_movimientos.py)
+    COLUMNAS_MOVIMIENTOS = [
+        'id', 'tipo', 'fecha', 'responsable', 'responsable_nombre',
+        'responsable_apellido', 'responsable_dni_cuit', 'responsable_institucional',
+        'observaciones', 'archivo_path_docx', 'archivo_path_pdf',
+        'numero_transferencia', 'eliminado', 'fecha_eliminacion', 'motivo_eliminacion',
+    ] + list(resumen_movimientos.COLUMNAS)
+    
+    # Actualización de bienes según el tipo de movimiento: (SET, usa datos del responsable)
+    ACTUALIZACIONES_POR_MOVIMIENTO = {
+        "Entrega": ("estado='Asignado', nombre=?, apellido=?, dni_cuit=?, institucional=?", True),
+        "Devolución": ("estado='En depósito', nombre='', apellido='', dni_cuit='', institucional=''", False),
+        "Baja": ("estado='Baja definitiva'", False),
+    }
+
+    # Columnas de usuarios que devuelven las consultas (nunca la contraseña)
+    COLUMNAS_USUARIO = ['id', 'nombre', 'apellido', 'cargo', 'dni_cuit', 'email', 'rol', 'activo']
+
     def __init__(self, path, actas_folder):
         self.path = path
         self.actas_folder = actas_folder
         self.conn = None
+        self.registro_actividad = None
+        self.replica_lectura = None
+        self.diario_escrituras = None
+        self.notificador_cambios = None
+        self.mantenimiento = None
+        self.archivo = None
         self._conectar_db()
 
     def _conectar_db(self):
@@ -26,74 +73,76 @@ class DB:
         max_intentos = 3
         for intento in range(max_intentos):
             try:
-                print(f"🔗 Intentando conectar a la base de datos... (Intento {intento + 1}/{max_intentos})")
-                print(f"📍 Ruta: {self.path}")
+                logger.debug("🔗 Intentando conectar a la base de datos... (Intento %s/%s)", intento + 1, max_intentos)
+                logger.debug("📍 Ruta: %s", self.path)
                 
                 # ✅ MEJORADO: Crear directorio automáticamente
                 directorio = os.path.dirname(self.path)
                 if not os.path.exists(directorio):
-                    print(f"⚠️  El directorio no existe: {directorio}")
-                    print("💡 Creando directorio automáticamente...")
+                    logger.warning("⚠️  El directorio no existe: %s", directorio)
+                    logger.debug("💡 Creando directorio automáticamente...")
                     try:
                         os.makedirs(directorio, exist_ok=True)
-                        print(f"✅ Directorio creado: {directorio}")
+                        logger.debug("✅ Directorio creado: %s", directorio)
                     except Exception as e:
-                        print(f"❌ No se pudo crear el directorio: {e}")
+                        logger.error("❌ No se pudo crear el directorio: %s", e)
                         # Cambiar automáticamente a modo local
                         self._cambiar_a_modo_local_emergencia()
                         return
                 
-                self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
-                self.conn.row_factory = sqlite3.Row
-                print(f"✅ Conectado exitosamente a: {os.path.basename(self.path)}")
-                self._init_db()
+                with etapa("db.conectar"):
+                    self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, factory=ConexionMedida)
+                    self.conn.row_factory = sqlite3.Row
+                logger.info("✅ Conectado exitosamente a: %s", os.path.basename(self.path))
+                with etapa("db.init_db"):
+                    self._init_db()
                 return
                 
             except sqlite3.OperationalError as e:
-                print(f"❌ Error en intento {intento + 1}: {e}")
+                logger.error("❌ Error en intento %s: %s", intento + 1, e)
                 
                 if intento < max_intentos - 1:
-                    print("🔄 Reintentando en 3 segundos...")
+                    logger.debug("🔄 Reintentando en 3 segundos...")
                     time.sleep(3)
                 else:
-                    print(f"💡 No se pudo conectar después de {max_intentos} intentos")
+                    logger.error("💡 No se pudo conectar después de %s intentos", max_intentos)
                     # Cambiar automáticamente a modo local
                     self._cambiar_a_modo_local_emergencia()
                     return
 
     def _cambiar_a_modo_local_emergencia(self):
         """Cambia automáticamente a modo local en caso de error"""
-        print("🔄 Cambiando automáticamente a MODO LOCAL...")
+        logger.info("🔄 Cambiando automáticamente a MODO LOCAL...")
         
         # Usar ruta local por defecto
         local_db = "inventario_local.db"
         local_actas = "actas_local"
         
-        print(f"📍 Nueva ruta local: {local_db}")
+        logger.debug("📍 Nueva ruta local: %s", local_db)
         
         try:
-            self.conn = sqlite3.connect(local_db, check_same_thread=False, timeout=30)
+            self.conn = sqlite3.connect(local_db, check_same_thread=False, timeout=30, factory=ConexionMedida)
             self.conn.row_factory = sqlite3.Row
-            print(f"✅ Conectado exitosamente a base de datos local")
+            logger.info("✅ Conectado exitosamente a base de datos local")
             self._init_db()
         except Exception as e:
-            print(f"❌ Error crítico: No se pudo conectar ni siquiera en modo local: {e}")
+            logger.error("❌ Error crítico: No se pudo conectar ni siquiera en modo local: %s", e)
             raise e
 
     def _cambiar_a_modo_local(self):
         """Cambia automáticamente a modo local - VERSIÓN SIN IMPORTS CIRCULARES"""
-        print("🔄 Cambiando a MODO LOCAL...")
+        logger.info("🔄 Cambiando a MODO LOCAL...")
         
         # Usar ruta local por defecto directamente
         local_db = "inventario_local.db"
         local_actas = "actas_local"
         
-        print(f"📍 Nueva ruta local: {local_db}")
+        logger.debug("📍 Nueva ruta local: %s", local_db)
         
         try:
-            self.conn = sqlite3.connect(local_db, check_same_thread=False, timeout=30)
+            self.conn = sqlite3.connect(local_db, check_same_thread=False, timeout=30, factory=ConexionMedida)
             self.conn.row_factory = sqlite3.Row
-            print(f"✅ Conectado exitosamente a base de datos local")
+            logger.info("✅ Conectado exitosamente a base de datos local")
             self._init_db()
             
             # Mostrar mensaje al usuario
@@ -103,14 +152,14 @@ class DB:
                                 "Los datos se guardarán localmente hasta que se restablezca la conexión de red.")
                                 
         except Exception as e:
-            print(f"❌ Error crítico: No se pudo conectar ni siquiera en modo local: {e}")
+            logger.error("❌ Error crítico: No se pudo conectar ni siquiera en modo local: %s", e)
             raise e
 
     def _init_db(self):
         """Inicializa las tablas de la base de datos - VERSIÓN MEJORADA"""
         cur = self.conn.cursor()
         
-        print("🔧 Inicializando base de datos...")
+        logger.debug("🔧 Inicializando base de datos...")
         
         # PRIMERO: Crear tabla bienes si no existe
         cur.execute("""
@@ -138,7 +187,7 @@ class DB:
                 anio_prd TEXT
             )
         """)
-        print("✅ Tabla 'bienes' verificada")
+        logger.debug("✅ Tabla 'bienes' verificada")
 
         # ✅ ESTRUCTURA MEJORADA (COMPLETA)
         cur.execute("""
@@ -158,7 +207,7 @@ class DB:
             )
         """)
         self._actualizar_estructura_usuarios()
-        print("✅ Tabla 'usuarios' verificada")
+        logger.debug("✅ Tabla 'usuarios' verificada")
         
         # ✅ USUARIO DE PRUEBA MEJORADO
         cur.execute("SELECT COUNT(*) FROM usuarios WHERE id = 'mario'")
@@ -170,7 +219,7 @@ class DB:
                 ("mario", "Mario", "Admin", "Administrador del Sistema", 
                 "20123456789", "mario@agc.gob.ar", "1234", "admin", "sistema")
             )
-            print("✅ Usuario de prueba 'mario' creado con datos completos")
+            logger.info("✅ Usuario de prueba 'mario' creado con datos completos")
         
         # ✅ NUEVA LÍNEA: Verificar y agregar columnas de asignación
         self.verificar_y_agregar_columnas_asignacion()
@@ -198,10 +247,10 @@ class DB:
                 motivo_eliminacion TEXT
             )
         """)
-        print("✅ Tabla 'movimientos' actualizada con campos de eliminación")
+        logger.debug("✅ Tabla 'movimientos' actualizada con campos de eliminación")
         
         # CUARTO: Verificar y agregar columnas nuevas a movimientos si es necesario
-        self._agregar_columnas_movimientos()
+        columnas_agregadas = self._agregar_columnas_movimientos()
         
         cur.execute("""
             CREATE TABLE IF NOT EXISTS bienes_movimientos (
@@ -228,7 +277,21 @@ class DB:
         self._crear_indices_seguros()
         
         self.conn.commit()
-        print("✅ Base de datos inicializada correctamente")
+        
+        # Resúmenes por movimiento (cantidad_bienes, fichas, prds): triggers y, si
+        # las columnas son nuevas, el cálculo inicial
+        resumen_movimientos.instalar(self.conn)
+        if set(columnas_agregadas) & set(resumen_movimientos.COLUMNAS):
+            with etapa("db.resumenes_movimientos"):
+                resumen_movimientos.recalcular(self.conn)
+        
+        # SÉPTIMO: Auditoría con buffer + retención
+        if self.registro_actividad is not None:
+            self.registro_actividad.cerrar()
+        self.registro_actividad = RegistroActividad(self.conn)
+        self.registro_actividad.depurar()
+        
+        logger.info("✅ Base de datos inicializada correctamente")
 
     # ... (aquí van todos los demás métodos de la clase DB)
     # Los pongo en el siguiente mensaje para no hacerlo muy largo
@@ -242,7 +305,7 @@ class DB:
             # Verificar qué columnas existen
             cur.execute("PRAGMA table_info(movimientos)")
             columnas_existentes = [col[1] for col in cur.fetchall()]
-            print(f"🔍 Columnas existentes en movimientos: {columnas_existentes}")
+            logger.debug("🔍 Columnas existentes en movimientos: %s", columnas_existentes)
             
             # Lista de TODAS las columnas que deberían existir
             columnas_necesarias = [
@@ -252,8 +315,8 @@ class DB:
                 'responsable_institucional',
                 'eliminado',           # ← NUEVA
                 'fecha_eliminacion',   # ← NUEVA  
-                'motivo_eliminacion'   # ← NUEVA
-            ]
+                'motivo_eliminacion',  # ← NUEVA
+            ] + list(resumen_movimientos.COLUMNAS)
             
             # Agregar columnas faltantes
             columnas_agregadas = []
@@ -262,25 +325,30 @@ class DB:
                     try:
                         if columna == 'eliminado':
                             cur.execute(f"ALTER TABLE movimientos ADD COLUMN {columna} INTEGER DEFAULT 0")
+                        elif columna in resumen_movimientos.COLUMNAS:
+                            cur.execute(f"ALTER TABLE movimientos ADD COLUMN {columna} "
+                                        f"{resumen_movimientos.COLUMNAS[columna]}")
                         else:
                             cur.execute(f"ALTER TABLE movimientos ADD COLUMN {columna} TEXT")
                         
                         columnas_agregadas.append(columna)
-                        print(f"✅ Columna '{columna}' agregada a movimientos")
+                        logger.info("✅ Columna '%s' agregada a movimientos", columna)
                         
                     except sqlite3.OperationalError as e:
-                        print(f"⚠️ No se pudo agregar columna '{columna}': {e}")
+                        logger.warning("⚠️ No se pudo agregar columna '%s': %s", columna, e)
                 else:
-                    print(f"✓ Columna '{columna}' ya existe")
+                    logger.debug("✓ Columna '%s' ya existe", columna)
             
             if columnas_agregadas:
                 self.conn.commit()
-                print(f"✅ Columnas agregadas exitosamente: {columnas_agregadas}")
+                logger.debug("✅ Columnas agregadas exitosamente: %s", columnas_agregadas)
             
             cur.close()
+            return columnas_agregadas
             
         except Exception as e:
-            print(f"❌ Error en _agregar_columnas_movimientos: {e}")
+            logger.error("❌ Error en _agregar_columnas_movimientos: %s", e)
+            return []
 
     def _actualizar_estructura_usuarios(self):
         """Actualiza la estructura de la tabla usuarios si es necesario"""
@@ -305,14 +373,14 @@ class DB:
                             cur.execute(f"ALTER TABLE usuarios ADD COLUMN {columna} TEXT")
                         else:
                             cur.execute(f"ALTER TABLE usuarios ADD COLUMN {columna} TEXT")
-                        print(f"✅ Columna '{columna}' agregada a usuarios")
+                        logger.info("✅ Columna '%s' agregada a usuarios", columna)
                     except sqlite3.OperationalError as e:
-                        print(f"⚠️ No se pudo agregar columna '{columna}': {e}")
+                        logger.warning("⚠️ No se pudo agregar columna '%s': %s", columna, e)
             
             self.conn.commit()
             
         except Exception as e:
-            print(f"❌ Error actualizando estructura de usuarios: {e}")
+            logger.error("❌ Error actualizando estructura de usuarios: %s", e)
 
     def _agregar_columnas_faltantes(self):
         """Agrega columnas faltantes a la tabla bienes de forma segura"""
@@ -333,9 +401,9 @@ class DB:
             if columna not in columnas_existentes:
                 try:
                     cur.execute(f"ALTER TABLE bienes ADD COLUMN {columna} TEXT")
-                    print(f"✅ Columna '{columna}' agregada")
+                    logger.info("✅ Columna '%s' agregada", columna)
                 except sqlite3.OperationalError as e:
-                    print(f"⚠️  No se pudo agregar columna '{columna}': {e}")
+                    logger.warning("⚠️  No se pudo agregar columna '%s': %s", columna, e)
         
         cur.close()
 
@@ -360,14 +428,21 @@ class DB:
             ('idx_bienes_busqueda', 'bienes', 'ficha, tipo, estado'),
             ('idx_bienes_responsable', 'bienes', 'nombre, apellido'),
             ('idx_movimientos_fecha', 'movimientos', 'fecha DESC'),
-            ('idx_bienes_movimientos_bien', 'bienes_movimientos', 'id_bien'),
+            # De cobertura para los dos sentidos del join (historial de un bien / bienes de un movimiento)
+            ('idx_bienes_movimientos_bien_mov', 'bienes_movimientos', 'id_bien, id_movimiento'),
+            ('idx_bienes_movimientos_mov_bien', 'bienes_movimientos', 'id_movimiento, id_bien'),
+            ('idx_logs_actividad_usuario', 'logs_actividad', 'usuario'),
+            ('idx_logs_actividad_fecha', 'logs_actividad', 'fecha'),
         ]
         
+        # Reemplazado por idx_bienes_movimientos_bien_mov (era su prefijo)
+        cur.execute("DROP INDEX IF EXISTS idx_bienes_movimientos_bien")
+
         for nombre_idx, tabla, columnas in indices:
             # Verificar que la tabla existe
             cur.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name=?", (tabla,))
             if not cur.fetchone():
-                print(f"⏭️  Saltando índice '{nombre_idx}' - tabla '{tabla}' no existe")
+                logger.debug("⏭️  Saltando índice '%s' - tabla '%s' no existe", nombre_idx, tabla)
                 continue
                 
             # Verificar que todas las columnas del índice existen
@@ -383,11 +458,11 @@ class DB:
             if not columnas_target or all(columna in columnas_target for columna in columnas_lista):
                 try:
                     cur.execute(f"CREATE INDEX IF NOT EXISTS {nombre_idx} ON {tabla}({columnas})")
-                    print(f"✅ Índice '{nombre_idx}' creado en {tabla}")
+                    logger.debug("✅ Índice '%s' creado en %s", nombre_idx, tabla)
                 except sqlite3.OperationalError as e:
-                    print(f"⚠️  No se pudo crear índice '{nombre_idx}': {e}")
+                    logger.warning("⚠️  No se pudo crear índice '%s': %s", nombre_idx, e)
             else:
-                print(f"⏭️  Saltando índice '{nombre_idx}' - columnas no existen: {columnas_lista}")
+                logger.debug("⏭️  Saltando índice '%s' - columnas no existen: %s", nombre_idx, columnas_lista)
         
         cur.close()
 
@@ -406,9 +481,9 @@ class DB:
             if columna not in columnas_existentes:
                 try:
                     cur.execute(f"ALTER TABLE bienes ADD COLUMN {columna} TEXT")
-                    print(f"✅ Columna '{columna}' agregada a la tabla bienes")
+                    logger.info("✅ Columna '%s' agregada a la tabla bienes", columna)
                 except sqlite3.OperationalError as e:
-                    print(f"⚠️ No se pudo agregar columna '{columna}': {e}")
+                    logger.warning("⚠️ No se pudo agregar columna '%s': %s", columna, e)
         
         self.conn.commit()
         cur.close()
@@ -453,7 +528,7 @@ class DB:
             columnas_faltantes = [col for col in columnas_basicas if col not in columnas_a_usar]
             
             if columnas_faltantes:
-                print(f"⚠️ Columnas básicas faltantes: {columnas_faltantes}")
+                logger.warning("⚠️ Columnas básicas faltantes: %s", columnas_faltantes)
                 # Agregar las columnas básicas faltantes con valores por defecto
                 for columna in columnas_faltantes:
                     if columna == "fecha_registro":
@@ -470,30 +545,52 @@ class DB:
             keys = ",".join(columnas_a_usar)
             placeholders = ",".join("?" for _ in columnas_a_usar)
             
+            if self.diario_escrituras is not None:
+                bien_id = self.diario_escrituras.reservar_id('bienes')
+                self._escribir([{
+                    "sql": f"INSERT INTO bienes (id,{keys}) VALUES (?,{placeholders})",
+                    "params": [bien_id] + valores_a_usar,
+                }], f"Alta de bien {data.get('ficha', '')}")
+                logger.debug("✅ Bien encolado - ID: %s", bien_id)
+                return True
+            
             cur.execute(f"INSERT INTO bienes ({keys}) VALUES ({placeholders})", tuple(valores_a_usar))
             self.conn.commit()
             
-            print(f"✅ Bien guardado exitosamente - ID: {cur.lastrowid}")
+            logger.debug("✅ Bien guardado exitosamente - ID: %s", cur.lastrowid)
             return True
             
         except sqlite3.IntegrityError as e:
-            print(f"❌ Error de integridad (posible duplicado): {e}")
+            logger.error("❌ Error de integridad (posible duplicado): %s", e)
             return False
         except Exception as e:
-            print(f"❌ Error al agregar bien: {e}")
+            logger.error("❌ Error al agregar bien: %s", e)
             return False
         finally:
             cur.close()
 
-    def list_bienes(self, limite=1000):
+    def _proyeccion_bienes(self, columnas=None):
+        """
+        Arma la lista de columnas del SELECT de bienes.
+        
+        Args:
+            columnas: Campos pedidos (ej: los visibles en la grilla). None = todos.
+                      Solo se aceptan campos de COLUMNAS_LISTADO_BIENES y
+                      el 'id' se incluye siempre.
+        """
+        if not columnas:
+            return ", ".join(self.COLUMNAS_LISTADO_BIENES)
+        
+        seleccion = [col for col in self.COLUMNAS_LISTADO_BIENES
+                     if col == 'id' or col in columnas]
+        return ", ".join(seleccion)
+
+    def list_bienes(self, limite=1000, columnas=None):
         """Obtiene bienes ordenados por fecha con límite para rendimiento"""
         try:
-            cur = self.conn.cursor()
-            query = """
-                SELECT id, ficha, tipo, marca, modelo, serie, estado, prd, 
-                    nombre, apellido, dni_cuit, institucional,
-                    linea, sim, empresa, imei, descripcion, fecha_registro, 
-                    monto_original, anio_prd
+            cur = self._conexion_lectura().cursor()
+            query = f"""
+                SELECT {self._proyeccion_bienes(columnas)}
                 FROM bienes 
                 ORDER BY fecha_registro DESC 
                 LIMIT ?
@@ -503,33 +600,30 @@ class DB:
             cur.close()
             return resultado
         except Exception as e:
-            print(f"Error al listar bienes: {e}")
+            logger.error("Error al listar bienes: %s", e)
             return []
 
-    def list_bienes_completos(self):
+    def list_bienes_completos(self, columnas=None):
         """Obtiene TODOS los bienes sin límite - PARA FILTROS"""
         try:
-            cur = self.conn.cursor()
-            query = """
-                SELECT id, ficha, tipo, marca, modelo, serie, estado, prd, 
-                    nombre, apellido, dni_cuit, institucional,
-                    linea, sim, empresa, imei, descripcion, fecha_registro, 
-                    monto_original, anio_prd
+            cur = self._conexion_lectura().cursor()
+            query = f"""
+                SELECT {self._proyeccion_bienes(columnas)}
                 FROM bienes 
                 ORDER BY fecha_registro DESC
             """
             cur.execute(query)
             resultado = cur.fetchall()
             cur.close()
-            print(f"✅ Obtenidos {len(resultado)} registros completos para filtros")
+            logger.debug("✅ Obtenidos %s registros completos para filtros", len(resultado))
             return resultado
         except Exception as e:
-            print(f"❌ Error al listar bienes completos: {e}")
+            logger.error("❌ Error al listar bienes completos: %s", e)
             return []
 
     def buscar_bienes(self, texto, limite=1000):
         """Busca bienes por cualquier campo con límite para rendimiento"""
-        cur = self.conn.cursor()
+        cur = self._conexion_lectura().cursor()
         try:
             query = """
                 SELECT id, ficha, tipo, marca, modelo, serie, estado, prd, 
@@ -546,7 +640,7 @@ class DB:
             cur.execute(query, [parametro] * 13 + [limite])
             return cur.fetchall()
         except sqlite3.OperationalError as e:
-            print(f"Error en búsqueda: {e}")
+            logger.error("Error en búsqueda: %s", e)
             # Búsqueda básica como fallback
             try:
                 query_basica = """
@@ -565,33 +659,271 @@ class DB:
             cur.close()
 
     def log_actividad(self, usuario, accion, detalles=""):
-        """Registra actividad de usuarios en la BD"""
+        """Registra actividad de usuarios (se escribe por lotes, ver RegistroActividad)"""
         try:
-            cur = self.conn.cursor()
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS logs_actividad (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    usuario TEXT NOT NULL,
-                    accion TEXT NOT NULL,
-                    detalles TEXT,
-                    fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            cur.execute(
-                "INSERT INTO logs_actividad (usuario, accion, detalles) VALUES (?, ?, ?)",
-                (usuario, accion, detalles)
+            return self.registro_actividad.registrar(usuario, accion, detalles)
+        except Exception as e:
+            logger.error("Error en log: %s", e)
+            return False
+
+    def vaciar_logs_actividad(self):
+        """Escribe en la BD la actividad pendiente del buffer"""
+        if self.registro_actividad is None:
+            return 0
+        return self.registro_actividad.vaciar()
+
+    def activar_replica_lectura(self, ruta_replica):
+        """
+        Modo red_directo: las lecturas se sirven desde una réplica local que
+        solo trae de la red lo que cambió (ver ReplicaLectura).
+        """
+        try:
+            self.replica_lectura = ReplicaLectura(self.conn, self.path, ruta_replica)
+            logger.info("📖 Lecturas servidas desde réplica local: %s", ruta_replica)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ No se pudo activar la réplica de lectura, se lee de la red: %s", e)
+            self.replica_lectura = None
+            return False
+
+    def activar_diario_escrituras(self, ruta_diario):
+        """
+        Modo red_directo: las escrituras se confirman en un diario local y un
+        hilo las aplica en la red por lotes (ver DiarioEscrituras).
+        """
+        try:
+            self.diario_escrituras = DiarioEscrituras(self.path, ruta_diario, self.conn)
+            logger.info("📝 Escrituras diferidas activas: %s", ruta_diario)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ No se pudo activar el diario de escrituras, se escribe directo: %s", e)
+            self.diario_escrituras = None
+            return False
+
+    def activar_mantenimiento(self, puede_ejecutar=None, horizonte_archivo=None):
+        """
+        PRAGMA optimize, ANALYZE, vacuum incremental, integrity_check y
+        archivo de movimientos viejos (si `horizonte_archivo` días) en segundo
+        plano cuando la base está inactiva (ver MantenimientoProgramado).
+        """
+        try:
+            if self.mantenimiento is None:
+                ruta = self.conn.execute("PRAGMA database_list").fetchone()[2] or self.path
+                self.mantenimiento = MantenimientoProgramado(ruta, puede_ejecutar,
+                                                             horizonte_archivo=horizonte_archivo)
+                logger.info("🧰 Mantenimiento automático activo: %s", ruta)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ No se pudo activar el mantenimiento automático: %s", e)
+            self.mantenimiento = None
+            return False
+
+    def al_cambiar(self, callback, intervalo=None):
+        """
+        Registra `callback(cambios)` para los cambios que hagan otros puestos
+        (o este) en la base en uso. Ver NotificadorCambios.
+        """
+        try:
+            if self.notificador_cambios is None:
+                # La ruta real del archivo abierto (puede ser la local de emergencia)
+                ruta = self.conn.execute("PRAGMA database_list").fetchone()[2] or self.path
+                self.notificador_cambios = NotificadorCambios(ruta, intervalo)
+            self.notificador_cambios.al_cambiar(callback)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ No se pudo activar el aviso de cambios: %s", e)
+            return False
+
+    def escrituras_pendientes(self):
+        """Operaciones confirmadas localmente que todavía no llegaron a la red"""
+        if self.diario_escrituras is None:
+            return 0
+        return self.diario_escrituras.pendientes()
+
+    def _escribir(self, sentencias, descripcion=""):
+        """
+        Ejecuta una operación de escritura (lista de sentencias) como unidad:
+        al diario si está activo, si no en una transacción directa.
+        """
+        if self.diario_escrituras is not None:
+            return self.diario_escrituras.encolar(sentencias, descripcion)
+        with self.conn:
+            for sentencia in sentencias:
+                if "lote" in sentencia:
+                    self.conn.executemany(sentencia["sql"], sentencia["lote"])
+                else:
+                    self.conn.execute(sentencia["sql"], sentencia.get("params", []))
+        return True
+
+    def registrar_acceso(self, usuario_id):
+        """Actualiza el último acceso del usuario"""
+        try:
+            return self._escribir([{
+                "sql": "UPDATE usuarios SET ultimo_acceso = datetime('now') WHERE id = ?",
+                "params": [usuario_id],
+            }], f"Acceso de {usuario_id}")
+        except Exception as e:
+            logger.warning("⚠️ No se pudo registrar el acceso: %s", e)
+            return False
+
+    def listar_usuarios(self, solo_activos=False):
+        """Usuarios ordenados por apellido y nombre - PARA LOGIN Y GESTIÓN"""
+        try:
+            filtro = "WHERE activo = 1" if solo_activos else ""
+            cur = self._conexion_lectura().execute(
+                f"SELECT {', '.join(self.COLUMNAS_USUARIO)} FROM usuarios {filtro} ORDER BY apellido, nombre"
             )
-            self.conn.commit()
+            return [dict(zip(self.COLUMNAS_USUARIO, fila)) for fila in cur.fetchall()]
+        except Exception as e:
+            logger.error("❌ Error listando usuarios: %s", e)
+            return []
+
+    def obtener_usuario(self, usuario_id):
+        """Un usuario por su ID (None si no existe)"""
+        try:
+            fila = self._conexion_lectura().execute(
+                f"SELECT {', '.join(self.COLUMNAS_USUARIO)} FROM usuarios WHERE id = ?", (usuario_id,)
+            ).fetchone()
+            return dict(zip(self.COLUMNAS_USUARIO, fila)) if fila else None
+        except Exception as e:
+            logger.error("❌ Error obteniendo usuario: %s", e)
+            return None
+
+    def verificar_credenciales(self, usuario_id, password):
+        """El usuario activo si la contraseña coincide; si no, None"""
+        try:
+            # De la base principal: la réplica puede no tener aún un cambio de contraseña
+            fila = self.conn.execute(
+                f"SELECT {', '.join(self.COLUMNAS_USUARIO)} FROM usuarios "
+                "WHERE id = ? AND password = ? AND activo = 1", (usuario_id, password)
+            ).fetchone()
+            return dict(zip(self.COLUMNAS_USUARIO, fila)) if fila else None
+        except Exception as e:
+            logger.error("❌ Error verificando credenciales: %s", e)
+            return None
+
+    def crear_usuario(self, datos, usuario_creacion):
+        """Alta de usuario; `datos` con las COLUMNAS_USUARIO y 'password'"""
+        columnas = [c for c in self.COLUMNAS_USUARIO + ['password'] if c in datos] + ['usuario_creacion']
+        try:
+            return self._escribir([{
+                "sql": f"INSERT INTO usuarios ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})",
+                "params": [datos[c] for c in columnas[:-1]] + [usuario_creacion],
+            }], f"Alta de usuario {datos.get('id')}")
+        except Exception as e:
+            logger.error("❌ Error creando usuario: %s", e)
+            return False
+
+    def actualizar_usuario(self, usuario_id, datos):
+        """Modifica los campos de `datos` (COLUMNAS_USUARIO y 'password'; el id no)"""
+        columnas = [c for c in self.COLUMNAS_USUARIO[1:] + ['password'] if c in datos]
+        if not columnas:
             return True
+        try:
+            return self._escribir([{
+                "sql": f"UPDATE usuarios SET {', '.join(f'{c} = ?' for c in columnas)} WHERE id = ?",
+                "params": [datos[c] for c in columnas] + [usuario_id],
+            }], f"Edición de usuario {usuario_id}")
         except Exception as e:
-            print(f"Error en log: {e}")
+            logger.error("❌ Error actualizando usuario: %s", e)
             return False
-        finally:
-            cur.close()
 
-    def crear_backup(self):
-        """Crea un backup automático de la base de datos"""
+    def cambiar_estado_usuario(self, usuario_id, activo):
+        """Activa o desactiva un usuario"""
+        return self.actualizar_usuario(usuario_id, {'activo': 1 if activo else 0})
+
+    def _conexion_lectura(self):
+        """Conexión para consultas: la réplica local si está activa, si no la principal"""
+        if self.replica_lectura is not None:
+            try:
+                return self.replica_lectura.conexion()
+            except Exception as e:
+                logger.warning("⚠️ Réplica de lectura no disponible: %s", e)
+        return self.conn
+
+    def _archivo(self):
+        """ArchivoMovimientos de la conexión actual (puede ser la local de emergencia)"""
+        if self.conn is None:
+            return None
+        if self.archivo is None or self.archivo.conn is not self.conn:
+            try:
+                self.archivo = ArchivoMovimientos(self.conn)
+            except sqlite3.Error as e:
+                logger.warning("⚠️ Archivo de movimientos no disponible: %s", e)
+                return None
+        return self.archivo
+
+    def _conexion_historial(self):
+        """
+        (conexión, tabla de movimientos, tabla de vínculos) para consultas de
+        historial: las vistas que suman el archivo si existe. La réplica local
+        no lo tiene adjunto, así que en ese caso se lee de la principal.
+        """
+        archivo = self._archivo()
+        if archivo is not None and archivo.adjuntar():
+            return self.conn, ArchivoMovimientos.VISTAS['movimientos'], ArchivoMovimientos.VISTAS['bienes_movimientos']
+        return self._conexion_lectura(), 'movimientos', 'bienes_movimientos'
+
+    def reparar_resumenes_movimientos(self):
+        """
+        Recalcula cantidad_bienes, fichas y prds de todos los movimientos (y
+        del archivo) y corrige los que no coinciden. Devuelve cuántos corrigió.
+        """
+        try:
+            corregidas = resumen_movimientos.recalcular(self.conn)
+            archivo = self._archivo()
+            if archivo is not None and archivo.adjuntar():
+                corregidas += resumen_movimientos.recalcular(self.conn, esquema=ArchivoMovimientos.ESQUEMA)
+            return corregidas
+        except sqlite3.Error as e:
+            logger.error("❌ Error reparando resúmenes de movimientos: %s", e)
+            return 0
+
+    def archivar_movimientos(self, horizonte_dias):
+        """
+        Mueve al archivo los movimientos de más de `horizonte_dias` días y los
+        eliminados (ver ArchivoMovimientos). Devuelve cuántos movió.
+        """
+        if self.diario_escrituras is not None:
+            logger.warning("⚠️ Con escrituras diferidas el archivo lo hace el puesto que abre la base local")
+            return 0
+        try:
+            archivo = self._archivo()
+            return archivo.archivar(horizonte_dias) if archivo is not None else 0
+        except sqlite3.Error as e:
+            logger.error("❌ Error archivando movimientos: %s", e)
+            return 0
+
+    def cerrar(self):
+        """Vacía la actividad pendiente y cierra la conexión"""
+        try:
+            if self.registro_actividad is not None:
+                self.registro_actividad.cerrar()
+            if self.diario_escrituras is not None:
+                self.diario_escrituras.detener()
+                self.diario_escrituras = None
+            if self.notificador_cambios is not None:
+                self.notificador_cambios.detener()
+                self.notificador_cambios = None
+            if self.mantenimiento is not None:
+                self.mantenimiento.detener()
+                self.mantenimiento = None
+            if self.replica_lectura is not None:
+                self.replica_lectura.cerrar()
+                self.replica_lectura = None
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+        except Exception as e:
+            logger.error("❌ Error cerrando la base de datos: %s", e)
+
+    def crear_backup(self, comprimir=False, en_segundo_plano=False, al_terminar=None):
+        """
+        Crea un backup consistente de la base de datos (API de backup de SQLite).
+
+        Con en_segundo_plano=True devuelve el hilo y avisa a `al_terminar(ruta)`
+        desde ese hilo; si no, devuelve la ruta del backup o None.
+        """
         try:
             # Crear carpeta de backups si no existe
             backup_dir = os.path.join(os.path.dirname(self.path), "backups")
@@ -602,16 +934,28 @@ class DB:
             backup_name = f"inventario_backup_{timestamp}.db"
             backup_path = os.path.join(backup_dir, backup_name)
             
-            # Crear backup
-            shutil.copy2(self.path, backup_path)
+            # La actividad en buffer también va al backup
+            self.vaciar_logs_actividad()
+            
+            if en_segundo_plano:
+                def _terminado(ruta):
+                    if ruta:
+                        self._limpiar_backups_antiguos(backup_dir)
+                    if al_terminar:
+                        al_terminar(ruta)
+                return crear_respaldo_en_segundo_plano(
+                    self.path, backup_path, comprimir=comprimir, al_terminar=_terminado
+                )
+            
+            backup_path = crear_respaldo(self.path, backup_path, comprimir=comprimir)
             
-            # Limitar a 10 backups máximo (eliminar los más viejos)
+            # Limitar la cantidad de backups (eliminar los más viejos)
             self._limpiar_backups_antiguos(backup_dir)
             
-            print(f"✅ Backup creado: {backup_name}")
+            logger.info("✅ Backup creado: %s", os.path.basename(backup_path))
             return backup_path
         except Exception as e:
-            print(f"❌ Error en backup: {e}")
+            logger.error("❌ Error en backup: %s", e)
             return None
 
     def _limpiar_backups_antiguos(self, backup_dir, max_backups=15):
@@ -619,7 +963,7 @@ class DB:
         try:
             backups = []
             for file in os.listdir(backup_dir):
-                if file.startswith("inventario_backup_") and file.endswith(".db"):
+                if file.startswith("inventario_backup_") and file.endswith((".db", ".db.gz")):
                     file_path = os.path.join(backup_dir, file)
                     creation_time = os.path.getctime(file_path)
                     backups.append((file_path, creation_time))
@@ -631,104 +975,105 @@ class DB:
             for backup_path, _ in backups[max_backups:]:
                 try:
                     os.remove(backup_path)
-                    print(f"🗑️ Backup antiguo eliminado: {os.path.basename(backup_path)}")
+                    logger.info("🗑️ Backup antiguo eliminado: %s", os.path.basename(backup_path))
                 except Exception as e:
-                    print(f"⚠️ No se pudo eliminar backup: {e}")
+                    logger.warning("⚠️ No se pudo eliminar backup: %s", e)
                     
         except Exception as e:
-            print(f"⚠️ Error limpiando backups antiguos: {e}")
+            logger.warning("⚠️ Error limpiando backups antiguos: %s", e)
 
-    def add_movimiento(self, mov_data, bienes_ids):
-        """Registra un movimiento y actualiza estados Y DATOS DEL RESPONSABLE - VERSIÓN CON TRANSACCIÓN"""
+    def add_movimiento(self, mov_data, bienes_ids, tamano_lote=500):
+        """Registra un movimiento y actualiza estados Y DATOS DEL RESPONSABLE - VERSIÓN CON TRANSACCIÓN
+        
+        Operación por conjuntos: un executemany para los vínculos y un UPDATE ... IN (...)
+        por lote de bienes, todo dentro de la misma transacción.
+        """
         try:
+            keys = ",".join(mov_data.keys())
+            placeholders = ",".join("?" for _ in mov_data)
+            ids_unicos = list(dict.fromkeys(bienes_ids))
+            
+            # Escritura diferida: id reservado y todo en una sola operación del diario
+            if self.diario_escrituras is not None:
+                mov_id = self.diario_escrituras.reservar_id('movimientos')
+                sentencias = [{
+                    "sql": f"INSERT INTO movimientos (id,{keys}) VALUES (?,{placeholders})",
+                    "params": [mov_id] + list(mov_data.values()),
+                }]
+                sentencias += self._sentencias_bienes_movimiento(mov_id, mov_data, bienes_ids, tamano_lote)
+                self._escribir(sentencias, f"Movimiento {mov_data['tipo']} #{mov_id}")
+                logger.info("✅ Movimiento %s (%s) encolado con %s bienes", mov_id, mov_data['tipo'], len(ids_unicos))
+                return mov_id
+            
             # ✅ TRANSACCIÓN ATÓMICA - TODO O NADA
             with self.conn:
                 cur = self.conn.cursor()
                 
-                # Debug: mostrar datos que llegan al movimiento
-                print(f"🔄 DEBUG add_movimiento:")
-                print(f"   Tipo: {mov_data['tipo']}")
-                print(f"   Responsable nombre: '{mov_data.get('responsable_nombre', '')}'")
-                print(f"   Responsable apellido: '{mov_data.get('responsable_apellido', '')}'")
-                print(f"   Responsable dni_cuit: '{mov_data.get('responsable_dni_cuit', '')}'")
-                print(f"   Bienes IDs: {bienes_ids}")
-                
                 # Insertar movimiento CON DATOS SEPARADOS
-                keys = ",".join(mov_data.keys())
-                placeholders = ",".join("?" for _ in mov_data)
                 cur.execute(f"INSERT INTO movimientos ({keys}) VALUES ({placeholders})", 
                         tuple(mov_data.values()))
                 mov_id = cur.lastrowid
                 
-                # Relacionar bienes con movimiento Y ACTUALIZAR DATOS
-                for bien_id in bienes_ids:
-                    cur.execute("INSERT INTO bienes_movimientos (id_bien, id_movimiento) VALUES (?, ?)", 
-                            (bien_id, mov_id))
-                    
-                    # Actualizar estado Y DATOS DEL RESPONSABLE del bien
-                    tipo_mov = mov_data["tipo"]
-                    if tipo_mov == "Entrega":
-                        nuevo_estado = "Asignado"
-                        # ✅ ACTUALIZAR BIEN CON DATOS SEPARADOS DEL RESPONSABLE
-                        cur.execute("""
-                            UPDATE bienes SET estado=?, nombre=?, apellido=?, dni_cuit=?, institucional=?
-                            WHERE id=?
-                        """, (
-                            nuevo_estado,
-                            mov_data.get("responsable_nombre", ""),
-                            mov_data.get("responsable_apellido", ""), 
-                            mov_data.get("responsable_dni_cuit", ""),
-                            mov_data.get("responsable_institucional", ""),
-                            bien_id
-                        ))
-                        
-                        # Debug: verificar la actualización
-                        print(f"   ✅ Actualizado bien {bien_id}:")
-                        print(f"      Estado: {nuevo_estado}")
-                        print(f"      Nombre: '{mov_data.get('responsable_nombre', '')}'")
-                        print(f"      Apellido: '{mov_data.get('responsable_apellido', '')}'")
-                        print(f"      DNI/CUIT: '{mov_data.get('responsable_dni_cuit', '')}'")
-                        
-                    elif tipo_mov == "Devolución":
-                        nuevo_estado = "En depósito"
-                        # ✅ LIMPIAR DATOS DEL RESPONSABLE (devolver a stock)
-                        cur.execute("""
-                            UPDATE bienes SET estado=?, nombre='', apellido='', dni_cuit='', institucional=''
-                            WHERE id=?
-                        """, (nuevo_estado, bien_id))
-                        print(f"   ✅ Devolución bien {bien_id} - datos limpiados")
-                        
-                    elif tipo_mov == "Baja":
-                        nuevo_estado = "Baja definitiva"
-                        cur.execute("UPDATE bienes SET estado=? WHERE id=?", (nuevo_estado, bien_id))
+                # Vínculos (un solo executemany) y estado/responsable de los bienes
+                for sentencia in self._sentencias_bienes_movimiento(mov_id, mov_data, bienes_ids, tamano_lote):
+                    if "lote" in sentencia:
+                        cur.executemany(sentencia["sql"], sentencia["lote"])
                     else:
-                        nuevo_estado = "En depósito"
-                        cur.execute("UPDATE bienes SET estado=? WHERE id=?", (nuevo_estado, bien_id))
-                    
-                print(f"✅ Movimiento {mov_id} guardado correctamente")
+                        cur.execute(sentencia["sql"], sentencia["params"])
+                
+                logger.info("✅ Movimiento %s (%s) guardado con %s bienes", mov_id, mov_data['tipo'], len(ids_unicos))
                 return mov_id
                 
         except Exception as e:
-            print(f"❌ Error al agregar movimiento: {e}")
+            logger.error("❌ Error al agregar movimiento: %s", e)
             raise e
 
+    def _sentencias_bienes_movimiento(self, mov_id, mov_data, bienes_ids, tamano_lote=500):
+        """Vínculos bien-movimiento + UPDATE de estado/responsable por lotes"""
+        sentencias = [{
+            "sql": "INSERT INTO bienes_movimientos (id_bien, id_movimiento) VALUES (?, ?)",
+            "lote": [[bien_id, mov_id] for bien_id in bienes_ids],
+        }]
+        
+        set_clause, usa_responsable = self.ACTUALIZACIONES_POR_MOVIMIENTO.get(
+            mov_data["tipo"], ("estado='En depósito'", False)
+        )
+        params_set = []
+        if usa_responsable:
+            params_set = [
+                mov_data.get("responsable_nombre", ""),
+                mov_data.get("responsable_apellido", ""),
+                mov_data.get("responsable_dni_cuit", ""),
+                mov_data.get("responsable_institucional", ""),
+            ]
+        
+        ids_unicos = list(dict.fromkeys(bienes_ids))
+        for inicio in range(0, len(ids_unicos), tamano_lote):
+            lote = ids_unicos[inicio:inicio + tamano_lote]
+            placeholders_ids = ",".join("?" for _ in lote)
+            sentencias.append({
+                "sql": f"UPDATE bienes SET {set_clause} WHERE id IN ({placeholders_ids})",
+                "params": params_set + lote,
+            })
+        return sentencias
+
     def marcar_como_eliminado(self, movimiento_id, motivo, usuario):
         """Marca un movimiento como eliminado (soft delete)"""
         try:
             from datetime import datetime
             
-            cur = self.conn.cursor()
             fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            cur.execute("""
-                UPDATE movimientos 
-                SET eliminado = 1, 
-                    fecha_eliminacion = ?, 
-                    motivo_eliminacion = ?
-                WHERE id = ?
-            """, (fecha_actual, motivo, movimiento_id))
-            
-            self.conn.commit()
+            self._escribir([{
+                "sql": """
+                    UPDATE movimientos 
+                    SET eliminado = 1, 
+                        fecha_eliminacion = ?, 
+                        motivo_eliminacion = ?
+                    WHERE id = ?
+                """,
+                "params": [fecha_actual, motivo, movimiento_id],
+            }], f"Eliminar movimiento #{movimiento_id}")
             
             # Registrar en logs
             self.log_actividad(
@@ -737,79 +1082,97 @@ class DB:
                 f"Movimiento #{movimiento_id} marcado como eliminado. Motivo: {motivo}"
             )
             
-            cur.close()
-            print(f"✅ Movimiento #{movimiento_id} marcado como eliminado")
+            logger.info("✅ Movimiento #%s marcado como eliminado", movimiento_id)
             return True
             
         except Exception as e:
-            print(f"❌ Error marcando movimiento como eliminado: {e}")
+            logger.error("❌ Error marcando movimiento como eliminado: %s", e)
             return False
 
     def list_movimientos(self):
         """Obtiene todos los movimientos"""
-        cur = self.conn.cursor()
+        cur = self._conexion_lectura().cursor()
         try:
             cur.execute("SELECT * FROM movimientos ORDER BY fecha DESC")
             return cur.fetchall()
         except sqlite3.OperationalError as e:
-            print(f"Error al listar movimientos: {e}")
+            logger.error("Error al listar movimientos: %s", e)
             return []
         finally:
             cur.close()
 
-    def get_movimientos_detallados(self, incluir_eliminados=False):
-        """Obtiene movimientos con información detallada de bienes"""
-        cur = self.conn.cursor()
+    def get_movimientos_detallados(self, incluir_eliminados=False, columnas=None, ids=None,
+                                   incluir_archivo=None):
+        """
+        Obtiene movimientos con información detallada de bienes
+        
+        Args:
+            incluir_eliminados: Incluir movimientos con soft delete
+            columnas: Campos pedidos (columnas de movimientos, incluidos los
+                      resúmenes 'cantidad_bienes', 'fichas', 'prds'). None = todos.
+                      El 'id' se incluye siempre.
+            ids: Solo estos movimientos (para refrescar filas puntuales). None = todos.
+            incluir_archivo: Sumar los movimientos archivados. None = si se
+                             piden los eliminados (el historial completo).
+        """
+        if incluir_archivo is None:
+            incluir_archivo = incluir_eliminados
+        if incluir_archivo:
+            conn, tabla_movimientos, _ = self._conexion_historial()
+        else:
+            conn, tabla_movimientos = self._conexion_lectura(), 'movimientos'
+        cur = conn.cursor()
         try:
-            # Construir WHERE según parámetro
-            if incluir_eliminados:
-                where_clause = ""
+            # Construir WHERE según parámetros
+            condiciones = []
+            params = []
+            if not incluir_eliminados:
+                condiciones.append("m.eliminado = 0")
+            if ids is not None:
+                condiciones.append(f"m.id IN ({','.join('?' for _ in ids) or 'NULL'})")
+                params.extend(ids)
+            where_clause = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+            
+            # Proyección: los resúmenes son columnas guardadas, sin JOIN ni GROUP BY
+            if columnas:
+                seleccion = [f"m.{col}" for col in self.COLUMNAS_MOVIMIENTOS
+                             if col == 'id' or col in columnas]
             else:
-                where_clause = "WHERE m.eliminado = 0"
+                seleccion = ["m.*"]
             
             query = f"""
-            SELECT m.*, 
-                COUNT(bm.id_bien) as cantidad_bienes,
-                GROUP_CONCAT(b.ficha) as fichas,
-                GROUP_CONCAT(DISTINCT b.prd) as prds
-            FROM movimientos m
-            LEFT JOIN bienes_movimientos bm ON m.id = bm.id_movimiento
-            LEFT JOIN bienes b ON bm.id_bien = b.id
+            SELECT {", ".join(seleccion)}
+            FROM {tabla_movimientos} m
             {where_clause}
-            GROUP BY m.id
             ORDER BY m.fecha DESC
             """
             
-            print(f"🔍 Query movimientos: incluir_eliminados={incluir_eliminados}")
-            cur.execute(query)
+            logger.debug("🔍 Query movimientos: incluir_eliminados=%s", incluir_eliminados)
+            cur.execute(query, params)
             return cur.fetchall()
             
         except Exception as e:
-            print(f"Error al obtener movimientos detallados: {e}")
+            logger.error("Error al obtener movimientos detallados: %s", e)
             return self.list_movimientos()  # Fallback
         finally:
             cur.close()
             
     def obtener_movimientos_eliminados(self):
-        """Obtiene solo los movimientos eliminados"""
-        cur = self.conn.cursor()
+        """Obtiene solo los movimientos eliminados (también los ya archivados)"""
+        conn, tabla_movimientos, _ = self._conexion_historial()
+        cur = conn.cursor()
         try:
-            query = """
-            SELECT m.*, 
-                COUNT(bm.id_bien) as cantidad_bienes,
-                GROUP_CONCAT(b.ficha) as fichas
-            FROM movimientos m
-            LEFT JOIN bienes_movimientos bm ON m.id = bm.id_movimiento
-            LEFT JOIN bienes b ON bm.id_bien = b.id
+            query = f"""
+            SELECT m.*
+            FROM {tabla_movimientos} m
             WHERE m.eliminado = 1
-            GROUP BY m.id
             ORDER BY m.fecha_eliminacion DESC
             """
             
             cur.execute(query)
             return cur.fetchall()
         except Exception as e:
-            print(f"❌ Error obteniendo movimientos eliminados: {e}")
+            logger.error("❌ Error obteniendo movimientos eliminados: %s", e)
             return []
         finally:
             cur.close()
@@ -838,8 +1201,8 @@ class DB:
                 """, (ficha_clean,))
                 existente = cur.fetchone()
                 if existente:
-                    print(f"🚨 DUPLICADO POR FICHA: {ficha_clean}")
-                    print(f"   Ya existe: {existente['tipo']} - {existente['marca']} {existente['modelo']}")
+                    logger.warning("🚨 DUPLICADO POR FICHA: %s", ficha_clean)
+                    logger.debug("   Ya existe: %s - %s %s", existente['tipo'], existente['marca'], existente['modelo'])
                     return True
             
             # 2. PRIORIDAD ALTA: Mismo IMEI (no vacío en ambos) - IGNORAR VALORES GENÉRICOS
@@ -851,8 +1214,8 @@ class DB:
                 """, (imei_clean,))
                 existente = cur.fetchone()
                 if existente:
-                    print(f"🚨 DUPLICADO POR IMEI: {imei_clean}")
-                    print(f"   Ya existe: Ficha {existente['ficha']} - {existente['marca']} {existente['modelo']}")
+                    logger.warning("🚨 DUPLICADO POR IMEI: %s", imei_clean)
+                    logger.debug("   Ya existe: Ficha %s - %s %s", existente['ficha'], existente['marca'], existente['modelo'])
                     return True
             
             # 3. PRIORIDAD MEDIA: Misma Serie (no vacía en ambos) - IGNORAR "SIN SERIE"
@@ -864,8 +1227,8 @@ class DB:
                 """, (serie_clean,))
                 existente = cur.fetchone()
                 if existente:
-                    print(f"⚠️ DUPLICADO POR SERIE: {serie_clean}")
-                    print(f"   Ya existe: Ficha {existente['ficha']} - {existente['marca']} {existente['modelo']}")
+                    logger.warning("⚠️ DUPLICADO POR SERIE: %s", serie_clean)
+                    logger.debug("   Ya existe: Ficha %s - %s %s", existente['ficha'], existente['marca'], existente['modelo'])
                     return True
             
             # 4. PRIORIDAD BAJA: Mismo tipo+marca+modelo SOLO SI NO HAY SERIE/IMEI VÁLIDOS
@@ -881,21 +1244,21 @@ class DB:
                 """, (tipo_clean, marca_clean, modelo_clean))
                 existente = cur.fetchone()
                 if existente:
-                    print(f"🔍 DUPLICADO POR TIPO+MARCA+MODELO (sin identificadores únicos):")
-                    print(f"   Tipo: {tipo_clean}, Marca: {marca_clean}, Modelo: {modelo_clean}")
-                    print(f"   Ya existe: Ficha {existente['ficha']}")
+                    logger.debug("🔍 DUPLICADO POR TIPO+MARCA+MODELO (sin identificadores únicos):")
+                    logger.debug("   Tipo: %s, Marca: %s, Modelo: %s", tipo_clean, marca_clean, modelo_clean)
+                    logger.debug("   Ya existe: Ficha %s", existente['ficha'])
                     return True
             
             return False
             
         except Exception as e:
-            print(f"❌ Error verificando existencia: {e}")
+            logger.error("❌ Error verificando existencia: %s", e)
             return False
     
     def obtener_bien_por_id(self, bien_id):
         """Obtiene un bien por su ID - PARA EL GENERADOR DE ACTAS"""
         try:
-            cur = self.conn.cursor()
+            cur = self._conexion_lectura().cursor()
             cur.execute("SELECT * FROM bienes WHERE id = ?", (bien_id,))
             resultado = cur.fetchone()
             
@@ -904,14 +1267,53 @@ class DB:
                 return dict(zip(columnas, resultado))
             return None
         except Exception as e:
-            print(f"❌ Error obteniendo bien por ID: {e}")
+            logger.error("❌ Error obteniendo bien por ID: %s", e)
             return None
 
+    def obtener_bienes_por_ids(self, bienes_ids, tamano_lote=500):
+        """
+        Obtiene varios bienes por ID en pocas consultas - PARA MOVIMIENTOS Y ACTAS
+        
+        Args:
+            bienes_ids: Lista de IDs de bienes
+            tamano_lote: Cantidad máxima de IDs por consulta (límite de variables de SQLite)
+        
+        Returns:
+            list: Diccionarios en el mismo orden que bienes_ids (se omiten los inexistentes)
+        """
+        try:
+            ids_unicos = list(dict.fromkeys(bienes_ids))
+            encontrados = {}
+            
+            cur = self._conexion_lectura().cursor()
+            for inicio in range(0, len(ids_unicos), tamano_lote):
+                lote = ids_unicos[inicio:inicio + tamano_lote]
+                placeholders = ",".join("?" for _ in lote)
+                cur.execute(f"SELECT * FROM bienes WHERE id IN ({placeholders})", lote)
+                for fila in cur.fetchall():
+                    encontrados[fila['id']] = dict(fila)
+            cur.close()
+            
+            # Respetar el orden pedido (los IDs pueden venir como texto desde la UI)
+            resultado = []
+            for bien_id in bienes_ids:
+                try:
+                    bien = encontrados.get(int(bien_id))
+                except (ValueError, TypeError):
+                    bien = None
+                if bien:
+                    resultado.append(dict(bien))
+            return resultado
+        except Exception as e:
+            logger.error("❌ Error obteniendo bienes por IDs: %s", e)
+            return []
+
     def obtener_movimientos_por_bien(self, bien_id):
-        """Obtiene todos los movimientos de un bien específico para el timeline - VERSIÓN CORREGIDA"""
+        """Obtiene todos los movimientos de un bien específico para el timeline (incluye el archivo)"""
         try:
-            cur = self.conn.cursor()
-            query = """
+            conn, tabla_movimientos, tabla_vinculos = self._conexion_historial()
+            cur = conn.cursor()
+            query = f"""
                 SELECT 
                     m.id,
                     m.tipo,
@@ -929,8 +1331,8 @@ class DB:
                     b.marca,
                     b.modelo,
                     b.serie
-                FROM movimientos m
-                JOIN bienes_movimientos bm ON m.id = bm.id_movimiento
+                FROM {tabla_movimientos} m
+                JOIN {tabla_vinculos} bm ON m.id = bm.id_movimiento
                 JOIN bienes b ON bm.id_bien = b.id
                 WHERE bm.id_bien = ?
                 ORDER BY m.fecha DESC
@@ -947,21 +1349,22 @@ class DB:
             return resultado
             
         except Exception as e:
-            print(f"❌ Error obteniendo movimientos del bien {bien_id}: {e}")
+            logger.error("❌ Error obteniendo movimientos del bien %s: %s", bien_id, e)
             return []
         
     def obtener_movimiento_por_id(self, movimiento_id):
-        """Obtiene un movimiento por su ID - VERSIÓN ACTUALIZADA"""
+        """Obtiene un movimiento por su ID (también si está archivado)"""
         try:
-            cur = self.conn.cursor()
+            conn, tabla_movimientos, _ = self._conexion_historial()
+            cur = conn.cursor()
             # ✅ CORREGIDO: Buscar archivo_path_pdf, no archivo_path
-            cur.execute("""
+            cur.execute(f"""
                 SELECT id, tipo, fecha, responsable, responsable_nombre, 
                     responsable_apellido, responsable_dni_cuit, 
                     responsable_institucional, observaciones, 
                     archivo_path_pdf, archivo_path_docx, 
                     numero_transferencia 
-                FROM movimientos 
+                FROM {tabla_movimientos} 
                 WHERE id = ?
             """, (movimiento_id,))
             resultado = cur.fetchone()
@@ -971,14 +1374,14 @@ class DB:
                 return dict(zip(columnas, resultado))
             return None
         except Exception as e:
-            print(f"❌ Error obteniendo movimiento por ID: {e}")
+            logger.error("❌ Error obteniendo movimiento por ID: %s", e)
             return None
 
     def get_estadisticas(self):
         """Obtiene estadísticas del inventario con manejo seguro de cursor"""
         try:
             # ✅ SIN CONTEXT MANAGER - MANUAL
-            cur = self.conn.cursor()
+            cur = self._conexion_lectura().cursor()
             cur.execute("SELECT COUNT(*) FROM bienes")
             total = cur.fetchone()[0]
             # ✅ CORREGIDO: Usar LOWER para agrupar sin importar mayúsculas
@@ -996,7 +1399,7 @@ class DB:
                 'por_tipo': por_tipo
             }
         except Exception as e:
-            print(f"Error obteniendo estadísticas: {e}")
+            logger.error("Error obteniendo estadísticas: %s", e)
             return {'total': 0, 'por_estado': {}, 'por_tipo': {}}
         
     def obtener_valores_unicos(self, campo):
@@ -1005,14 +1408,14 @@ class DB:
         Útil para llenar combos de filtro.
         """
         try:
-            cur = self.conn.cursor()
+            cur = self._conexion_lectura().cursor()
             cur.execute(f"SELECT DISTINCT {campo} FROM bienes WHERE {campo} IS NOT NULL AND {campo} != '' ORDER BY {campo}")
             resultados = cur.fetchall()
             cur.close()
             # Devolver solo los valores, sin None ni vacíos
             return [r[0] for r in resultados if r[0]]
         except Exception as e:
-            print(f"Error obteniendo valores únicos de '{campo}': {e}")
+            logger.error("Error obteniendo valores únicos de '%s': %s", campo, e)
             return []
 
     def get_estadisticas_filtradas(self, institucional=None, tipo=None, marca=None, estado=None):
@@ -1020,7 +1423,7 @@ class DB:
         Devuelve estadísticas filtradas por institucional, tipo, marca, estado
         """
         try:
-            cur = self.conn.cursor()
+            cur = self._conexion_lectura().cursor()
             # Construir WHERE dinámicamente
             condiciones = []
             params = []
@@ -1066,7 +1469,7 @@ class DB:
                 'por_institucional': por_institucional
             }
         except Exception as e:
-            print(f"Error obteniendo estadísticas filtradas: {e}")
+            logger.error("Error obteniendo estadísticas filtradas: %s", e)
             return {'total': 0, 'por_estado': {}, 'por_tipo': {}, 'por_marca': {}, 'por_institucional': {}}
         
     def fetch_one(self, query, params=()):
@@ -1078,13 +1481,13 @@ class DB:
             cur.close()
             return result
         except Exception as e:
-            print(f"Error en fetch_one: {e}")
+            logger.error("Error en fetch_one: %s", e)
             return None
         
     def obtener_bien_por_ficha(self, ficha):
         """Obtiene un bien por su número de ficha"""
         try:
-            cur = self.conn.cursor()
+            cur = self._conexion_lectura().cursor()
             cur.execute("SELECT * FROM bienes WHERE ficha = ?", (ficha,))
             resultado = cur.fetchone()
             
@@ -1093,10 +1496,10 @@ class DB:
                 return dict(zip(columnas, resultado))
             return None
         except Exception as e:
-            print(f"❌ Error obteniendo bien por ficha: {e}")
+            logger.error("❌ Error obteniendo bien por ficha: %s", e)
             return None
     
-    def buscar_bienes_filtrados(self, filtros):
+    def buscar_bienes_filtrados(self, filtros, columnas=None):
         """Query SQL optimizada con WHERE dinámico - REEMPLAZA filtro manual"""
         
         condiciones = []
@@ -1201,10 +1604,7 @@ class DB:
         where_clause = " AND ".join(condiciones) if condiciones else "1=1"
         
         query = f"""
-            SELECT id, ficha, tipo, marca, modelo, serie, estado, prd,
-                nombre, apellido, dni_cuit, institucional,
-                linea, sim, empresa, imei, descripcion, fecha_registro,
-                monto_original, anio_prd
+            SELECT {self._proyeccion_bienes(columnas)}
             FROM bienes 
             WHERE {where_clause}
             ORDER BY fecha_registro DESC
@@ -1212,18 +1612,18 @@ class DB:
         """
         
         try:
-            cur = self.conn.cursor()
+            cur = self._conexion_lectura().cursor()
             cur.execute(query, params)
             resultado = cur.fetchall()
             cur.close()
             
-            print(f"✅ Query optimizada: {len(resultado)} resultados en {len(condiciones)} filtros")
+            logger.debug("✅ Query optimizada: %s resultados en %s filtros", len(resultado), len(condiciones))
             return resultado
             
         except Exception as e:
-            print(f"❌ Error en query optimizada: {e}")
+            logger.error("❌ Error en query optimizada: %s", e)
             # Fallback a búsqueda básica
-            return self.list_bienes()
+            return self.list_bienes(columnas=columnas)
         
     def actualizar_pdf_movimiento(self, movimiento_id, ruta_pdf):
         """Actualiza la ruta del PDF de un movimiento existente - VERSIÓN CORREGIDA"""
@@ -1231,37 +1631,39 @@ class DB:
             import os
             from config.settings import get_config
             
-            print(f"🔍 DEBUG actualizar_pdf_movimiento:")
-            print(f"   Ruta PDF recibida: {ruta_pdf}")
-            print(f"   ¿Es ruta absoluta?: {os.path.isabs(ruta_pdf) if ruta_pdf else 'No ruta'}")
+            logger.debug("🔍 actualizar_pdf_movimiento:")
+            logger.debug("   Ruta PDF recibida: %s", ruta_pdf)
+            logger.debug("   ¿Es ruta absoluta?: %s", os.path.isabs(ruta_pdf) if ruta_pdf else 'No ruta')
             
             # ✅ SI la ruta es solo nombre de archivo, convertir a ruta completa
             if ruta_pdf and not os.path.isabs(ruta_pdf):
                 config = get_config()
                 ruta_completa = os.path.join(config["actas_folder_local"], ruta_pdf)
-                print(f"   Convirtiendo a ruta completa: {ruta_completa}")
+                logger.debug("   Convirtiendo a ruta completa: %s", ruta_completa)
                 ruta_pdf = ruta_completa
             
-            print(f"   Guardando en BD: {ruta_pdf}")
+            logger.debug("   Guardando en BD: %s", ruta_pdf)
             
-            query = "UPDATE movimientos SET archivo_path_pdf = ? WHERE id = ?"
-            self.conn.execute(query, (ruta_pdf, movimiento_id))
-            self.conn.commit()
+            self._escribir([{
+                "sql": "UPDATE movimientos SET archivo_path_pdf = ? WHERE id = ?",
+                "params": [ruta_pdf, movimiento_id],
+            }], f"PDF de movimiento #{movimiento_id}")
             
-            print(f"✅ PDF actualizado en BD para movimiento {movimiento_id}")
+            logger.debug("✅ PDF actualizado en BD para movimiento %s", movimiento_id)
             return True
             
         except Exception as e:
-            print(f"❌ Error actualizando PDF del movimiento: {e}")
+            logger.error("❌ Error actualizando PDF del movimiento: %s", e)
             return False
         
     def get_bienes_de_movimiento(self, movimiento_id):
-        """Obtiene los bienes asociados a un movimiento"""
+        """Obtiene los bienes asociados a un movimiento (también si está archivado)"""
         try:
-            cur = self.conn.cursor()
-            cur.execute("""
+            conn, _, tabla_vinculos = self._conexion_historial()
+            cur = conn.cursor()
+            cur.execute(f"""
                 SELECT b.* FROM bienes b
-                JOIN bienes_movimientos bm ON b.id = bm.id_bien
+                JOIN {tabla_vinculos} bm ON b.id = bm.id_bien
                 WHERE bm.id_movimiento = ?
             """, (movimiento_id,))
             rows = cur.fetchall()
@@ -1274,5 +1676,10 @@ class DB:
                 cur.close()
                 return []
         except Exception as e:
-            print(f"❌ Error obteniendo bienes del movimiento: {e}")
-            return []
\ No newline at end of file
+            logger.error("❌ Error obteniendo bienes del movimiento: %s", e)
+            return []
+
+
+# Métricas por método para el panel de rendimiento (mismas operaciones que expone DBRemoto)
+for _metodo in sorted(METODOS_LECTURA | METODOS_ESCRITURA):
+    setattr(DB, _metodo, medido(getattr(DB, _metodo)))
@@ -0,0 +1,216 @@
+"""
+🌐 BASE DE DATOS REMOTA - Sistema de Inventario AGC
+Backend de DB que habla con el servidor de coordinación (servidor.py)
+"""
+
+import http.client
+import json
+import threading
+from urllib.parse import urlparse
+
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+# Operaciones de DB expuestas por el servidor
+METODOS_LECTURA = {
+    'list_bienes', 'list_bienes_completos', 'buscar_bienes', 'list_movimientos',
+    'get_movimientos_detallados', 'obtener_movimientos_eliminados', 'bien_existe',
+    'obtener_bien_por_id', 'obtener_bienes_por_ids', 'obtener_movimientos_por_bien',
+    'obtener_movimiento_por_id', 'get_estadisticas', 'obtener_valores_unicos',
+    'get_estadisticas_filtradas', 'obtener_bien_por_ficha',
+    'buscar_bienes_filtrados', 'get_bienes_de_movimiento',
+    'listar_usuarios', 'obtener_usuario', 'verificar_credenciales',
+}
+METODOS_ESCRITURA = {
+    'add_bien', 'add_movimiento', 'marcar_como_eliminado', 'actualizar_pdf_movimiento',
+    'registrar_acceso', 'log_actividad', 'vaciar_logs_actividad', 'crear_backup',
+    'verificar_y_agregar_columnas_asignacion',
+    'crear_usuario', 'actualizar_usuario', 'cambiar_estado_usuario',
+}
+
+
+class FilaRemota(dict):
+    """Fila recibida del servidor: se accede por nombre o por posición, como sqlite3.Row"""
+
+    def __getitem__(self, clave):
+        if isinstance(clave, int):
+            return list(self.values())[clave]
+        return super().__getitem__(clave)
+
+
+def a_json(valor):
+    """Convierte resultados de DB (sqlite3.Row incluidas) a algo serializable"""
+    if hasattr(valor, 'keys') and not isinstance(valor, dict):
+        return {"__fila__": list(valor.keys()), "valores": [a_json(v) for v in valor]}
+    if isinstance(valor, dict):
+        return {str(k): a_json(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [a_json(v) for v in valor]
+    if isinstance(valor, bytes):
+        return valor.decode('utf-8', errors='replace')
+    return valor
+
+
+def desde_json(valor):
+    """Inversa de a_json: reconstruye las filas como FilaRemota"""
+    if isinstance(valor, dict):
+        if "__fila__" in valor:
+            return FilaRemota(zip(valor["__fila__"], (desde_json(v) for v in valor["valores"])))
+        return {k: desde_json(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [desde_json(v) for v in valor]
+    return valor
+
+
+class ErrorRemoto(Exception):
+    """El servidor devolvió un error para la llamada"""
+
+
+class DBRemoto:
+    """
+    Misma interfaz que DB, pero cada operación es una llamada al servidor.
+
+    - Una sola conexión HTTP persistente (keep-alive) por cliente.
+    - llamar_lote() manda varias operaciones en un solo viaje.
+    - Las lecturas se guardan en caché hasta que el servidor publique un
+      cambio (versión nueva), así repetir una consulta no viaja.
+    - Solo las operaciones de METODOS_LECTURA / METODOS_ESCRITURA: no hay
+      `conn` ni SQL directo (lo que lo necesita se desactiva en modo remoto).
+    - Cada pedido lleva el token compartido del servidor (X-Token).
+    """
+
+    es_remoto = True
+    TIMEOUT = 30
+    ESPERA_CAMBIOS = 25  # segundos de long-polling
+
+    def __init__(self, url, token):
+        partes = urlparse(url if "://" in url else f"http://{url}")
+        self.token = token
+        self.host = partes.hostname or "127.0.0.1"
+        self.puerto = partes.port or 8765
+        self.path = url
+        self.diario_escrituras = None
+        self.replica_lectura = None
+        self.version = 0
+        self._http = None
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._oyentes = []
+        self._detener = threading.Event()
+
+        estado = self._pedir("GET", "/estado")
+        self.actas_folder = estado.get("actas_folder", "")
+        self.version = estado.get("version", 0)
+
+        self._hilo_cambios = threading.Thread(target=self._escuchar_cambios, name="db-remoto-cambios", daemon=True)
+        self._hilo_cambios.start()
+        logger.info("🌐 Conectado al servidor de inventario %s:%s", self.host, self.puerto)
+
+    # ------------------------------------------------------------------
+    # Transporte
+    # ------------------------------------------------------------------
+    def _pedir(self, metodo_http, ruta, cuerpo=None, conexion=None, timeout=None):
+        datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else None
+        propia = conexion is None
+        for intento in range(2):
+            if propia:
+                if self._http is None:
+                    self._http = http.client.HTTPConnection(self.host, self.puerto, timeout=self.TIMEOUT)
+                conexion = self._http
+            try:
+                conexion.request(metodo_http, ruta, body=datos,
+                                 headers={"Content-Type": "application/json", "X-Token": self.token})
+                respuesta = conexion.getresponse()
+                contenido = respuesta.read()
+                if respuesta.status != 200:
+                    raise ErrorRemoto(f"HTTP {respuesta.status}: {contenido[:200]!r}")
+                return json.loads(contenido)
+            except (http.client.HTTPException, ConnectionError, OSError):
+                # Conexión keep-alive vencida: reconectar una vez
+                conexion.close()
+                if propia:
+                    self._http = None
+                if intento:
+                    raise
+
+    def llamar_lote(self, llamadas):
+        """
+        Ejecuta varias operaciones en un solo viaje.
+        `llamadas`: [(metodo, args, kwargs), ...]. Devuelve los resultados en orden.
+        """
+        cuerpo = {"llamadas": [
+            {"metodo": metodo, "args": a_json(list(args)), "kwargs": a_json(dict(kwargs))}
+            for metodo, args, kwargs in llamadas
+        ]}
+        with self._lock:
+            respuesta = self._pedir("POST", "/rpc", cuerpo)
+        self._actualizar_version(respuesta.get("version", self.version))
+
+        resultados = []
+        for llamada, resultado in zip(llamadas, respuesta["resultados"]):
+            if not resultado.get("ok"):
+                raise ErrorRemoto(f"{llamada[0]}: {resultado.get('error')}")
+            resultados.append(desde_json(resultado.get("valor")))
+        return resultados
+
+    def _llamar(self, metodo, *args, **kwargs):
+        if metodo in METODOS_LECTURA:
+            clave = (metodo, json.dumps([a_json(list(args)), a_json(kwargs)], sort_keys=True, default=str))
+            if clave in self._cache:
+                return self._cache[clave]
+            valor = self.llamar_lote([(metodo, args, kwargs)])[0]
+            self._cache[clave] = valor
+            return valor
+        return self.llamar_lote([(metodo, args, kwargs)])[0]
+
+    def __getattr__(self, nombre):
+        if nombre in METODOS_LECTURA or nombre in METODOS_ESCRITURA:
+            return lambda *args, **kwargs: self._llamar(nombre, *args, **kwargs)
+        raise AttributeError(nombre)
+
+    # ------------------------------------------------------------------
+    # Cambios publicados por el servidor
+    # ------------------------------------------------------------------
+    def al_cambiar(self, callback):
+        """Registra `callback(cambios)`; se llama desde el hilo de escucha"""
+        self._oyentes.append(callback)
+
+    def _actualizar_version(self, version, cambios=None):
+        if version != self.version:
+            self.version = version
+            self._cache.clear()
+            for callback in list(self._oyentes):
+                try:
+                    callback(cambios or [])
+                except Exception as e:
+                    logger.error("❌ Error notificando cambios: %s", e)
+
+    def _escuchar_cambios(self):
+        """Long-polling de /cambios con una conexión propia"""
+        conexion = None
+        while not self._detener.is_set():
+            try:
+                if conexion is None:
+                    conexion = http.client.HTTPConnection(
+                        self.host, self.puerto, timeout=self.ESPERA_CAMBIOS + 10
+                    )
+                respuesta = self._pedir(
+                    "GET", f"/cambios?desde={self.version}&espera={self.ESPERA_CAMBIOS}",
+                    conexion=conexion
+                )
+                self._actualizar_version(respuesta["version"], respuesta.get("cambios"))
+            except Exception as e:
+                logger.debug("🌐 Canal de cambios interrumpido: %s", e)
+                conexion = None
+                self._detener.wait(5)
+
+    def escrituras_pendientes(self):
+        return 0
+
+    def cerrar(self):
+        self._detener.set()
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
@@ -0,0 +1,339 @@
+"""
+📝 DIARIO DE ESCRITURAS - Sistema de Inventario AGC
+Escrituras diferidas hacia la base de red (modo red_directo)
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from database.huellas import HuellasDB
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class DiarioEscrituras:
+    """
+    Diario local y durable de operaciones pendientes contra la base maestra.
+
+    - encolar() guarda la operación en un SQLite local y vuelve enseguida.
+    - Un hilo aplica las pendientes en lotes, una transacción por lote, con
+      reintentos y espera exponencial si la red está ocupada o bloqueada.
+    - Cada operación aplicada queda registrada en la maestra
+      (_diario_aplicado), así un corte entre el COMMIT remoto y el borrado
+      local no la aplica dos veces.
+    - Los ids de filas nuevas salen de bloques reservados en la maestra
+      (sqlite_sequence), para devolver el id sin esperar a la red.
+    - Después de aplicar, recalcula las huellas Merkle pendientes de la
+      maestra (las réplicas de lectura las leen sin escribir).
+    - Lo que la maestra rechaza (duplicado, esquema...) no se reintenta solo:
+      queda en operaciones_fallidas hasta que el usuario lo reintente o lo
+      descarte (fallidas(), reintentar_fallidas(), descartar_fallidas()).
+
+    Una operación es una lista de sentencias: {"sql": ..., "params": [...]}
+    o {"sql": ..., "lote": [[...], ...]} para executemany.
+    """
+
+    TAMANO_LOTE = 50
+    IDS_POR_RESERVA = 50
+    ESPERA_MINIMA = 0.5   # segundos
+    ESPERA_MAXIMA = 30.0
+    INTERVALO_VACIADO = 1.0
+
+    def __init__(self, ruta_maestra, ruta_diario, conn_maestra):
+        self.ruta_maestra = ruta_maestra
+        self.conn_maestra = conn_maestra
+        self.conn = sqlite3.connect(ruta_diario, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        self._hay_trabajo = threading.Event()
+        self._detener = threading.Event()
+        self._ultimo_error = None
+        self._crear_tablas()
+        self.origen = self._obtener_origen()
+
+        self._hilo = threading.Thread(target=self._bucle, name="diario-escrituras", daemon=True)
+        self._hilo.start()
+        if self.pendientes():
+            logger.info("📝 %s escrituras pendientes de la sesión anterior", self.pendientes())
+            self._hay_trabajo.set()
+
+    def _crear_tablas(self):
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS operaciones (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sentencias TEXT NOT NULL,
+                    descripcion TEXT,
+                    creado TEXT NOT NULL,
+                    intentos INTEGER DEFAULT 0
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS operaciones_fallidas (
+                    id INTEGER PRIMARY KEY,
+                    sentencias TEXT NOT NULL,
+                    descripcion TEXT,
+                    creado TEXT NOT NULL,
+                    error TEXT
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS ids_reservados (
+                    tabla TEXT PRIMARY KEY,
+                    siguiente INTEGER NOT NULL,
+                    ultimo INTEGER NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS propiedades (clave TEXT PRIMARY KEY, valor TEXT)")
+
+    def _obtener_origen(self):
+        fila = self.conn.execute("SELECT valor FROM propiedades WHERE clave='origen'").fetchone()
+        if fila:
+            return fila[0]
+        origen = uuid.uuid4().hex
+        with self.conn:
+            self.conn.execute("INSERT INTO propiedades (clave, valor) VALUES ('origen', ?)", (origen,))
+        return origen
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def encolar(self, sentencias, descripcion=""):
+        """Guarda la operación en el diario local (durable) y la agenda"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO operaciones (sentencias, descripcion, creado) VALUES (?, ?, ?)",
+                (json.dumps(sentencias, default=str), descripcion,
+                 datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+        self._hay_trabajo.set()
+        return True
+
+    def reservar_id(self, tabla):
+        """Próximo id para `tabla`, de un bloque reservado en la maestra"""
+        with self._lock:
+            fila = self.conn.execute(
+                "SELECT siguiente, ultimo FROM ids_reservados WHERE tabla=?", (tabla,)
+            ).fetchone()
+            if fila is None or fila[0] > fila[1]:
+                primero, ultimo = self._reservar_bloque(tabla)
+            else:
+                primero, ultimo = fila
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO ids_reservados (tabla, siguiente, ultimo) VALUES (?, ?, ?)",
+                    (tabla, primero + 1, ultimo)
+                )
+            return primero
+
+    def _reservar_bloque(self, tabla):
+        """
+        Avanza sqlite_sequence de la maestra IDS_POR_RESERVA posiciones.
+        Si el llamador tiene una transacción abierta en la conexión, la
+        reserva se suma a ella (SAVEPOINT) en vez de confirmársela.
+        """
+        conn = self.conn_maestra
+        with transaccion(conn, inmediata=True):
+            fila = conn.execute("SELECT seq FROM sqlite_sequence WHERE name=?", (tabla,)).fetchone()
+            if fila is None:
+                actual = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabla}").fetchone()[0]
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                             (tabla, actual + self.IDS_POR_RESERVA))
+            else:
+                actual = fila[0]
+                conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?",
+                             (actual + self.IDS_POR_RESERVA, tabla))
+        logger.debug("📝 Reservados ids %s-%s de %s", actual + 1, actual + self.IDS_POR_RESERVA, tabla)
+        return actual + 1, actual + self.IDS_POR_RESERVA
+
+    def pendientes(self):
+        """Cantidad de operaciones aún no aplicadas en la maestra"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM operaciones").fetchone()[0]
+
+    def fallidas(self):
+        """Operaciones que la maestra rechazó (no se reintentan solas)"""
+        columnas = ("id", "descripcion", "creado", "error", "sentencias")
+        with self._lock:
+            cur = self.conn.execute(
+                f"SELECT {', '.join(columnas)} FROM operaciones_fallidas ORDER BY id"
+            )
+            return [dict(zip(columnas, fila)) for fila in cur]
+
+    def cantidad_fallidas(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM operaciones_fallidas").fetchone()[0]
+
+    def reintentar_fallidas(self, ids):
+        """Vuelve a encolar las operaciones rechazadas `ids` (al final de la cola)"""
+        marcas = ", ".join("?" * len(ids))
+        with self._lock, self.conn:
+            # Id nuevo: la marca de _diario_aplicado del intento anterior no aplica
+            movidas = self.conn.execute(f"""
+                INSERT INTO operaciones (sentencias, descripcion, creado)
+                SELECT sentencias, descripcion, creado FROM operaciones_fallidas
+                WHERE id IN ({marcas}) ORDER BY id
+            """, list(ids)).rowcount
+            self.conn.execute(f"DELETE FROM operaciones_fallidas WHERE id IN ({marcas})", list(ids))
+        if movidas:
+            logger.info("📝 %s operaciones rechazadas vuelven a la cola", movidas)
+            self._hay_trabajo.set()
+        return movidas
+
+    def descartar_fallidas(self, ids):
+        """Elimina del diario las operaciones rechazadas `ids`"""
+        marcas = ", ".join("?" * len(ids))
+        with self._lock, self.conn:
+            borradas = self.conn.execute(
+                f"DELETE FROM operaciones_fallidas WHERE id IN ({marcas})", list(ids)
+            ).rowcount
+        if borradas:
+            logger.warning("🗑️ %s operaciones rechazadas descartadas", borradas)
+        return borradas
+
+    @property
+    def ultimo_error(self):
+        return self._ultimo_error
+
+    def vaciar(self, timeout=10.0):
+        """Espera (hasta `timeout`) a que no queden operaciones pendientes"""
+        limite = time.monotonic() + timeout
+        self._hay_trabajo.set()
+        while self.pendientes() and time.monotonic() < limite:
+            time.sleep(0.05)
+        return self.pendientes() == 0
+
+    def detener(self, timeout=10.0):
+        """Intenta aplicar lo pendiente y detiene el hilo (lo que quede, sigue en el diario)"""
+        self.vaciar(timeout)
+        self._detener.set()
+        self._hay_trabajo.set()
+        self._hilo.join(timeout)
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Hilo de aplicación
+    # ------------------------------------------------------------------
+    def _bucle(self):
+        conn_red = None
+        espera = self.ESPERA_MINIMA
+        while not self._detener.is_set():
+            self._hay_trabajo.wait(self.INTERVALO_VACIADO)
+            self._hay_trabajo.clear()
+            try:
+                if conn_red is None:
+                    conn_red = sqlite3.connect(self.ruta_maestra, timeout=5)
+                    conn_red.execute("""
+                        CREATE TABLE IF NOT EXISTS _diario_aplicado (
+                            origen TEXT NOT NULL,
+                            operacion INTEGER NOT NULL,
+                            PRIMARY KEY (origen, operacion)
+                        )
+                    """)
+                    conn_red.commit()
+                aplico = False
+                while self._aplicar_lote(conn_red):
+                    aplico = True
+                if aplico:
+                    self._actualizar_huellas(conn_red)
+                espera = self.ESPERA_MINIMA
+                self._ultimo_error = None
+            except sqlite3.OperationalError as e:
+                # Red ocupada, bloqueada o caída: reintentar más tarde
+                self._ultimo_error = str(e)
+                logger.warning("⚠️ Escrituras diferidas: %s (reintento en %.1fs)", e, espera)
+                if conn_red is not None and "locked" not in str(e) and "busy" not in str(e):
+                    conn_red.close()
+                    conn_red = None
+                self._detener.wait(espera + random.uniform(0, espera / 2))
+                espera = min(espera * 2, self.ESPERA_MAXIMA)
+                self._hay_trabajo.set()
+            except Exception as e:
+                self._ultimo_error = str(e)
+                logger.error("❌ Error aplicando escrituras diferidas: %s", e)
+                self._detener.wait(self.ESPERA_MAXIMA)
+        if conn_red is not None:
+            conn_red.close()
+
+    def _actualizar_huellas(self, conn_red):
+        """Mantiene _huellas_rangos de la maestra; si está ocupada, queda para la próxima"""
+        try:
+            HuellasDB(conn_red).actualizar()
+        except sqlite3.OperationalError as e:
+            logger.debug("📝 Huellas de la maestra sin actualizar: %s", e)
+
+    def _aplicar_lote(self, conn_red):
+        """Aplica hasta TAMANO_LOTE operaciones en una transacción; True si aplicó alguna"""
+        with self._lock:
+            lote = self.conn.execute(
+                "SELECT id, sentencias, descripcion, creado FROM operaciones ORDER BY id LIMIT ?",
+                (self.TAMANO_LOTE,)
+            ).fetchall()
+        if not lote:
+            return False
+
+        aplicadas, rechazadas = [], []
+        conn_red.execute("BEGIN IMMEDIATE")
+        try:
+            # Las marcas de operaciones ya borradas del diario local no hacen falta
+            conn_red.execute(
+                "DELETE FROM _diario_aplicado WHERE origen=? AND operacion < ?",
+                (self.origen, lote[0][0])
+            )
+            for op_id, sentencias, descripcion, creado in lote:
+                ya_aplicada = conn_red.execute(
+                    "SELECT 1 FROM _diario_aplicado WHERE origen=? AND operacion=?",
+                    (self.origen, op_id)
+                ).fetchone()
+                if ya_aplicada:
+                    aplicadas.append(op_id)
+                    continue
+                conn_red.execute("SAVEPOINT operacion")
+                try:
+                    for sentencia in json.loads(sentencias):
+                        if "lote" in sentencia:
+                            conn_red.executemany(sentencia["sql"], sentencia["lote"])
+                        else:
+                            conn_red.execute(sentencia["sql"], sentencia.get("params", []))
+                    conn_red.execute(
+                        "INSERT INTO _diario_aplicado (origen, operacion) VALUES (?, ?)",
+                        (self.origen, op_id)
+                    )
+                    conn_red.execute("RELEASE operacion")
+                    aplicadas.append(op_id)
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error as e:
+                    # La maestra rechaza la operación (duplicado, esquema...): no reintentar
+                    conn_red.execute("ROLLBACK TO operacion")
+                    conn_red.execute("RELEASE operacion")
+                    rechazadas.append((op_id, sentencias, descripcion, creado, str(e)))
+            conn_red.execute("COMMIT")
+        except Exception:
+            conn_red.execute("ROLLBACK")
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "UPDATE operaciones SET intentos = intentos + 1 WHERE id = ?",
+                    [(fila[0],) for fila in lote]
+                )
+            raise
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO operaciones_fallidas (id, sentencias, descripcion, creado, error) "
+                "VALUES (?, ?, ?, ?, ?)", rechazadas
+            )
+            ids = aplicadas + [r[0] for r in rechazadas]
+            self.conn.executemany("DELETE FROM operaciones WHERE id = ?", [(i,) for i in ids])
+
+        for op_id, _, descripcion, _, error in rechazadas:
+            logger.error("❌ Operación #%s rechazada por la red (%s): %s", op_id, descripcion, error)
+        logger.debug("📝 %s operaciones aplicadas en la red", len(aplicadas))
+        return True
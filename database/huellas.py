@@ -0,0 +1,370 @@
+"""
+🌳 HUELLAS MERKLE - Sistema de Inventario AGC
+Huellas por tabla para comparar dos bases sin recorrerlas completas
+"""
+
+import hashlib
+import json
+
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class HuellasDB:
+    """
+    Árbol de Merkle por tabla, mantenido de forma incremental.
+
+    - Las filas se agrupan en rangos de id (FILAS_POR_RANGO); cada rango tiene
+      un hash guardado en _huellas_rangos.
+    - Triggers marcan en _huellas_pendientes los rangos tocados por INSERT,
+      UPDATE o DELETE; actualizar() solo recalcula esos rangos.
+    - Los nodos internos agrupan RAMIFICACION hijos por nivel hasta la raíz,
+      así dos bases se comparan bajando solo por las ramas distintas.
+
+    Con la base sin cambios, raiz() no recalcula nada.
+
+    Con `solo_lectura` no escribe nunca en la base (ni instala ni persiste):
+    los rangos pendientes se recalculan en memoria sobre los guardados, y
+    el resultado vale hasta olvidar(). Es para leer huellas de la maestra
+    compartida sin tomar su lock de escritura; las mantiene quien escribe.
+    """
+
+    TABLAS = ['bienes', 'movimientos', 'bienes_movimientos', 'usuarios', 'logs_actividad']
+
+    # Tablas con id no numérico: un único rango
+    TABLAS_ID_TEXTO = {'usuarios'}
+
+    FILAS_POR_RANGO = 256
+    RAMIFICACION = 16
+    NIVELES = 4  # 16^4 rangos * 256 filas ≈ 16M ids por tabla
+
+    def __init__(self, conn, tablas=None, solo_lectura=False):
+        self.conn = conn
+        self.solo_lectura = solo_lectura
+        self.tablas = [t for t in (tablas or self.TABLAS) if self._tabla_existe(t)]
+        self._cache_rangos = {}
+        self._cache_nodos = {}
+        if solo_lectura:
+            self._instaladas = self._tabla_existe('_huellas_pendientes')
+        else:
+            self.instalar()
+
+    # ------------------------------------------------------------------
+    # Instalación
+    # ------------------------------------------------------------------
+    def instalar(self):
+        """Crea las tablas de huellas y los triggers (idempotente)"""
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _huellas_rangos (
+                    tabla TEXT NOT NULL,
+                    rango INTEGER NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (tabla, rango)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _huellas_pendientes (
+                    tabla TEXT NOT NULL,
+                    rango INTEGER NOT NULL,
+                    PRIMARY KEY (tabla, rango)
+                )
+            """)
+            for tabla in self.tablas:
+                if self._triggers_instalados(tabla):
+                    continue
+                for evento, filas in (("INSERT", ["NEW"]), ("UPDATE", ["OLD", "NEW"]), ("DELETE", ["OLD"])):
+                    marcas = "\n".join(
+                        f"INSERT OR IGNORE INTO _huellas_pendientes (tabla, rango) "
+                        f"VALUES ('{tabla}', {self._expresion_rango(tabla, fila)});"
+                        for fila in filas
+                    )
+                    self.conn.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS _huellas_{tabla}_{evento.lower()}
+                        AFTER {evento} ON {tabla}
+                        BEGIN
+                            {marcas}
+                        END
+                    """)
+                # Primera vez: todo lo existente está pendiente
+                self.conn.execute(f"""
+                    INSERT OR IGNORE INTO _huellas_pendientes (tabla, rango)
+                    SELECT DISTINCT '{tabla}', {self._expresion_rango(tabla)} FROM {tabla}
+                """)
+                logger.debug("🌳 Huellas instaladas en %s", tabla)
+
+    def _expresion_rango(self, tabla, fila=None):
+        if tabla in self.TABLAS_ID_TEXTO:
+            return "0"
+        columna = f"{fila}.id" if fila else "id"
+        return f"{columna} / {self.FILAS_POR_RANGO}"
+
+    def _triggers_instalados(self, tabla):
+        fila = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name=?",
+            (f"_huellas_{tabla}_insert",)
+        ).fetchone()
+        return fila is not None
+
+    def _tabla_existe(self, tabla):
+        fila = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tabla,)
+        ).fetchone()
+        return fila is not None
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+    def actualizar(self, tabla=None):
+        """Recalcula solo los rangos marcados como pendientes"""
+        tablas = [tabla] if tabla else self.tablas
+        recalculados = 0
+        with transaccion(self.conn):
+            for t in tablas:
+                pendientes = [r[0] for r in self.conn.execute(
+                    "SELECT rango FROM _huellas_pendientes WHERE tabla=?", (t,)
+                )]
+                if not pendientes:
+                    continue
+                for rango in pendientes:
+                    hash_rango = self._calcular_hash_rango(t, rango)
+                    if hash_rango:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO _huellas_rangos (tabla, rango, hash) VALUES (?, ?, ?)",
+                            (t, rango, hash_rango)
+                        )
+                    else:
+                        self.conn.execute(
+                            "DELETE FROM _huellas_rangos WHERE tabla=? AND rango=?", (t, rango)
+                        )
+                self.conn.execute("DELETE FROM _huellas_pendientes WHERE tabla=?", (t,))
+                self._cache_rangos.pop(t, None)
+                self._cache_nodos = {k: v for k, v in self._cache_nodos.items() if k[0] != t}
+                recalculados += len(pendientes)
+        if recalculados:
+            logger.debug("🌳 %s rangos recalculados", recalculados)
+        return recalculados
+
+    def _calcular_hash_rango(self, tabla, rango):
+        filas = self.hashes_filas(tabla, rango)
+        if not filas:
+            return ""
+        digest = hashlib.sha256()
+        for id_fila in sorted(filas, key=str):
+            digest.update(f"{id_fila}:{filas[id_fila]};".encode())
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Consulta del árbol
+    # ------------------------------------------------------------------
+    def hashes_rangos(self, tabla):
+        """{rango: hash} de la tabla (actualiza pendientes antes)"""
+        if self.solo_lectura:
+            if tabla not in self._cache_rangos:
+                self._cache_rangos[tabla] = self._rangos_en_memoria(tabla)
+            return self._cache_rangos[tabla]
+        self.actualizar(tabla)
+        if tabla not in self._cache_rangos:
+            self._cache_rangos[tabla] = {
+                rango: hash_rango for rango, hash_rango in self.conn.execute(
+                    "SELECT rango, hash FROM _huellas_rangos WHERE tabla=?", (tabla,)
+                )
+            }
+        return self._cache_rangos[tabla]
+
+    def _rangos_en_memoria(self, tabla):
+        """Rangos guardados con los pendientes recalculados, sin escribir nada"""
+        # BEGIN diferido: una lectura consistente que no pide el lock de escritura
+        with transaccion(self.conn):
+            if self._instaladas:
+                rangos = dict(self.conn.execute(
+                    "SELECT rango, hash FROM _huellas_rangos WHERE tabla=?", (tabla,)
+                ).fetchall())
+                pendientes = [r[0] for r in self.conn.execute(
+                    "SELECT rango FROM _huellas_pendientes WHERE tabla=?", (tabla,)
+                )]
+            else:
+                # Nunca se instalaron: todo está pendiente
+                rangos = {}
+                pendientes = [r[0] for r in self.conn.execute(
+                    f"SELECT DISTINCT {self._expresion_rango(tabla)} FROM {tabla}"
+                )]
+            for rango in pendientes:
+                hash_rango = self._calcular_hash_rango(tabla, rango)
+                if hash_rango:
+                    rangos[rango] = hash_rango
+                else:
+                    rangos.pop(rango, None)
+        return rangos
+
+    def olvidar(self):
+        """Descarta los hashes en memoria (en solo lectura, para ver cambios nuevos)"""
+        self._cache_rangos.clear()
+        self._cache_nodos.clear()
+        if self.solo_lectura:
+            self._instaladas = self._tabla_existe('_huellas_pendientes')
+
+    def nodo(self, tabla, nivel, indice):
+        """
+        Hash de un nodo del árbol. Nivel 0 son los rangos; NIVELES es la raíz.
+        Un subárbol vacío vale "".
+        """
+        return self._nodo(tabla, self.hashes_rangos(tabla), nivel, indice)
+
+    def _nodo(self, tabla, rangos, nivel, indice):
+        if nivel == 0:
+            return rangos.get(indice, "")
+
+        clave = (tabla, nivel, indice)
+        if clave not in self._cache_nodos:
+            ancho = self.RAMIFICACION ** nivel
+            primero, ultimo = indice * ancho, (indice + 1) * ancho
+            if not any(primero <= r < ultimo for r in rangos):
+                self._cache_nodos[clave] = ""
+            else:
+                digest = hashlib.sha256()
+                for hijo in self.hijos(indice):
+                    digest.update(self._nodo(tabla, rangos, nivel - 1, hijo).encode() + b";")
+                self._cache_nodos[clave] = digest.hexdigest()
+        return self._cache_nodos[clave]
+
+    def hijos(self, indice):
+        return range(indice * self.RAMIFICACION, (indice + 1) * self.RAMIFICACION)
+
+    def raiz(self, tabla):
+        return self.nodo(tabla, self.NIVELES, 0)
+
+    def raices(self):
+        """{tabla: hash raíz} - lo único que hace falta intercambiar si no hay cambios"""
+        return {tabla: self.raiz(tabla) for tabla in self.tablas}
+
+    def hashes_filas(self, tabla, rango):
+        """{id: hash de la fila} de un rango"""
+        if tabla in self.TABLAS_ID_TEXTO:
+            cursor = self.conn.execute(f"SELECT * FROM {tabla}")
+        else:
+            primero = rango * self.FILAS_POR_RANGO
+            cursor = self.conn.execute(
+                f"SELECT * FROM {tabla} WHERE id >= ? AND id < ?",
+                (primero, primero + self.FILAS_POR_RANGO)
+            )
+        return _hashes_cursor(cursor)
+
+    def hashes_de_ids(self, tabla, ids, tamano_lote=500):
+        """{id: hash de la fila} de ids puntuales (los inexistentes no aparecen)"""
+        ids = list(ids)
+        resultado = {}
+        for i in range(0, len(ids), tamano_lote):
+            lote = ids[i:i + tamano_lote]
+            cursor = self.conn.execute(
+                f"SELECT * FROM {tabla} WHERE id IN ({','.join('?' * len(lote))})", lote
+            )
+            resultado.update(_hashes_cursor(cursor))
+        return resultado
+
+
+def _hashes_cursor(cursor):
+    columnas = [d[0] for d in cursor.description]
+    resultado = {}
+    for fila in cursor:
+        datos = dict(zip(columnas, fila))
+        # Orden de columnas independiente del orden de ALTER TABLE
+        contenido = json.dumps(datos, sort_keys=True, default=str, ensure_ascii=False)
+        resultado[datos['id']] = hashlib.sha256(contenido.encode()).hexdigest()
+    return resultado
+
+
+def comparar(huellas_a, huellas_b, tabla):
+    """
+    Baja por el árbol solo donde los hashes difieren.
+
+    Devuelve {'solo_a': [...], 'solo_b': [...], 'distintas': [...]} con ids.
+    """
+    diferencias = {'solo_a': [], 'solo_b': [], 'distintas': []}
+    pila = [(HuellasDB.NIVELES, 0)]
+    while pila:
+        nivel, indice = pila.pop()
+        if huellas_a.nodo(tabla, nivel, indice) == huellas_b.nodo(tabla, nivel, indice):
+            continue
+        if nivel > 0:
+            pila.extend((nivel - 1, hijo) for hijo in huellas_a.hijos(indice))
+            continue
+
+        filas_a = huellas_a.hashes_filas(tabla, indice)
+        filas_b = huellas_b.hashes_filas(tabla, indice)
+        for id_fila, hash_fila in filas_a.items():
+            if id_fila not in filas_b:
+                diferencias['solo_a'].append(id_fila)
+            elif filas_b[id_fila] != hash_fila:
+                diferencias['distintas'].append(id_fila)
+        diferencias['solo_b'].extend(i for i in filas_b if i not in filas_a)
+    return diferencias
+
+
+def reparar(huellas_origen, huellas_destino, tabla, diferencias=None):
+    """
+    Deja en destino las mismas filas que en origen, tocando solo las distintas.
+    Devuelve la cantidad de filas escritas o borradas.
+    """
+    if diferencias is None:
+        diferencias = comparar(huellas_origen, huellas_destino, tabla)
+
+    copiar = diferencias['solo_a'] + diferencias['distintas']
+    borrar = diferencias['solo_b']
+    if not copiar and not borrar:
+        return 0
+
+    copiar_filas(huellas_origen.conn, huellas_destino.conn, tabla, copiar)
+    borrar_filas(huellas_destino.conn, tabla, borrar)
+
+    logger.info("🔧 %s: %s filas copiadas, %s borradas", tabla, len(copiar), len(borrar))
+    return len(copiar) + len(borrar)
+
+
+def diferencias_por_ids(huellas_origen, huellas_destino, tabla, ids):
+    """Como comparar(), pero restringido a un conjunto de ids conocido"""
+    filas_a = huellas_origen.hashes_de_ids(tabla, ids)
+    filas_b = huellas_destino.hashes_de_ids(tabla, ids)
+    return {
+        'solo_a': [i for i in filas_a if i not in filas_b],
+        'solo_b': [i for i in filas_b if i not in filas_a],
+        'distintas': [i for i, h in filas_a.items() if i in filas_b and filas_b[i] != h],
+    }
+
+
+def copiar_filas(origen, destino, tabla, ids, tamano_lote=500):
+    """INSERT OR REPLACE en destino de las filas `ids` de origen (columnas comunes)"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    columnas_destino = {c[1] for c in destino.execute(f"PRAGMA table_info({tabla})")}
+    with transaccion(destino):
+        for i in range(0, len(ids), tamano_lote):
+            lote = ids[i:i + tamano_lote]
+            marcadores = ",".join("?" * len(lote))
+            cursor = origen.execute(f"SELECT * FROM {tabla} WHERE id IN ({marcadores})", lote)
+            columnas = [d[0] for d in cursor.description if d[0] in columnas_destino]
+            indices = [n for n, d in enumerate(cursor.description) if d[0] in columnas_destino]
+            filas = [tuple(fila[n] for n in indices) for fila in cursor]
+            destino.executemany(
+                f"INSERT OR REPLACE INTO {tabla} ({', '.join(columnas)}) "
+                f"VALUES ({', '.join('?' * len(columnas))})",
+                filas
+            )
+    return len(ids)
+
+
+def borrar_filas(destino, tabla, ids, tamano_lote=500):
+    """DELETE en destino de las filas `ids`"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    with transaccion(destino):
+        for i in range(0, len(ids), tamano_lote):
+            lote = ids[i:i + tamano_lote]
+            destino.execute(
+                f"DELETE FROM {tabla} WHERE id IN ({','.join('?' * len(lote))})", lote
+            )
+    return len(ids)
@@ -0,0 +1,275 @@
+"""
+🧰 MANTENIMIENTO PROGRAMADO - Sistema de Inventario AGC
+PRAGMA optimize, ANALYZE, vacuum incremental, integrity_check y archivo en los ratos libres
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+from database import resumen_movimientos
+from database.archivo import ArchivoMovimientos
+from database.metricas import metricas
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class MantenimientoProgramado:
+    """
+    Mantiene sano un archivo SQLite sin que nadie tenga que acordarse.
+
+    Un hilo con conexión propia revisa cada INTERVALO segundos si la base
+    está inactiva (este proceso no la usó y ningún otro confirmó cambios,
+    según PRAGMA data_version, en INACTIVIDAD segundos) y si `puede_ejecutar()`
+    lo permite (ej: SyncManager.ventana_libre, para no pisar una
+    sincronización). Entonces corre las tareas vencidas según TAREAS:
+
+    - optimize: PRAGMA optimize (re-analiza solo lo que cambió mucho);
+    - analyze: ANALYZE completo con analysis_limit, para que no sea eterno;
+    - vacuum: devuelve páginas libres de a PAGINAS_POR_PASO con
+      incremental_vacuum. Si la base no está en auto_vacuum=INCREMENTAL y
+      tiene más de UMBRAL_LIBRES de páginas libres, la convierte una vez
+      con VACUUM (solo si pesa menos de VACUUM_COMPLETO_MAX_MB);
+    - integridad: PRAGMA integrity_check;
+    - resumenes: recalcula cantidad_bienes/fichas/prds de los movimientos
+      (y del archivo) y corrige los que no coinciden con sus vínculos;
+    - archivo: mueve a la base de archivo los movimientos anteriores a
+      `horizonte_archivo` días y los eliminados (ver ArchivoMovimientos).
+      Va antes que vacuum, que después devuelve el espacio.
+
+    Antes de cada tarea y de cada paso se vuelve a verificar la ventana;
+    `interrumpir()` corta lo que esté corriendo. Cada corrida queda en la
+    tabla _mantenimiento (local: no se sincroniza).
+    """
+
+    INTERVALO = 60
+    INACTIVIDAD = 120
+    PAGINAS_POR_PASO = 256
+    UMBRAL_LIBRES = 0.20
+    VACUUM_COMPLETO_MAX_MB = 200
+    LIMITE_ANALISIS = 1000
+    MAX_REGISTROS = 200
+
+    # Tarea -> cada cuánto (segundos) desde la última corrida exitosa
+    TAREAS = {
+        'optimize': 6 * 3600,
+        'archivo': 24 * 3600,
+        'vacuum': 24 * 3600,
+        'analyze': 7 * 24 * 3600,
+        'integridad': 7 * 24 * 3600,
+        'resumenes': 7 * 24 * 3600,
+    }
+
+    def __init__(self, ruta_db, puede_ejecutar=None, intervalo=None, inactividad=None, horizonte_archivo=None):
+        self.ruta_db = ruta_db
+        self.puede_ejecutar = puede_ejecutar
+        self.horizonte_archivo = horizonte_archivo
+        self.intervalo = intervalo or self.INTERVALO
+        self.inactividad = self.INACTIVIDAD if inactividad is None else inactividad
+        self._detener = threading.Event()
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._ultimo_cambio_externo = time.monotonic()
+
+        # timeout corto: si la base está ocupada, el mantenimiento es el que cede
+        self.conn = sqlite3.connect(ruta_db, check_same_thread=False, timeout=1)
+        self._instalar()
+
+        self._hilo = threading.Thread(target=self._bucle, name="mantenimiento-db", daemon=True)
+        self._hilo.start()
+
+    def _instalar(self):
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _mantenimiento (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    tarea TEXT NOT NULL,
+                    inicio TEXT NOT NULL,
+                    duracion_ms INTEGER,
+                    resultado TEXT NOT NULL,
+                    detalle TEXT
+                )
+            """)
+
+    # ------------------------------------------------------------------
+    # Ventana de ejecución
+    # ------------------------------------------------------------------
+    def inactiva(self):
+        """True si nadie usó la base en los últimos `inactividad` segundos"""
+        ahora = time.monotonic()
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._ultimo_cambio_externo = ahora
+        ultima_local = metricas().ultima_actividad or 0
+        return ahora - max(ultima_local, self._ultimo_cambio_externo) >= self.inactividad
+
+    def _puede_seguir(self):
+        if self._detener.is_set():
+            return False
+        try:
+            if self.puede_ejecutar is not None and not self.puede_ejecutar():
+                return False
+            return self.inactiva()
+        except Exception as e:
+            logger.debug("🧰 No se pudo evaluar la ventana de mantenimiento: %s", e)
+            return False
+
+    def interrumpir(self):
+        """Corta la tarea en curso (la siguiente revisión vuelve a intentar)"""
+        self.conn.interrupt()
+
+    # ------------------------------------------------------------------
+    # Tareas
+    # ------------------------------------------------------------------
+    def pendientes(self):
+        """Tareas vencidas, en el orden de TAREAS (las interrumpidas o con error se reintentan)"""
+        ahora = datetime.now()
+        vencidas = []
+        for tarea, periodo in self.TAREAS.items():
+            ultima = self.conn.execute(
+                "SELECT MAX(inicio) FROM _mantenimiento "
+                "WHERE tarea = ? AND resultado IN ('ok', 'omitida', 'problemas')", (tarea,)
+            ).fetchone()[0]
+            if ultima is None or datetime.fromisoformat(ultima) + timedelta(seconds=periodo) <= ahora:
+                vencidas.append(tarea)
+        return vencidas
+
+    def revisar(self, forzar=False):
+        """Corre las tareas pendientes si la ventana lo permite; devuelve [(tarea, resultado)]"""
+        hechas = []
+        with self._lock:
+            if not forzar and not self._puede_seguir():
+                return hechas
+            for tarea in (list(self.TAREAS) if forzar else self.pendientes()):
+                if not forzar and not self._puede_seguir():
+                    break
+                hechas.append((tarea, self.ejecutar(tarea, forzar)))
+        return hechas
+
+    def ejecutar(self, tarea, forzar=False):
+        inicio = datetime.now()
+        reloj = time.perf_counter()
+        try:
+            resultado, detalle = getattr(self, f"_tarea_{tarea}")(forzar)
+        except sqlite3.OperationalError as e:
+            # interrupt() o base ocupada: no es una falla de la base
+            resultado, detalle = 'interrumpida', str(e)
+        except sqlite3.Error as e:
+            resultado, detalle = 'error', str(e)
+        duracion_ms = int((time.perf_counter() - reloj) * 1000)
+        self._registrar(tarea, inicio, duracion_ms, resultado, detalle)
+        if resultado == 'ok':
+            logger.info("🧰 Mantenimiento %s: %s (%s ms)", tarea, detalle, duracion_ms)
+        elif resultado == 'problemas':
+            logger.error("❌ Mantenimiento %s: %s", tarea, detalle)
+        else:
+            logger.warning("⚠️ Mantenimiento %s %s: %s", tarea, resultado, detalle)
+        return resultado
+
+    def _tarea_optimize(self, forzar):
+        self.conn.execute("PRAGMA optimize")
+        return 'ok', "PRAGMA optimize"
+
+    def _tarea_analyze(self, forzar):
+        self.conn.execute(f"PRAGMA analysis_limit={self.LIMITE_ANALISIS}")
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
+        return 'ok', f"ANALYZE (analysis_limit={self.LIMITE_ANALISIS})"
+
+    def _tarea_vacuum(self, forzar):
+        paginas = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        libres = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        modo = self.conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        tamano_mb = paginas * self.conn.execute("PRAGMA page_size").fetchone()[0] / (1024 * 1024)
+
+        if modo != 2:  # 2 = INCREMENTAL
+            if not paginas or libres / paginas < self.UMBRAL_LIBRES:
+                return 'ok', f"{libres} páginas libres de {paginas}: no hace falta compactar"
+            if tamano_mb > self.VACUUM_COMPLETO_MAX_MB:
+                return 'omitida', f"{tamano_mb:.0f} MB: VACUUM completo demasiado largo para hacerlo solo"
+            # El modo incremental recién vale después de un VACUUM completo
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.conn.execute("VACUUM")
+            return 'ok', f"VACUUM completo ({libres} páginas liberadas, auto_vacuum=INCREMENTAL)"
+
+        liberadas = 0
+        while libres and (forzar or self._puede_seguir()):
+            self.conn.execute(f"PRAGMA incremental_vacuum({self.PAGINAS_POR_PASO})").fetchall()
+            restantes = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            liberadas += libres - restantes
+            if restantes >= libres:
+                break
+            libres = restantes
+        return ('ok' if not libres else 'interrumpida'), f"{liberadas} páginas liberadas, quedan {libres}"
+
+    def _tarea_archivo(self, forzar):
+        if not self.horizonte_archivo:
+            return 'omitida', "archivo desactivado (archivo_horizonte_dias)"
+        movidos = ArchivoMovimientos(self.conn, self.ruta_db).archivar(self.horizonte_archivo)
+        return 'ok', f"{movidos} movimientos archivados (horizonte {self.horizonte_archivo} días)"
+
+    def _tarea_resumenes(self, forzar):
+        corregidos = resumen_movimientos.recalcular(self.conn)
+        archivo = ArchivoMovimientos(self.conn, self.ruta_db)
+        if archivo.adjuntar():
+            corregidos += resumen_movimientos.recalcular(self.conn, esquema=archivo.ESQUEMA)
+        return 'ok', f"{corregidos} movimientos con resúmenes corregidos"
+
+    def _tarea_integridad(self, forzar):
+        filas = [fila[0] for fila in self.conn.execute("PRAGMA integrity_check(100)")]
+        if filas == ['ok']:
+            return 'ok', "integrity_check: ok"
+        return 'problemas', "; ".join(filas[:10])
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def _registrar(self, tarea, inicio, duracion_ms, resultado, detalle):
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO _mantenimiento (tarea, inicio, duracion_ms, resultado, detalle) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (tarea, inicio.isoformat(timespec="seconds"), duracion_ms, resultado, detalle)
+                )
+                self.conn.execute(
+                    "DELETE FROM _mantenimiento WHERE id <= (SELECT MAX(id) FROM _mantenimiento) - ?",
+                    (self.MAX_REGISTROS,)
+                )
+        except sqlite3.Error as e:
+            logger.debug("🧰 No se pudo registrar el mantenimiento: %s", e)
+
+    def historial(self, limite=20):
+        """Últimas corridas: [{tarea, inicio, duracion_ms, resultado, detalle}]"""
+        # Conexión aparte: no esperar a que termine la tarea en curso
+        conn = sqlite3.connect(self.ruta_db, timeout=1)
+        try:
+            filas = conn.execute(
+                "SELECT tarea, inicio, duracion_ms, resultado, detalle FROM _mantenimiento "
+                "ORDER BY id DESC LIMIT ?", (limite,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(zip(('tarea', 'inicio', 'duracion_ms', 'resultado', 'detalle'), fila)) for fila in filas]
+
+    # ------------------------------------------------------------------
+    # Hilo
+    # ------------------------------------------------------------------
+    def detener(self):
+        self._detener.set()
+        self.interrumpir()
+        self._hilo.join(5)
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.revisar()
+            except sqlite3.Error as e:
+                logger.debug("🧰 Mantenimiento no disponible: %s", e)
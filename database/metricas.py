@@ -0,0 +1,285 @@
+"""
+📊 MÉTRICAS DE RENDIMIENTO - Sistema de Inventario AGC
+Latencias de DB, consultas lentas, fases de sincronización y dibujo de tablas
+"""
+
+import functools
+import json
+import platform
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+# Listas IN con cualquier cantidad de marcadores: una sola entrada del catálogo
+_RE_LISTA_IN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+
+
+class MetricasRendimiento:
+    """
+    Registro en memoria, liviano y seguro entre hilos, que alimenta el
+    panel de rendimiento.
+
+    - Series por (categoría, nombre): 'db' por método de DB, 'sync' por
+      fase de sincronización, 'ui' por grilla dibujada. De cada una se
+      guardan las últimas MUESTRAS duraciones (para p50/p95) y las filas.
+    - Consultas lentas: SQL con sus parámetros que tardaron más de
+      SQL_LENTA_MS, las MAX_SQL_LENTAS más recientes.
+    - Catálogo de sentencias ejecutadas (hasta MAX_CONSULTAS distintas),
+      con llamadas, tiempo acumulado y la última sentencia con sus
+      parámetros: lo que analiza el asesor de índices. Las listas
+      `IN (?, ?, ...)` cuentan como una sola sentencia sin importar cuántos
+      marcadores tengan.
+    """
+
+    MUESTRAS = 500
+    SQL_LENTA_MS = 20
+    MAX_SQL_LENTAS = 50
+    MAX_CONSULTAS = 300
+
+    def __init__(self):
+        self.activo = True
+        self.desde = datetime.now()
+        self.ultima_actividad = None   # time.monotonic() del último registro (para detectar inactividad)
+        self._lock = threading.Lock()
+        self._series = {}
+        self._sql_lentas = deque(maxlen=self.MAX_SQL_LENTAS)
+        self._consultas = {}
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def registrar(self, categoria, nombre, segundos, filas=None):
+        if not self.activo:
+            return
+        self.ultima_actividad = time.monotonic()
+        with self._lock:
+            serie = self._series.get((categoria, nombre))
+            if serie is None:
+                serie = self._series[(categoria, nombre)] = {
+                    'llamadas': 0, 'filas': 0, 'con_filas': 0,
+                    'muestras': deque(maxlen=self.MUESTRAS), 'ultimo': None,
+                }
+            serie['llamadas'] += 1
+            serie['muestras'].append(segundos)
+            serie['ultimo'] = segundos
+            if filas is not None:
+                serie['filas'] += filas
+                serie['con_filas'] += 1
+
+    def registrar_sql(self, sql, parametros, segundos, filas=None):
+        if not self.activo:
+            return
+        clave = _RE_LISTA_IN.sub("IN (?…)", sql)
+        with self._lock:
+            consulta = self._consultas.get(clave)
+            if consulta is None and len(self._consultas) < self.MAX_CONSULTAS:
+                consulta = self._consultas[clave] = {'llamadas': 0, 'segundos': 0.0}
+            if consulta is not None:
+                consulta['llamadas'] += 1
+                consulta['segundos'] += segundos
+                # La última sentencia real, que coincide con sus parámetros (para EXPLAIN)
+                consulta['sql'] = sql
+                consulta['parametros'] = parametros
+            if segundos * 1000 < self.SQL_LENTA_MS:
+                return
+            self._sql_lentas.append({
+                'fecha': datetime.now().strftime("%H:%M:%S"),
+                'ms': round(segundos * 1000, 1),
+                'filas': filas,
+                'sql': " ".join(sql.split()),
+                'parametros': list(parametros) if isinstance(parametros, (list, tuple)) else parametros,
+            })
+
+    @contextmanager
+    def medir(self, categoria, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(categoria, nombre, time.perf_counter() - inicio)
+
+    def reiniciar(self):
+        with self._lock:
+            self._series.clear()
+            self._sql_lentas.clear()
+            self._consultas.clear()
+            self.desde = datetime.now()
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def resumen(self, categoria):
+        """[{nombre, llamadas, p50_ms, p95_ms, max_ms, ultimo_ms, filas_promedio}] del más costoso al menos"""
+        with self._lock:
+            series = [(nombre, dict(serie, muestras=sorted(serie['muestras'])))
+                      for (cat, nombre), serie in self._series.items() if cat == categoria]
+        filas = []
+        for nombre, serie in series:
+            muestras = serie['muestras']
+            filas.append({
+                'nombre': nombre,
+                'llamadas': serie['llamadas'],
+                'p50_ms': round(_percentil(muestras, 0.50) * 1000, 2),
+                'p95_ms': round(_percentil(muestras, 0.95) * 1000, 2),
+                'max_ms': round(muestras[-1] * 1000, 2) if muestras else 0.0,
+                'ultimo_ms': round((serie['ultimo'] or 0) * 1000, 2),
+                'filas_promedio': round(serie['filas'] / serie['con_filas'], 1) if serie['con_filas'] else None,
+            })
+        filas.sort(key=lambda f: f['p95_ms'] * f['llamadas'], reverse=True)
+        return filas
+
+    def sql_lentas(self):
+        """Consultas lentas, la más reciente primero"""
+        with self._lock:
+            return list(reversed(self._sql_lentas))
+
+    def consultas(self):
+        """[{sql, parametros, llamadas, total_ms}] de las sentencias vistas, la de más tiempo acumulado primero"""
+        with self._lock:
+            vistas = [dict(datos) for datos in self._consultas.values()]
+        consultas = [{
+            'sql': " ".join(datos['sql'].split()),
+            'parametros': datos.get('parametros', ()),
+            'llamadas': datos['llamadas'],
+            'total_ms': round(datos['segundos'] * 1000, 2),
+        } for datos in vistas]
+        consultas.sort(key=lambda c: c['total_ms'], reverse=True)
+        return consultas
+
+    def exportar(self, ruta, extra=None):
+        """Vuelca todo a JSON (para mandar a soporte)"""
+        datos = {
+            'fecha': datetime.now().isoformat(timespec="seconds"),
+            'desde': self.desde.isoformat(timespec="seconds"),
+            'equipo': platform.node(),
+            'plataforma': platform.platform(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'db': self.resumen('db'),
+            'sync': self.resumen('sync'),
+            'ui': self.resumen('ui'),
+            'sql_lentas': self.sql_lentas(),
+            **(extra or {}),
+        }
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False, default=str)
+        logger.info("📊 Métricas exportadas a %s", ruta)
+        return ruta
+
+
+def _percentil(ordenadas, p):
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+
+_metricas = MetricasRendimiento()
+
+
+def metricas():
+    """Registro único del proceso"""
+    return _metricas
+
+
+def medir(categoria, nombre):
+    """Atajo: `with medir("ui", "tabla_bienes"): ...`"""
+    return _metricas.medir(categoria, nombre)
+
+
+def medido(metodo):
+    """Decorador de métodos de DB: duración y filas devueltas por llamada"""
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = metodo(*args, **kwargs)
+            return resultado
+        finally:
+            filas = len(resultado) if isinstance(resultado, (list, tuple)) else None
+            _metricas.registrar('db', metodo.__name__, time.perf_counter() - inicio, filas)
+    return envoltura
+
+
+# Gancho de SQL ------------------------------------------------------------------
+
+class CursorMedido(sqlite3.Cursor):
+    """Cursor que mide cada sentencia: ejecución y, si la hay, lectura con fetch*"""
+
+    _pendiente = None
+
+    def execute(self, sql, parametros=()):
+        self._cerrar_medicion()
+        inicio = time.perf_counter()
+        try:
+            return super().execute(sql, parametros)
+        finally:
+            self._pendiente = [sql, parametros, time.perf_counter() - inicio]
+            if self.description is None:
+                self._cerrar_medicion()
+
+    def executemany(self, sql, lote):
+        self._cerrar_medicion()
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(sql, lote)
+        finally:
+            _metricas.registrar_sql(sql, (), time.perf_counter() - inicio)
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = super().fetchall()
+        self._cerrar_medicion(len(filas), time.perf_counter() - inicio)
+        return filas
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = super().fetchone()
+        self._cerrar_medicion(None, time.perf_counter() - inicio)
+        return fila
+
+    def close(self):
+        self._cerrar_medicion()
+        super().close()
+
+    def _cerrar_medicion(self, filas=None, lectura=0.0):
+        if self._pendiente is None:
+            return
+        sql, parametros, segundos = self._pendiente
+        self._pendiente = None
+        _metricas.registrar_sql(sql, parametros, segundos + lectura, filas)
+
+
+class ConexionMedida(sqlite3.Connection):
+    """Conexión cuyos cursores (y conn.execute) pasan por CursorMedido"""
+
+    def cursor(self, factory=CursorMedido):
+        return super().cursor(factory)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, lote):
+        return self.cursor().executemany(sql, lote)
+
+
+def explicar(conn, sql, parametros=()):
+    """Plan de EXPLAIN QUERY PLAN como texto indentado (no ejecuta la sentencia)"""
+    try:
+        filas = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros or ()).fetchall()
+    except sqlite3.Error as e:
+        return f"No se pudo obtener el plan: {e}"
+    niveles = {0: -1}
+    lineas = []
+    for id_nodo, padre, _, detalle in filas:
+        niveles[id_nodo] = niveles.get(padre, -1) + 1
+        lineas.append("  " * niveles[id_nodo] + detalle)
+    return "\n".join(lineas)
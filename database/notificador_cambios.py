@@ -0,0 +1,194 @@
+"""
+🔔 NOTIFICADOR DE CAMBIOS - Sistema de Inventario AGC
+Avisa a los puestos qué tablas e ids cambiaron en una base compartida
+"""
+
+import sqlite3
+import threading
+
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class NotificadorCambios:
+    """
+    Canal liviano de cambios sobre un archivo SQLite compartido.
+
+    - Triggers anotan en _cambios (tabla, fila_id) cada INSERT, UPDATE o
+      DELETE de las tablas vigiladas, lo haga quien lo haga.
+    - Un hilo con conexión propia mira PRAGMA data_version cada INTERVALO
+      segundos: solo lee el encabezado de la base y no cambia si nadie
+      confirmó nada. Recién cuando cambia se leen las filas nuevas de
+      _cambios (por id, sin consultas completas).
+    - Los oyentes reciben [{"tablas": [...], "ids": {tabla: [...]}}], el
+      mismo formato que publica el servidor de coordinación.
+    """
+
+    INTERVALO = 2.0       # segundos entre chequeos
+    MAX_IDS = 500         # más ids que esto en un chequeo: se avisa la tabla entera
+
+    def __init__(self, ruta_db, intervalo=None):
+        self.ruta_db = ruta_db
+        self.intervalo = intervalo or self.INTERVALO
+        self._oyentes = []
+        self._detener = threading.Event()
+        self._lock = threading.Lock()
+        self._data_version = None
+
+        self.conn = sqlite3.connect(ruta_db, check_same_thread=False, timeout=30)
+        self.instalar()
+        self._ultimo_id = self._max_id()
+
+        self._hilo = threading.Thread(target=self._bucle, name="notificador-cambios", daemon=True)
+        self._hilo.start()
+
+    # ------------------------------------------------------------------
+    # Instalación
+    # ------------------------------------------------------------------
+    def instalar(self):
+        instalar_registro_cambios(self.conn)
+
+    def _max_id(self):
+        return ultimo_cambio(self.conn)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def al_cambiar(self, callback):
+        """Registra `callback(cambios)`; se llama desde el hilo del notificador"""
+        self._oyentes.append(callback)
+
+    def revisar(self):
+        """Lee los cambios nuevos (si data_version se movió) y avisa; devuelve la lista"""
+        with self._lock:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return []
+            self._data_version = data_version
+
+            filas = self.conn.execute(
+                "SELECT id, tabla, fila_id FROM _cambios WHERE id > ? ORDER BY id",
+                (self._ultimo_id,)
+            ).fetchall()
+            if not filas:
+                return []
+            self._ultimo_id = filas[-1][0]
+
+        ids = {}
+        for _, tabla, fila_id in filas:
+            ids.setdefault(tabla, set()).add(fila_id)
+        cambios = [{
+            "tablas": sorted(ids),
+            "ids": {tabla: sorted(valores) for tabla, valores in ids.items()
+                    if len(valores) <= self.MAX_IDS},
+        }]
+        logger.debug("🔔 Cambios detectados: %s", {t: len(v) for t, v in ids.items()})
+        for callback in list(self._oyentes):
+            try:
+                callback(cambios)
+            except Exception as e:
+                logger.error("❌ Error notificando cambios: %s", e)
+        return cambios
+
+    def descartar_pendientes(self):
+        """Da por vistos los cambios hasta ahora (ej: los que hizo la propia sincronización)"""
+        with self._lock:
+            self._ultimo_id = self._max_id()
+            self._data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join(self.intervalo + 1)
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+    # ------------------------------------------------------------------
+    # Hilo de chequeo
+    # ------------------------------------------------------------------
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.revisar()
+            except sqlite3.Error as e:
+                # Red no disponible o base ocupada: se reintenta en el próximo chequeo
+                logger.debug("🔔 No se pudieron revisar cambios: %s", e)
+
+
+# Registro de cambios en la base ---------------------------------------------
+
+RETENCION_CAMBIOS = 20000  # filas de _cambios que se conservan
+
+# Tabla vigilada -> [(tabla publicada, expresión del id)]
+TABLAS_CON_CAMBIOS = {
+    'bienes': [('bienes', '{fila}.id')],
+    'movimientos': [('movimientos', '{fila}.id')],
+    'bienes_movimientos': [('bienes', '{fila}.id_bien'), ('movimientos', '{fila}.id_movimiento')],
+    'usuarios': [('usuarios', '{fila}.id')],
+}
+
+
+def instalar_registro_cambios(conn):
+    """Crea _cambios y sus triggers (idempotente) y depura lo más viejo"""
+    with transaccion(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS _cambios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tabla TEXT NOT NULL,
+                fila_id
+            )
+        """)
+        for tabla, publicaciones in TABLAS_CON_CAMBIOS.items():
+            existe = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tabla,)
+            ).fetchone()
+            if not existe:
+                continue
+            for evento, fila in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                marcas = "\n".join(
+                    f"INSERT INTO _cambios (tabla, fila_id) "
+                    f"VALUES ('{publicada}', {expresion.format(fila=fila)});"
+                    for publicada, expresion in publicaciones
+                )
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS _cambios_{tabla}_{evento.lower()}
+                    AFTER {evento} ON {tabla}
+                    BEGIN
+                        {marcas}
+                    END
+                """)
+        conn.execute(
+            "DELETE FROM _cambios WHERE id <= (SELECT MAX(id) FROM _cambios) - ?",
+            (RETENCION_CAMBIOS,)
+        )
+
+
+def ultimo_cambio(conn):
+    """Id del último cambio registrado (0 si no hay registro)"""
+    try:
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM _cambios").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+
+
+def cambios_desde(conn, marca):
+    """
+    {tabla: [ids]} cambiados después de `marca`, o None si el registro ya no
+    llega tan atrás (se depuró) o no existe.
+    """
+    try:
+        primero = conn.execute("SELECT MIN(id) FROM _cambios").fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+    if primero is not None and primero > marca + 1:
+        return None
+    ids = {}
+    for tabla, fila_id in conn.execute(
+        "SELECT tabla, fila_id FROM _cambios WHERE id > ? GROUP BY tabla, fila_id ORDER BY MAX(id)",
+        (marca,)
+    ):
+        ids.setdefault(tabla, []).append(fila_id)
+    return ids
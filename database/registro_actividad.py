@@ -0,0 +1,138 @@
+"""
+📋 REGISTRO DE ACTIVIDAD - Sistema de Inventario AGC
+Auditoría con buffer en memoria y escritura por lotes en logs_actividad
+"""
+
+import atexit
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+# Registros abiertos, para vaciarlos al salir. Referencias débiles: un DB
+# descartado sin cerrar() no queda vivo (con su conexión) hasta el final
+_registros = weakref.WeakSet()
+
+
+class RegistroActividad:
+    """
+    Acumula las acciones auditadas y las escribe en una sola transacción.
+
+    Se vacía cuando el buffer llega a TAMANO_LOTE, cuando la entrada más
+    vieja supera INTERVALO_MAXIMO segundos, al llamar a vaciar() y al salir.
+    Nunca dentro de una transacción abierta por otro código sobre la misma
+    conexión: la confirmaría o la desharía con ella (queda para la próxima).
+    """
+
+    TAMANO_LOTE = 50
+    INTERVALO_MAXIMO = 30  # segundos
+    RETENCION_DIAS = 365
+
+    def __init__(self, conn, tamano_lote=None, intervalo_maximo=None):
+        self.conn = conn
+        self.tamano_lote = tamano_lote or self.TAMANO_LOTE
+        self.intervalo_maximo = intervalo_maximo or self.INTERVALO_MAXIMO
+        self._pendientes = []
+        self._primera_pendiente = None
+        self._lock = threading.Lock()
+        _registros.add(self)
+
+    def registrar(self, usuario, accion, detalles=""):
+        """Agrega una entrada al buffer; la fecha es la del momento de la acción"""
+        # Mismo formato que CURRENT_TIMESTAMP (UTC)
+        fecha = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            if not self._pendientes:
+                self._primera_pendiente = time.monotonic()
+            self._pendientes.append((usuario, accion, detalles, fecha))
+            lleno = len(self._pendientes) >= self.tamano_lote
+            vencido = time.monotonic() - self._primera_pendiente >= self.intervalo_maximo
+
+        if lleno or vencido:
+            self.vaciar()
+        return True
+
+    def pendientes(self):
+        """Cantidad de entradas aún no escritas"""
+        return len(self._pendientes)
+
+    def vaciar(self):
+        """Escribe todas las entradas pendientes en una única transacción"""
+        if self.conn is None or self.conn.in_transaction:
+            return 0
+
+        with self._lock:
+            lote, self._pendientes = self._pendientes, []
+            self._primera_pendiente = None
+
+        if not lote:
+            return 0
+
+        try:
+            with transaccion(self.conn):
+                self.conn.executemany(
+                    "INSERT INTO logs_actividad (usuario, accion, detalles, fecha) VALUES (?, ?, ?, ?)",
+                    lote
+                )
+            logger.debug("📋 %s entradas de actividad escritas", len(lote))
+            return len(lote)
+        except Exception as e:
+            logger.error("❌ Error escribiendo logs de actividad: %s", e)
+            # Devolver al buffer para el próximo intento
+            with self._lock:
+                self._pendientes = lote + self._pendientes
+                self._primera_pendiente = self._primera_pendiente or time.monotonic()
+            return 0
+
+    def depurar(self, dias=None):
+        """
+        Mueve a logs_actividad_archivo las entradas con más de `dias` días
+        y las elimina de logs_actividad.
+        """
+        dias = self.RETENCION_DIAS if dias is None else dias
+        limite = f"-{int(dias)} days"
+        try:
+            with self.conn:
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS logs_actividad_archivo (
+                        id INTEGER PRIMARY KEY,
+                        usuario TEXT NOT NULL,
+                        accion TEXT NOT NULL,
+                        detalles TEXT,
+                        fecha TIMESTAMP
+                    )
+                """)
+                self.conn.execute("""
+                    INSERT OR IGNORE INTO logs_actividad_archivo (id, usuario, accion, detalles, fecha)
+                    SELECT id, usuario, accion, detalles, fecha
+                    FROM logs_actividad
+                    WHERE fecha < datetime('now', ?)
+                """, (limite,))
+                movidas = self.conn.execute(
+                    "DELETE FROM logs_actividad WHERE fecha < datetime('now', ?)", (limite,)
+                ).rowcount
+            if movidas:
+                logger.info("🗄️ %s entradas de actividad archivadas (más de %s días)", movidas, dias)
+            return movidas
+        except Exception as e:
+            logger.error("❌ Error depurando logs de actividad: %s", e)
+            return 0
+
+    def cerrar(self):
+        """Vacía el buffer y deja de escuchar la salida del proceso"""
+        self.vaciar()
+        _registros.discard(self)
+
+
+@atexit.register
+def _vaciar_al_salir():
+    for registro in list(_registros):
+        try:
+            registro.vaciar()
+        except Exception as e:
+            logger.debug("📋 No se pudo vaciar la actividad al salir: %s", e)
@@ -0,0 +1,122 @@
+"""
+📖 RÉPLICA DE LECTURA - Sistema de Inventario AGC
+Copia local de la base de red para servir lecturas en modo red_directo
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from database import resumen_movimientos
+from database.huellas import HuellasDB, reparar
+from database.metricas import ConexionMedida
+from database.respaldo import crear_respaldo
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class ReplicaLectura:
+    """
+    Réplica local de solo lectura de la base maestra.
+
+    Antes de cada lectura se mira PRAGMA data_version de la maestra (cambia
+    cuando otra conexión confirma) y total_changes de nuestra propia
+    conexión (cambia con nuestras escrituras). Si ninguno se movió, la
+    lectura sale de la réplica sin tocar la red. Si cambiaron, se comparan
+    las raíces Merkle por tabla y solo se copian las filas distintas.
+
+    Los chequeos se agrupan en ventanas de INTERVALO_CHEQUEO segundos para
+    que un refresco de grilla con muchas consultas haga uno solo.
+    """
+
+    INTERVALO_CHEQUEO = 1.0  # segundos
+
+    def __init__(self, conn_maestra, ruta_maestra, ruta_replica):
+        self.conn_maestra = conn_maestra
+        self.ruta_maestra = ruta_maestra
+        self.ruta_replica = ruta_replica
+        self._version = None
+        self._ultimo_chequeo = 0.0
+        self._lock = threading.Lock()
+
+        self._preparar_archivo()
+        self.conn = sqlite3.connect(ruta_replica, check_same_thread=False, timeout=30, factory=ConexionMedida)
+        self.conn.row_factory = sqlite3.Row
+        # La copia del archivo trae los triggers de resúmenes de la maestra:
+        # acá los resúmenes se copian tal cual, no se recalculan
+        resumen_movimientos.desinstalar(self.conn)
+        # Solo lectura: leer la maestra no toma su lock de escritura (las
+        # huellas de la maestra las mantienen el diario, la sincronización...)
+        self.huellas_maestra = HuellasDB(conn_maestra, solo_lectura=True)
+        self.huellas_replica = HuellasDB(self.conn)
+        self.refrescar(forzar=True)
+
+    def _preparar_archivo(self):
+        """Copia completa solo si no hay réplica o cambió el esquema"""
+        if os.path.exists(self.ruta_replica) and self._mismo_esquema():
+            return
+        logger.info("📖 Creando réplica local de lectura: %s", self.ruta_replica)
+        crear_respaldo(self.ruta_maestra, self.ruta_replica, pausa=0)
+
+    def _mismo_esquema(self):
+        try:
+            with sqlite3.connect(self.ruta_replica) as replica:
+                return _esquema(replica) == _esquema(self.conn_maestra)
+        except sqlite3.Error:
+            return False
+
+    def _version_maestra(self):
+        data_version = self.conn_maestra.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, self.conn_maestra.total_changes)
+
+    def conexion(self):
+        """Conexión para leer, con la réplica al día"""
+        self.refrescar()
+        return self.conn
+
+    def refrescar(self, forzar=False):
+        """Trae de la maestra solo las tablas (y filas) que cambiaron"""
+        with self._lock:
+            ahora = time.monotonic()
+            if not forzar and ahora - self._ultimo_chequeo < self.INTERVALO_CHEQUEO:
+                # Nuestras propias escrituras se ven siempre, sin esperar la ventana
+                if self._version is None or self._version[1] == self.conn_maestra.total_changes:
+                    return 0
+            self._ultimo_chequeo = ahora
+
+            version = self._version_maestra()
+            if not forzar and version == self._version:
+                return 0
+
+            inicio = time.perf_counter()
+            filas = 0
+            self.huellas_maestra.olvidar()
+            raices_replica = self.huellas_replica.raices()
+            for tabla, raiz in self.huellas_maestra.raices().items():
+                if raices_replica.get(tabla) != raiz:
+                    filas += reparar(self.huellas_maestra, self.huellas_replica, tabla)
+            # Cambios hechos mientras comparábamos: se verán en el próximo chequeo
+            self._version = version
+            if filas:
+                logger.debug("📖 Réplica actualizada: %s filas en %.3fs", filas, time.perf_counter() - inicio)
+            return filas
+
+    def cerrar(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def _esquema(conn):
+    """{tabla: (columnas...)} de las tablas de datos (sin las internas: _huellas, _cambios...)"""
+    tablas = [fila[0] for fila in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' "
+        "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE '\\_%' ESCAPE '\\'"
+    )]
+    return {
+        tabla: tuple(col[1] for col in conn.execute(f"PRAGMA table_info({tabla})"))
+        for tabla in tablas
+    }
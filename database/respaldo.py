@@ -0,0 +1,131 @@
+"""
+💾 MOTOR DE RESPALDOS - Sistema de Inventario AGC
+Backups consistentes en caliente con la API de backup de SQLite
+"""
+
+import gzip
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+# Páginas copiadas por paso y pausa entre pasos: deja respirar a los escritores
+PAGINAS_POR_PASO = 256
+PAUSA_ENTRE_PASOS = 0.005  # segundos
+
+
+class ErrorRespaldo(Exception):
+    """El respaldo no se pudo crear o no pasó la verificación"""
+
+
+def crear_respaldo(ruta_origen, ruta_destino, comprimir=False,
+                   paginas_por_paso=PAGINAS_POR_PASO, pausa=PAUSA_ENTRE_PASOS):
+    """
+    Copia la base `ruta_origen` a `ruta_destino` por pasos de páginas.
+
+    La copia es una instantánea consistente aunque haya otras conexiones
+    escribiendo. Se verifica con PRAGMA quick_check antes de darla por buena;
+    con comprimir=True el resultado final es `ruta_destino + ".gz"`.
+
+    Devuelve la ruta del respaldo o lanza ErrorRespaldo.
+    """
+    if not os.path.exists(ruta_origen):
+        raise ErrorRespaldo(f"La base no existe: {ruta_origen}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(ruta_destino)), exist_ok=True)
+    ruta_temporal = ruta_destino + ".tmp"
+    inicio = time.perf_counter()
+
+    def _progreso(estado, restantes, total):
+        if pausa and restantes:
+            time.sleep(pausa)
+
+    origen = sqlite3.connect(ruta_origen, timeout=30)
+    destino = sqlite3.connect(ruta_temporal)
+    try:
+        origen.backup(destino, pages=paginas_por_paso, progress=_progreso)
+    except sqlite3.Error as e:
+        destino.close()
+        _eliminar(ruta_temporal)
+        raise ErrorRespaldo(f"Error copiando {ruta_origen}: {e}") from e
+    finally:
+        origen.close()
+
+    try:
+        resultado = destino.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        destino.close()
+
+    if resultado != "ok":
+        _eliminar(ruta_temporal)
+        raise ErrorRespaldo(f"quick_check falló: {resultado}")
+
+    if comprimir:
+        ruta_final = ruta_destino + ".gz"
+        with open(ruta_temporal, "rb") as f_in, gzip.open(ruta_final, "wb", compresslevel=6) as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+        _eliminar(ruta_temporal)
+    else:
+        ruta_final = ruta_destino
+        os.replace(ruta_temporal, ruta_final)
+
+    logger.debug("💾 Respaldo %s en %.2fs", os.path.basename(ruta_final), time.perf_counter() - inicio)
+    return ruta_final
+
+
+def crear_respaldo_en_segundo_plano(ruta_origen, ruta_destino, comprimir=False, al_terminar=None):
+    """
+    Igual que crear_respaldo pero en un hilo aparte.
+
+    `al_terminar(ruta_o_None)` se llama desde ese hilo: desde la UI hay que
+    reenviarlo al hilo principal (señal Qt o QTimer.singleShot).
+    """
+    def _trabajo():
+        ruta = None
+        try:
+            ruta = crear_respaldo(ruta_origen, ruta_destino, comprimir=comprimir)
+            logger.info("✅ Backup creado: %s", os.path.basename(ruta))
+        except Exception as e:
+            logger.error("❌ Error en backup: %s", e)
+        if al_terminar:
+            al_terminar(ruta)
+
+    hilo = threading.Thread(target=_trabajo, name="respaldo-sqlite", daemon=True)
+    hilo.start()
+    return hilo
+
+
+def restaurar_respaldo(ruta_respaldo, ruta_destino):
+    """Vuelca un respaldo (.db o .db.gz) sobre la base `ruta_destino`"""
+    ruta_fuente = ruta_respaldo
+    temporal = None
+    if ruta_respaldo.endswith(".gz"):
+        temporal = ruta_destino + ".restaurar.tmp"
+        with gzip.open(ruta_respaldo, "rb") as f_in, open(temporal, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+        ruta_fuente = temporal
+
+    try:
+        origen = sqlite3.connect(ruta_fuente)
+        destino = sqlite3.connect(ruta_destino, timeout=30)
+        try:
+            origen.backup(destino)
+        finally:
+            origen.close()
+            destino.close()
+    finally:
+        if temporal:
+            _eliminar(temporal)
+    return True
+
+
+def _eliminar(ruta):
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
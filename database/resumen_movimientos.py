@@ -0,0 +1,157 @@
+"""
+🧮 RESÚMENES DE MOVIMIENTOS - Sistema de Inventario AGC
+cantidad_bienes, fichas y prds guardados en cada movimiento y mantenidos por triggers
+"""
+
+from database.transaccion import transaccion
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+# Columna -> tipo (se agregan a movimientos con ALTER TABLE)
+COLUMNAS = {
+    'cantidad_bienes': "INTEGER DEFAULT 0",
+    'fichas': "TEXT",
+    'prds': "TEXT",
+}
+
+
+def _calculos(id_movimiento, vinculos="bienes_movimientos", bienes="bienes"):
+    """
+    Expresiones SQL que recalculan los resúmenes de un movimiento.
+    Orden canónico: el de los vínculos (bm.id), que es el mismo en que los
+    agrega el trigger incremental; así recalcular no cambia filas que ya
+    estaban bien (ni genera diferencias para la sincronización).
+    """
+    ordenados = (f"SELECT b.ficha, b.prd FROM {vinculos} bm JOIN {bienes} b ON b.id = bm.id_bien "
+                 f"WHERE bm.id_movimiento = {id_movimiento} ORDER BY bm.id")
+    return {
+        'cantidad_bienes': f"(SELECT COUNT(*) FROM {vinculos} bm WHERE bm.id_movimiento = {id_movimiento})",
+        'fichas': f"(SELECT GROUP_CONCAT(ficha) FROM ({ordenados}))",
+        'prds': f"(SELECT GROUP_CONCAT(DISTINCT prd) FROM ({ordenados}))",
+    }
+
+
+def instalar(conn):
+    """
+    Triggers que mantienen los resúmenes (idempotente). Cubren cualquier
+    escritura, también las de la fusión y el diario. La réplica de lectura
+    no los lleva (ver desinstalar):
+
+    - vínculo nuevo: suma uno y agrega la ficha/prd al final, sin releer
+      los demás vínculos (un acta de mil bienes no se vuelve cuadrática).
+      Un INSERT OR REPLACE sobre un vínculo existente (fusión, réplica)
+      borra antes el viejo con un trigger BEFORE (el REPLACE no dispara los
+      triggers de DELETE y el conteo quedaría duplicado) y deja
+      cantidad_bienes en NULL, que pide el recálculo completo: así la ficha
+      queda en su lugar del orden canónico;
+    - vínculo borrado o modificado, bien nuevo/borrado o con otra ficha o
+      prd: se recalculan los movimientos afectados.
+
+    Los SQL de los triggers no llevan esquema: SQLite no lo permite.
+    """
+    def recalculo(id_movimiento):
+        return ", ".join(f"{col} = {sql}" for col, sql in _calculos(id_movimiento).items())
+
+    ficha = "(SELECT ficha FROM bienes WHERE id = NEW.id_bien)"
+    prd = "(SELECT prd FROM bienes WHERE id = NEW.id_bien)"
+    calculos = _calculos("NEW.id_movimiento")
+    por_bien = "id IN (SELECT id_movimiento FROM bienes_movimientos WHERE id_bien = {}.id)"
+
+    triggers = {
+        '_resumen_vinculo_reemplazo': """
+            BEFORE INSERT ON bienes_movimientos
+            WHEN EXISTS (SELECT 1 FROM bienes_movimientos WHERE id = NEW.id)
+            BEGIN
+                DELETE FROM bienes_movimientos WHERE id = NEW.id;
+                UPDATE movimientos SET cantidad_bienes = NULL WHERE id = NEW.id_movimiento;
+            END""",
+        '_resumen_vinculo_insert': f"""
+            AFTER INSERT ON bienes_movimientos
+            BEGIN
+                UPDATE movimientos SET
+                    cantidad_bienes = CASE WHEN cantidad_bienes IS NULL THEN {calculos['cantidad_bienes']}
+                                           ELSE cantidad_bienes + 1 END,
+                    fichas = CASE WHEN cantidad_bienes IS NULL THEN {calculos['fichas']}
+                                  WHEN {ficha} IS NULL THEN fichas
+                                  WHEN fichas IS NULL THEN {ficha}
+                                  ELSE fichas || ',' || {ficha} END,
+                    prds = CASE WHEN cantidad_bienes IS NULL THEN {calculos['prds']}
+                                WHEN {prd} IS NULL THEN prds
+                                WHEN prds IS NULL THEN {prd}
+                                WHEN instr(',' || prds || ',', ',' || {prd} || ',') > 0 THEN prds
+                                ELSE prds || ',' || {prd} END
+                WHERE id = NEW.id_movimiento;
+            END""",
+        '_resumen_vinculo_delete': f"""
+            AFTER DELETE ON bienes_movimientos
+            BEGIN
+                UPDATE movimientos SET {recalculo('OLD.id_movimiento')} WHERE id = OLD.id_movimiento;
+            END""",
+        '_resumen_vinculo_update': f"""
+            AFTER UPDATE ON bienes_movimientos
+            BEGIN
+                UPDATE movimientos SET {recalculo('movimientos.id')}
+                WHERE id IN (OLD.id_movimiento, NEW.id_movimiento);
+            END""",
+        '_resumen_bien_insert': f"""
+            AFTER INSERT ON bienes
+            BEGIN
+                UPDATE movimientos SET {recalculo('movimientos.id')} WHERE {por_bien.format('NEW')};
+            END""",
+        '_resumen_bien_delete': f"""
+            AFTER DELETE ON bienes
+            BEGIN
+                UPDATE movimientos SET {recalculo('movimientos.id')} WHERE {por_bien.format('OLD')};
+            END""",
+        '_resumen_bien_update': f"""
+            AFTER UPDATE OF ficha, prd ON bienes
+            WHEN OLD.ficha IS NOT NEW.ficha OR OLD.prd IS NOT NEW.prd
+            BEGIN
+                UPDATE movimientos SET {recalculo('movimientos.id')} WHERE {por_bien.format('NEW')};
+            END""",
+    }
+    with conn:
+        for nombre, cuerpo in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {nombre} {cuerpo}")
+
+
+def desinstalar(conn):
+    """
+    Quita los triggers de resúmenes. Para copias fila a fila de otra base
+    (ReplicaLectura): los resúmenes llegan ya calculados con su movimiento y
+    los triggers los volverían a sumar al copiar los vínculos.
+    """
+    nombres = [fila[0] for fila in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '\\_resumen\\_%' ESCAPE '\\'"
+    )]
+    with transaccion(conn):
+        for nombre in nombres:
+            conn.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+
+
+def recalcular(conn, ids=None, esquema="main", tamano_lote=500):
+    """
+    Reparación: recalcula los resúmenes de `ids` (None = todos) y escribe
+    solo los que no coinciden. `esquema` permite reparar el archivo
+    (sus vínculos contra los bienes de main). Devuelve las filas corregidas.
+    """
+    calculos = _calculos("movimientos.id", f"{esquema}.bienes_movimientos", "main.bienes")
+    asignaciones = ", ".join(f"{col} = {sql}" for col, sql in calculos.items())
+    distintas = " OR ".join(f"{col} IS NOT {sql}" for col, sql in calculos.items())
+    sentencia = f"UPDATE {esquema}.movimientos SET {asignaciones} WHERE ({distintas})"
+
+    corregidas = 0
+    with transaccion(conn):
+        if ids is None:
+            corregidas = conn.execute(sentencia).rowcount
+        else:
+            ids = list(ids)
+            for i in range(0, len(ids), tamano_lote):
+                lote = ids[i:i + tamano_lote]
+                corregidas += conn.execute(
+                    f"{sentencia} AND id IN ({','.join('?' * len(lote))})", lote
+                ).rowcount
+    if corregidas:
+        logger.info("🧮 Resúmenes de %s movimientos recalculados (%s)", corregidas, esquema)
+    return corregidas
@@ -0,0 +1,38 @@
+"""
+🔒 TRANSACCIONES ANIDABLES - Sistema de Inventario AGC
+Escrituras que se confirman solas o se suman a la transacción que ya esté abierta
+"""
+
+from contextlib import contextmanager
+
+
+@contextmanager
+def transaccion(conn, inmediata=False):
+    """
+    Reemplazo de `with conn:` que se puede anidar.
+
+    - Sin transacción abierta: la abre (BEGIN, o BEGIN IMMEDIATE si
+      `inmediata`, que toma el lock de escritura antes de leer) y la
+      confirma o deshace al salir.
+    - Con una transacción abierta (del llamador): usa un SAVEPOINT. Un error
+      deshace solo lo de este bloque y nada se confirma antes de tiempo;
+      `with conn:` en cambio haría COMMIT de la transacción ajena.
+    """
+    if conn.in_transaction:
+        conn.execute("SAVEPOINT anidada")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO anidada")
+            conn.execute("RELEASE anidada")
+            raise
+        conn.execute("RELEASE anidada")
+        return
+
+    conn.execute("BEGIN IMMEDIATE" if inmediata else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
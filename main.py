@@ -10,15 +10,24 @@ import traceback
 # ✅ AGREGAR ESTO PARA IMPORTS ABSOLUTOS
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from PyQt5.QtWidgets import QApplication, QMessageBox
+# Perfil de arranque opcional: se activa antes de cualquier otra importación
+from utils.perfil_arranque import etapa, perfil_arranque
+if perfil_arranque().solicitado():
+    perfil_arranque().activar()
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QSplashScreen
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QPixmap, QColor
 
 # ✅ NUEVAS IMPORTACIONES - ARQUITECTURA PROFESIONAL
-from config.settings import get_db_path, get_actas_folder, get_info_sistema
+from config.settings import get_config, get_db_path, get_db_maestra_path, get_actas_folder, get_info_sistema
+from core.puesta_al_dia import PuestaAlDia
 from database.db_manager import DB
+from database.db_remoto import DBRemoto
 from ui.dialogs.login_dialog import LoginDialog
-from ui.main_window import VentanaPrincipal
+from utils.logger import configurar_logging, obtener_logger
+
+logger = obtener_logger(__name__)
 
 
 def excepcion_global(tipo, valor, tb):
@@ -32,16 +41,38 @@ def excepcion_global(tipo, valor, tb):
     sys.exit(1)
 
 
+def poner_al_dia(app, db, config):
+    """Trae de la maestra lo cambiado desde la última sincronización, con splash de progreso"""
+    imagen = QPixmap(460, 120)
+    imagen.fill(QColor("#2c3e50"))
+    splash = QSplashScreen(imagen)
+    splash.show()
+    
+    def progreso(porcentaje, texto):
+        splash.showMessage(f"⏩ Poniendo al día el inventario\n{texto} ({porcentaje}%)",
+                           Qt.AlignCenter, Qt.white)
+        app.processEvents()
+    
+    try:
+        return PuestaAlDia.desde_config(db.conn, get_db_maestra_path(), config).ejecutar(progreso)
+    finally:
+        splash.close()
+
+
 def main():
     """Función principal de la aplicación"""
     try:
         # Configurar manejo de excepciones
         sys.excepthook = excepcion_global
         
+        # Logging antes de abrir la base de datos
+        configurar_logging(get_config())
+        
         # Crear aplicación Qt
-        app = QApplication(sys.argv)
-        app.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-        app.setFont(QFont("Segoe UI", 10))
+        with etapa("qt.aplicacion"):
+            app = QApplication(sys.argv)
+            app.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+            app.setFont(QFont("Segoe UI", 10))
         
         print("🚀 INICIANDO SISTEMA DE INVENTARIO AGC - ARQUITECTURA PROFESIONAL")
         print("=" * 70)
@@ -61,25 +92,60 @@ def main():
         
         print(f"🔗 Conectando a base de datos: {db_path}")
         
-        # Inicializar base de datos
-        db = DB(db_path, actas_folder)
+        # Inicializar base de datos (remota si hay servidor de coordinación)
+        config = get_config()
+        with etapa("db.abrir"):
+            if config.get("servidor_url"):
+                logger.info("🖧 Usando servidor de inventario: %s", config["servidor_url"])
+                db = DBRemoto(config["servidor_url"], config.get("servidor_token", ""))
+            else:
+                db = DB(db_path, actas_folder)
+            
+            # En red_directo las lecturas salen de una réplica local y las
+            # escrituras pasan por un diario local que se aplica en segundo plano
+            if config.get("modo_trabajo") == "red_directo" and not config.get("servidor_url"):
+                db.activar_replica_lectura(config["db_replica_local"])
+                db.activar_diario_escrituras(config["db_diario_escrituras"])
+        
+        # Con caché local: traer lo nuevo de la red antes de mostrar datos
+        puesta_al_dia = None
+        if config.get("modo_trabajo") == "local_con_sincronizacion" and not config.get("servidor_url"):
+            with etapa("puesta_al_dia"):
+                puesta_al_dia = poner_al_dia(app, db, config)
         
         # Mostrar diálogo de login
-        login_dialog = LoginDialog(db)
-        if login_dialog.exec_() == LoginDialog.Accepted:
+        with etapa("login.crear"):
+            login_dialog = LoginDialog(db)
+        perfil_arranque().marcar("login_visible")
+        with etapa("login.espera_usuario"):
+            aceptado = login_dialog.exec_() == LoginDialog.Accepted
+        if aceptado:
             usuario = login_dialog.obtener_usuario_actual()
             print(f"✅ Usuario autenticado: {usuario['id']} ({usuario['rol']})")
             
-            # Crear y mostrar ventana principal
-            ventana = VentanaPrincipal(db, usuario)
-            ventana.show()
+            # Crear y mostrar ventana principal (se importa recién acá: el login aparece antes)
+            with etapa("ventana.importar"):
+                from ui.main_window import VentanaPrincipal
+            with etapa("ventana.crear"):
+                ventana = VentanaPrincipal(db, usuario)
+                ventana.show()
+            perfil_arranque().finalizar()
+            
+            if puesta_al_dia is not None:
+                for conflicto in puesta_al_dia['conflictos']:
+                    ventana.sync_manager.conflicto_detectado.emit(conflicto)
+                if puesta_al_dia['pendiente']:
+                    ventana.sync_manager.sincronizar_pronto()
             
             print("🎉 Sistema cargado correctamente")
             print("💡 Usa el botón 🔄 Sincronizar para mantener tus datos actualizados")
             
             # Ejecutar aplicación
-            sys.exit(app.exec_())
+            codigo_salida = app.exec_()
+            db.cerrar()
+            sys.exit(codigo_salida)
         else:
+            perfil_arranque().finalizar()
             print("❌ Login cancelado")
             sys.exit(0)
             
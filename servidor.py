@@ -0,0 +1,54 @@
+"""
+🖧 SERVIDOR DE INVENTARIO AGC - PUNTO DE ENTRADA
+Servidor sin interfaz que centraliza la base maestra para varios puestos
+
+Uso:
+    python servidor.py --db M:\\Patrimonio\\...\\inventario.db --host <ip del servidor> --puerto 8765 --token <token>
+
+En cada puesto: config "servidor_url": "http://<ip del servidor>:8765" y
+"servidor_token" con el mismo token (sin él el servidor responde 401).
+Escuchar solo en la interfaz de la red interna, nunca en todas.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import get_config, get_db_maestra_path
+from core.servidor_coordinacion import ServidorCoordinacion
+from database.db_manager import DB
+from utils.logger import configurar_logging, obtener_logger
+
+logger = obtener_logger("servidor")
+
+
+def main():
+    config = get_config()
+    parser = argparse.ArgumentParser(description="Servidor de coordinación del inventario")
+    parser.add_argument("--db", default=get_db_maestra_path(), help="Base maestra")
+    parser.add_argument("--actas", default=config.get("actas_folder_red", "actas"), help="Carpeta de actas")
+    parser.add_argument("--host", default="127.0.0.1", help="IP de la interfaz de la red interna")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--token", default=config.get("servidor_token", ""), help="Token compartido con los puestos")
+    args = parser.parse_args()
+
+    configurar_logging(config)
+    if not args.token:
+        logger.error("❌ Falta el token compartido (--token o servidor_token en la configuración)")
+        sys.exit(1)
+    db = DB(args.db, args.actas)
+    if config.get("mantenimiento_automatico", True):
+        db.activar_mantenimiento(horizonte_archivo=config.get("archivo_horizonte_dias", 730))
+    servidor = ServidorCoordinacion(db, args.token, args.host, args.puerto)
+    try:
+        servidor.iniciar()
+    except KeyboardInterrupt:
+        logger.info("🛑 Deteniendo servidor...")
+    finally:
+        servidor.detener()
+
+
+if __name__ == "__main__":
+    main()
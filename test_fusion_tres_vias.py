@@ -0,0 +1,124 @@
+"""
+🧪 TEST FUSIÓN DE TRES VÍAS - Primera fusión, choques de ids y fusión atómica
+"""
+
+import os
+import shutil
+import tempfile
+
+from core.fusion_tres_vias import FusionTresVias, listar_conflictos
+from database.db_manager import DB
+
+
+def _bases(carpeta, filas_iniciales=3):
+    """Red con `filas_iniciales` bienes y un local que es copia exacta de ella"""
+    ruta_red = os.path.join(carpeta, "red.db")
+    ruta_local = os.path.join(carpeta, "local.db")
+    red = DB(ruta_red, carpeta)
+    for i in range(filas_iniciales):
+        red.conn.execute("INSERT INTO bienes (ficha, serie, tipo) VALUES (?, ?, 'PC')", (f"F{i}", f"S{i}"))
+    red.conn.commit()
+    red.cerrar()
+    shutil.copy(ruta_red, ruta_local)
+    return DB(ruta_local, carpeta), DB(ruta_red, carpeta)
+
+
+def _bienes(db):
+    return [tuple(fila) for fila in db.conn.execute("SELECT id, ficha, serie FROM bienes ORDER BY id")]
+
+
+def _foto(db):
+    """Todo lo que una fusión puede tocar en una base"""
+    tablas = [fila[0] for fila in db.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name IN "
+        "('bienes', 'movimientos', 'bienes_movimientos', '_sync_base', '_sync_conflictos', '_sync_estado')"
+    )]
+    return {tabla: sorted(tuple(f) for f in db.conn.execute(f"SELECT * FROM {tabla}")) for tabla in tablas}
+
+
+def test_primera_fusion_con_ficha_editada_es_conflicto_no_duplicado():
+    with tempfile.TemporaryDirectory() as carpeta:
+        local, red = _bases(carpeta)
+        try:
+            # Antes de la primera sincronización se corrige una ficha en el puesto
+            local.conn.execute("UPDATE bienes SET ficha = 'F1-corr' WHERE ficha = 'F1'")
+            local.conn.commit()
+
+            FusionTresVias(local.conn, red.conn).fusionar()
+
+            assert len(_bienes(local)) == len(_bienes(red)) == 3
+            assert _bienes(local) == _bienes(red)
+            conflictos = [c for c in listar_conflictos(local.conn) if c['tabla'] == 'bienes']
+            assert [(c['tipo'], c['campo']) for c in conflictos] == [('campo', 'ficha')]
+        finally:
+            local.cerrar()
+            red.cerrar()
+
+
+def test_sin_base_no_renumera_con_base_si():
+    with tempfile.TemporaryDirectory() as carpeta:
+        local, red = _bases(carpeta)
+        try:
+            # Primera fusión: el mismo id nuevo en ambos lados no se renumera
+            local.conn.execute("INSERT INTO bienes (id, ficha, serie, tipo) VALUES (4, 'LOCAL', 'SL', 'PC')")
+            local.conn.commit()
+            red.conn.execute("INSERT INTO bienes (id, ficha, serie, tipo) VALUES (4, 'RED', 'SR', 'PC')")
+            red.conn.commit()
+            FusionTresVias(local.conn, red.conn).fusionar()
+            assert [b[0] for b in _bienes(local)] == [1, 2, 3, 4]
+            assert _bienes(local) == _bienes(red)
+
+            # Con base: dos altas con el mismo id son filas distintas, la local se renumera
+            local.conn.execute("INSERT INTO bienes (id, ficha, serie, tipo) VALUES (5, 'ALTA-L', 'AL', 'PC')")
+            local.conn.commit()
+            red.conn.execute("INSERT INTO bienes (id, ficha, serie, tipo) VALUES (5, 'ALTA-R', 'AR', 'PC')")
+            red.conn.commit()
+            resumen = FusionTresVias(local.conn, red.conn).fusionar()
+            assert resumen['renumeradas'] >= 1
+            assert _bienes(local) == _bienes(red)
+            fichas = {b[1]: b[0] for b in _bienes(red)}
+            assert fichas['ALTA-R'] == 5 and fichas['ALTA-L'] == 6
+        finally:
+            local.cerrar()
+            red.cerrar()
+
+
+class _FusionQueFalla(FusionTresVias):
+    """Falla después de escribir bienes en ambas bases, antes de terminar"""
+
+    def _sembrar_base(self, tabla):
+        if tabla == 'bienes':
+            raise RuntimeError("corte a mitad de la fusión")
+        super()._sembrar_base(tabla)
+
+
+def test_error_a_mitad_de_la_fusion_no_deja_nada_aplicado():
+    with tempfile.TemporaryDirectory() as carpeta:
+        local, red = _bases(carpeta)
+        try:
+            local.conn.execute("INSERT INTO bienes (ficha, serie, tipo) VALUES ('SOLO-LOCAL', 'SL', 'PC')")
+            local.conn.commit()
+            red.conn.execute("UPDATE bienes SET serie = 'S0-red' WHERE ficha = 'F0'")
+            red.conn.commit()
+            fusion = _FusionQueFalla(local.conn, red.conn)  # crea sus tablas _sync_*
+            antes_local, antes_red = _foto(local), _foto(red)
+
+            try:
+                fusion.fusionar()
+                assert False, "la fusión tenía que fallar"
+            except RuntimeError:
+                pass
+
+            assert not local.conn.in_transaction and not red.conn.in_transaction
+            assert _foto(local) == antes_local
+            assert _foto(red) == antes_red
+        finally:
+            local.cerrar()
+            red.cerrar()
+
+
+if __name__ == "__main__":
+    test_primera_fusion_con_ficha_editada_es_conflicto_no_duplicado()
+    test_sin_base_no_renumera_con_base_si()
+    test_error_a_mitad_de_la_fusion_no_deja_nada_aplicado()
+    print("🎯 TEST COMPLETADO")
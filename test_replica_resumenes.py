@@ -0,0 +1,51 @@
+"""
+🧪 TEST RÉPLICA DE LECTURA - Resúmenes de movimientos copiados de la maestra
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from database.db_manager import DB
+
+
+def _resumen(conn, movimiento_id):
+    return tuple(conn.execute(
+        "SELECT cantidad_bienes, fichas, prds FROM movimientos WHERE id = ?", (movimiento_id,)
+    ).fetchone())
+
+
+def test_replica_copia_resumenes_de_la_maestra():
+    with tempfile.TemporaryDirectory() as carpeta:
+        db = DB(os.path.join(carpeta, "maestra.db"), carpeta)
+        try:
+            for i in range(3):
+                db.conn.execute("INSERT INTO bienes (ficha, serie, tipo, prd) VALUES (?, ?, 'PC', 'P1')",
+                                (f"F{i}", f"S{i}"))
+            db.conn.commit()
+            db.activar_replica_lectura(os.path.join(carpeta, "replica.db"))
+            ids_bienes = [fila[0] for fila in db.conn.execute("SELECT id FROM bienes ORDER BY id")]
+
+            # Movimiento nuevo en la maestra: la réplica lo trae con sus vínculos
+            movimiento_id = db.add_movimiento(
+                {'tipo': 'Entrega', 'fecha': '2024-01-01', 'responsable': 'PEPE GOMEZ'}, ids_bienes
+            )
+            replica = db.replica_lectura.conexion()
+            assert _resumen(db.conn, movimiento_id) == (3, 'F0,F1,F2', 'P1')
+            assert _resumen(replica, movimiento_id) == _resumen(db.conn, movimiento_id)
+
+            # Otra conexión cambia una ficha (la réplica se entera por data_version)
+            otra = sqlite3.connect(os.path.join(carpeta, "maestra.db"))
+            otra.execute("UPDATE bienes SET ficha = 'F1-corr' WHERE ficha = 'F1'")
+            otra.commit()
+            otra.close()
+            db.replica_lectura.refrescar(forzar=True)
+            assert _resumen(db.conn, movimiento_id) == (3, 'F0,F1-corr,F2', 'P1')
+            assert _resumen(replica, movimiento_id) == _resumen(db.conn, movimiento_id)
+        finally:
+            db.cerrar()
+
+
+if __name__ == "__main__":
+    test_replica_copia_resumenes_de_la_maestra()
+    print("🎯 TEST COMPLETADO")
@@ -7,6 +7,10 @@ from PyQt5.QtWidgets import QHeaderView, QMenu, QAction
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QCursor
 
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
 
 class HeaderFiltros(QHeaderView):
     """Header personalizado SIMPLIFICADO - Solo ordenamiento"""
@@ -76,4 +80,4 @@ class HeaderFiltros(QHeaderView):
 
     def limpiar_filtros(self):
         """Método por compatibilidad"""
-        print("💡 Los filtros se gestionan desde el panel avanzado")
\ No newline at end of file
+        logger.debug("💡 Los filtros se gestionan desde el panel avanzado")
\ No newline at end of file
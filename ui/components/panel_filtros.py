@@ -9,6 +9,9 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIntValidator, QDoubleValidator
 from database.db_manager import DB  # ✅ NUEVO IMPORT
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
 
 class PanelFiltrosAvanzados(QWidget):
     """Panel de filtros visibles - DISEÑO COMPACTO HORIZONTAL"""
@@ -19,15 +22,15 @@ class PanelFiltrosAvanzados(QWidget):
     def __init__(self, parent=None, db=None):
         super().__init__(parent)
         self.db = db
-        print(f"🔍 DEBUG PanelFiltros: BD recibida = {self.db is not None}")
+        logger.debug("🔍 PanelFiltros: BD recibida = %s", self.db is not None)
         
         self._setup_ui()
         
         if self.db:
-            print("🔍 DEBUG: Llamando a actualizar_tipos_dinamicos...")
+            logger.debug("🔍 Llamando a actualizar_tipos_dinamicos...")
             self.actualizar_tipos_dinamicos()
         else:
-            print("❌ DEBUG: No hay BD para actualizar tipos")
+            logger.error("❌ DEBUG: No hay BD para actualizar tipos")
     
     def _setup_ui(self):
         """Configura la interfaz del panel de filtros - DISEÑO HORIZONTAL COMPACTO"""
@@ -351,15 +354,15 @@ class PanelFiltrosAvanzados(QWidget):
     def actualizar_tipos_dinamicos(self):
         """Actualiza SOLO el combobox de tipos con datos reales de la BD - VERSIÓN DEBUG"""
         try:
-            print("🔄 DEBUG: Ejecutando actualizar_tipos_dinamicos...")
+            logger.debug("🔄 Ejecutando actualizar_tipos_dinamicos...")
             
             if not self.db:
-                print("❌ DEBUG: No hay conexión a BD")
+                logger.error("❌ DEBUG: No hay conexión a BD")
                 return
                 
             # Obtener bienes para extraer tipos
-            bienes = self.db.list_bienes(limite=1000)
-            print(f"📊 DEBUG: Bienes obtenidos: {len(bienes)}")
+            bienes = self.db.list_bienes(limite=1000, columnas=['tipo'])
+            logger.debug("📊 Bienes obtenidos: %s", len(bienes))
             
             # Extraer tipos únicos
             tipos_unicos = set()
@@ -371,32 +374,30 @@ class PanelFiltrosAvanzados(QWidget):
                 
                 tipo = str(bien_dict.get('tipo', '')).strip()
                 if i < 5:  # Mostrar solo primeros 5 para no saturar
-                    print(f"🔍 DEBUG: Bien {i} - Tipo: '{tipo}'")
+                    logger.debug("🔍 Bien %s - Tipo: '%s'", i, tipo)
                 if tipo and tipo != 'None' and tipo != '':  # Filtrar vacíos
                     tipos_unicos.add(tipo)
             
             # Ordenar alfabéticamente
             tipos_ordenados = sorted(list(tipos_unicos))
-            print(f"🎯 DEBUG: Tipos únicos encontrados: {tipos_ordenados}")
+            logger.debug("🎯 Tipos únicos encontrados: %s", tipos_ordenados)
             
             # Actualizar combobox
             current_text = self.filtro_tipo.currentText()
-            print(f"🔧 DEBUG: Texto actual en combobox: '{current_text}'")
+            logger.debug("🔧 Texto actual en combobox: '%s'", current_text)
             
             self.filtro_tipo.clear()
             self.filtro_tipo.addItem("")  # Opción vacía
             self.filtro_tipo.addItems(tipos_ordenados)
             
-            print(f"✅ DEBUG: Combobox actualizado con {len(tipos_ordenados)} tipos")
-            print(f"✅ DEBUG: Items en combobox: {[self.filtro_tipo.itemText(i) for i in range(self.filtro_tipo.count())]}")
+            logger.debug("✅ Combobox actualizado con %s tipos", len(tipos_ordenados))
+            logger.debug("✅ Items en combobox: %s", [self.filtro_tipo.itemText(i) for i in range(self.filtro_tipo.count())])
             
         except Exception as e:
-            print(f"❌ DEBUG: Error en actualizar_tipos_dinamicos: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ DEBUG: Error en actualizar_tipos_dinamicos: %s", e)
         
     def aplicar_filtros(self):
         """Aplica los filtros y emite la señal"""
         filtros = self.obtener_filtros()
         self.filtros_aplicados.emit(filtros)
-        print(f"🔍 Filtros aplicados: {len(filtros)} criterios")
\ No newline at end of file
+        logger.debug("🔍 Filtros aplicados: %s criterios", len(filtros))
\ No newline at end of file
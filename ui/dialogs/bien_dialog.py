@@ -4,7 +4,6 @@ Formulario completo para gestión de bienes - VERSIÓN MODULAR
 """
 
 import os
-import pandas as pd
 from datetime import datetime
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
@@ -525,6 +524,7 @@ class BienDialog(QDialog):
                 'imei': ['', '123456789012345', '']
             }
             
+            import pandas as pd
             df = pd.DataFrame(datos)
             ruta, _ = QFileDialog.getSaveFileName(
                 self, "Guardar plantilla", 
@@ -546,8 +546,10 @@ class BienDialog(QDialog):
             return False
         try:
             # Manejar pandas NaN y otros valores especiales
-            if hasattr(valor, 'dtype') and pd.isna(valor):
-                return False
+            if hasattr(valor, 'dtype'):
+                import pandas as pd  # ya cargado si el valor viene de un DataFrame
+                if pd.isna(valor):
+                    return False
         except:
             pass
         
@@ -593,6 +595,7 @@ class BienDialog(QDialog):
                 btn_descargar = QPushButton("📥 Descargar reporte de errores")
                 btn_descargar.setStyleSheet("background-color: #e74c3c; color: white; font-weight: bold;")
                 def descargar_errores():
+                    import pandas as pd
                     # Crear DataFrame combinado de errores
                     dfs = []
                     
@@ -788,6 +791,7 @@ class BienDialog(QDialog):
                 })
             
             # Exportar
+            import pandas as pd
             df = pd.DataFrame(datos)
             ruta, _ = QFileDialog.getSaveFileName(
                 self, "Guardar archivo Excel",
@@ -104,6 +104,14 @@ class ConfiguracionModoDialog(QDialog):
         self.check_notificar_conflictos.setToolTip("Mostrar alertas cuando se detecten conflictos")
         layout_sync.addWidget(self.check_notificar_conflictos)
         
+        self.check_resolucion_automatica = QCheckBox("Resolver conflictos automáticamente")
+        self.check_resolucion_automatica.setChecked(self.config_actual.get("resolucion_automatica", False))
+        self.check_resolucion_automatica.setToolTip(
+            "Si un mismo campo cambió distinto en dos puestos y no hay regla,\n"
+            "conservar el valor que llegó primero a la red en lugar de preguntar"
+        )
+        layout_sync.addWidget(self.check_resolucion_automatica)
+        
         layout.addWidget(self.grupo_sync)
         
         # ✅ NUEVO: Configuración de Rutas
@@ -238,7 +246,7 @@ class ConfiguracionModoDialog(QDialog):
                 "auto_sincronizar": self.check_auto_sync.isChecked(),
                 "intervalo_sincronizacion": intervalo * 60,  # Convertir a segundos
                 "notificar_conflictos": self.check_notificar_conflictos.isChecked(),
-                "resolucion_automatica": False,  # Por ahora manual
+                "resolucion_automatica": self.check_resolucion_automatica.isChecked(),
                 "backup_automatico": True,
                 "max_backups": 10,
                 
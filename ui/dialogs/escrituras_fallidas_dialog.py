@@ -0,0 +1,146 @@
+"""
+⚠️ ESCRITURAS RECHAZADAS - Sistema de Inventario AGC
+Operaciones guardadas localmente que la base de red no aceptó (modo red_directo)
+"""
+
+import json
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QHeaderView, QTextEdit, QSplitter, QMessageBox,
+                             QAbstractItemView)
+from PyQt5.QtCore import Qt
+
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class EscriturasFallidasDialog(QDialog):
+    """Lista las operaciones rechazadas por la red y permite reintentarlas o descartarlas"""
+
+    COLUMNAS = [("#", 'id'), ("Guardada", 'creado'), ("Operación", 'descripcion'), ("Error", 'error')]
+
+    def __init__(self, diario, parent=None):
+        super().__init__(parent)
+        self.diario = diario
+        self._fallidas = []
+        self.setWindowTitle("⚠️ Escrituras rechazadas - Sistema AGC")
+        self.setMinimumSize(900, 500)
+
+        self._setup_ui()
+        self.cargar()
+
+    def _setup_ui(self):
+        """Configura la interfaz del diálogo"""
+        layout = QVBoxLayout(self)
+
+        aviso = QLabel(
+            "Estas operaciones se guardaron en este puesto pero la base de red las rechazó,\n"
+            "así que no figuran en el inventario. Reintentalas (por ejemplo, después de\n"
+            "corregir el dato que choca) o descartalas."
+        )
+        aviso.setStyleSheet("""
+            QLabel {
+                color: #856404;
+                background-color: #fff3cd;
+                border: 1px solid #ffeaa7;
+                border-radius: 6px;
+                padding: 10px;
+            }
+        """)
+        layout.addWidget(aviso)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.tabla = QTableWidget(0, len(self.COLUMNAS))
+        self.tabla.setHorizontalHeaderLabels([titulo for titulo, _ in self.COLUMNAS])
+        self.tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla.verticalHeader().setVisible(False)
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tabla.horizontalHeader().setStretchLastSection(True)
+        self.tabla.itemSelectionChanged.connect(self._mostrar_detalle)
+        splitter.addWidget(self.tabla)
+
+        self.texto_detalle = QTextEdit()
+        self.texto_detalle.setReadOnly(True)
+        splitter.addWidget(self.texto_detalle)
+        layout.addWidget(splitter)
+
+        # ===== BOTONES =====
+        botones = QHBoxLayout()
+        self.btn_reintentar = QPushButton("🔄 Reintentar seleccionadas")
+        self.btn_reintentar.clicked.connect(self.reintentar)
+        self.btn_descartar = QPushButton("🗑️ Descartar seleccionadas")
+        self.btn_descartar.setStyleSheet("QPushButton { color: #c0392b; }")
+        self.btn_descartar.clicked.connect(self.descartar)
+        btn_cerrar = QPushButton("Cerrar")
+        btn_cerrar.clicked.connect(self.accept)
+        botones.addWidget(self.btn_reintentar)
+        botones.addWidget(self.btn_descartar)
+        botones.addStretch()
+        botones.addWidget(btn_cerrar)
+        layout.addLayout(botones)
+
+    def cargar(self):
+        try:
+            self._fallidas = self.diario.fallidas()
+        except Exception as e:
+            logger.error("❌ Error leyendo escrituras rechazadas: %s", e)
+            self._fallidas = []
+        self.tabla.setRowCount(len(self._fallidas))
+        for i, operacion in enumerate(self._fallidas):
+            for j, (_, clave) in enumerate(self.COLUMNAS):
+                self.tabla.setItem(i, j, QTableWidgetItem(str(operacion.get(clave) or "")))
+        self.texto_detalle.clear()
+        hay = bool(self._fallidas)
+        self.btn_reintentar.setEnabled(hay)
+        self.btn_descartar.setEnabled(hay)
+
+    def _seleccionadas(self):
+        filas = sorted({indice.row() for indice in self.tabla.selectionModel().selectedRows()})
+        return [self._fallidas[fila]['id'] for fila in filas if fila < len(self._fallidas)]
+
+    def _mostrar_detalle(self):
+        filas = self.tabla.selectionModel().selectedRows()
+        if not filas or filas[0].row() >= len(self._fallidas):
+            self.texto_detalle.clear()
+            return
+        operacion = self._fallidas[filas[0].row()]
+        try:
+            sentencias = json.dumps(json.loads(operacion['sentencias']), indent=2, ensure_ascii=False)
+        except (TypeError, ValueError):
+            sentencias = operacion.get('sentencias') or ""
+        self.texto_detalle.setPlainText(
+            f"{operacion.get('descripcion') or ''}\n\nError: {operacion.get('error')}\n\n{sentencias}"
+        )
+
+    def reintentar(self):
+        ids = self._seleccionadas()
+        if not ids:
+            QMessageBox.warning(self, "Reintentar", "Selecciona las operaciones a reintentar")
+            return
+        try:
+            self.diario.reintentar_fallidas(ids)
+        except Exception as e:
+            logger.error("❌ Error reintentando escrituras rechazadas: %s", e)
+            QMessageBox.critical(self, "Error", f"No se pudieron reintentar:\n{str(e)}")
+        self.cargar()
+
+    def descartar(self):
+        ids = self._seleccionadas()
+        if not ids:
+            QMessageBox.warning(self, "Descartar", "Selecciona las operaciones a descartar")
+            return
+        respuesta = QMessageBox.question(
+            self, "Descartar",
+            f"Se descartarán {len(ids)} operaciones. Lo que contenían no llegará a la base.\n\n¿Continuar?",
+            QMessageBox.Yes | QMessageBox.No)
+        if respuesta != QMessageBox.Yes:
+            return
+        try:
+            self.diario.descartar_fallidas(ids)
+        except Exception as e:
+            logger.error("❌ Error descartando escrituras rechazadas: %s", e)
+            QMessageBox.critical(self, "Error", f"No se pudieron descartar:\n{str(e)}")
+        self.cargar()
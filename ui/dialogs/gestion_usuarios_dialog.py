@@ -190,13 +190,7 @@ class GestionUsuariosDialog(QDialog):
     def _cargar_usuarios(self):
         """Carga todos los usuarios en la tabla"""
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                SELECT id, nombre, apellido, cargo, dni_cuit, email, rol, activo
-                FROM usuarios 
-                ORDER BY apellido, nombre
-            """)
-            usuarios = cursor.fetchall()
+            usuarios = self.db.listar_usuarios()
             
             self.tabla_usuarios.setRowCount(len(usuarios))
             
@@ -242,31 +236,25 @@ class GestionUsuariosDialog(QDialog):
                 return
             
             # Verificar que el ID no exista
-            cursor = self.db.conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM usuarios WHERE id = ?", (self.nuevo_id.text(),))
-            if cursor.fetchone()[0] > 0:
+            if self.db.obtener_usuario(self.nuevo_id.text()):
                 QMessageBox.warning(self, "Error", "El ID de usuario ya existe")
                 return
             
             # Insertar nuevo usuario
-            cursor.execute("""
-                INSERT INTO usuarios 
-                (id, nombre, apellido, cargo, dni_cuit, email, password, rol, activo, usuario_creacion)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                self.nuevo_id.text(),
-                self.nuevo_nombre.text(),
-                self.nuevo_apellido.text(),
-                self.nuevo_cargo.text(),
-                self.nuevo_dni.text() or None,
-                self.nuevo_email.text() or None,
-                self.nuevo_password.text(),
-                self.nuevo_rol.currentText(),
-                1 if self.nuevo_activo.isChecked() else 0,
-                self.usuario_actual['id']
-            ))
-            
-            self.db.conn.commit()
+            creado = self.db.crear_usuario({
+                'id': self.nuevo_id.text(),
+                'nombre': self.nuevo_nombre.text(),
+                'apellido': self.nuevo_apellido.text(),
+                'cargo': self.nuevo_cargo.text(),
+                'dni_cuit': self.nuevo_dni.text() or None,
+                'email': self.nuevo_email.text() or None,
+                'password': self.nuevo_password.text(),
+                'rol': self.nuevo_rol.currentText(),
+                'activo': 1 if self.nuevo_activo.isChecked() else 0,
+            }, self.usuario_actual['id'])
+            if not creado:
+                QMessageBox.critical(self, "Error", f"No se pudo crear el usuario {self.nuevo_id.text()}")
+                return
             
             QMessageBox.information(self, "Éxito", f"Usuario {self.nuevo_id.text()} creado correctamente")
             self._limpiar_formulario()
@@ -287,12 +275,7 @@ class GestionUsuariosDialog(QDialog):
         
         try:
             # Obtener datos actuales del usuario
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                SELECT id, nombre, apellido, cargo, dni_cuit, email, rol, activo
-                FROM usuarios WHERE id = ?
-            """, (usuario_id,))
-            usuario = cursor.fetchone()
+            usuario = self.db.obtener_usuario(usuario_id)
             
             if not usuario:
                 QMessageBox.warning(self, "Error", "Usuario no encontrado")
@@ -374,7 +357,7 @@ class GestionUsuariosDialog(QDialog):
             
             # ✅ CORREGIDO: Usar lambda para conectar el botón
             btn_guardar.clicked.connect(lambda: self._guardar_cambios_usuario(
-                dialog, cursor, usuario_id, edit_nombre, edit_apellido, 
+                dialog, usuario_id, edit_nombre, edit_apellido, 
                 edit_cargo, edit_dni, edit_email, edit_rol, edit_password, edit_activo
             ))
             
@@ -385,7 +368,7 @@ class GestionUsuariosDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error editando usuario: {str(e)}")
 
-    def _guardar_cambios_usuario(self, dialog, cursor, usuario_id, edit_nombre, edit_apellido, 
+    def _guardar_cambios_usuario(self, dialog, usuario_id, edit_nombre, edit_apellido, 
                                 edit_cargo, edit_dni, edit_email, edit_rol, edit_password, edit_activo):
         """Guarda los cambios del usuario editado"""
         if not all([edit_nombre.text(), edit_apellido.text(), edit_cargo.text()]):
@@ -393,42 +376,25 @@ class GestionUsuariosDialog(QDialog):
             return
         
         try:
+            datos = {
+                'nombre': edit_nombre.text(),
+                'apellido': edit_apellido.text(),
+                'cargo': edit_cargo.text(),
+                'dni_cuit': edit_dni.text() or None,
+                'email': edit_email.text() or None,
+                'rol': edit_rol.currentText(),
+                'activo': 1 if edit_activo.isChecked() else 0,
+            }
             # ✅ ACTUALIZACIÓN MEJORADA - Manejo de contraseña
             if edit_password.text():  # Si se ingresó nueva contraseña
-                cursor.execute("""
-                    UPDATE usuarios SET 
-                    nombre=?, apellido=?, cargo=?, dni_cuit=?, email=?, rol=?, activo=?, password=?
-                    WHERE id=?
-                """, (
-                    edit_nombre.text(),
-                    edit_apellido.text(),
-                    edit_cargo.text(),
-                    edit_dni.text() or None,
-                    edit_email.text() or None,
-                    edit_rol.currentText(),
-                    1 if edit_activo.isChecked() else 0,
-                    edit_password.text(),  # Nueva contraseña
-                    usuario_id
-                ))
+                datos['password'] = edit_password.text()
                 mensaje = f"Usuario {usuario_id} actualizado correctamente\n\n🔐 Contraseña cambiada"
             else:  # Mantener contraseña actual
-                cursor.execute("""
-                    UPDATE usuarios SET 
-                    nombre=?, apellido=?, cargo=?, dni_cuit=?, email=?, rol=?, activo=?
-                    WHERE id=?
-                """, (
-                    edit_nombre.text(),
-                    edit_apellido.text(),
-                    edit_cargo.text(),
-                    edit_dni.text() or None,
-                    edit_email.text() or None,
-                    edit_rol.currentText(),
-                    1 if edit_activo.isChecked() else 0,
-                    usuario_id
-                ))
                 mensaje = f"Usuario {usuario_id} actualizado correctamente\n\n🔐 Contraseña mantenida"
             
-            self.db.conn.commit()
+            if not self.db.actualizar_usuario(usuario_id, datos):
+                QMessageBox.critical(dialog, "Error", f"No se pudo actualizar el usuario {usuario_id}")
+                return
             QMessageBox.information(dialog, "Éxito", mensaje)
             dialog.accept()
             self._cargar_usuarios()  # Actualizar lista
@@ -448,12 +414,9 @@ class GestionUsuariosDialog(QDialog):
         nuevo_estado = 0 if estado_actual else 1
         
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute(
-                "UPDATE usuarios SET activo = ? WHERE id = ?",
-                (nuevo_estado, usuario_id)
-            )
-            self.db.conn.commit()
+            if not self.db.cambiar_estado_usuario(usuario_id, nuevo_estado):
+                QMessageBox.critical(self, "Error", f"No se pudo cambiar el estado de {usuario_id}")
+                return
             
             estado_texto = "activado" if nuevo_estado else "desactivado"
             QMessageBox.information(self, "Éxito", f"Usuario {usuario_id} {estado_texto}")
@@ -8,20 +8,90 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QTableWidget, QTableWidgetItem, QPushButton,
                            QHeaderView, QTextEdit, QGroupBox, QMessageBox,
                            QTabWidget, QWidget, QFileDialog, QProgressBar, QMenu )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QDesktopServices
 import os
 import shutil
+import threading
+import time
 from datetime import datetime
 
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class CacheArchivosPDF:
+    """
+    Ruta resuelta y metadatos (existe, tamaño, modificación) de los PDFs de
+    actas, compartidos entre diálogos. Las actas suelen estar en la red y
+    cada consulta es un stat remoto: se hace en segundo plano y se reusa,
+    mostrando lo último conocido mientras se refresca lo vencido (VIGENCIA).
+    """
+    
+    VIGENCIA = 300  # segundos
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datos = {}
+    
+    def obtener(self, ruta_almacenada):
+        """Info en caché (aunque esté vencida) o None - sin I/O"""
+        with self._lock:
+            return self._datos.get(ruta_almacenada)
+    
+    def vigente(self, ruta_almacenada):
+        info = self.obtener(ruta_almacenada)
+        return info is not None and time.monotonic() - info['consultado'] < self.VIGENCIA
+    
+    def resolver(self, ruta_almacenada, carpetas=()):
+        """
+        Resuelve la ruta (puede ser solo el nombre del archivo: se busca en
+        `carpetas`) y guarda sus metadatos. Hace I/O: llamar fuera del hilo de UI.
+        """
+        candidatas = [ruta_almacenada]
+        if not os.path.dirname(ruta_almacenada):
+            candidatas += [os.path.join(carpeta, ruta_almacenada) for carpeta in carpetas if carpeta]
+        info = {'ruta': ruta_almacenada, 'existe': False, 'tamano': None, 'modificado': None}
+        for ruta in candidatas:
+            try:
+                stats = os.stat(ruta)
+            except OSError:
+                continue
+            info.update(ruta=ruta, existe=True, tamano=stats.st_size, modificado=stats.st_mtime)
+            break
+        info['consultado'] = time.monotonic()
+        with self._lock:
+            self._datos[ruta_almacenada] = info
+        return info
+    
+    def olvidar(self, ruta_almacenada):
+        with self._lock:
+            self._datos.pop(ruta_almacenada, None)
+
+
+_cache_pdfs = CacheArchivosPDF()
+
 
 class HistorialDialog(QDialog):
-    """Diálogo que muestra el historial completo de movimientos de un bien"""
+    """
+    Diálogo que muestra el historial completo de movimientos de un bien.
+    
+    Los movimientos se consultan una vez (self.movimientos, en el orden de
+    la tabla) y los PDFs se verifican en segundo plano con CacheArchivosPDF:
+    recorrer la tabla no vuelve a consultar la base ni el disco.
+    """
+    
+    # (número de carga, {ruta guardada: info}) desde el hilo que verifica los PDFs
+    archivos_resueltos = pyqtSignal(int, dict)
     
     def __init__(self, db, bien, parent=None):
         super().__init__(parent)
         self.db = db
         self.bien = bien
+        self.movimientos = []
+        self._carga = 0
+        self.archivos_resueltos.connect(self._aplicar_archivos)
         self.setWindowTitle(f"📋 Historial - {bien['ficha']}")
         self.setMinimumSize(1000, 700)  # ← Aumentado para nuevos botones
         self.setStyleSheet("""
@@ -157,7 +227,7 @@ class HistorialDialog(QDialog):
         
         # Botón actualizar
         self.btn_actualizar = QPushButton("🔄 Actualizar Historial")
-        self.btn_actualizar.clicked.connect(self.cargar_historial)
+        self.btn_actualizar.clicked.connect(lambda: self.cargar_historial(forzar=True))
         self.btn_actualizar.setStyleSheet("""
             QPushButton {
                 background-color: #f39c12;
@@ -193,34 +263,38 @@ class HistorialDialog(QDialog):
         btn_layout.addWidget(self.btn_cerrar)
         layout.addLayout(btn_layout)
 
-    def cargar_historial(self):
-        """Carga el historial de movimientos del bien - VERSIÓN MEJORADA"""
+    def cargar_historial(self, forzar=False):
+        """
+        Carga el historial de movimientos del bien (una consulta) y lanza la
+        verificación de sus PDFs. `forzar` vuelve a verificar aunque estén en caché.
+        """
         try:
             # Obtener movimientos del bien
             bien_id = self.bien['id']
             movimientos = self.db.obtener_movimientos_por_bien(bien_id)
             
-            print(f"📊 Cargando historial - Bien ID: {bien_id}, Movimientos: {len(movimientos)}")
+            logger.debug("📊 Cargando historial - Bien ID: %s, Movimientos: %s", bien_id, len(movimientos))
             
-            if not movimientos:
+            # Ordenar por fecha (más reciente primero): es el orden de las filas
+            self._carga += 1
+            self.movimientos = sorted(movimientos, 
+                                      key=lambda x: x.get('fecha', ''), 
+                                      reverse=True)
+            
+            if not self.movimientos:
                 self.tabla_movimientos.setRowCount(1)
                 self.tabla_movimientos.setItem(0, 0, QTableWidgetItem("No se encontraron movimientos para este bien"))
                 return
             
-            # Ordenar por fecha (más reciente primero)
-            movimientos_ordenados = sorted(movimientos, 
-                                         key=lambda x: x.get('fecha', ''), 
-                                         reverse=True)
-            
-            self.tabla_movimientos.setRowCount(len(movimientos_ordenados))
+            self.tabla_movimientos.setRowCount(len(self.movimientos))
             
-            for i, mov in enumerate(movimientos_ordenados):
+            for i, mov in enumerate(self.movimientos):
                 # Fecha formateada
                 fecha_original = mov.get('fecha', '')
                 try:
                     fecha_dt = datetime.strptime(fecha_original, "%Y-%m-%d %H:%M:%S")
                     fecha_str = fecha_dt.strftime("%d/%m/%Y %H:%M")
-                except:
+                except (TypeError, ValueError):
                     fecha_str = fecha_original
                 
                 # Tipo de movimiento con icono
@@ -247,18 +321,6 @@ class HistorialDialog(QDialog):
                 # Área/Institucional
                 area = mov.get('responsable_institucional', '')
                 
-                # PDF
-                archivo_pdf = mov.get('archivo_path_pdf', '')  # ← ✅ CORRECTO
-                if archivo_pdf and os.path.exists(archivo_pdf):
-                    pdf_text = "📎 PDF"
-                    pdf_tooltip = f"Archivo: {os.path.basename(archivo_pdf)}"
-                else:
-                    pdf_text = "❌ Sin PDF"
-                    pdf_tooltip = "Haz clic en 'Agregar PDF' para adjuntar documento"
-                
-                # ✅ NUEVO: BOTÓN DE ACCIONES
-                movimiento_id = mov.get('id')  # ID del movimiento para actualizar
-                
                 # Llenar tabla
                 self.tabla_movimientos.setItem(i, 0, QTableWidgetItem(fecha_str))
                 self.tabla_movimientos.setItem(i, 1, QTableWidgetItem(f"{tipo_icono}{tipo}"))
@@ -266,53 +328,111 @@ class HistorialDialog(QDialog):
                 self.tabla_movimientos.setItem(i, 3, QTableWidgetItem(dni_cuit))
                 self.tabla_movimientos.setItem(i, 4, QTableWidgetItem(area))
                 
-                # Columna PDF
-                pdf_item = QTableWidgetItem(pdf_text)
-                pdf_item.setToolTip(pdf_tooltip)
-                self.tabla_movimientos.setItem(i, 5, pdf_item)
-                
-                # ✅ NUEVO: COLUMNA ACCIONES
-                if archivo_pdf and os.path.exists(archivo_pdf):
-                    # Ya tiene PDF - solo botón de abrir
-                    btn_abrir = QPushButton("👁️ Abrir")
-                    btn_abrir.setStyleSheet("""
-                        QPushButton {
-                            background-color: #3498db;
-                            color: white;
-                            padding: 4px 8px;
-                            border-radius: 3px;
-                            font-size: 10px;
-                        }
-                    """)
-                    btn_abrir.clicked.connect(lambda checked, ruta=archivo_pdf: self._abrir_archivo(ruta))
-                    self.tabla_movimientos.setCellWidget(i, 6, btn_abrir)
-                else:
-                    # No tiene PDF - botón para agregar
-                    btn_agregar = QPushButton("📎 Agregar PDF")
-                    btn_agregar.setStyleSheet("""
-                        QPushButton {
-                            background-color: #e67e22;
-                            color: white;
-                            padding: 4px 8px;
-                            border-radius: 3px;
-                            font-size: 10px;
-                            font-weight: bold;
-                        }
-                        QPushButton:hover {
-                            background-color: #d35400;
-                        }
-                    """)
-                    btn_agregar.clicked.connect(lambda checked, mov_id=movimiento_id, fila=i: self.agregar_pdf_manual(mov_id, fila))
-                    btn_agregar.setToolTip("Agregar PDF a este movimiento")
-                    self.tabla_movimientos.setCellWidget(i, 6, btn_agregar)
-            
-            print(f"✅ Historial cargado: {len(movimientos)} movimientos")
+                # Columnas PDF y Acciones: con lo que haya en caché
+                self._pintar_pdf(i)
+            
+            self._verificar_archivos(forzar)
+            logger.debug("✅ Historial cargado: %s movimientos", len(movimientos))
             
         except Exception as e:
-            print(f"❌ Error cargando historial: {e}")
+            logger.error("❌ Error cargando historial: %s", e)
             self.tabla_movimientos.setRowCount(1)
             self.tabla_movimientos.setItem(0, 0, QTableWidgetItem(f"Error cargando historial: {str(e)}"))
 
+    def _verificar_archivos(self, forzar=False):
+        """Resuelve y verifica en segundo plano los PDFs sin info vigente en caché"""
+        rutas = {mov.get('archivo_path_pdf') for mov in self.movimientos if mov.get('archivo_path_pdf')}
+        if not forzar:
+            rutas = {ruta for ruta in rutas if not _cache_pdfs.vigente(ruta)}
+        if not rutas:
+            return
+        try:
+            from config.settings import get_config
+            config = get_config()
+            carpetas = (config.get("actas_folder_local"), config.get("actas_folder_red"))
+        except Exception as e:
+            logger.warning("⚠️ No se pudieron leer las carpetas de actas: %s", e)
+            carpetas = ()
+        threading.Thread(target=self._resolver_archivos, args=(self._carga, rutas, carpetas),
+                         name="historial-pdfs", daemon=True).start()
+
+    def _resolver_archivos(self, carga, rutas, carpetas):
+        """Hilo: un stat por PDF; el resultado vuelve al hilo de UI por señal"""
+        resultados = {ruta: _cache_pdfs.resolver(ruta, carpetas) for ruta in rutas}
+        try:
+            self.archivos_resueltos.emit(carga, resultados)
+        except RuntimeError:
+            pass  # El diálogo se cerró antes de terminar
+
+    def _aplicar_archivos(self, carga, resultados):
+        """Repinta las filas cuyos PDFs se acaban de verificar"""
+        if carga != self._carga:
+            return  # Resultado de una carga anterior
+        for fila, mov in enumerate(self.movimientos):
+            if mov.get('archivo_path_pdf') in resultados:
+                self._pintar_pdf(fila)
+
+    def _info_pdf(self, fila):
+        """Info en caché del PDF de una fila (None si no tiene o no se verificó) - sin I/O"""
+        if not 0 <= fila < len(self.movimientos):
+            return None
+        ruta = self.movimientos[fila].get('archivo_path_pdf')
+        return _cache_pdfs.obtener(ruta) if ruta else None
+
+    def _pintar_pdf(self, fila):
+        """Columnas PDF y Acciones de una fila según el modelo y la caché"""
+        mov = self.movimientos[fila]
+        ruta = mov.get('archivo_path_pdf')
+        info = self._info_pdf(fila)
+        
+        if ruta and info is None:
+            # Todavía no se sabe: se verifica en segundo plano
+            pdf_item = QTableWidgetItem("⏳ Verificando")
+            pdf_item.setToolTip(f"Buscando {os.path.basename(ruta)}...")
+            self.tabla_movimientos.setItem(fila, 5, pdf_item)
+            self.tabla_movimientos.removeCellWidget(fila, 6)
+        elif info and info['existe']:
+            pdf_item = QTableWidgetItem("📎 PDF")
+            pdf_item.setToolTip(f"Archivo: {os.path.basename(info['ruta'])}")
+            self.tabla_movimientos.setItem(fila, 5, pdf_item)
+            
+            # Ya tiene PDF - solo botón de abrir
+            btn_abrir = QPushButton("👁️ Abrir")
+            btn_abrir.setStyleSheet("""
+                QPushButton {
+                    background-color: #3498db;
+                    color: white;
+                    padding: 4px 8px;
+                    border-radius: 3px;
+                    font-size: 10px;
+                }
+            """)
+            btn_abrir.clicked.connect(lambda checked, ruta=info['ruta']: self._abrir_archivo(ruta))
+            self.tabla_movimientos.setCellWidget(fila, 6, btn_abrir)
+        else:
+            pdf_item = QTableWidgetItem("❌ Sin PDF")
+            pdf_item.setToolTip("Haz clic en 'Agregar PDF' para adjuntar documento")
+            self.tabla_movimientos.setItem(fila, 5, pdf_item)
+            
+            # No tiene PDF - botón para agregar
+            btn_agregar = QPushButton("📎 Agregar PDF")
+            btn_agregar.setStyleSheet("""
+                QPushButton {
+                    background-color: #e67e22;
+                    color: white;
+                    padding: 4px 8px;
+                    border-radius: 3px;
+                    font-size: 10px;
+                    font-weight: bold;
+                }
+                QPushButton:hover {
+                    background-color: #d35400;
+                }
+            """)
+            btn_agregar.clicked.connect(lambda checked, mov_id=mov.get('id'), f=fila: self.agregar_pdf_manual(mov_id, f))
+            btn_agregar.setToolTip("Agregar PDF a este movimiento")
+            self.tabla_movimientos.setCellWidget(fila, 6, btn_agregar)
+
     def agregar_pdf_manual(self, movimiento_id, fila_tabla):
         """Agrega un PDF manualmente a un movimiento existente"""
         try:
@@ -378,29 +498,13 @@ class HistorialDialog(QDialog):
     def actualizar_fila_con_pdf(self, fila, ruta_pdf):
         """Actualiza una fila específica después de agregar PDF"""
         try:
-            # Actualizar columna PDF
-            pdf_item = QTableWidgetItem("📎 PDF")
-            pdf_item.setToolTip(f"Archivo: {os.path.basename(ruta_pdf)}")
-            self.tabla_movimientos.setItem(fila, 5, pdf_item)
-            
-            # Actualizar columna Acciones (reemplazar botón)
-            btn_abrir = QPushButton("👁️ Abrir")
-            btn_abrir.setStyleSheet("""
-                QPushButton {
-                    background-color: #3498db;
-                    color: white;
-                    padding: 4px 8px;
-                    border-radius: 3px;
-                    font-size: 10px;
-                }
-            """)
-            btn_abrir.clicked.connect(lambda checked, ruta=ruta_pdf: self._abrir_archivo(ruta))
-            self.tabla_movimientos.setCellWidget(fila, 6, btn_abrir)
-            
-            print(f"✅ Fila {fila} actualizada con PDF: {ruta_pdf}")
+            self.movimientos[fila]['archivo_path_pdf'] = ruta_pdf
+            _cache_pdfs.resolver(ruta_pdf)  # Recién copiado: un solo stat, local a esta acción
+            self._pintar_pdf(fila)
+            logger.debug("✅ Fila %s actualizada con PDF: %s", fila, ruta_pdf)
             
         except Exception as e:
-            print(f"❌ Error actualizando fila: {e}")
+            logger.error("❌ Error actualizando fila: %s", e)
 
     def abrir_pdf_seleccionado(self):
         """Abre el PDF del movimiento seleccionado"""
@@ -427,26 +531,17 @@ class HistorialDialog(QDialog):
             if archivo_pdf:
                 self._abrir_archivo(archivo_pdf)
         except Exception as e:
-            print(f"❌ Error abriendo PDF: {e}")
+            logger.error("❌ Error abriendo PDF: %s", e)
 
     def _obtener_pdf_de_fila(self, fila):
-        """Obtiene la ruta del PDF de una fila específica"""
+        """Ruta resuelta del PDF de una fila, si existe (del modelo y la caché)"""
         try:
-            # Obtener el movimiento correspondiente a la fila
-            bien_id = self.bien['id']
-            movimientos = self.db.obtener_movimientos_por_bien(bien_id)
-            movimientos_ordenados = sorted(movimientos, 
-                                         key=lambda x: x.get('fecha', ''), 
-                                         reverse=True)
-            
-            if fila < len(movimientos_ordenados):
-                mov = movimientos_ordenados[fila]
-                archivo_pdf = mov.get('archivo_path_pdf', '')  # ← ✅ CORRECTO
-                if archivo_pdf and os.path.exists(archivo_pdf):
-                    return archivo_pdf
+            info = self._info_pdf(fila)
+            if info and info['existe']:
+                return info['ruta']
             return None
         except Exception as e:
-            print(f"❌ Error obteniendo PDF de fila: {e}")
+            logger.error("❌ Error obteniendo PDF de fila: %s", e)
             return None
 
     def _abrir_archivo(self, ruta_archivo):
@@ -464,10 +559,10 @@ class HistorialDialog(QDialog):
             else:  # Linux
                 subprocess.run(["xdg-open", ruta_archivo])
                 
-            print(f"✅ Archivo abierto: {ruta_archivo}")
+            logger.debug("✅ Archivo abierto: %s", ruta_archivo)
             
         except Exception as e:
-            print(f"❌ Error abriendo archivo: {e}")
+            logger.error("❌ Error abriendo archivo: %s", e)
             QMessageBox.critical(self, "Error", f"No se pudo abrir el archivo:\n{ruta_archivo}")
             
     def mostrar_menu_gestion_pdf(self):
@@ -487,12 +582,13 @@ class HistorialDialog(QDialog):
             # Crear menú contextual
             menu = QMenu(self)
             
-            if archivo_pdf_actual and os.path.exists(archivo_pdf_actual):
+            info = self._info_pdf(fila)
+            if info and info['existe']:
                 # Movimiento CON PDF - Opciones completas
                 menu.addAction("👁️ Abrir PDF", lambda: self._abrir_archivo(archivo_pdf_actual))
                 menu.addAction("🔄 Reemplazar PDF", lambda: self.reemplazar_pdf(movimiento_id, fila, archivo_pdf_actual))
                 menu.addAction("🗑️ Eliminar PDF", lambda: self.eliminar_pdf(movimiento_id, fila))
-                menu.addAction("📊 Información del PDF", lambda: self.mostrar_info_pdf(archivo_pdf_actual))
+                menu.addAction("📊 Información del PDF", lambda: self.mostrar_info_pdf(fila))
             else:
                 # Movimiento SIN PDF - Solo agregar
                 menu.addAction("📥 Agregar PDF", lambda: self.agregar_pdf_manual(movimiento_id, fila))
@@ -505,21 +601,16 @@ class HistorialDialog(QDialog):
             QMessageBox.critical(self, "Error", f"Error mostrando menú: {str(e)}")
 
     def _obtener_info_movimiento_fila(self, fila):
-        """Obtiene ID y PDF del movimiento en una fila específica"""
+        """ID y PDF (ruta resuelta si se verificó) del movimiento de una fila"""
         try:
-            bien_id = self.bien['id']
-            movimientos = self.db.obtener_movimientos_por_bien(bien_id)
-            movimientos_ordenados = sorted(movimientos, key=lambda x: x.get('fecha', ''), reverse=True)
-            
-            if fila < len(movimientos_ordenados):
-                mov = movimientos_ordenados[fila]
-                movimiento_id = mov.get('id')
-                # ✅ CORREGIDO: Buscar archivo_path_pdf
-                archivo_pdf = mov.get('archivo_path_pdf', '')  # ← SOLO PDF, NO DOCX
-                return movimiento_id, archivo_pdf
+            if 0 <= fila < len(self.movimientos):
+                mov = self.movimientos[fila]
+                info = self._info_pdf(fila)
+                archivo_pdf = info['ruta'] if info and info['existe'] else mov.get('archivo_path_pdf', '')
+                return mov.get('id'), archivo_pdf
             return None, None
         except Exception as e:
-            print(f"❌ Error obteniendo info de movimiento: {e}")
+            logger.error("❌ Error obteniendo info de movimiento: %s", e)
             return None, None
 
     def reemplazar_pdf(self, movimiento_id, fila, archivo_actual):
@@ -528,7 +619,9 @@ class HistorialDialog(QDialog):
             # Primero eliminar el archivo actual
             if archivo_actual and os.path.exists(archivo_actual):
                 os.remove(archivo_actual)
-                print(f"🗑️ PDF anterior eliminado: {archivo_actual}")
+                logger.info("🗑️ PDF anterior eliminado: %s", archivo_actual)
+                _cache_pdfs.olvidar(self.movimientos[fila].get('archivo_path_pdf'))
+                self.actualizar_fila_sin_pdf(fila)
             
             # Luego agregar uno nuevo
             self.agregar_pdf_manual(movimiento_id, fila)
@@ -549,10 +642,10 @@ class HistorialDialog(QDialog):
             )
             
             if respuesta == QMessageBox.Yes:
-                # Actualizar base de datos (poner archivo_path como NULL o vacío)
-                query = "UPDATE movimientos SET archivo_path = NULL WHERE id = ?"
-                self.db.conn.execute(query, (movimiento_id,))
-                self.db.conn.commit()
+                # Actualizar base de datos (archivo_path_pdf en NULL)
+                if not self.db.actualizar_pdf_movimiento(movimiento_id, None):
+                    QMessageBox.critical(self, "❌ Error", "No se pudo actualizar la base de datos")
+                    return
                 
                 # Actualizar la fila en la tabla
                 self.actualizar_fila_sin_pdf(fila)
@@ -562,19 +655,17 @@ class HistorialDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "❌ Error", f"Error eliminando PDF: {str(e)}")
 
-    def mostrar_info_pdf(self, ruta_pdf):
-        """Muestra información detallada del PDF"""
+    def mostrar_info_pdf(self, fila):
+        """Muestra información detallada del PDF de una fila (metadatos en caché)"""
         try:
-            if not ruta_pdf or not os.path.exists(ruta_pdf):
+            info = self._info_pdf(fila)
+            if not info or not info['existe']:
                 QMessageBox.warning(self, "Info PDF", "No hay PDF asociado a este movimiento")
                 return
             
-            import os
-            from datetime import datetime
-            
-            stats = os.stat(ruta_pdf)
-            tamaño_kb = stats.st_size / 1024
-            fecha_modificacion = datetime.fromtimestamp(stats.st_mtime).strftime("%d/%m/%Y %H:%M")
+            ruta_pdf = info['ruta']
+            tamaño_kb = info['tamano'] / 1024
+            fecha_modificacion = datetime.fromtimestamp(info['modificado']).strftime("%d/%m/%Y %H:%M")
             
             info_text = f"""
             📊 INFORMACIÓN DEL PDF:
@@ -593,66 +684,12 @@ class HistorialDialog(QDialog):
     def actualizar_fila_sin_pdf(self, fila):
         """Actualiza una fila para mostrar que no tiene PDF"""
         try:
-            # Actualizar columna PDF
-            pdf_item = QTableWidgetItem("❌ Sin PDF")
-            pdf_item.setToolTip("Haz clic en 'Agregar PDF' para adjuntar documento")
-            self.tabla_movimientos.setItem(fila, 5, pdf_item)
-            
-            # Actualizar columna Acciones (botón de agregar)
-            btn_agregar = QPushButton("📎 Agregar PDF")
-            btn_agregar.setStyleSheet("""
-                QPushButton {
-                    background-color: #e67e22;
-                    color: white;
-                    padding: 4px 8px;
-                    border-radius: 3px;
-                    font-size: 10px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #d35400;
-                }
-            """)
-            
-            # Obtener movimiento_id para esta fila
-            movimiento_id, _ = self._obtener_info_movimiento_fila(fila)
-            if movimiento_id:
-                btn_agregar.clicked.connect(lambda checked, mov_id=movimiento_id, f=fila: self.agregar_pdf_manual(mov_id, f))
-            
-            self.tabla_movimientos.setCellWidget(fila, 6, btn_agregar)
-            
-            print(f"✅ Fila {fila} actualizada - PDF eliminado")
-            
-        except Exception as e:
-            print(f"❌ Error actualizando fila sin PDF: {e}")
-            
-    def _resolver_ruta_pdf(self, ruta_almacenada):
-        """Resuelve una ruta de PDF (puede ser relativa o absoluta)"""
-        try:
-            from config.settings import get_config
-            
-            config = get_config()
-            
-            # Si ya es una ruta absoluta que existe
-            if os.path.exists(ruta_almacenada):
-                return ruta_almacenada
-            
-            # Si es solo un nombre de archivo, buscar en actas_local
-            if not os.path.dirname(ruta_almacenada):  # Solo nombre de archivo
-                ruta_local = os.path.join(config["actas_folder_local"], ruta_almacenada)
-                if os.path.exists(ruta_local):
-                    return ruta_local
-                
-                # Intentar en red también
-                ruta_red = os.path.join(config["actas_folder_red"], ruta_almacenada)
-                if os.path.exists(ruta_red):
-                    return ruta_red
-            
-            return ruta_almacenada  # Devolver original si no se resuelve
+            self.movimientos[fila]['archivo_path_pdf'] = None
+            self._pintar_pdf(fila)
+            logger.debug("✅ Fila %s actualizada - PDF eliminado", fila)
             
         except Exception as e:
-            print(f"❌ Error resolviendo ruta PDF: {e}")
-            return ruta_almacenada
+            logger.error("❌ Error actualizando fila sin PDF: %s", e)
 
 # Prueba simple
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
+from utils.perfil_arranque import etapa
+
 
 class LoginDialog(QDialog):
     """Diálogo de autenticación de usuarios"""
@@ -112,14 +114,8 @@ class LoginDialog(QDialog):
     def _cargar_usuarios(self):
         """Carga la lista de usuarios desde la base de datos - VERSIÓN MEJORADA"""
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                SELECT id, nombre, apellido, cargo, rol 
-                FROM usuarios 
-                WHERE activo = 1 
-                ORDER BY nombre, apellido
-            """)
-            usuarios = cursor.fetchall()
+            with etapa("login.usuarios"):
+                usuarios = self.db.listar_usuarios(solo_activos=True)
             
             self.combo_usuario.clear()
             
@@ -147,13 +143,8 @@ class LoginDialog(QDialog):
                 return
             
             # ✅ CONSULTA MEJORADA - OBTENER TODOS LOS CAMPOS
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                SELECT id, nombre, apellido, cargo, dni_cuit, email, rol 
-                FROM usuarios 
-                WHERE id = ? AND password = ? AND activo = 1
-            """, (usuario_id, password))
-            usuario = cursor.fetchone()
+            with etapa("login.verificar"):
+                usuario = self.db.verificar_credenciales(usuario_id, password)
             
             if usuario:
                 self.usuario_actual = {
@@ -167,12 +158,7 @@ class LoginDialog(QDialog):
                 }
                 
                 # ✅ ACTUALIZAR ÚLTIMO ACCESO
-                cursor.execute("""
-                    UPDATE usuarios 
-                    SET ultimo_acceso = datetime('now') 
-                    WHERE id = ?
-                """, (usuario_id,))
-                self.db.conn.commit()
+                self.db.registrar_acceso(usuario_id)
                 
                 print(f"✅ Usuario autenticado: {usuario['apellido']}, {usuario['nombre']} ({usuario['rol']})")
                 self.accept()
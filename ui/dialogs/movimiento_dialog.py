@@ -328,7 +328,8 @@ class MovimientoDialog(QDialog):
             hasta_num = None
 
         # Aplicar filtros
-        for bien in self.db.list_bienes():
+        columnas = ['ficha', 'tipo', 'marca', 'modelo', 'prd', 'estado']
+        for bien in self.db.list_bienes(columnas=columnas):
             ficha_raw = str(bien["ficha"]).strip()
             tipo_bien = str(bien["tipo"]).strip()
             prd_bien = str(bien["prd"]).strip().lower()
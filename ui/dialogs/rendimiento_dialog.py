@@ -0,0 +1,259 @@
+"""
+📊 PANEL DE RENDIMIENTO - Sistema de Inventario AGC
+Diagnóstico para administradores: métodos de DB, SQL lentas, sincronización y grillas
+"""
+
+import os
+from datetime import datetime
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QHeaderView, QTabWidget, QWidget, QTextEdit,
+                             QSplitter, QFileDialog, QMessageBox, QAbstractItemView)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from config.config_manager import cargar_configuracion
+from database.asesor_indices import AsesorIndices, informe
+from database.metricas import explicar, metricas
+from utils.logger import obtener_logger
+
+logger = obtener_logger(__name__)
+
+
+class RendimientoDialog(QDialog):
+    """Panel de métricas en vivo (se refresca cada INTERVALO_MS mientras está abierto)"""
+
+    INTERVALO_MS = 2000
+    COLUMNAS_RESUMEN = [("Nombre", 'nombre'), ("Llamadas", 'llamadas'), ("p50 (ms)", 'p50_ms'),
+                        ("p95 (ms)", 'p95_ms'), ("Máx (ms)", 'max_ms'), ("Último (ms)", 'ultimo_ms'),
+                        ("Filas prom.", 'filas_promedio')]
+    COLUMNAS_SQL = [("Hora", 'fecha'), ("ms", 'ms'), ("Filas", 'filas'), ("SQL", 'sql')]
+    COLUMNAS_MANTENIMIENTO = [("Inicio", 'inicio'), ("Tarea", 'tarea'), ("ms", 'duracion_ms'),
+                              ("Resultado", 'resultado'), ("Detalle", 'detalle')]
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self._sql_lentas = []
+        self.setWindowTitle("📊 Rendimiento - Sistema AGC")
+        self.setMinimumSize(1000, 650)
+
+        self._setup_ui()
+        self.actualizar()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.actualizar)
+        self.timer.start(self.INTERVALO_MS)
+
+    def _setup_ui(self):
+        """Configura la interfaz del panel"""
+        layout = QVBoxLayout(self)
+
+        self.label_desde = QLabel()
+        self.label_desde.setStyleSheet("color: #7f8c8d; padding: 4px;")
+        layout.addWidget(self.label_desde)
+
+        self.tabs = QTabWidget()
+        self.tabla_db = self._crear_tabla(self.COLUMNAS_RESUMEN)
+        self.tabs.addTab(self.tabla_db, "🗄️ Métodos DB")
+        self.tabs.addTab(self._crear_tab_sql(), "🐢 SQL lentas")
+        self.tabla_sync = self._crear_tabla(self.COLUMNAS_RESUMEN)
+        self.tabs.addTab(self.tabla_sync, "🔄 Sincronización")
+        self.tabla_ui = self._crear_tabla(self.COLUMNAS_RESUMEN)
+        self.tabs.addTab(self.tabla_ui, "🖥️ Interfaz")
+        self.tabs.addTab(self._crear_tab_indices(), "💡 Índices")
+        self.tabla_mantenimiento = self._crear_tabla(self.COLUMNAS_MANTENIMIENTO)
+        self.tabs.addTab(self.tabla_mantenimiento, "🧰 Mantenimiento")
+        self.tabs.currentChanged.connect(self.actualizar)
+        layout.addWidget(self.tabs)
+
+        # ===== BOTONES =====
+        botones = QHBoxLayout()
+        btn_actualizar = QPushButton("🔄 Actualizar")
+        btn_actualizar.clicked.connect(self.actualizar)
+        btn_reiniciar = QPushButton("🧹 Reiniciar")
+        btn_reiniciar.setToolTip("Descarta las mediciones acumuladas hasta ahora")
+        btn_reiniciar.clicked.connect(self.reiniciar)
+        btn_exportar = QPushButton("💾 Exportar...")
+        btn_exportar.setToolTip("Guarda las métricas en JSON para enviar a soporte")
+        btn_exportar.clicked.connect(self.exportar)
+        btn_cerrar = QPushButton("Cerrar")
+        btn_cerrar.clicked.connect(self.accept)
+        for boton in (btn_actualizar, btn_reiniciar, btn_exportar):
+            botones.addWidget(boton)
+        botones.addStretch()
+        botones.addWidget(btn_cerrar)
+        layout.addLayout(botones)
+
+    def _crear_tabla(self, columnas):
+        tabla = QTableWidget(0, len(columnas))
+        tabla.setHorizontalHeaderLabels([titulo for titulo, _ in columnas])
+        tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        tabla.setSelectionMode(QAbstractItemView.SingleSelection)
+        tabla.verticalHeader().setVisible(False)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        tabla.horizontalHeader().setStretchLastSection(True)
+        return tabla
+
+    def _crear_tab_sql(self):
+        """Consultas lentas arriba y, para la seleccionada, su plan de ejecución abajo"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        splitter = QSplitter(Qt.Vertical)
+
+        self.tabla_sql = self._crear_tabla(self.COLUMNAS_SQL)
+        self.tabla_sql.itemSelectionChanged.connect(self._mostrar_plan)
+        splitter.addWidget(self.tabla_sql)
+
+        self.texto_plan = QTextEdit()
+        self.texto_plan.setReadOnly(True)
+        self.texto_plan.setFont(QFont("Courier New", 9))
+        self.texto_plan.setPlaceholderText("Seleccione una consulta para ver su EXPLAIN QUERY PLAN")
+        splitter.addWidget(self.texto_plan)
+
+        layout.addWidget(splitter)
+        return tab
+
+    def _crear_tab_indices(self):
+        """Propuestas del asesor sobre las consultas registradas hasta ahora"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        botones = QHBoxLayout()
+        btn_analizar = QPushButton("🔍 Analizar consultas")
+        btn_analizar.clicked.connect(self.analizar_indices)
+        self.btn_aplicar_indices = QPushButton("✅ Validar y aplicar")
+        self.btn_aplicar_indices.setToolTip(
+            "Prueba cada índice en una transacción que se deshace y crea los que mejoran\n"
+            "(requiere 'asesor_indices_aplicar' en la configuración)")
+        self.btn_aplicar_indices.clicked.connect(self.aplicar_indices)
+        self.btn_aplicar_indices.setEnabled(
+            bool(cargar_configuracion().get("asesor_indices_aplicar")) and hasattr(self.db, 'conn'))
+        botones.addWidget(btn_analizar)
+        botones.addWidget(self.btn_aplicar_indices)
+        botones.addStretch()
+        layout.addLayout(botones)
+
+        self.texto_indices = QTextEdit()
+        self.texto_indices.setReadOnly(True)
+        self.texto_indices.setFont(QFont("Courier New", 9))
+        self.texto_indices.setPlaceholderText("Use la aplicación normalmente y después analice las consultas")
+        layout.addWidget(self.texto_indices)
+        return tab
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+    def actualizar(self):
+        """Vuelve a leer el registro de métricas"""
+        try:
+            registro = metricas()
+            self.label_desde.setText(
+                f"Mediciones desde {registro.desde.strftime('%d/%m/%Y %H:%M:%S')} · "
+                f"SQL lenta: más de {registro.SQL_LENTA_MS} ms")
+            self._llenar(self.tabla_db, self.COLUMNAS_RESUMEN, registro.resumen('db'))
+            self._llenar(self.tabla_sync, self.COLUMNAS_RESUMEN, registro.resumen('sync'))
+            self._llenar(self.tabla_ui, self.COLUMNAS_RESUMEN, registro.resumen('ui'))
+
+            sql_lentas = registro.sql_lentas()
+            if sql_lentas != self._sql_lentas:
+                # Solo se redibuja si cambió, para no perder la selección ni el plan
+                self._sql_lentas = sql_lentas
+                self._llenar(self.tabla_sql, self.COLUMNAS_SQL, sql_lentas)
+                self.texto_plan.clear()
+
+            mantenimiento = getattr(self.db, 'mantenimiento', None)
+            if mantenimiento is not None and self.tabs.currentWidget() is self.tabla_mantenimiento:
+                self._llenar(self.tabla_mantenimiento, self.COLUMNAS_MANTENIMIENTO, mantenimiento.historial())
+        except Exception as e:
+            logger.error("❌ Error actualizando panel de rendimiento: %s", e)
+
+    def _llenar(self, tabla, columnas, filas):
+        tabla.setUpdatesEnabled(False)
+        tabla.setRowCount(len(filas))
+        for i, fila in enumerate(filas):
+            for j, (_, clave) in enumerate(columnas):
+                valor = fila.get(clave)
+                item = QTableWidgetItem("" if valor is None else str(valor))
+                if isinstance(valor, (int, float)):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                tabla.setItem(i, j, item)
+        tabla.setUpdatesEnabled(True)
+
+    def _mostrar_plan(self):
+        filas = self.tabla_sql.selectionModel().selectedRows()
+        if not filas or filas[0].row() >= len(self._sql_lentas):
+            return
+        consulta = self._sql_lentas[filas[0].row()]
+        conexion_lectura = getattr(self.db, '_conexion_lectura', None)
+        if conexion_lectura is None:
+            plan = "Plan no disponible: la base es remota"
+        else:
+            parametros = consulta['parametros']
+            plan = explicar(conexion_lectura(), consulta['sql'],
+                            parametros if isinstance(parametros, (list, tuple, dict)) else ())
+        self.texto_plan.setPlainText(
+            f"{consulta['sql']}\n\nParámetros: {consulta['parametros']}\n\n"
+            f"EXPLAIN QUERY PLAN\n{plan}")
+
+    def analizar_indices(self):
+        conexion_lectura = getattr(self.db, '_conexion_lectura', None)
+        if conexion_lectura is None:
+            self.texto_indices.setPlainText("Análisis no disponible: la base es remota")
+            return
+        try:
+            propuestas = AsesorIndices(conexion_lectura()).analizar(metricas().consultas())
+            self.texto_indices.setPlainText(informe(propuestas))
+        except Exception as e:
+            logger.error("❌ Error analizando índices: %s", e)
+            self.texto_indices.setPlainText(f"❌ Error analizando índices: {e}")
+
+    def aplicar_indices(self):
+        """Valida cada propuesta sobre la base principal y crea las que mejoran"""
+        respuesta = QMessageBox.question(
+            self, "Aplicar índices",
+            "Se probará cada índice propuesto sobre la base (puede tardar y bloquear\n"
+            "las escrituras de otros puestos mientras tanto).\n\n¿Continuar?",
+            QMessageBox.Yes | QMessageBox.No)
+        if respuesta != QMessageBox.Yes:
+            return
+        try:
+            asesor = AsesorIndices(self.db.conn)
+            propuestas = [asesor.validar(p) for p in asesor.analizar(metricas().consultas())]
+            creados = asesor.aplicar(asesor.seleccionar(propuestas))
+            self.texto_indices.setPlainText(
+                informe(propuestas) + f"\n✅ Índices creados: {len(creados)}\n" + "\n".join(creados))
+        except Exception as e:
+            logger.error("❌ Error aplicando índices: %s", e)
+            QMessageBox.critical(self, "Error", f"No se pudieron aplicar los índices:\n{str(e)}")
+
+    def reiniciar(self):
+        metricas().reiniciar()
+        self._sql_lentas = []
+        self.actualizar()
+
+    def exportar(self):
+        """Guarda las métricas en JSON"""
+        try:
+            ruta, _ = QFileDialog.getSaveFileName(
+                self, "Exportar métricas de rendimiento",
+                f"rendimiento_{datetime.now().strftime('%Y%m%d_%H%M')}.json",
+                "JSON (*.json)"
+            )
+            if not ruta:
+                return
+            ruta_db = getattr(self.db, 'path', None)
+            extra = {'base': ruta_db}
+            if ruta_db and os.path.exists(ruta_db):
+                extra['base_mb'] = round(os.path.getsize(ruta_db) / (1024 * 1024), 1)
+            metricas().exportar(ruta, extra)
+            QMessageBox.information(self, "Exportar", f"✅ Métricas exportadas a:\n{ruta}")
+        except Exception as e:
+            logger.error("❌ Error exportando métricas: %s", e)
+            QMessageBox.critical(self, "Error", f"No se pudieron exportar las métricas:\n{str(e)}")
+
+    def done(self, resultado):
+        self.timer.stop()
+        super().done(resultado)
@@ -5,7 +5,6 @@ Ventana principal modularizada - VERSIÓN COMPLETAMENTE FUNCIONAL
 
 import os
 import sys
-import pandas as pd
 from datetime import datetime
 
 # ✅ AGREGAR ESTO PARA IMPORTS ABSOLUTOS
@@ -23,38 +22,50 @@ from PyQt5.QtCore import Qt, QUrl
 from PyQt5.QtGui import QDesktopServices, QTextDocument, QTextCursor, QTextCharFormat, QFont
 # ✅ NUEVAS IMPORTACIONES PARA SINCRONIZACIÓN
 from core.sync_manager import SyncManager
-from config.config_manager import obtener_estado_sincronizacion, actualizar_ultima_sincronizacion
+from config.config_manager import cargar_configuracion, obtener_estado_sincronizacion, actualizar_ultima_sincronizacion
 from core.bien_manager import BienManager  # ← ✅ CORRECTO
 
 # ✅ IMPORTS ABSOLUTOS (ahora funcionarán)
 from database.db_manager import DB
+from database.metricas import medir
 from core.bien_manager import BienManager
-from utils import excel_handler
+from utils.logger import obtener_logger
+from utils.perfil_arranque import etapa
 
 # ✅ IMPORTS RELATIVOS (para módulos dentro de ui/)
 from .components.header_filtros import HeaderFiltros
 from .components.panel_filtros import PanelFiltrosAvanzados
-from .dialogs.bien_dialog import BienDialog
-from .dialogs.movimiento_dialog import MovimientoDialog
-from .dialogs.config_modo_dialog import ConfiguracionModoDialog
+# Los diálogos, pandas y matplotlib se importan al usarlos: no frenan el arranque
+
+logger = obtener_logger(__name__)
 
 
 class VentanaPrincipal(QMainWindow):
+    # Cambios publicados por la base (llegan desde otro hilo)
+    cambios_recibidos = QtCore.pyqtSignal(list)
+
     def __init__(self, db: DB, usuario_actual=None):
         super().__init__()
         self.db = db
         self.usuario_actual = usuario_actual
         
+        # Filas visibles por id, para refrescar solo las que cambian
+        self._filas_bienes = {}
+        self._filas_movimientos = {}
+        self._mostrando_eliminados = False
+        
         # ✅ INICIALIZAR MANAGERS PRIMERO
-        self.bien_manager = BienManager(db)  # ← PRIMERO esto
-        self.sync_manager = SyncManager(db)   # ← LUEGO esto
+        with etapa("ventana.managers"):
+            self.bien_manager = BienManager(db)  # ← PRIMERO esto
+            self.sync_manager = SyncManager(db)   # ← LUEGO esto
         
         self.status_bar = None
         self._status_widgets = []
         
         # ✅ LUEGO configurar UI
         self._inicializar_configuracion()
-        self._setup_ui()
+        with etapa("ventana.setup_ui"):
+            self._setup_ui()
         
         # ✅ FINALMENTE conectar señales
         self.sync_manager.sincronizacion_iniciada.connect(self._on_sincronizacion_iniciada)
@@ -66,16 +77,73 @@ class VentanaPrincipal(QMainWindow):
         self.sync_manager.conflicto_detectado.connect(self._on_conflicto_detectado)
         
         # ✅ QUINTO: Actualizar UI final
-        self.actualizar_status_bar()
-        self._actualizar_estado_sincronizacion_ui()
+        with etapa("ventana.estado"):
+            self.actualizar_status_bar()
+            self._actualizar_estado_sincronizacion_ui()
+        
+        # Escritura periódica de la actividad auditada en buffer
+        self.timer_logs_actividad = QtCore.QTimer(self)
+        self.timer_logs_actividad.timeout.connect(self.db.vaciar_logs_actividad)
+        self.timer_logs_actividad.start(15000)
+        
+        # Indicador de escrituras diferidas (modo red_directo)
+        if self.db.diario_escrituras is not None:
+            self._pendientes_anteriores = 0
+            self.label_escrituras_pendientes = QLabel()
+            self.label_escrituras_pendientes.setStyleSheet("""
+                QLabel {
+                    color: #d35400; 
+                    font-weight: bold; 
+                    padding: 0 8px;
+                    background-color: #fdebd0;
+                    border-radius: 10px;
+                    margin: 2px;
+                }
+            """)
+            self.label_escrituras_pendientes.hide()
+            self.status_bar.addPermanentWidget(self.label_escrituras_pendientes)
+            # Escrituras que la red rechazó: no llegaron al inventario
+            self._fallidas_anteriores = 0
+            self.btn_escrituras_fallidas = QPushButton()
+            self.btn_escrituras_fallidas.setStyleSheet("""
+                QPushButton {
+                    color: white; 
+                    font-weight: bold; 
+                    padding: 0 8px;
+                    background-color: #c0392b;
+                    border: none;
+                    border-radius: 10px;
+                    margin: 2px;
+                }
+            """)
+            self.btn_escrituras_fallidas.setToolTip("La red rechazó estas escrituras: clic para verlas")
+            self.btn_escrituras_fallidas.clicked.connect(self.mostrar_escrituras_fallidas)
+            self.btn_escrituras_fallidas.hide()
+            self.status_bar.addPermanentWidget(self.btn_escrituras_fallidas)
+            self.timer_escrituras = QtCore.QTimer(self)
+            self.timer_escrituras.timeout.connect(self._actualizar_escrituras_pendientes)
+            self.timer_escrituras.start(1000)
         
         # Cargar datos iniciales
-        self.cargar_bienes()
-        self.cargar_movimientos()
+        with etapa("ventana.cargar_datos"):
+            self.cargar_bienes()
+            self.cargar_movimientos()
+        
+        # Mantenimiento de la base cuando está inactiva y lejos de una sincronización.
+        # En red_directo el archivo es la maestra compartida: de eso se ocupa el servidor.
+        config = cargar_configuracion()
+        if (config.get("mantenimiento_automatico", True) and not getattr(self.db, "es_remoto", False)
+                and config.get("modo_trabajo") != "red_directo"):
+            self.db.activar_mantenimiento(self.sync_manager.ventana_libre,
+                                          config.get("archivo_horizonte_dias", 730))
+        
+        # Avisos de cambios (de este u otros puestos): refrescar solo lo tocado
+        self.cambios_recibidos.connect(self._aplicar_cambios)
+        self.db.al_cambiar(self.cambios_recibidos.emit)
         #✅ VERIFICACIÓN FINAL
-        print("✅ Sistema completamente inicializado:")
-        print(f"   - sync_manager: {'✅' if self.sync_manager else '❌'}")
-        print(f"   - bien_manager: {'✅' if self.bien_manager else '❌'}")
+        logger.debug("✅ Sistema completamente inicializado:")
+        logger.debug("   - sync_manager: %s", '✅' if self.sync_manager else '❌')
+        logger.debug("   - bien_manager: %s", '✅' if self.bien_manager else '❌')
         
     def _inicializar_configuracion(self):
         """Configuración inicial de la ventana"""
@@ -326,6 +394,26 @@ class VentanaPrincipal(QMainWindow):
         self.btn_gestion_usuarios.setVisible(self.usuario_actual['rol'] == 'admin')
         
         toolbar.addWidget(self.btn_gestion_usuarios)
+
+        # Panel de rendimiento (solo admins)
+        self.btn_rendimiento = QPushButton("📊 Rendimiento")
+        self.btn_rendimiento.setStyleSheet("""
+            QPushButton {
+                background-color: #16a085;
+                color: white;
+                padding: 5px 10px;
+                border-radius: 3px;
+                font-weight: bold;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #138d75;
+            }
+        """)
+        self.btn_rendimiento.clicked.connect(self.mostrar_panel_rendimiento)
+        self.btn_rendimiento.setToolTip("Latencias de la base, consultas lentas y tiempos de sincronización")
+        self.btn_rendimiento.setVisible(self.usuario_actual['rol'] == 'admin')
+        toolbar.addWidget(self.btn_rendimiento)
         
         # Espacio flexible
         toolbar.addWidget(QLabel(""))
@@ -357,6 +445,16 @@ class VentanaPrincipal(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"No se pudo abrir gestión de usuarios:\n{str(e)}")        
 
+    def mostrar_panel_rendimiento(self):
+        """Muestra el panel de rendimiento (no modal: se puede dejar abierto mientras se trabaja)"""
+        try:
+            from .dialogs.rendimiento_dialog import RendimientoDialog
+            dialog = RendimientoDialog(self.db, self)
+            dialog.setAttribute(Qt.WA_DeleteOnClose)
+            dialog.show()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudo abrir el panel de rendimiento:\n{str(e)}")
+
     # ========== 🆕 MÉTODOS DE SINCRONIZACIÓN ==========
 
     def _actualizar_estado_sincronizacion_ui(self):
@@ -370,13 +468,13 @@ class VentanaPrincipal(QMainWindow):
             
             for componente in componentes_requeridos:
                 if not hasattr(self, componente) or getattr(self, componente) is None:
-                    print(f"⚠️ Componente '{componente}' no está listo aún")
+                    logger.warning("⚠️ Componente '%s' no está listo aún", componente)
                     return
             
             # ✅ VERIFICAR QUE EL SYNC MANAGER ESTÉ INICIALIZADO CORRECTAMENTE
             estado = self.sync_manager.obtener_estado()
             if not estado:
-                print("⚠️ No se pudo obtener estado del SyncManager")
+                logger.warning("⚠️ No se pudo obtener estado del SyncManager")
                 return
                 
             modo = estado.get("modo_trabajo", "desconocido")
@@ -425,7 +523,7 @@ class VentanaPrincipal(QMainWindow):
                         color = "#27ae60"  # Verde
                         tooltip = f"Última sincronización: {fecha_dt.strftime('%d/%m/%Y %H:%M')}"
                     except Exception as date_error:
-                        print(f"⚠️ Error formateando fecha: {date_error}")
+                        logger.warning("⚠️ Error formateando fecha: %s", date_error)
                         texto = "✅ Conectado"
                         color = "#27ae60"
                         tooltip = "Conectado a la red"
@@ -468,10 +566,10 @@ class VentanaPrincipal(QMainWindow):
             if hasattr(self, 'actualizar_status_bar'):
                 self.actualizar_status_bar()
             
-            print(f"✅ UI de sincronización actualizada: {modo_texto} - {texto}")
+            logger.debug("✅ UI de sincronización actualizada: %s - %s", modo_texto, texto)
             
         except Exception as e:
-            print(f"⚠️ Error recuperable en UI sync: {e}")
+            logger.warning("⚠️ Error recuperable en UI sync: %s", e)
             # No hacemos nada, es un error temporal que se resolverá en el próximo intento
 
     def sincronizar_manual(self):
@@ -487,12 +585,12 @@ class VentanaPrincipal(QMainWindow):
 
     def _on_sincronizacion_iniciada(self, mensaje):
         """Maneja el inicio de sincronización"""
-        print(f"🔄 {mensaje}")
+        logger.debug("🔄 %s", mensaje)
         self.status_bar.showMessage(mensaje)
 
     def _on_sincronizacion_completada(self, mensaje, exito):
         """Maneja la finalización de sincronización - VERSIÓN CORREGIDA"""
-        print(f"✅ Sincronización completada: {mensaje}")
+        logger.debug("✅ Sincronización completada: %s", mensaje)
         
         # ✅ CORREGIDO: Verificar que status_bar existe antes de usarlo
         if hasattr(self, 'status_bar') and self.status_bar is not None:
@@ -502,7 +600,7 @@ class VentanaPrincipal(QMainWindow):
                 self.status_bar.showMessage(f"❌ {mensaje}", 5000)
         else:
             # Si no existe status_bar, solo mostrar en consola
-            print(f"📢 {mensaje}")
+            logger.debug("📢 %s", mensaje)
         
         # Restaurar botón
         self.btn_sync_manual.setEnabled(True)
@@ -522,20 +620,55 @@ class VentanaPrincipal(QMainWindow):
 
     def _on_progreso_sincronizacion(self, porcentaje, estado):
         """Maneja actualizaciones de progreso - VERSIÓN CORREGIDA"""
+        # Arranca una sincronización: el mantenimiento en curso cede la base
+        if porcentaje == 0 and getattr(self.db, "mantenimiento", None) is not None:
+            self.db.mantenimiento.interrumpir()
         # ✅ CORREGIDO: Verificar que status_bar existe
         if hasattr(self, 'status_bar') and self.status_bar is not None:
             self.status_bar.showMessage(f"🔄 {estado} ({porcentaje}%)")
         else:
-            print(f"🔄 {estado} ({porcentaje}%)")
+            logger.debug("🔄 %s (%s%%)", estado, porcentaje)
 
     def _on_conflicto_detectado(self, conflicto):
-        """Maneja conflictos detectados"""
-        print(f"⚠️ Conflicto detectado: {conflicto}")
-        # Por ahora solo mostrar advertencia
-        QMessageBox.warning(self, "Conflicto", 
-                        f"Se detectó un conflicto en la sincronización.\n\n"
-                        f"ID: {conflicto.get('id', 'N/A')}\n"
-                        f"Tipo: {conflicto.get('tipo', 'N/A')}")
+        """Encola el conflicto; se muestran todos juntos al terminar la sincronización"""
+        logger.warning("⚠️ Conflicto detectado: %s", conflicto)
+        if not hasattr(self, '_conflictos_por_mostrar'):
+            self._conflictos_por_mostrar = []
+        self._conflictos_por_mostrar.append(conflicto)
+        if len(self._conflictos_por_mostrar) == 1:
+            QtCore.QTimer.singleShot(0, self._resolver_conflictos_pendientes)
+
+    def _resolver_conflictos_pendientes(self):
+        """Pregunta uno por uno qué valor conservar; 'Después' deja el resto en la cola"""
+        conflictos, self._conflictos_por_mostrar = self._conflictos_por_mostrar, []
+        for n, conflicto in enumerate(conflictos, 1):
+            if conflicto.get('tipo') == 'borrado':
+                detalle = (f"La fila fue borrada en un lado y modificada en el otro.\n\n"
+                           f"Local: {'(borrada)' if conflicto.get('local') is None else 'modificada'}\n"
+                           f"Red: {'(borrada)' if conflicto.get('red') is None else 'modificada'}")
+            else:
+                detalle = (f"Campo: {conflicto.get('campo')}\n\n"
+                           f"Antes: {conflicto.get('base')}\n"
+                           f"Local: {conflicto.get('local')}\n"
+                           f"Red: {conflicto.get('red')}")
+            caja = QMessageBox(self)
+            caja.setIcon(QMessageBox.Warning)
+            caja.setWindowTitle(f"Conflicto {n} de {len(conflictos)}")
+            caja.setText(f"{conflicto.get('tabla')} #{conflicto.get('fila_id')} cambió en este "
+                         f"puesto y en otro.\n\n{detalle}")
+            usar_local = caja.addButton("Usar local", QMessageBox.AcceptRole)
+            usar_red = caja.addButton("Usar red", QMessageBox.AcceptRole)
+            caja.addButton("Decidir después", QMessageBox.RejectRole)
+            caja.exec_()
+            
+            if caja.clickedButton() is usar_local:
+                self.sync_manager.resolver_conflicto(conflicto['id'], 'local')
+            elif caja.clickedButton() is usar_red:
+                self.sync_manager.resolver_conflicto(conflicto['id'], 'red')
+            else:
+                restantes = len(self.sync_manager.conflictos_pendientes())
+                self.status_bar.showMessage(f"⚠️ {restantes} conflictos pendientes de resolver", 10000)
+                break
 
     def mostrar_dialogo_sincronizacion(self):
         """Muestra diálogo con información detallada de sincronización"""
@@ -909,20 +1042,19 @@ class VentanaPrincipal(QMainWindow):
         self.tabs.addTab(tab, "🔄 Movimientos")
 
     def _crear_tab_estadisticas(self):
-        """Crea el panel de estadísticas ejecutivo - VERSIÓN INTERACTIVA"""
-        from widgets.dashboard import DashboardConfigurableWidget
-        tab = QWidget()
-        layout = QVBoxLayout(tab)
-
-        # ✅ MODIFICADO: Pasar 'self' como parent para interactividad
-        self.dashboard_widget = DashboardConfigurableWidget(self.db, self)  # ← ¡AGREGAR self!
-        layout.addWidget(self.dashboard_widget)
+        """Agrega la pestaña del dashboard; el widget (y matplotlib) se crea al entrar por primera vez"""
+        self.dashboard_widget = None
+        self.tab_dashboard = QWidget()
+        QVBoxLayout(self.tab_dashboard)
 
-        self.tabs.addTab(tab, "📊 Dashboard")
+        self.tabs.addTab(self.tab_dashboard, "📊 Dashboard")
 
         # Opcional: Actualizar dashboard cada vez que se entra a la pestaña
         def actualizar_al_mostrar(index):
-            if self.tabs.tabText(index) == "📊 Dashboard":
+            if self.tabs.widget(index) is self.tab_dashboard:
+                if self.dashboard_widget is None:
+                    self._construir_dashboard()
+                    return
                 if hasattr(self.dashboard_widget, 'filtros_actuales') and self.dashboard_widget.filtros_actuales:
                     self.dashboard_widget._cargar_datos_con_filtros(self.dashboard_widget.filtros_actuales)
                 else:
@@ -930,6 +1062,20 @@ class VentanaPrincipal(QMainWindow):
 
         self.tabs.currentChanged.connect(actualizar_al_mostrar)
 
+    def _construir_dashboard(self):
+        """Crea el dashboard la primera vez que se muestra (ya carga sus datos al construirse)"""
+        try:
+            from widgets.dashboard import DashboardConfigurableWidget
+            QtWidgets.QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                # ✅ MODIFICADO: Pasar 'self' como parent para interactividad
+                self.dashboard_widget = DashboardConfigurableWidget(self.db, self)
+                self.tab_dashboard.layout().addWidget(self.dashboard_widget)
+            finally:
+                QtWidgets.QApplication.restoreOverrideCursor()
+        except Exception as e:
+            logger.error("❌ Error creando el dashboard: %s", e)
+
     def _crear_tarjeta_kpi(self, titulo, valor, color):
         """Crea una tarjeta KPI individual"""
         container = QWidget()
@@ -985,7 +1131,7 @@ class VentanaPrincipal(QMainWindow):
                 self.label_columnas_activas.setText(f"Columnas visibles: {columnas_texto}")
                 
         except Exception as e:
-            print(f"❌ Error configurando columnas de tabla: {e}")
+            logger.error("❌ Error configurando columnas de tabla: %s", e)
 
     def configurar_columnas_movimientos(self):
         """Configura las columnas de la tabla de movimientos"""
@@ -1012,13 +1158,33 @@ class VentanaPrincipal(QMainWindow):
                 self.label_columnas_mov_activas.setText(f"Columnas visibles: {columnas_texto}")
                 
         except Exception as e:
-            print(f"❌ Error configurando columnas de movimientos: {e}")
+            logger.error("❌ Error configurando columnas de movimientos: %s", e)
+
+    def _columnas_consulta_bienes(self):
+        """Campos de BD que necesita la grilla de bienes según las columnas visibles"""
+        columnas = [campo for nombre, campo in self.mapeo_columnas
+                    if self.columnas_visibles_bienes.get(nombre, False)]
+        
+        # ESTADO se muestra como "Disponible" según tenga o no responsable
+        if "estado" in columnas:
+            columnas += ["nombre", "apellido"]
+        return columnas
+
+    def _columnas_consulta_movimientos(self):
+        """Campos de BD que necesita la grilla de movimientos según las columnas visibles"""
+        columnas = [campo for nombre, campo in self.mapeo_columnas_movimientos
+                    if self.columnas_visibles_movimientos.get(nombre, False)]
+        
+        # La columna Acta se arma con el PDF firmado (el id viene siempre)
+        if "archivo_path" in columnas:
+            columnas.append("archivo_path_pdf")
+        return columnas
 
     def cargar_bienes(self):
         """Carga bienes aplicando paginación"""
         try:
-            # Obtener TODOS los bienes
-            todos_los_bienes = self.db.list_bienes()
+            # Obtener TODOS los bienes (solo las columnas visibles)
+            todos_los_bienes = self.db.list_bienes(columnas=self._columnas_consulta_bienes())
             self.total_registros = len(todos_los_bienes)
             
             # Calcular paginación
@@ -1035,11 +1201,12 @@ class VentanaPrincipal(QMainWindow):
             # Actualizar controles de paginación
             self.actualizar_controles_paginacion()
             
-            print(f"✅ Cargados {len(bienes_paginados)} registros (página {self.pagina_actual})")
+            logger.debug("✅ Cargados %s registros (página %s)", len(bienes_paginados), self.pagina_actual)
             
         except Exception as e:
-            print(f"❌ Error cargando bienes: {e}")
+            logger.error("❌ Error cargando bienes: %s", e)
 
+    @medir("ui", "tabla_bienes")
     def mostrar_bienes_en_tabla(self, bienes):
         """Muestra bienes en tabla"""
         try:
@@ -1048,6 +1215,7 @@ class VentanaPrincipal(QMainWindow):
                 
             # Limpiar tabla
             self.tabla_bienes.setRowCount(0)
+            self._filas_bienes = {}
             
             if bienes:
                 self.tabla_bienes.setRowCount(len(bienes))
@@ -1055,37 +1223,44 @@ class VentanaPrincipal(QMainWindow):
                 for i, bien in enumerate(bienes):
                     if i >= 500:  # Límite para rendimiento
                         break
-                    col_idx = 0
-                                       
-                    for nombre_columna, campo_bd in self.mapeo_columnas:
-                        if not self.columnas_visibles_bienes.get(nombre_columna, False):
-                            continue
-                            
-                        valor = self.safe_get(bien, campo_bd)                        
-                       
-                        # Lógica especial para el estado
-                        if nombre_columna == "ESTADO":
-                            estado = valor.lower()
-                            nombre = self.safe_get(bien, "nombre")
-                            apellido = self.safe_get(bien, "apellido")
-                            
-                            if (estado == "en depósito" or estado == "stock") and not (nombre.strip() or apellido.strip()):
-                                valor = "🟢 Disponible"
-                            elif estado == "asignado":
-                                valor = "🔵 Asignado"
-                            elif estado == "en reparación":
-                                valor = "🟡 En reparación" 
-                            elif estado == "baja definitiva":
-                                valor = "🔴 Baja"
-                        
-                        self.tabla_bienes.setItem(i, col_idx, QTableWidgetItem(str(valor)))
-                        col_idx += 1
+                    self._pintar_fila_bien(i, bien)
             
             self.tabla_bienes.resizeColumnsToContents()
-            print(f"✅ Tabla actualizada: {min(len(bienes), 500)} registros")
+            logger.debug("✅ Tabla actualizada: %s registros", min(len(bienes), 500))
 
         except Exception as e:
-            print(f"❌ Error en mostrar_bienes_en_tabla: {e}")
+            logger.error("❌ Error en mostrar_bienes_en_tabla: %s", e)
+
+    def _pintar_fila_bien(self, i, bien):
+        """Escribe un bien en la fila `i` de la grilla y recuerda su id"""
+        col_idx = 0
+        for nombre_columna, campo_bd in self.mapeo_columnas:
+            if not self.columnas_visibles_bienes.get(nombre_columna, False):
+                continue
+                
+            valor = self.safe_get(bien, campo_bd)                        
+           
+            # Lógica especial para el estado
+            if nombre_columna == "ESTADO":
+                estado = valor.lower()
+                nombre = self.safe_get(bien, "nombre")
+                apellido = self.safe_get(bien, "apellido")
+                
+                if (estado == "en depósito" or estado == "stock") and not (nombre.strip() or apellido.strip()):
+                    valor = "🟢 Disponible"
+                elif estado == "asignado":
+                    valor = "🔵 Asignado"
+                elif estado == "en reparación":
+                    valor = "🟡 En reparación" 
+                elif estado == "baja definitiva":
+                    valor = "🔴 Baja"
+            
+            self.tabla_bienes.setItem(i, col_idx, QTableWidgetItem(str(valor)))
+            col_idx += 1
+        
+        bien_id = self.safe_get(bien, "id")
+        if bien_id:
+            self._filas_bienes[int(bien_id)] = i
 
     def safe_get(self, bien, campo):
         """Obtiene valores de forma segura desde sqlite3.Row"""
@@ -1113,7 +1288,7 @@ class VentanaPrincipal(QMainWindow):
             self.label_registros.setText(f"Mostrando {inicio}-{fin} de {self.total_registros} registros")
             
         except Exception as e:
-            print(f"❌ Error actualizando controles de paginación: {e}")
+            logger.error("❌ Error actualizando controles de paginación: %s", e)
 
     def pagina_anterior(self):
         """Va a la página anterior"""
@@ -1136,27 +1311,27 @@ class VentanaPrincipal(QMainWindow):
                 self.pagina_actual = 1
                 self.cargar_bienes()
         except Exception as e:
-            print(f"❌ Error cambiando items por página: {e}")
+            logger.error("❌ Error cambiando items por página: %s", e)
 
     # ========== MÉTODOS DE FILTROS AVANZADOS ==========
 
     def aplicar_filtros_avanzados(self, filtros):
         """Aplica filtros avanzados REALES usando BienManager - VERSIÓN CORREGIDA"""
         try:
-            print(f"🎯 Filtros recibidos en main_window: {filtros}")
+            logger.debug("🎯 Filtros recibidos en main_window: %s", filtros)
             
             # ✅ VERIFICACIÓN CRÍTICA: ¿bien_manager existe?
             if not hasattr(self, 'bien_manager') or self.bien_manager is None:
-                print("❌ ERROR CRÍTICO: bien_manager no está inicializado")
-                print("🔄 Intentando inicializar bien_manager...")
+                logger.error("❌ ERROR CRÍTICO: bien_manager no está inicializado")
+                logger.debug("🔄 Intentando inicializar bien_manager...")
                 
                 # ✅ CORREGIDO: Importar desde core/
                 try:
                     from core.bien_manager import BienManager  # ← ¡CORREGIDO!
                     self.bien_manager = BienManager(self.db)
-                    print("✅ bien_manager inicializado exitosamente desde core/")
+                    logger.debug("✅ bien_manager inicializado exitosamente desde core/")
                 except Exception as init_error:
-                    print(f"❌ No se pudo inicializar bien_manager: {init_error}")
+                    logger.error("❌ No se pudo inicializar bien_manager: %s", init_error)
                     self.status_bar.showMessage("❌ Error: Sistema no inicializado correctamente")
                     return
             
@@ -1170,7 +1345,9 @@ class VentanaPrincipal(QMainWindow):
                 return
             
             # ✅ USAR BienManager para aplicar filtros (AHORA SEGURO)
-            bienes_filtrados = self.bien_manager.buscar_bienes(filtros)
+            bienes_filtrados = self.bien_manager.buscar_bienes(
+                filtros, columnas=self._columnas_consulta_bienes()
+            )
             
             # Actualizar la tabla con los resultados filtrados
             self.total_registros = len(bienes_filtrados)
@@ -1192,10 +1369,10 @@ class VentanaPrincipal(QMainWindow):
             criterios = len(filtros)
             self.status_bar.showMessage(f"✅ Filtros aplicados: {criterios} criterios, {self.total_registros} resultados")
             
-            print(f"✅ Filtros procesados: {criterios} criterios, {len(bienes_filtrados)} registros")
+            logger.debug("✅ Filtros procesados: %s criterios, %s registros", criterios, len(bienes_filtrados))
             
         except Exception as e:
-            print(f"❌ Error aplicando filtros: {e}")
+            logger.error("❌ Error aplicando filtros: %s", e)
             self.status_bar.showMessage("❌ Error aplicando filtros")
             # Fallback: cargar bienes normales
             self.cargar_bienes()
@@ -1205,13 +1382,14 @@ class VentanaPrincipal(QMainWindow):
     def abrir_formulario_bien(self):
         """Abre el formulario de bienes"""
         try:
+            from .dialogs.bien_dialog import BienDialog
             dialog = BienDialog(self.db, self)
             if dialog.exec_() == QDialog.Accepted:
                 self.cargar_bienes()
                 self.actualizar_status_bar()
                 self.panel_filtros.actualizar_tipos_dinamicos()
         except Exception as e:
-            print(f"❌ Error abriendo formulario bien: {e}")
+            logger.error("❌ Error abriendo formulario bien: %s", e)
 
     def abrir_formulario_movimiento(self):
         """Abre el formulario de movimientos"""
@@ -1220,6 +1398,7 @@ class VentanaPrincipal(QMainWindow):
             # dialog = MovimientoDialog(self.db, self)
             
             # ✅ AHORA: Pasar usuario_actual
+            from .dialogs.movimiento_dialog import MovimientoDialog
             dialog = MovimientoDialog(self.db, self.usuario_actual, self)
             
             if dialog.exec_() == QDialog.Accepted:
@@ -1227,78 +1406,39 @@ class VentanaPrincipal(QMainWindow):
                 self.cargar_bienes()
                 self.actualizar_status_bar()
         except Exception as e:
-            print(f"❌ Error abriendo formulario movimiento: {e}")
+            logger.error("❌ Error abriendo formulario movimiento: %s", e)
 
     def mostrar_configuracion_avanzada(self):
         """Muestra el diálogo de configuración avanzada"""
         try:
+            from .dialogs.config_modo_dialog import ConfiguracionModoDialog
             dialog = ConfiguracionModoDialog(self)
             dialog.exec_()
         except Exception as e:
-            print(f"❌ Error mostrando configuración: {e}")
+            logger.error("❌ Error mostrando configuración: %s", e)
 
     # ========== MÉTODOS DE MOVIMIENTOS ==========
 
+    @medir("ui", "tabla_movimientos")
     def cargar_movimientos(self, mostrar_eliminados=False):
         """Carga movimientos con diseño optimizado - SIN COLUMNA ACCIONES"""
         try:
             # Pasar parámetro mostrar_eliminados a la BD
-            movimientos = self.db.get_movimientos_detallados(incluir_eliminados=mostrar_eliminados)
+            movimientos = self.db.get_movimientos_detallados(
+                incluir_eliminados=mostrar_eliminados,
+                columnas=self._columnas_consulta_movimientos()
+            )
                 
             self.tabla_movimientos.setRowCount(len(movimientos))
+            self._filas_movimientos = {}
+            self._mostrando_eliminados = mostrar_eliminados
             
             for i, mov in enumerate(movimientos):
-                col_idx = 0
-                for nombre_columna, campo_bd in self.mapeo_columnas_movimientos:
-                    if not self.columnas_visibles_movimientos.get(nombre_columna, False):
-                        continue
-                        
-                    # ✅ SOLO COLUMNAS DE DATOS - SIN WIDGETS COMPLEJOS
-                    if nombre_columna == "Acta":
-                        archivo_item = self._crear_item_acta_simple(mov)
-                        self.tabla_movimientos.setItem(i, col_idx, archivo_item)
-                        
-                    elif nombre_columna == "Fecha":
-                        fecha_original = self.safe_get(mov, "fecha")
-                        try:
-                            fecha_dt = datetime.strptime(fecha_original, "%Y-%m-%d")
-                            valor = fecha_dt.strftime("%d/%m")  # Formato corto
-                        except:
-                            valor = fecha_original
-                        self.tabla_movimientos.setItem(i, col_idx, QTableWidgetItem(valor))
-                        
-                    elif nombre_columna == "Área":
-                        area_completa = self.safe_get(mov, "responsable_institucional")
-                        # Acortar nombres largos de áreas
-                        if len(area_completa) > 20:
-                            valor = area_completa[:18] + ".."
-                        else:
-                            valor = area_completa
-                        self.tabla_movimientos.setItem(i, col_idx, QTableWidgetItem(valor))
-                        
-                    elif nombre_columna == "Cantidad Bienes":
-                        cantidad = self.safe_get(mov, "cantidad_bienes")
-                        valor = f"{cantidad}📦" if cantidad and cantidad != "0" else "0"
-                        item = QTableWidgetItem(valor)
-                        item.setTextAlignment(Qt.AlignCenter)
-                        self.tabla_movimientos.setItem(i, col_idx, item)
-                        
-                    elif nombre_columna in ["Tipo", "PRD"]:
-                        valor = self.safe_get(mov, campo_bd)
-                        item = QTableWidgetItem(valor)
-                        item.setTextAlignment(Qt.AlignCenter)
-                        self.tabla_movimientos.setItem(i, col_idx, item)
-                        
-                    else:
-                        # Para las demás columnas (Nombre, Apellido, etc.)
-                        valor = self.safe_get(mov, campo_bd)
-                        self.tabla_movimientos.setItem(i, col_idx, QTableWidgetItem(valor))
-                    
-                    col_idx += 1
+                self._pintar_fila_movimiento(i, mov)
                 
                 # ✅ LÍMITE DE RENDIMIENTO
                 if i >= 1000:
-                    print(f"⚠️ Límite de rendimiento alcanzado: 1000 filas")
+                    logger.warning("⚠️ Límite de rendimiento alcanzado: 1000 filas")
                     break
                 
             # ✅ AJUSTES FINALES CON EL MÉTODO NUEVO
@@ -1312,14 +1452,66 @@ class VentanaPrincipal(QMainWindow):
                 5000
             )
             
-            print(f"✅ Tabla de movimientos optimizada: {movimientos_cargados} registros")
+            logger.debug("✅ Tabla de movimientos optimizada: %s registros", movimientos_cargados)
             
         except Exception as e:
-            print(f"❌ Error cargando movimientos: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error cargando movimientos: %s", e)
             self.status_bar.showMessage("❌ Error cargando movimientos", 3000)
 
+    def _pintar_fila_movimiento(self, i, mov):
+        """Escribe un movimiento en la fila `i` de la grilla y recuerda su id"""
+        col_idx = 0
+        for nombre_columna, campo_bd in self.mapeo_columnas_movimientos:
+            if not self.columnas_visibles_movimientos.get(nombre_columna, False):
+                continue
+                
+            # ✅ SOLO COLUMNAS DE DATOS - SIN WIDGETS COMPLEJOS
+            if nombre_columna == "Acta":
+                archivo_item = self._crear_item_acta_simple(mov)
+                self.tabla_movimientos.setItem(i, col_idx, archivo_item)
+                
+            elif nombre_columna == "Fecha":
+                fecha_original = self.safe_get(mov, "fecha")
+                try:
+                    fecha_dt = datetime.strptime(fecha_original, "%Y-%m-%d")
+                    valor = fecha_dt.strftime("%d/%m")  # Formato corto
+                except:
+                    valor = fecha_original
+                self.tabla_movimientos.setItem(i, col_idx, QTableWidgetItem(valor))
+                
+            elif nombre_columna == "Área":
+                area_completa = self.safe_get(mov, "responsable_institucional")
+                # Acortar nombres largos de áreas
+                if len(area_completa) > 20:
+                    valor = area_completa[:18] + ".."
+                else:
+                    valor = area_completa
+                self.tabla_movimientos.setItem(i, col_idx, QTableWidgetItem(valor))
+                
+            elif nombre_columna == "Cantidad Bienes":
+                cantidad = self.safe_get(mov, "cantidad_bienes")
+                valor = f"{cantidad}📦" if cantidad and cantidad != "0" else "0"
+                item = QTableWidgetItem(valor)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.tabla_movimientos.setItem(i, col_idx, item)
+                
+            elif nombre_columna in ["Tipo", "PRD"]:
+                valor = self.safe_get(mov, campo_bd)
+                item = QTableWidgetItem(valor)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.tabla_movimientos.setItem(i, col_idx, item)
+                
+            else:
+                # Para las demás columnas (Nombre, Apellido, etc.)
+                valor = self.safe_get(mov, campo_bd)
+                self.tabla_movimientos.setItem(i, col_idx, QTableWidgetItem(valor))
+            
+            col_idx += 1
+        
+        mov_id = self.safe_get(mov, "id")
+        if mov_id:
+            self._filas_movimientos[int(mov_id)] = i
+
     def _aplicar_ajustes_tabla_movimientos(self):
         """Aplica ajustes finales a la tabla de movimientos"""
         try:
@@ -1360,7 +1552,7 @@ class VentanaPrincipal(QMainWindow):
             header.setStretchLastSection(True)
             
         except Exception as e:
-            print(f"❌ Error aplicando ajustes de tabla: {e}")
+            logger.error("❌ Error aplicando ajustes de tabla: %s", e)
 
     def _crear_item_acta_simple(self, movimiento):
         """Crea item de acta SIMPLIFICADO - solo PDF firmado o subir"""
@@ -1391,11 +1583,11 @@ class VentanaPrincipal(QMainWindow):
                 if movimiento_id_str and movimiento_id_str.strip():
                     movimiento_id = int(movimiento_id_str)
             except (ValueError, TypeError) as e:
-                print(f"⚠️ Error obteniendo ID del movimiento: {e}")
+                logger.warning("⚠️ Error obteniendo ID del movimiento: %s", e)
                 movimiento_id = None
             
             # 5. DEBUG
-            print(f"🔍 Creando item acta - PDF: {archivo_pdf}, Existe: {pdf_existe}, ID: {movimiento_id}")
+            logger.debug("🔍 Creando item acta - PDF: %s, Existe: %s, ID: %s", archivo_pdf, pdf_existe, movimiento_id)
             
             # 6. Asignar texto simple según estado
             if pdf_existe:
@@ -1420,9 +1612,7 @@ class VentanaPrincipal(QMainWindow):
             return archivo_item
             
         except Exception as e:
-            print(f"❌ Error creando item de acta: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error creando item de acta: %s", e)
             item = QTableWidgetItem("❌")
             item.setTextAlignment(Qt.AlignCenter)
             item.setToolTip("Error cargando información")
@@ -1439,14 +1629,14 @@ class VentanaPrincipal(QMainWindow):
             # 2. Obtener el item de la tabla
             item = self.tabla_movimientos.item(row, column)
             if not item:
-                print(f"⚠️ No hay item en fila {row}, columna {column}")
+                logger.warning("⚠️ No hay item en fila %s, columna %s", row, column)
                 return
                 
             # 3. Obtener datos almacenados en UserRole
             datos = item.data(Qt.UserRole)
             
             # 4. DEBUG: Ver qué datos tenemos
-            print(f"🔍 Click en acta - fila {row}, datos: {datos}")
+            logger.debug("🔍 Click en acta - fila %s, datos: %s", row, datos)
             
             # 5. Si no hay datos, mostrar advertencia
             if not datos:
@@ -1458,13 +1648,13 @@ class VentanaPrincipal(QMainWindow):
             # 6. Si tiene PDF, abrirlo
             if "pdf" in datos and datos["pdf"]:
                 pdf_path = datos["pdf"]
-                print(f"📄 Abriendo PDF: {pdf_path}")
+                logger.debug("📄 Abriendo PDF: %s", pdf_path)
                 self.abrir_archivo_desde_ruta(pdf_path)
                 
             # 7. Si tiene movimiento_id, subir acta
             elif "movimiento_id" in datos and datos["movimiento_id"]:
                 movimiento_id = datos["movimiento_id"]
-                print(f"📤 Subiendo acta para movimiento ID: {movimiento_id}")
+                logger.debug("📤 Subiendo acta para movimiento ID: %s", movimiento_id)
                 self._subir_acta_firmada(movimiento_id)
                 
             # 8. Si no coincide con ningún caso
@@ -1474,16 +1664,14 @@ class VentanaPrincipal(QMainWindow):
                                     "Contacte al administrador.")
                 
         except Exception as e:
-            print(f"❌ Error manejando click en acta: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error manejando click en acta: %s", e)
             QMessageBox.critical(self, "Error", 
                             f"No se pudo procesar la solicitud:\n{str(e)}")
             
     def _subir_acta_firmada(self, movimiento_id):
         """Abre diálogo para subir acta firmada (PDF) y actualiza BD"""
         try:
-            print(f"📤 DEBUG _subir_acta_firmada INICIO - Mov ID: {movimiento_id}")
+            logger.debug("📤 _subir_acta_firmada INICIO - Mov ID: %s", movimiento_id)
             
             # 1. Diálogo para seleccionar archivo PDF
             file_path, _ = QFileDialog.getOpenFileName(
@@ -1494,11 +1682,11 @@ class VentanaPrincipal(QMainWindow):
             )
             
             if not file_path or not os.path.exists(file_path):
-                print("❌ Usuario canceló o archivo no existe")
+                logger.error("❌ Usuario canceló o archivo no existe")
                 return  # Usuario canceló o archivo inválido
                 
-            print(f"📤 DEBUG: Archivo seleccionado: {file_path}")
-            print(f"📤 DEBUG: ¿Existe?: {os.path.exists(file_path)}")
+            logger.debug("📤 Archivo seleccionado: %s", file_path)
+            logger.debug("📤 ¿Existe?: %s", os.path.exists(file_path))
             
             # 2. Verificar que sea PDF
             if not file_path.lower().endswith('.pdf'):
@@ -1520,17 +1708,17 @@ class VentanaPrincipal(QMainWindow):
                                 f"No se encontró el movimiento ID: {movimiento_id}")
                 return
             
-            print(f"✅ Movimiento encontrado: {movimiento.get('tipo', 'N/A')}")
+            logger.debug("✅ Movimiento encontrado: %s", movimiento.get('tipo', 'N/A'))
             
             # 5. Usar MovimientoManager para guardar correctamente
             try:
                 from core.movimiento_manager import MovimientoManager
                 movimiento_manager = MovimientoManager(self.db)
                 
-                print(f"📤 DEBUG: Llamando a _guardar_pdf_correctamente...")
-                print(f"   PDF temp: {file_path}")
-                print(f"   Mov ID: {movimiento_id}")
-                print(f"   Tipo: {movimiento.get('tipo', 'N/A')}")
+                logger.debug("📤 Llamando a _guardar_pdf_correctamente...")
+                logger.debug("   PDF temp: %s", file_path)
+                logger.debug("   Mov ID: %s", movimiento_id)
+                logger.debug("   Tipo: %s", movimiento.get('tipo', 'N/A'))
                 
                 ruta_pdf_final = movimiento_manager._guardar_pdf_correctamente(
                     file_path, 
@@ -1538,17 +1726,17 @@ class VentanaPrincipal(QMainWindow):
                     movimiento
                 )
                 
-                print(f"📤 DEBUG: Retorno de _guardar_pdf_correctamente: {ruta_pdf_final}")
+                logger.debug("📤 Retorno de _guardar_pdf_correctamente: %s", ruta_pdf_final)
                 
                 if not ruta_pdf_final:
                     QMessageBox.critical(self, "Error", 
                                     "No se pudo guardar el PDF en la carpeta local.")
                     return
                     
-                print(f"✅ PDF guardado en: {ruta_pdf_final}")
+                logger.debug("✅ PDF guardado en: %s", ruta_pdf_final)
                 
             except Exception as mgr_error:
-                print(f"⚠️ Error con MovimientoManager: {mgr_error}")
+                logger.warning("⚠️ Error con MovimientoManager: %s", mgr_error)
                 # Fallback: guardar directamente
                 import shutil
                 import datetime
@@ -1562,11 +1750,11 @@ class VentanaPrincipal(QMainWindow):
                 ruta_pdf_final = os.path.join("actas_local", nombre)
                 
                 shutil.copy2(file_path, ruta_pdf_final)
-                print(f"✅ PDF guardado (fallback): {ruta_pdf_final}")
+                logger.debug("✅ PDF guardado (fallback): %s", ruta_pdf_final)
             
             # 6. Actualizar base de datos
             if self.db.actualizar_pdf_movimiento(movimiento_id, ruta_pdf_final):
-                print(f"✅ Base de datos actualizada para movimiento {movimiento_id}")
+                logger.debug("✅ Base de datos actualizada para movimiento %s", movimiento_id)
                 
                 # 7. Actualizar tabla visualmente
                 self.cargar_movimientos()
@@ -1583,9 +1771,7 @@ class VentanaPrincipal(QMainWindow):
                                 "El archivo se guardó pero no se vinculó al movimiento.")
                     
         except Exception as e:
-            print(f"❌ Error subiendo acta: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error subiendo acta: %s", e)
             QMessageBox.critical(self, "Error", 
                             f"No se pudo subir el acta:\n{str(e)}")
         
@@ -1607,7 +1793,7 @@ class VentanaPrincipal(QMainWindow):
                 self._abrir_archivo_movimiento(row, column)
                 
         except Exception as e:
-            print(f"❌ Error manejando click en tabla: {e}")
+            logger.error("❌ Error manejando click en tabla: %s", e)
 
     def _abrir_archivo_movimiento(self, row, column):
         """Abre el archivo PDF o DOCX asociado al movimiento - VERSIÓN ACTUALIZADA"""
@@ -1652,7 +1838,7 @@ class VentanaPrincipal(QMainWindow):
                     self.abrir_archivo_desde_ruta(archivos_data['docx'])
                     
         except Exception as e:
-            print(f"❌ Error abriendo archivo del movimiento: {e}")
+            logger.error("❌ Error abriendo archivo del movimiento: %s", e)
             QMessageBox.critical(self, "Error", f"No se pudo abrir el archivo:\n{str(e)}")
 
     def abrir_archivo_desde_ruta(self, ruta_archivo):
@@ -1674,13 +1860,13 @@ class VentanaPrincipal(QMainWindow):
                     import subprocess
                     subprocess.run(["xdg-open", ruta_archivo])
                     
-                print(f"✅ Archivo abierto: {ruta_archivo}")
+                logger.debug("✅ Archivo abierto: %s", ruta_archivo)
             else:
                 QMessageBox.warning(self, "Archivo no encontrado", 
                                 f"El archivo no existe:\n{ruta_archivo}")
                 
         except Exception as e:
-            print(f"❌ Error abriendo archivo: {e}")
+            logger.error("❌ Error abriendo archivo: %s", e)
             QMessageBox.critical(self, "Error", 
                             f"No se pudo abrir el archivo:\n{str(e)}\n\n"
                             f"Ruta: {ruta_archivo}")
@@ -1694,7 +1880,7 @@ class VentanaPrincipal(QMainWindow):
             self._actualizar_tarjetas_kpi(stats)
             self._actualizar_graficos(stats)
         except Exception as e:
-            print(f"❌ Error actualizando dashboard: {e}")
+            logger.error("❌ Error actualizando dashboard: %s", e)
 
     def _actualizar_tarjetas_kpi(self, stats):
         """Actualiza los valores de las tarjetas KPI"""
@@ -1708,7 +1894,7 @@ class VentanaPrincipal(QMainWindow):
             self._actualizar_tarjeta_kpi(self.kpi_asignados, str(por_estado.get('Asignado', 0)))
             self._actualizar_tarjeta_kpi(self.kpi_bajas, str(por_estado.get('Baja definitiva', 0)))
         except Exception as e:
-            print(f"❌ Error actualizando tarjetas KPI: {e}")
+            logger.error("❌ Error actualizando tarjetas KPI: %s", e)
 
     def _actualizar_tarjeta_kpi(self, tarjeta_widget, nuevo_valor):
         """Actualiza el valor de una tarjeta KPI específica"""
@@ -1719,7 +1905,7 @@ class VentanaPrincipal(QMainWindow):
                 if isinstance(label_valor, QLabel):
                     label_valor.setText(nuevo_valor)
         except Exception as e:
-            print(f"❌ Error actualizando tarjeta: {e}")
+            logger.error("❌ Error actualizando tarjeta: %s", e)
 
     def _actualizar_graficos(self, stats):
         """Actualiza los gráficos (placeholders)"""
@@ -1733,7 +1919,7 @@ class VentanaPrincipal(QMainWindow):
             self.grafico_estados.setText(texto_estados)
             self.grafico_tipos.setText("Gráfico de Tipos - Próximamente")
         except Exception as e:
-            print(f"❌ Error actualizando gráficos: {e}")
+            logger.error("❌ Error actualizando gráficos: %s", e)
 
     # ========== MÉTODOS AUXILIARES ==========
 
@@ -1777,7 +1963,7 @@ class VentanaPrincipal(QMainWindow):
                     sync_str = f"Última sync: {fecha_dt.strftime('%H:%M')}"
                     color_sync = "#27ae60"  # Verde
                 except Exception as e:
-                    print(f"⚠️ Error formateando fecha sync: {e}")
+                    logger.warning("⚠️ Error formateando fecha sync: %s", e)
                     sync_str = "Sync: Activo"
                     color_sync = "#f39c12"  # Naranja
             else:
@@ -1814,7 +2000,133 @@ class VentanaPrincipal(QMainWindow):
             error_msg = f"👤 {self.usuario_actual['id']} | Error actualizando estado: {str(e)}"
             if hasattr(self, 'status_bar') and self.status_bar is not None:
                 self.status_bar.showMessage(error_msg)
-            print(f"❌ Error en actualizar_status_bar: {e}")
+            logger.error("❌ Error en actualizar_status_bar: %s", e)
+
+    def _aplicar_cambios(self, cambios):
+        """
+        Refresca solo lo que tocaron los cambios publicados:
+        {"tablas": [...], "ids": {tabla: [...]}}. Una tabla sin ids se recarga entera.
+        """
+        try:
+            ids = {}
+            completas = set()
+            for cambio in cambios:
+                for tabla in cambio.get("tablas", []):
+                    if tabla in cambio.get("ids", {}):
+                        ids.setdefault(tabla, set()).update(int(i) for i in cambio["ids"][tabla])
+                    else:
+                        completas.add(tabla)
+            tablas = completas | set(ids)
+            if not tablas & {"bienes", "movimientos", "bienes_movimientos"}:
+                return
+            
+            if "bienes" in tablas:
+                self._refrescar_filas_bienes(None if "bienes" in completas else ids["bienes"])
+            if tablas & {"movimientos", "bienes_movimientos"}:
+                recargar = completas & {"movimientos", "bienes_movimientos"}
+                self._refrescar_filas_movimientos(None if recargar else ids.get("movimientos", set()))
+            
+            # El dashboard se recalcula solo si está a la vista (al entrar se recarga igual)
+            dashboard = self.dashboard_widget
+            if dashboard is not None and self.tabs.currentWidget() is self.tab_dashboard:
+                if getattr(dashboard, 'filtros_actuales', None):
+                    dashboard._cargar_datos_con_filtros(dashboard.filtros_actuales)
+                else:
+                    dashboard.cargar_datos_iniciales()
+            if "bienes" in tablas:
+                self.actualizar_status_bar()
+        except Exception as e:
+            logger.error("❌ Error aplicando cambios recibidos: %s", e)
+
+    def _refrescar_filas_bienes(self, ids):
+        """Vuelve a pintar los bienes `ids` que están en la grilla; None = recargar"""
+        filtrando = bool(getattr(self, 'filtros_activos', None))
+        if ids is None:
+            if not filtrando:
+                self.cargar_bienes()
+            return
+        
+        visibles = [i for i in ids if i in self._filas_bienes]
+        nuevos = [i for i in ids if i not in self._filas_bienes]
+        
+        bienes = self.db.obtener_bienes_por_ids(visibles) if visibles else []
+        for bien in bienes:
+            self._pintar_fila_bien(self._filas_bienes[bien["id"]], bien)
+        
+        # Bajas, o altas (ids mayores a los mostrados, que van primero): la página cambia
+        borrados = len(bienes) < len(visibles)
+        altas = bool(nuevos) and self.pagina_actual == 1 and max(nuevos) > max(self._filas_bienes, default=0)
+        if (borrados or altas) and not filtrando:
+            self.cargar_bienes()
+        elif bienes:
+            logger.debug("🔔 %s bienes refrescados en la grilla", len(bienes))
+
+    def _refrescar_filas_movimientos(self, ids):
+        """Vuelve a pintar los movimientos `ids` que están en la grilla; None = recargar"""
+        if self._filas_movimientos is None:
+            # Vista filtrada por el usuario: no se la cambia, solo se avisa
+            self.status_bar.showMessage("🔔 Hay movimientos nuevos o modificados", 5000)
+            return
+        if ids is None or any(i not in self._filas_movimientos for i in ids):
+            self.cargar_movimientos(mostrar_eliminados=self._mostrando_eliminados)
+            return
+        if not ids:
+            return
+        
+        movimientos = self.db.get_movimientos_detallados(
+            incluir_eliminados=self._mostrando_eliminados,
+            columnas=self._columnas_consulta_movimientos(),
+            ids=list(ids)
+        )
+        if len(movimientos) < len(ids):
+            # Alguno dejó de mostrarse (eliminado): la grilla se achica
+            self.cargar_movimientos(mostrar_eliminados=self._mostrando_eliminados)
+            return
+        for mov in movimientos:
+            self._pintar_fila_movimiento(self._filas_movimientos[mov["id"]], mov)
+        logger.debug("🔔 %s movimientos refrescados en la grilla", len(movimientos))
+
+    def _actualizar_escrituras_pendientes(self):
+        """Muestra cuántas escrituras faltan aplicar en la red y recarga al terminar"""
+        try:
+            pendientes = self.db.escrituras_pendientes()
+            if pendientes:
+                self.label_escrituras_pendientes.setText(f"⏳ {pendientes} pendientes")
+                error = self.db.diario_escrituras.ultimo_error
+                self.label_escrituras_pendientes.setToolTip(
+                    f"Escrituras guardadas localmente, aplicándose en la red\n{error or ''}".strip()
+                )
+                self.label_escrituras_pendientes.show()
+            else:
+                self.label_escrituras_pendientes.hide()
+                if self._pendientes_anteriores:
+                    # Ya están en la red: refrescar para verlas
+                    self.cargar_bienes()
+                    self.cargar_movimientos()
+            self._pendientes_anteriores = pendientes
+            
+            fallidas = self.db.diario_escrituras.cantidad_fallidas()
+            if fallidas:
+                self.btn_escrituras_fallidas.setText(f"⚠️ {fallidas} rechazadas")
+                self.btn_escrituras_fallidas.show()
+                if fallidas > self._fallidas_anteriores:
+                    self.status_bar.showMessage(
+                        "⚠️ La red rechazó escrituras guardadas en este puesto: revisalas", 10000)
+            else:
+                self.btn_escrituras_fallidas.hide()
+            self._fallidas_anteriores = fallidas
+        except Exception as e:
+            logger.error("❌ Error actualizando escrituras pendientes: %s", e)
+
+    def mostrar_escrituras_fallidas(self):
+        """Muestra las escrituras rechazadas por la red para reintentarlas o descartarlas"""
+        try:
+            from .dialogs.escrituras_fallidas_dialog import EscriturasFallidasDialog
+            dialog = EscriturasFallidasDialog(self.db.diario_escrituras, self)
+            dialog.exec_()
+            self._actualizar_escrituras_pendientes()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudieron mostrar las escrituras rechazadas:\n{str(e)}")
 
     def _actualizar_widgets_status_bar(self, estado_sync, stats):
         """Agrega widgets visuales a la barra de estado - VERSIÓN ROBUSTA"""
@@ -1932,10 +2244,10 @@ class VentanaPrincipal(QMainWindow):
             self.status_bar.addPermanentWidget(label_hora)
             self._status_widgets.append(label_hora)
             
-            print("✅ Widgets de estado actualizados correctamente")
+            logger.debug("✅ Widgets de estado actualizados correctamente")
             
         except Exception as e:
-            print(f"⚠️ Error en widgets de estado: {e}")
+            logger.warning("⚠️ Error en widgets de estado: %s", e)
             # Fallback seguro: solo mostrar mensaje básico
             try:
                 total_bienes = stats.get('total', 0)
@@ -1948,8 +2260,10 @@ class VentanaPrincipal(QMainWindow):
     def exportar_movimientos(self):
         """Exporta movimientos a Excel"""
         try:
-            # Obtener movimientos
-            movimientos = self.db.get_movimientos_detallados()
+            # Obtener movimientos (solo las columnas visibles)
+            movimientos = self.db.get_movimientos_detallados(
+                columnas=self._columnas_consulta_movimientos()
+            )
             
             if not movimientos:
                 QMessageBox.warning(self, "Exportar", "No hay movimientos para exportar")
@@ -1979,6 +2293,7 @@ class VentanaPrincipal(QMainWindow):
                             fila[nombre_col] = valor
                     datos_exportar.append(fila)
                 
+                import pandas as pd
                 df = pd.DataFrame(datos_exportar)
                 
                 # Exportar a Excel
@@ -1994,11 +2309,12 @@ class VentanaPrincipal(QMainWindow):
         """Exporta bienes filtrados a Excel"""
         try:
             # Obtener bienes (filtrados si hay filtros activos, sino todos)
+            columnas = self._columnas_consulta_bienes()
             if self.filtros_activos:
-                bienes = self.bien_manager.buscar_bienes(self.filtros_activos)
+                bienes = self.bien_manager.buscar_bienes(self.filtros_activos, columnas=columnas)
                 tipo_export = "filtrados"
             else:
-                bienes = self.db.list_bienes(limite=10000)
+                bienes = self.db.list_bienes(limite=10000, columnas=columnas)
                 tipo_export = "completo"
             
             if not bienes:
@@ -2022,6 +2338,7 @@ class VentanaPrincipal(QMainWindow):
                             fila[nombre_col] = self.safe_get(bien, campo_bd)
                     datos_exportar.append(fila)
                 
+                import pandas as pd
                 df = pd.DataFrame(datos_exportar)
                 
                 # Exportar a Excel
@@ -2232,11 +2549,12 @@ class VentanaPrincipal(QMainWindow):
         """Exporta bienes filtrados a PDF con formato horizontal mejorado"""
         try:
             # Obtener bienes (filtrados si hay filtros activos, sino todos)
+            columnas = self._columnas_consulta_bienes()
             if self.filtros_activos:
-                bienes = self.bien_manager.buscar_bienes(self.filtros_activos)
+                bienes = self.bien_manager.buscar_bienes(self.filtros_activos, columnas=columnas)
                 tipo_export = "filtrados"
             else:
-                bienes = self.db.list_bienes(limite=10000)
+                bienes = self.db.list_bienes(limite=10000, columnas=columnas)
                 tipo_export = "completo"
             
             if not bienes:
@@ -2369,8 +2687,10 @@ class VentanaPrincipal(QMainWindow):
     def exportar_movimientos_pdf(self):
         """Exporta movimientos a PDF con formato horizontal mejorado"""
         try:
-            # Obtener movimientos
-            movimientos = self.db.get_movimientos_detallados()
+            # Obtener movimientos (solo las columnas visibles)
+            movimientos = self.db.get_movimientos_detallados(
+                columnas=self._columnas_consulta_movimientos()
+            )
             
             if not movimientos:
                 QMessageBox.warning(self, "Exportar PDF", "No hay movimientos para exportar")
@@ -2507,12 +2827,12 @@ class VentanaPrincipal(QMainWindow):
                 # Obtener ficha del bien (columna 0 - FICHA)
                 ficha = self.tabla_bienes.item(fila, 0).text()
                 
-                print(f"🎯 Doble click en fila {fila}, ficha: {ficha}")
+                logger.debug("🎯 Doble click en fila %s, ficha: %s", fila, ficha)
                 
                 # Buscar el bien completo por ficha
                 bien = self.db.obtener_bien_por_ficha(ficha)
                 if bien:
-                    print(f"✅ Bien encontrado: ID {bien['id']} - {bien['ficha']} - {bien['tipo']}")
+                    logger.debug("✅ Bien encontrado: ID %s - %s - %s", bien['id'], bien['ficha'], bien['tipo'])
                     
                     # Abrir diálogo de historial
                     from .dialogs.historial_dialog import HistorialDialog
@@ -2522,7 +2842,7 @@ class VentanaPrincipal(QMainWindow):
                     QMessageBox.warning(self, "Historial", f"No se encontró el bien con ficha: {ficha}")
                     
         except Exception as e:
-            print(f"❌ Error mostrando historial: {e}")
+            logger.error("❌ Error mostrando historial: %s", e)
             QMessageBox.critical(self, "Error", f"No se pudo abrir el historial:\n{str(e)}")
             
     def generar_acta_seleccionado(self):
@@ -2553,8 +2873,8 @@ class VentanaPrincipal(QMainWindow):
             # Generar acta
             from generador_actas import GeneradorActas
             generador = GeneradorActas()
-            print(f"🔍 DEBUG - usuario_actual completo:")
-            print(f"   {self.usuario_actual}")
+            logger.debug("🔍 - usuario_actual completo:")
+            logger.debug("   %s", self.usuario_actual)
             if tipo_acta == "entrega":
                 ruta_acta = generador.generar_acta_entrega(bien, self.usuario_actual)  # ← Sin ['id']
             else:
@@ -2618,12 +2938,14 @@ class VentanaPrincipal(QMainWindow):
             self.mostrar_movimientos_filtrados(movimientos_filtrados)
             
         except Exception as e:
-            print(f"❌ Error en búsqueda en tiempo real: {e}")
+            logger.error("❌ Error en búsqueda en tiempo real: %s", e)
 
+    @medir("ui", "tabla_movimientos_filtrados")
     def mostrar_movimientos_filtrados(self, movimientos_filtrados):
         """Muestra movimientos filtrados en la tabla - PASO 1"""
         try:
             self.tabla_movimientos.setRowCount(len(movimientos_filtrados))
+            self._filas_movimientos = None  # vista filtrada: los avisos no la tocan
             
             for i, mov in enumerate(movimientos_filtrados):
                 col_idx = 0
@@ -2663,7 +2985,7 @@ class VentanaPrincipal(QMainWindow):
             self.status_bar.showMessage(f"✅ Encontrados {len(movimientos_filtrados)} movimientos", 3000)
             
         except Exception as e:
-            print(f"❌ Error mostrando movimientos filtrados: {e}")
+            logger.error("❌ Error mostrando movimientos filtrados: %s", e)
             
     def mostrar_resumen_movimiento(self, index):
         """Doble click muestra TODO en una sola pantalla - VERSIÓN MEJORADA"""
@@ -2682,7 +3004,7 @@ class VentanaPrincipal(QMainWindow):
             # 📊 ACCESO A RESUMEN COMPLETO
             movimientos = self.db.get_movimientos_detallados()
             if row >= len(movimientos):
-                print(f"⚠️ Fila {row} fuera de rango")
+                logger.warning("⚠️ Fila %s fuera de rango", row)
                 return
                 
             movimiento_row = movimientos[row]
@@ -2704,7 +3026,7 @@ class VentanaPrincipal(QMainWindow):
             self.status_bar.showMessage(f"✅ Movimiento #{movimiento_id} revisado", 2000)
 
         except Exception as e:
-            print(f"❌ Error en doble click: {e}")
+            logger.error("❌ Error en doble click: %s", e)
             QMessageBox.critical(self, "Error", 
                             f"No se pudo abrir el resumen:\n{str(e)}\n\n"
                             f"💡 Asegúrate de que el movimiento tenga datos válidos.")
@@ -2776,7 +3098,7 @@ class VentanaPrincipal(QMainWindow):
             self.status_bar.showMessage(f"✅ {len(movimientos_filtrados)} movimientos de {tipo}", 3000)
             
         except Exception as e:
-            print(f"❌ Error filtrando por tipo: {e}")
+            logger.error("❌ Error filtrando por tipo: %s", e)
 
     def filtrar_movimientos_hoy(self):
         """Filtra movimientos del día actual - PASO 2"""
@@ -2809,12 +3131,12 @@ class VentanaPrincipal(QMainWindow):
             self.status_bar.showMessage(f"✅ {len(movimientos_hoy)} movimientos de hoy", 3000)
             
         except Exception as e:
-            print(f"❌ Error filtrando movimientos de hoy: {e}")
+            logger.error("❌ Error filtrando movimientos de hoy: %s", e)
             
     def abrir_acta_movimiento(self, movimiento_id):
         """Abre el acta del movimiento para visualización - PASO 4 CORREGIDO"""
         try:
-            print(f"📄 Abriendo acta del movimiento: {movimiento_id}")
+            logger.debug("📄 Abriendo acta del movimiento: %s", movimiento_id)
             
             # Obtener datos del movimiento
             movimiento_data = self.db.obtener_movimiento_por_id(movimiento_id)
@@ -2865,7 +3187,7 @@ class VentanaPrincipal(QMainWindow):
             self.abrir_archivo_desde_ruta(archivo_a_abrir)
             
         except Exception as e:
-            print(f"❌ Error abriendo acta: {e}")
+            logger.error("❌ Error abriendo acta: %s", e)
             QMessageBox.critical(self, "Error", f"No se pudo abrir el acta:\n{str(e)}")
             
     def _toggle_mostrar_eliminados(self, state):
@@ -2880,12 +3202,12 @@ class VentanaPrincipal(QMainWindow):
                 self.status_bar.showMessage("✅ Mostrando solo movimientos activos", 3000)
                 
         except Exception as e:
-            print(f"❌ Error al mostrar eliminados: {e}")
+            logger.error("❌ Error al mostrar eliminados: %s", e)
             
     def _aplicar_ajustes_tabla_movimientos_optimizada(self):
         """Ajustes optimizados para tabla SIN columna Acciones - MÉTODO NUEVO"""
         try:
-            print("🎯 Aplicando ajustes optimizados de tabla...")
+            logger.debug("🎯 Aplicando ajustes optimizados de tabla...")
             
             # 1. Ajustar automáticamente el tamaño primero
             self.tabla_movimientos.resizeColumnsToContents()
@@ -2915,11 +3237,11 @@ class VentanaPrincipal(QMainWindow):
                     # Columna con ancho fijo
                     header.setSectionResizeMode(col_idx, QHeaderView.Fixed)
                     self.tabla_movimientos.setColumnWidth(col_idx, anchos_fijos[nombre_col])
-                    print(f"   📏 {nombre_col}: {anchos_fijos[nombre_col]}px (fijo)")
+                    logger.debug("   📏 %s: %spx (fijo)", nombre_col, anchos_fijos[nombre_col])
                 else:
                     # Columna con tamaño interactivo
                     header.setSectionResizeMode(col_idx, QHeaderView.Interactive)
-                    print(f"   📏 {nombre_col}: tamaño automático")
+                    logger.debug("   📏 %s: tamaño automático", nombre_col)
                 
                 col_idx += 1
                 
@@ -2935,10 +3257,10 @@ class VentanaPrincipal(QMainWindow):
             # 7. También agregar tooltip al header para mayor visibilidad
             header.setToolTip("Doble click en filas para detalles completos")
             
-            print("✅ Ajustes de tabla aplicados correctamente")
+            logger.debug("✅ Ajustes de tabla aplicados correctamente")
             
         except Exception as e:
-            print(f"❌ Error aplicando ajustes de tabla: {e}")
+            logger.error("❌ Error aplicando ajustes de tabla: %s", e)
             # Fallback básico
             try:
                 self.tabla_movimientos.resizeColumnsToContents()
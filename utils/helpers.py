@@ -64,10 +64,10 @@ def exportar_dataframe_excel(df, titulo_archivo):
 
 
 def crear_backup_automatico(db_path):
-    """Crea un backup automático de la base de datos"""
-    import shutil
+    """Crea un backup automático consistente de la base de datos"""
     import os
     from datetime import datetime
+    from database.respaldo import crear_respaldo
     
     try:
         # Crear carpeta de backups si no existe
@@ -79,8 +79,8 @@ def crear_backup_automatico(db_path):
         backup_name = f"inventario_backup_{timestamp}.db"
         backup_path = os.path.join(backup_dir, backup_name)
         
-        # Crear backup
-        shutil.copy2(db_path, backup_path)
+        # Crear backup (API de backup de SQLite + quick_check)
+        backup_path = crear_respaldo(db_path, backup_path)
         
         print(f"✅ Backup creado: {backup_name}")
         return backup_path
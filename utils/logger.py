@@ -0,0 +1,118 @@
+"""
+📝 LOGGING - Sistema de Inventario AGC
+Fachada de logging con niveles, cola no bloqueante y archivo rotativo
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# Todos los loggers del sistema cuelgan de este nombre raíz
+LOGGER_RAIZ = "inventario"
+
+NIVEL_POR_DEFECTO = "INFO"
+FORMATO = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+_listener = None
+
+
+def obtener_logger(nombre):
+    """
+    Devuelve el logger de un módulo (usar con __name__).
+
+    Ejemplo: obtener_logger("database.db_manager") -> "inventario.database.db_manager"
+    """
+    if nombre == LOGGER_RAIZ or nombre.startswith(LOGGER_RAIZ + "."):
+        return logging.getLogger(nombre)
+    return logging.getLogger(f"{LOGGER_RAIZ}.{nombre}")
+
+
+def _nivel(valor, por_defecto=NIVEL_POR_DEFECTO):
+    """Convierte 'DEBUG'/'info'/10 a nivel numérico de logging"""
+    if isinstance(valor, int):
+        return valor
+    nivel = logging.getLevelName(str(valor or por_defecto).upper())
+    return nivel if isinstance(nivel, int) else logging.getLevelName(por_defecto)
+
+
+def _ruta_log_por_defecto():
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, "logs", "inventario.log")
+
+
+def configurar_logging(config=None):
+    """
+    Configura el logging del sistema a partir de la configuración de la app.
+
+    Claves usadas (todas opcionales):
+        log_nivel: Nivel general ("DEBUG", "INFO", "WARNING", ...)
+        log_niveles_modulo: {"database.db_manager": "DEBUG", ...}
+        log_archivo: Ruta del archivo rotativo
+        log_max_bytes / log_backups: Tamaño y cantidad de archivos rotados
+        log_consola: Mostrar también en consola
+
+    Los registros pasan por una cola: quien loguea no espera la escritura
+    en disco ni en consola, eso lo hace el hilo del QueueListener.
+    """
+    global _listener
+    config = config or {}
+
+    raiz = logging.getLogger(LOGGER_RAIZ)
+    raiz.setLevel(_nivel(config.get("log_nivel")))
+    raiz.propagate = False
+
+    # Verbosidad por módulo
+    for modulo, nivel in (config.get("log_niveles_modulo") or {}).items():
+        obtener_logger(modulo).setLevel(_nivel(nivel))
+
+    # Reconfiguración: detener el listener anterior
+    detener_logging()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+
+    formatter = logging.Formatter(FORMATO)
+    destinos = []
+
+    ruta_archivo = config.get("log_archivo") or _ruta_log_por_defecto()
+    try:
+        os.makedirs(os.path.dirname(ruta_archivo), exist_ok=True)
+        archivo = logging.handlers.RotatingFileHandler(
+            ruta_archivo,
+            maxBytes=int(config.get("log_max_bytes", 2 * 1024 * 1024)),
+            backupCount=int(config.get("log_backups", 5)),
+            encoding="utf-8",
+        )
+        archivo.setFormatter(formatter)
+        destinos.append(archivo)
+    except OSError as e:
+        print(f"⚠️ No se pudo abrir el archivo de log {ruta_archivo}: {e}")
+
+    if config.get("log_consola", True):
+        consola = logging.StreamHandler(sys.stdout)
+        consola.setFormatter(formatter)
+        destinos.append(consola)
+
+    cola = queue.SimpleQueue()
+    raiz.addHandler(logging.handlers.QueueHandler(cola))
+    _listener = logging.handlers.QueueListener(cola, *destinos, respect_handler_level=True)
+    _listener.start()
+    return raiz
+
+
+def detener_logging():
+    """Vacía la cola y detiene el hilo de escritura (se llama también al salir)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        _listener = None
+
+
+atexit.register(detener_logging)
@@ -0,0 +1,243 @@
+"""
+⏱️ PERFIL DE ARRANQUE - Sistema de Inventario AGC
+Mide importaciones y etapas del arranque y las compara con una línea base
+"""
+
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Solo librería estándar: se importa antes que todo lo demás para medirlo
+
+ARGUMENTO = "--perfil-arranque"
+ARGUMENTO_GUARDAR_BASE = "--guardar-base-arranque"
+VARIABLE_ENTORNO = "INVENTARIO_PERFIL_ARRANQUE"
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_BASE = os.path.join(_RAIZ, "config", "perfil_arranque_base.json")
+CARPETA_INFORMES = os.path.join(_RAIZ, "logs")
+
+
+class PerfilArranque:
+    """
+    Perfilador opcional del arranque (main.py --perfil-arranque o
+    INVENTARIO_PERFIL_ARRANQUE=1).
+
+    - Importaciones: envuelve builtins.__import__ y anota, por módulo
+      cargado por primera vez, el tiempo total y el propio (sin contar
+      lo que ese módulo importó a su vez).
+    - Etapas: `with etapa("db.init_db"):` en los puntos del arranque.
+      Inactivo, etapa() no hace nada.
+    - Al terminar se escribe un JSON en logs/ y un resumen, comparando
+      cada etapa con config/perfil_arranque_base.json. Esa base no viene
+      con el programa: la crea el primer arranque con --guardar-base-arranque
+      en el puesto donde se va a comparar (los tiempos dependen del equipo).
+    """
+
+    TOLERANCIA = 0.25     # más de un 25% sobre la base es regresión...
+    MINIMO_MS = 50        # ...si además la diferencia pasa de esto
+    TOP_IMPORTACIONES = 20
+    ETAPAS_FUERA_DEL_TOTAL = ("login.espera_usuario",)   # tiempo del usuario, no del programa
+
+    def __init__(self):
+        self.activo = False
+        self.guardar_base = False
+        self.etapas = {}
+        self.importaciones = {}
+        self._inicio = None
+        self._pila = []
+        self._import_original = None
+
+    # ------------------------------------------------------------------
+    # Activación
+    # ------------------------------------------------------------------
+    @staticmethod
+    def solicitado(argv=None):
+        argv = sys.argv if argv is None else argv
+        return ARGUMENTO in argv or os.environ.get(VARIABLE_ENTORNO, "") not in ("", "0")
+
+    def activar(self, argv=None):
+        """Empieza a medir; quita los argumentos propios de argv (Qt no los conoce)"""
+        argv = sys.argv if argv is None else argv
+        self.guardar_base = ARGUMENTO_GUARDAR_BASE in argv
+        for argumento in (ARGUMENTO, ARGUMENTO_GUARDAR_BASE):
+            while argumento in argv:
+                argv.remove(argumento)
+
+        if self.activo:
+            return
+        self.activo = True
+        self._inicio = time.perf_counter()
+        self._import_original = builtins.__import__
+        builtins.__import__ = self._importar
+
+    def _desactivar_importaciones(self):
+        if self._import_original is not None:
+            builtins.__import__ = self._import_original
+            self._import_original = None
+
+    # ------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------
+    def _importar(self, nombre, globals=None, locals=None, fromlist=(), level=0):
+        importar = self._import_original
+        absoluto = nombre
+        if level:
+            try:
+                absoluto = importlib.util.resolve_name("." * level + nombre, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                return importar(nombre, globals, locals, fromlist, level)
+        if absoluto in sys.modules:
+            return importar(nombre, globals, locals, fromlist, level)
+
+        self._pila.append(0.0)
+        inicio = time.perf_counter()
+        try:
+            return importar(nombre, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - inicio
+            hijos = self._pila.pop()
+            if self._pila:
+                self._pila[-1] += total
+            if absoluto not in self.importaciones:
+                self.importaciones[absoluto] = {
+                    "total_ms": round(total * 1000, 2),
+                    "propio_ms": round((total - hijos) * 1000, 2),
+                }
+
+    @contextmanager
+    def etapa(self, nombre):
+        if not self.activo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            self.etapas[nombre] = round(self.etapas.get(nombre, 0.0) + ms, 2)
+
+    def marcar(self, nombre):
+        """Anota el tiempo transcurrido desde el inicio del arranque"""
+        if self.activo:
+            self.etapas[nombre] = round((time.perf_counter() - self._inicio) * 1000, 2)
+
+    # ------------------------------------------------------------------
+    # Informe
+    # ------------------------------------------------------------------
+    def informe(self):
+        importaciones = sorted(self.importaciones.items(), key=lambda i: i[1]["propio_ms"], reverse=True)
+        return {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": sys.platform,
+            "etapas": dict(self.etapas),
+            "importaciones_ms": round(sum(i["propio_ms"] for i in self.importaciones.values()), 2),
+            "modulos_importados": len(self.importaciones),
+            "importaciones": dict(importaciones),
+        }
+
+    def comparar(self, informe, base):
+        """[(etapa, base_ms, actual_ms)] que empeoraron más allá de la tolerancia"""
+        actuales = dict(informe["etapas"], importaciones=informe["importaciones_ms"])
+        regresiones = []
+        for nombre, base_ms in (base.get("etapas") or {}).items():
+            actual = actuales.get(nombre)
+            if actual is None:
+                continue
+            if actual > base_ms * (1 + self.TOLERANCIA) and actual - base_ms > self.MINIMO_MS:
+                regresiones.append((nombre, base_ms, actual))
+        return regresiones
+
+    def resumen(self, informe, regresiones=(), hay_base=True):
+        lineas = ["⏱️ PERFIL DE ARRANQUE", "=" * 60]
+        lineas += [f"  {nombre:<32} {ms:>9.1f} ms" for nombre, ms in informe["etapas"].items()]
+        lineas.append(f"  {'importaciones (propio)':<32} {informe['importaciones_ms']:>9.1f} ms "
+                      f"({informe['modulos_importados']} módulos)")
+        lineas.append("-" * 60)
+        for modulo, tiempos in list(informe["importaciones"].items())[:self.TOP_IMPORTACIONES]:
+            lineas.append(f"  {modulo:<40} {tiempos['propio_ms']:>8.1f} ms")
+        lineas.append("-" * 60)
+        if not hay_base:
+            lineas.append(f"  ℹ️ Sin línea base: arrancar con {ARGUMENTO} {ARGUMENTO_GUARDAR_BASE} para crearla")
+        elif regresiones:
+            for nombre, base_ms, actual in regresiones:
+                lineas.append(f"  ⚠️ REGRESIÓN {nombre}: {actual:.0f} ms (base {base_ms:.0f} ms)")
+        else:
+            lineas.append("  ✅ Sin regresiones respecto de la línea base")
+        return "\n".join(lineas)
+
+    def finalizar(self, ruta_informe=None, ruta_base=RUTA_BASE):
+        """Deja de medir, escribe el informe y devuelve las regresiones encontradas"""
+        if not self.activo:
+            return []
+        self.marcar("arranque_total")
+        self.etapas["arranque_total"] = round(
+            self.etapas["arranque_total"] - sum(self.etapas.get(e, 0.0) for e in self.ETAPAS_FUERA_DEL_TOTAL), 2
+        )
+        self._desactivar_importaciones()
+        self.activo = False
+
+        informe = self.informe()
+        base = cargar_base(ruta_base)
+        regresiones = self.comparar(informe, base) if base else []
+        informe["regresiones"] = [
+            {"etapa": nombre, "base_ms": base_ms, "actual_ms": actual}
+            for nombre, base_ms, actual in regresiones
+        ]
+
+        if ruta_informe is None:
+            os.makedirs(CARPETA_INFORMES, exist_ok=True)
+            ruta_informe = os.path.join(
+                CARPETA_INFORMES, f"perfil_arranque_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+        try:
+            with open(ruta_informe, "w", encoding="utf-8") as f:
+                json.dump(informe, f, indent=2, ensure_ascii=False)
+            if self.guardar_base:
+                guardar_base(informe, ruta_base)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el perfil de arranque: {e}")
+
+        print(self.resumen(informe, regresiones, hay_base=bool(base) or self.guardar_base))
+        print(f"📄 Informe: {ruta_informe}")
+        return regresiones
+
+
+def cargar_base(ruta=RUTA_BASE):
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def guardar_base(informe, ruta=RUTA_BASE):
+    """Crea o reemplaza la línea base con las etapas de este arranque"""
+    base = {
+        "descripcion": "Tiempos de referencia del arranque (ms). Regenerar con "
+                       f"main.py {ARGUMENTO} {ARGUMENTO_GUARDAR_BASE} en un puesto de oficina.",
+        "fecha": informe["fecha"],
+        "etapas": dict(informe["etapas"], importaciones=informe["importaciones_ms"]),
+    }
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(base, f, indent=2, ensure_ascii=False)
+
+
+_perfil = PerfilArranque()
+
+
+def perfil_arranque():
+    """Perfilador único del proceso"""
+    return _perfil
+
+
+def etapa(nombre):
+    """Atajo: `with etapa("ventana.setup_ui"): ...` (no hace nada si el perfil está apagado)"""
+    return _perfil.etapa(nombre)
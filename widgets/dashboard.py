@@ -13,6 +13,8 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 import matplotlib.pyplot as plt
 
+from database.metricas import medir
+
 
 class TarjetaKPI(QWidget):
     """Widget de tarjeta KPI para el dashboard - VERSIÓN MEJORADA"""
@@ -740,6 +742,7 @@ class DashboardConfigurableWidget(QWidget):
         except Exception as e:
             print(f"❌ Error actualizando tarjetas KPI: {e}")
 
+    @medir("ui", "dashboard_graficos")
     def _actualizar_graficos(self, stats):
         """Actualiza los 2 gráficos reales con matplotlib según su tipo seleccionado"""
         try: